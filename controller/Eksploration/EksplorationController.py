@@ -9,14 +9,19 @@ class NormalityTestController:
     Methods:
         __init__(NormalityTestModel):
             Initializes the NormalityTestController with the given model.
-        run_model(r_script):
+        run_model(r_script, options=None):
             Executes the normality test using the provided R script.
+        run_native(options):
+            Runs the normality tests with polars using the dialog options.
     """
     def __init__(self,NormalityTestModel):
         self.NormalityTestModel = NormalityTestModel
 
-    def run_model(self, r_script):
-        self.NormalityTestModel.run_model(r_script)
+    def run_model(self, r_script, options=None):
+        self.NormalityTestModel.run_model(r_script, options)
+
+    def run_native(self, options):
+        self.NormalityTestModel.run_native(options)
 
 class SummaryDataController:
     """_summary_data_controller
@@ -28,14 +33,19 @@ class SummaryDataController:
     Methods:
         __init__(SummaryData):
             Initializes the SummaryDataController with the given model.
-        run_model(r_script):
+        run_model(r_script, options=None):
             Executes the summary data generation using the provided R script
+        run_native(options):
+            Computes the summary data with polars using the dialog options.
     """
     def __init__(self, SummaryData):
         self.SummaryData = SummaryData
     
-    def run_model(self, r_script):
-        self.SummaryData.run_model(r_script)
+    def run_model(self, r_script, options=None):
+        self.SummaryData.run_model(r_script, options)
+
+    def run_native(self, options):
+        self.SummaryData.run_native(options)
 
 class CorrelationMatrixController:
     """_summary_data_controller
@@ -47,14 +57,19 @@ class CorrelationMatrixController:
     Methods:
         __init__(CorrelationMatrixModel):
             Initializes the CorrelationMatrixController with the given model.
-        run_model(r_script):
+        run_model(r_script, options=None):
             Executes the correlation matrix generation using the provided R script
+        run_native(options):
+            Computes the correlation matrix with polars using the dialog options.
     """
     def __init__(self, CorrelationMatrixModel):
         self.CorrelationMatrixModel = CorrelationMatrixModel
     
-    def run_model(self, r_script):
-        self.CorrelationMatrixModel.run_model(r_script)
+    def run_model(self, r_script, options=None):
+        self.CorrelationMatrixModel.run_model(r_script, options)
+
+    def run_native(self, options):
+        self.CorrelationMatrixModel.run_native(options)
 
 class MulticollinearityController:
     """_summary_data_controller
@@ -66,13 +81,18 @@ class MulticollinearityController:
     Methods:
         __init__(MulticollinearityModel):
             Initializes the MulticollinearityController with the given model.
-        run_model(r_script):
+        run_model(r_script, options=None):
+        run_native(options):
+            Computes the diagnostics with polars using the dialog options.
     """
     def __init__(self, multicollinearityModel):
         self.MulticollinearityModel = multicollinearityModel
     
-    def run_model(self, r_script):
-        self.MulticollinearityModel.run_model(r_script)
+    def run_model(self, r_script, options=None):
+        self.MulticollinearityModel.run_model(r_script, options)
+
+    def run_native(self, options):
+        self.MulticollinearityModel.run_native(options)
 
 class VariableSelectionController:
     """_summary_data_controller
@@ -84,11 +104,16 @@ class VariableSelectionController:
     Methods:
         __init__(VariableSelectionModel):
             Initializes the VariableSelectionController with the given model.
-        run_model(r_script):
+        run_model(r_script, options=None):
             Executes the variable selection generation using the provided R
+        run_native(options):
+            Runs the stepwise selection with polars using the dialog options.
     """
     def __init__(self, VariableSelectionModel):
         self.VariableSelectionModel = VariableSelectionModel
     
-    def run_model(self, r_script):
-        self.VariableSelectionModel.run_model(r_script)
+    def run_model(self, r_script, options=None):
+        self.VariableSelectionModel.run_model(r_script, options)
+
+    def run_native(self, options):
+        self.VariableSelectionModel.run_native(options)
@@ -1,10 +1,15 @@
-from PyQt6.QtWidgets import QMessageBox, QFileDialog, QLabel, QFrame
+from PyQt6.QtWidgets import QMessageBox, QFileDialog
 import polars as pl
 from view.components.CsvDialogOption import CSVOptionsDialog
+from view.components.ImportProgressDialog import ImportProgressDialog, ProjectSheetProgressDialog
+from view.components.ExportProgressDialog import ExportProgressDialog, ProjectSaveProgressDialog
+from view.components.ColumnSelectDialog import ColumnSelectDialog
+from service.file.ColumnarFile import read_columnar_schema, read_columnar, write_parquet, write_ipc
+from view.components.ExcelOptionsDialog import ExcelOptionsDialog
+from service.file.ExcelImport import read_sheet
+from service.session.Project import ProjectFile, PROJECT_EXTENSION
 from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import QInputDialog
-from PyQt6.QtGui import QPainter, QPdfWriter
-from PyQt6.QtCore import QRectF
+import os
 
 class FileController:
     """
@@ -17,11 +22,18 @@ class FileController:
         __init__(model1, model2, view):
             Initializes the FileController with the given models and view.
         load_file():
-            Loads a CSV or Excel file into the first model.
+            Loads a CSV, Excel, Parquet or Arrow IPC file into the first model.
+        import_csv(file_path, separator, header, encoding="utf-8", decimal_comma=False):
+            Streams a CSV file into the first model in a worker thread, showing the first rows early.
+        open_project():
+            Opens a .saep project, replacing both sheets and the output history; the data
+            sheet is streamed in a worker thread and plots are read when first shown.
+        save_project():
+            Saves both sheets, the outputs and their plots as a .saep project in a worker thread.
         save_data():
-            Saves data from the first model to a file in various formats (CSV, Excel, JSON, Text).
+            Saves data from the first model to a file in various formats (CSV, Excel, JSON, Text, Parquet, Arrow IPC).
         save_data_output():
-            Saves data from the second model to a file in various formats (CSV, Excel, JSON, Text).
+            Saves data from the second model to a file in various formats (CSV, Excel, JSON, Text, Parquet, Arrow IPC).
         save_as_csv(file_path, model):
             Saves data from the given model as a CSV file.
         save_as_excel(file_path, model):
@@ -30,8 +42,12 @@ class FileController:
             Saves data from the given model as a JSON file.
         save_as_txt(file_path, model):
             Saves data from the given model as a text file with tab-separated values.
+        save_as_parquet(file_path, model):
+            Saves data from the given model as a Parquet file.
+        save_as_ipc(file_path, model):
+            Saves data from the given model as an uncompressed Arrow IPC (Feather v2) file.
         export_output_to_pdf():
-            Exports the content of all widgets in the output layout to a PDF file.
+            Exports the records of the output history to a PDF file in a worker thread, with progress and cancel.
     """
     
     def __init__(self, model1, model2, view):
@@ -47,12 +63,14 @@ class FileController:
         self.view.actionSave_Data.triggered.connect(self.save_data)
         self.view.save_output_pdf.triggered.connect(self.export_output_to_pdf)
         self.view.recent_data.triggered.connect(self.view.load_temp_data)  
+        self.view.open_project_action.triggered.connect(self.open_project)
+        self.view.save_project_action.triggered.connect(self.save_project)
 
     def load_file(self):
         """Muat file CSV atau Excel ke model pertama."""
         file_path, selected_filter = QFileDialog.getOpenFileName(
             self.view, "Open File", "",
-            "CSV Files (*.csv);;Excel Files (*.xlsx)"
+            "CSV Files (*.csv);;Excel Files (*.xlsx);;Parquet Files (*.parquet);;Arrow IPC / Feather Files (*.arrow *.feather *.ipc)"
         )
 
         if not file_path:  # Jika file tidak dipilih
@@ -61,38 +79,157 @@ class FileController:
         try:
             if selected_filter == "CSV Files (*.csv)":
                 dialog = CSVOptionsDialog(self.view)
-                dialog.file_path = file_path
-                dialog.file_label.setText(f"Selected: {file_path}")
-                dialog.update_preview()
+                dialog.set_file(file_path)
                 file_path, separator, header = dialog.get_csv_options()
 
                 if not file_path:  # Jika file tidak dipilih
                     return
 
-                # Baca data dari CSV dengan atau tanpa header
-                if header:
-                    data = pl.read_csv(file_path, separator=separator, ignore_errors=True, has_header=True, null_values=["NA", "NULL", "na", "null"])
-                else:
-                    data = pl.read_csv(file_path, separator=separator, ignore_errors=True, has_header=False, null_values=["NA", "NULL", "na", "null"])
-                    data.columns = [f"Column {i+1}" for i in range(data.shape[1])]
+                self.import_csv(file_path, separator, header, dialog.get_encoding(), dialog.get_decimal_comma())
+                return
             elif selected_filter == "Excel Files (*.xlsx)":
-                import pandas as pd
-                sheet_names = pd.ExcelFile(file_path).sheet_names
-                sheet_name, ok = QInputDialog.getItem(self.view, "Select Sheet", "Sheet:", sheet_names, 0, False)
-                if not ok:
+                sheet_name, columns, n_rows = ExcelOptionsDialog(file_path, self.view).get_excel_options()
+                if not sheet_name:
                     return
-                data = pl.read_excel(file_path, sheet_name=sheet_name)
+                cache_dir = os.path.join(self.view.path, 'file-data', 'import-cache')
+                data = read_sheet(file_path, sheet_name, columns, n_rows, cache_dir)
+            elif selected_filter in ("Parquet Files (*.parquet)", "Arrow IPC / Feather Files (*.arrow *.feather *.ipc)"):
+                schema = read_columnar_schema(file_path)
+                columns = ColumnSelectDialog(schema, self.view).get_selected_columns()
+                if columns is None:
+                    return
+                data = read_columnar(file_path, columns if len(columns) < len(schema) else None)
 
             self.model1.set_data(data)
             self.view.update_table(1, self.model1)
         except Exception as e:
             QMessageBox.critical(self.view, "Error", f"Failed to load file: {str(e)}")
 
+    def import_csv(self, file_path, separator, header, encoding="utf-8", decimal_comma=False):
+        """Baca CSV secara bertahap di thread terpisah; batch pertama langsung ditampilkan."""
+        previous_data = self.model1.get_data()
+        progress = ImportProgressDialog(self.view, file_path, separator, header, encoding, decimal_comma)
+        state = {"first_batch": True}
+
+        def on_batch_ready(batch, bytes_read, total_bytes):
+            if state["first_batch"]:
+                state["first_batch"] = False
+                self.model1.set_data(batch)
+                self.view.spreadsheet.resizeColumnsToContents()
+            else:
+                self.model1.append_rows(batch)
+
+        def on_import_finished(error, cancelled):
+            progress.close()
+            self.import_progress = None
+            if error is not None or cancelled:
+                self.model1.set_data(previous_data)
+            self.view.update_table(1, self.model1)
+            if error is not None:
+                QMessageBox.critical(self.view, "Error", f"Failed to load file: {str(error)}")
+            elif cancelled:
+                QMessageBox.information(self.view, "Import Cancelled", "The import was cancelled. The previous data has been kept.")
+
+        progress.batch_ready.connect(on_batch_ready)
+        progress.import_finished.connect(on_import_finished)
+        self.import_progress = progress
+        progress.start()
+
+    def open_project(self):
+        """Buka project .saep: data kedua sheet dan riwayat output."""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self.view, "Open Project", "", f"SAE Pisan Project (*{PROJECT_EXTENSION})"
+        )
+        if not file_path:
+            return
+
+        try:
+            project = ProjectFile(file_path)
+            outputs = project.output_records()
+            data2 = project.load_sheet("data2") if "data2" in project.sheet_names() else None
+        except Exception as e:
+            if "project" in locals():
+                project.close()
+            QMessageBox.critical(self.view, "Error", f"Failed to open project: {str(e)}")
+            return
+
+        previous = (self.view.model1.get_data(), self.view.model2.get_data(), self.view.get_output_data(include_plots=True))
+        if data2 is not None:
+            self.view.model2.set_data(data2)
+        self.view.clear_outputs()
+        self.view.set_output_data(outputs)
+        self.view.update_table(2, self.view.model2)
+        if "data1" not in project.sheet_names():
+            project.close()
+            self.view.project_path = file_path
+            self.view.update_table(1, self.view.model1)
+            return
+
+        progress = ProjectSheetProgressDialog(self.view, project, "data1")
+        state = {"first_batch": True}
+
+        def on_batch_ready(batch, rows_read, total_rows):
+            if state["first_batch"]:
+                state["first_batch"] = False
+                self.model1.set_data(batch)
+                self.view.spreadsheet.resizeColumnsToContents()
+            else:
+                self.model1.append_rows(batch)
+
+        def on_open_finished(error, cancelled):
+            progress.close()
+            project.close()
+            self.import_progress = None
+            if error is not None or cancelled:
+                self.model1.set_data(previous[0])
+                self.view.model2.set_data(previous[1])
+                self.view.clear_outputs()
+                self.view.set_output_data(previous[2])
+                self.view.update_table(2, self.view.model2)
+            else:
+                self.view.project_path = file_path
+            self.view.update_table(1, self.model1)
+            if error is not None:
+                QMessageBox.critical(self.view, "Error", f"Failed to open project: {str(error)}")
+            elif cancelled:
+                QMessageBox.information(self.view, "Open Cancelled", "Opening the project was cancelled. The previous data has been kept.")
+
+        progress.batch_ready.connect(on_batch_ready)
+        progress.import_finished.connect(on_open_finished)
+        self.import_progress = progress
+        progress.start()
+
+    def save_project(self):
+        """Simpan data kedua sheet, output, dan plot sebagai project .saep di thread terpisah."""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self.view, "Save Project", self.view.project_path or "", f"SAE Pisan Project (*{PROJECT_EXTENSION})"
+        )
+        if not file_path:
+            return
+        if not file_path.lower().endswith(PROJECT_EXTENSION):
+            file_path += PROJECT_EXTENSION
+
+        sheets = {"data1": self.view.model1.get_data(), "data2": self.view.model2.get_data()}
+        progress = ProjectSaveProgressDialog(self.view, file_path, sheets, self.view.get_output_data(include_plots=True))
+
+        def on_save_finished(error, encoded):
+            progress.close()
+            self.save_progress = None
+            if error is not None:
+                QMessageBox.critical(self.view, "Error", f"Failed to save project: {str(error)}")
+                return
+            self.view.project_path = file_path
+            QMessageBox.information(self.view, "Success", "Project saved successfully!")
+
+        progress.save_finished.connect(on_save_finished)
+        self.save_progress = progress
+        progress.start()
+
     def save_data(self):
         """Simpan data dari model pertama (Sheet 1)."""
         file_path, selected_filter = QFileDialog.getSaveFileName(
             self.view, "Save File", "",
-            "CSV Files (*.csv);;Excel Files (*.xlsx);;JSON Files (*.json);;Text Files (*.txt)"
+            "CSV Files (*.csv);;Excel Files (*.xlsx);;JSON Files (*.json);;Text Files (*.txt);;Parquet Files (*.parquet);;Arrow IPC / Feather Files (*.arrow *.feather)"
         )
         
         if file_path:
@@ -106,6 +243,10 @@ class FileController:
                     self.save_as_json(file_path, self.model1)
                 elif selected_filter == "Text Files (*.txt)":
                     self.save_as_txt(file_path, self.model1)
+                elif selected_filter == "Parquet Files (*.parquet)":
+                    self.save_as_parquet(file_path, self.model1)
+                elif selected_filter == "Arrow IPC / Feather Files (*.arrow *.feather)":
+                    self.save_as_ipc(file_path, self.model1)
 
                 QMessageBox.information(self.view, "Success", "File saved successfully!")
             except Exception as e:
@@ -115,7 +256,7 @@ class FileController:
         """Simpan data dari model kedua (Sheet 2)."""
         file_path, selected_filter = QFileDialog.getSaveFileName(
             self.view, "Save Output Data", "",
-            "CSV Files (*.csv);;Excel Files (*.xlsx);;JSON Files (*.json);;Text Files (*.txt)"
+            "CSV Files (*.csv);;Excel Files (*.xlsx);;JSON Files (*.json);;Text Files (*.txt);;Parquet Files (*.parquet);;Arrow IPC / Feather Files (*.arrow *.feather)"
         )
         
         if file_path:
@@ -129,6 +270,10 @@ class FileController:
                     self.save_as_json(file_path, self.model2)
                 elif selected_filter == "Text Files (*.txt)":
                     self.save_as_txt(file_path, self.model2)
+                elif selected_filter == "Parquet Files (*.parquet)":
+                    self.save_as_parquet(file_path, self.model2)
+                elif selected_filter == "Arrow IPC / Feather Files (*.arrow *.feather)":
+                    self.save_as_ipc(file_path, self.model2)
 
                 QMessageBox.information(self.view, "Success", "Output file saved successfully!")
             except Exception as e:
@@ -153,9 +298,17 @@ class FileController:
         """Simpan data sebagai file teks."""
         data = model.get_data()
         data.write_csv(file_path, separator="\t")
+
+    def save_as_parquet(self, file_path, model):
+        """Simpan data sebagai Parquet."""
+        write_parquet(model.get_data(), file_path)
+
+    def save_as_ipc(self, file_path, model):
+        """Simpan data sebagai Arrow IPC (Feather v2) tanpa kompresi agar bisa di-memory-map."""
+        write_ipc(model.get_data(), file_path)
     
     def export_output_to_pdf(self):
-        """Export the content of all widgets in the output layout to a PDF file."""
+        """Export the records of the output history to a PDF file in a worker thread."""
         file_path, _ = QFileDialog.getSaveFileName(
             self.view, "Save PDF", "", "PDF Files (*.pdf)"
         )
@@ -163,62 +316,18 @@ class FileController:
         if not file_path:
             return
 
-        pdf_writer = QPdfWriter(file_path)
-        painter = QPainter(pdf_writer)
-
-        # Convert cm to points (1 cm = 28.3465 points)
-        top_margin = 4 * 28.3465
-        side_margin = 3 * 28.3465
-
-        y_offset = top_margin
-        page_height = pdf_writer.height()
-        page_width = pdf_writer.width()
-
-        def draw_text_multiline(text, y_offset):
-            """Helper function to split text and draw it across multiple pages if needed."""
-            font_metrics = painter.fontMetrics()
-            line_height = font_metrics.lineSpacing()
-            lines = text.splitlines()
-            for line in lines:
-                if y_offset + line_height > page_height - top_margin:
-                    pdf_writer.newPage()
-                    y_offset = top_margin
-                painter.drawText(QRectF(side_margin, y_offset, page_width - 2 * side_margin, line_height),
-                                Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, line)
-                y_offset += line_height
-            return y_offset
-
-        for i in range(self.view.output_layout.count()):
-            widget = self.view.output_layout.itemAt(i).widget()
-            if isinstance(widget, QFrame):
-                for j in range(widget.layout().count()):
-                    sub_widget = widget.layout().itemAt(j).widget()
-                    if isinstance(sub_widget, QLabel) and "<b>Script R:</b>" in sub_widget.text():
-                        script_box = widget.layout().itemAt(j + 1).widget()
-                        text = script_box.toPlainText()
-                        y_offset = draw_text_multiline(text, y_offset)
-                    elif isinstance(sub_widget, QLabel) and "<b>Output:</b>" in sub_widget.text():
-                        result_box = widget.layout().itemAt(j + 1).widget()
-                        text = result_box.toPlainText()
-                        y_offset = draw_text_multiline(text, y_offset)
-                    elif isinstance(sub_widget, QLabel) and "<b>Plot:</b>" in sub_widget.text():
-                        for k in range(j + 1, widget.layout().count()):
-                            plot_label = widget.layout().itemAt(k).widget()
-                            if isinstance(plot_label, QLabel):
-                                image = plot_label.pixmap().toImage()
-                                image_height = image.height() * (page_width - 2 * side_margin) / image.width()
-                                if y_offset + image_height > page_height - top_margin:
-                                    pdf_writer.newPage()
-                                    y_offset = top_margin
-                                rect = QRectF(side_margin, y_offset, page_width - 2 * side_margin, image_height)
-                                painter.drawImage(rect, image)
-                                y_offset += image_height
-
-            # Check if y_offset exceeds page height for next widget
-            if y_offset > page_height - top_margin:
-                pdf_writer.newPage()
-                y_offset = top_margin
-
-        painter.end()
-
-        QMessageBox.information(self.view, "Success", "PDF exported successfully!")
\ No newline at end of file
+        progress = ExportProgressDialog(self.view, file_path, self.view.get_output_data(include_plots=True))
+
+        def on_export_finished(error, pages):
+            progress.close()
+            self.export_progress = None
+            if error is not None:
+                QMessageBox.critical(self.view, "Error", f"Failed to export PDF: {str(error)}")
+            elif pages is None:
+                QMessageBox.information(self.view, "Export Cancelled", "The PDF export was cancelled.")
+            else:
+                QMessageBox.information(self.view, "Success", "PDF exported successfully!")
+
+        progress.export_finished.connect(on_export_finished)
+        self.export_progress = progress
+        progress.start()
@@ -6,14 +6,19 @@ class ScatterPlotController:
     Methods:
         __init__(ScatterPlotModel):
             Initializes the ScatterPlotController with a ScatterPlotModel instance.
-        run_model(r_script):
+        run_model(r_script, options=None):
             Executes the run_model method of the ScatterPlotModel with the provided R script.
+        run_native(options):
+            Executes the run_native method of the ScatterPlotModel with the dialog options.
     """
     def __init__(self, ScatterPlotModel):
         self.ScatterPlotModel = ScatterPlotModel
     
-    def run_model(self, r_script):
-        self.ScatterPlotModel.run_model(r_script)
+    def run_model(self, r_script, options=None):
+        self.ScatterPlotModel.run_model(r_script, options)
+
+    def run_native(self, options):
+        self.ScatterPlotModel.run_native(options)
 
 class LinePlotController:
     """_summary_line_plot_controller_
@@ -23,14 +28,19 @@ class LinePlotController:
     Methods:
         __init__(LinePlotModel):
             Initializes the LinePlotController with a LinePlotModel instance.
-        run_model(r_script):
+        run_model(r_script, options=None):
             Executes the run_model method of the LinePlotModel with the provided R script.
+        run_native(options):
+            Executes the run_native method of the LinePlotModel with the dialog options.
     """
     def __init__(self, LinePlotModel):
         self.LinePlotModel = LinePlotModel
     
-    def run_model(self, r_script):
-        self.LinePlotModel.run_model(r_script)
+    def run_model(self, r_script, options=None):
+        self.LinePlotModel.run_model(r_script, options)
+
+    def run_native(self, options):
+        self.LinePlotModel.run_native(options)
 
 class BoxPlotController:
     """_summary_box_plot_controller_
@@ -40,15 +50,20 @@ class BoxPlotController:
     Methods:
         __init__(BoxPlotModel):
             Initializes the BoxPlotController with a BoxPlotModel instance.
-        run_model(r_script):
+        run_model(r_script, options=None):
             Executes the run_model method of the BoxPlotModel with the provided
-            R script.
+            R script and dialog options.
+        run_native(options):
+            Executes the run_native method of the BoxPlotModel with the dialog options.
     """
     def __init__(self, BoxPlotModel):
         self.BoxPlotModel = BoxPlotModel
     
-    def run_model(self, r_script):
-        self.BoxPlotModel.run_model(r_script)
+    def run_model(self, r_script, options=None):
+        self.BoxPlotModel.run_model(r_script, options)
+
+    def run_native(self, options):
+        self.BoxPlotModel.run_native(options)
 
 class HistogramController:
     """_summary_histogram_controller_
@@ -58,12 +73,17 @@ class HistogramController:
     Methods:
         __init__(HistogramModel):
             Initializes the HistogramController with a HistogramModel instance.
-        run_model(r_script):
+        run_model(r_script, options=None):
             Executes the run_model method of the HistogramModel with the provided
             R script.
+        run_native(options):
+            Executes the run_native method of the HistogramModel with the dialog options.
     """
     def __init__(self, HistogramModel):
         self.HistogramModel = HistogramModel
     
-    def run_model(self, r_script):
-        self.HistogramModel.run_model(r_script)
\ No newline at end of file
+    def run_model(self, r_script, options=None):
+        self.HistogramModel.run_model(r_script, options)
+
+    def run_native(self, options):
+        self.HistogramModel.run_native(options)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from service.graph.BoxPlot import run_box_plot
+from service.graph.BoxPlot import run_box_plot, run_native_box_plot
 
 class BoxPlot:
     """
@@ -19,8 +19,11 @@ class BoxPlot:
         A flag indicating if there was an error, initialized as False.
     Methods
     -------
-    run_model(r_script)
-        Runs the box plot model using the provided R script.
+    run_model(r_script, options=None)
+        Runs the box plot model using the provided R script; `options` selects the columns and
+        group whose summary tables are sent to R instead of the raw data.
+    run_native(options)
+        Renders the box plot in Python without R, using the given dialog options.
     activate_R()
         Activates the R environment using rpy2.
     """
@@ -33,10 +36,15 @@ class BoxPlot:
         self.result = None
         self.error = False
 
-    def run_model(self, r_script):
+    def run_model(self, r_script, options=None):
         self.r_script = r_script
+        self.options = options
         run_box_plot(self)
 
+    def run_native(self, options):
+        self.options = options
+        run_native_box_plot(self)
+
     def activate_R(self):
         from rpy2.robjects import pandas2ri
         pandas2ri.activate()
@@ -0,0 +1,184 @@
+import bisect
+import threading
+import polars as pl
+
+DEFAULT_CHUNK_ROWS = 65536
+
+def blank_rows(schema, count):
+    """
+    Builds `count` empty rows for the given schema as a Polars DataFrame.
+    String columns are filled with "" (like a fresh sheet) and every other dtype with null.
+    Args:
+        schema (dict): Mapping of column name to Polars dtype.
+        count (int): Number of rows to create.
+    Returns:
+        pl.DataFrame: The empty rows.
+    """
+    return pl.DataFrame([
+        pl.repeat("" if dtype == pl.Utf8 else None, count, dtype=dtype, eager=True).alias(name)
+        for name, dtype in schema.items()
+    ])
+
+class ChunkedFrame:
+    """
+    Rope-style row storage made of Polars DataFrame chunks.
+    Inserting, deleting or editing rows only touches the chunk(s) containing those rows; the
+    rest of the sheet is shared, so a row insert in the middle of a multi-million-row sheet
+    costs a few zero-copy slices instead of rebuilding the whole frame. The full DataFrame is
+    assembled lazily (without rechunking) and cached until the next edit. When edits leave too
+    many small chunks behind, `compact_in_background()` re-partitions the rows in a worker
+    thread and swaps the result in if no edit happened meanwhile.
+    Attributes:
+        chunk_rows (int): Target number of rows per chunk.
+        version (int): Incremented on every edit; used to discard stale compactions.
+    Methods:
+        frame(): Returns the whole data as one Polars DataFrame.
+        set_frame(data): Replaces the whole data.
+        height(): Returns the number of rows.
+        chunk_count(): Returns the number of chunks.
+        insert_rows(row, rows): Inserts a DataFrame of rows before `row`.
+        delete_rows(start_row, count): Removes `count` rows and returns them as a DataFrame.
+        set_value(row, column, value): Sets a single cell.
+        needs_compaction(): Returns True if the chunk list has become fragmented.
+        compact(): Re-partitions the chunks synchronously.
+        compact_in_background(): Re-partitions the chunks in a worker thread.
+    """
+
+    def __init__(self, data, chunk_rows=DEFAULT_CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+        self.version = -1
+        self._lock = threading.Lock()
+        self._compacting = False
+        self.set_frame(data)
+
+    def set_frame(self, data):
+        with self._lock:
+            self.version += 1
+            self._empty = data.clear()
+            self._chunks = [data] if data.height > 0 else []
+            self._frame = data
+            self._reindex()
+
+    def frame(self):
+        frame = self._frame
+        if frame is None:
+            with self._lock:
+                if self._frame is None:
+                    self._frame = pl.concat(self._chunks, rechunk=False) if self._chunks else self._empty
+                frame = self._frame
+        return frame
+
+    def height(self):
+        return self._offsets[-1]
+
+    def chunk_count(self):
+        return len(self._chunks)
+
+    def _reindex(self):
+        offsets = [0]
+        for chunk in self._chunks:
+            offsets.append(offsets[-1] + chunk.height)
+        self._offsets = offsets
+
+    def _changed(self):
+        self._frame = None
+        self.version += 1
+        self._reindex()
+
+    def _split_chunk(self, index):
+        """Slice an oversized chunk into `chunk_rows` pieces (zero-copy) so edits stay local."""
+        chunk = self._chunks[index]
+        if chunk.height <= self.chunk_rows:
+            return
+        pieces = [chunk.slice(offset, self.chunk_rows) for offset in range(0, chunk.height, self.chunk_rows)]
+        self._chunks[index:index + 1] = pieces
+        self._reindex()
+
+    def _locate(self, row):
+        """Return (chunk index, row offset inside the chunk) for a global row index."""
+        index = bisect.bisect_right(self._offsets, row) - 1
+        index = min(max(index, 0), max(len(self._chunks) - 1, 0))
+        if self._chunks:
+            self._split_chunk(index)
+            index = bisect.bisect_right(self._offsets, row) - 1
+            index = min(max(index, 0), len(self._chunks) - 1)
+        return index, row - self._offsets[index]
+
+    def insert_rows(self, row, rows):
+        with self._lock:
+            if not self._chunks:
+                self._chunks = [rows]
+            elif row >= self.height():
+                self._chunks.append(rows)
+            else:
+                index, offset = self._locate(row)
+                chunk = self._chunks[index]
+                pieces = [chunk.slice(0, offset), rows, chunk.slice(offset)]
+                self._chunks[index:index + 1] = [piece for piece in pieces if piece.height > 0]
+            self._changed()
+
+    def delete_rows(self, start_row, count):
+        with self._lock:
+            end_row = min(start_row + count, self.height())
+            if end_row <= start_row:
+                return self._empty
+            first, first_offset = self._locate(start_row)
+            last, last_offset = self._locate(end_row - 1)
+            removed = []
+            for index in range(first, last + 1):
+                chunk = self._chunks[index]
+                begin = first_offset if index == first else 0
+                end = last_offset + 1 if index == last else chunk.height
+                removed.append(chunk.slice(begin, end - begin))
+            head = self._chunks[first].slice(0, first_offset)
+            tail = self._chunks[last].slice(last_offset + 1)
+            self._chunks[first:last + 1] = [piece for piece in (head, tail) if piece.height > 0]
+            self._changed()
+        return pl.concat(removed, rechunk=False) if removed else self._empty
+
+    def set_value(self, row, column, value):
+        with self._lock:
+            index, offset = self._locate(row)
+            chunk = self._chunks[index].clone()
+            chunk[offset, column] = value
+            self._chunks[index] = chunk
+            self._frame = None
+            self.version += 1
+
+    def needs_compaction(self):
+        expected = self.height() // self.chunk_rows + 1
+        return len(self._chunks) > 2 * expected + 8
+
+    def _repartition(self, chunks):
+        data = pl.concat(chunks, rechunk=False)
+        return [
+            data.slice(offset, self.chunk_rows).rechunk()
+            for offset in range(0, data.height, self.chunk_rows)
+        ]
+
+    def compact(self):
+        with self._lock:
+            if self._chunks:
+                self._chunks = self._repartition(self._chunks)
+                self._frame = None
+                self._reindex()
+
+    def compact_in_background(self):
+        if self._compacting or not self._chunks:
+            return
+        self._compacting = True
+        chunks = list(self._chunks)
+        version = self.version
+
+        def run_compaction():
+            try:
+                compacted = self._repartition(chunks)
+                with self._lock:
+                    if self.version == version:
+                        self._chunks = compacted
+                        self._frame = None
+                        self._reindex()
+            finally:
+                self._compacting = False
+
+        threading.Thread(target=run_compaction, name="Chunk Compaction", daemon=True).start()
@@ -1,4 +1,4 @@
-from service.exploration.CorrelationMatrix import run_correlation_matrix
+from service.exploration.CorrelationMatrix import run_correlation_matrix, run_native_correlation_matrix
 
 class CorrelationMatrix:
     """
@@ -13,14 +13,21 @@ class CorrelationMatrix:
         The view associated with the correlation matrix.
     result : str
         The result of the correlation matrix computation.
+    table : pl.DataFrame
+        The correlation matrix, when it was computed with polars.
+    pairs : pl.DataFrame
+        The most strongly correlated pairs, when computed with polars.
     plot : object, optional
         The plot of the correlation matrix (default is None).
     error : bool
         A flag indicating if there was an error during computation (default is False).
     Methods
     -------
-    run_model(r_script):
-        Runs the correlation matrix model using the provided R script.
+    run_model(r_script, options=None):
+        Runs the correlation matrix model using the provided R script; `options` selects the
+        columns sent to R.
+    run_native(options):
+        Computes the correlation matrix with polars, without R, using the given dialog options.
     activate_R():
         Activates the R environment using rpy2.
     """
@@ -30,13 +37,20 @@ class CorrelationMatrix:
         self.model2 = model2
         self.view = view
         self.result =""
+        self.table = None
+        self.pairs = None
         self.plot = None
         self.error = False
 
-    def run_model(self, r_script):
+    def run_model(self, r_script, options=None):
         self.r_script = r_script
+        self.options = options
         run_correlation_matrix(self)
 
+    def run_native(self, options):
+        self.options = options
+        run_native_correlation_matrix(self)
+
     def activate_R(self):
         from rpy2.robjects import pandas2ri
         pandas2ri.activate()
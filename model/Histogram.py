@@ -1,4 +1,4 @@
-from service.graph.Histogram import run_histogram
+from service.graph.Histogram import run_histogram, run_native_histogram
 
 class Histogram:
     """
@@ -19,8 +19,10 @@ class Histogram:
         Any error encountered during the histogram computation (default is None).
     Methods
     -------
-    run_model(r_script)
+    run_model(r_script, options=None)
         Runs the histogram model using the provided R script.
+    run_native(options)
+        Renders the histogram in Python without R, using the given dialog options.
     activate_R()
         Activates the R environment using rpy2's pandas2ri.
     """
@@ -33,10 +35,15 @@ class Histogram:
         self.result = None
         self.error = None
 
-    def run_model(self, r_script):
+    def run_model(self, r_script, options=None):
         self.r_script = r_script
+        self.options = options
         run_histogram(self)
 
+    def run_native(self, options):
+        self.options = options
+        run_native_histogram(self)
+
     def activate_R(self):
         from rpy2.robjects import pandas2ri
         pandas2ri.activate()
@@ -1,4 +1,4 @@
-from service.graph.Lineplot import run_lineplot
+from service.graph.Lineplot import run_lineplot, run_native_lineplot
 
 class Lineplot:
     """
@@ -21,8 +21,11 @@ class Lineplot:
     -------
     __init__(model1, model2, view)
         Initializes the Lineplot with the given models and view.
-    run_model(r_script)
-        Runs the line plot model using the provided R script.
+    run_model(r_script, options=None)
+        Runs the line plot model using the provided R script; `options` selects the plotted
+        columns and the downsampling applied before the data is sent to R.
+    run_native(options)
+        Renders the line plot in Python without R, using the given dialog options.
     activate_R()
         Activates the R environment using rpy2.
     """
@@ -35,10 +38,15 @@ class Lineplot:
         self.error = False
         self.result = None
 
-    def run_model(self, r_script):
+    def run_model(self, r_script, options=None):
         self.r_script = r_script
+        self.options = options
         run_lineplot(self)
 
+    def run_native(self, options):
+        self.options = options
+        run_native_lineplot(self)
+
     def activate_R(self):
         from rpy2.robjects import pandas2ri
         pandas2ri.activate()
@@ -1,4 +1,4 @@
-from service.exploration.Multicollinearity import run_multicollinearity
+from service.exploration.Multicollinearity import run_multicollinearity, run_native_multicollinearity
 
 class Multicollinearity:
     """
@@ -13,6 +13,9 @@ class Multicollinearity:
         The view component for displaying results.
     result : str
         The result of the multicollinearity analysis.
+    vif, condition, proportions : pl.DataFrame
+        The VIFs, condition indices and variance-decomposition proportions, when they were
+        computed with polars.
     reg_model : bool
         A flag indicating if the regression model is set.
     error : bool
@@ -21,8 +24,11 @@ class Multicollinearity:
     -------
     __init__(model1, model2, view)
         Initializes the Multicollinearity class with the given models and view.
-    run_model(r_script)
-        Runs the multicollinearity analysis using the provided R script.
+    run_model(r_script, options=None)
+        Runs the multicollinearity analysis using the provided R script; `options` selects
+        the columns sent to R.
+    run_native(options)
+        Computes the diagnostics with polars, without R, using the given dialog options.
     activate_R()
         Activates the R environment for running R scripts.
     """
@@ -32,13 +38,21 @@ class Multicollinearity:
         self.model2 = model2
         self.view = view
         self.result =""
+        self.vif = None
+        self.condition = None
+        self.proportions = None
         self.reg_model = False
         self.error = False
 
-    def run_model(self, r_script):
+    def run_model(self, r_script, options=None):
         self.r_script = r_script
+        self.options = options
         run_multicollinearity(self)
 
+    def run_native(self, options):
+        self.options = options
+        run_native_multicollinearity(self)
+
     def activate_R(self):
         from rpy2.robjects import pandas2ri
         pandas2ri.activate()
\ No newline at end of file
@@ -1,4 +1,4 @@
-from service.exploration.NormalityTest import run_normality_test
+from service.exploration.NormalityTest import run_normality_test, run_native_normality_test
 
 class NormalityTest:
     """
@@ -15,14 +15,19 @@ class NormalityTest:
         The view associated with the normality test.
     result : str
         The result of the normality test.
+    table : pl.DataFrame
+        The test results, when they were computed with polars.
     plot : object
         The plot generated from the normality test.
     error : bool
         A flag indicating if there was an error during the normality test.
     Methods
     -------
-    run_model(r_script)
-        Runs the normality test using the provided R script.
+    run_model(r_script, options=None)
+        Runs the normality test using the provided R script; `options` selects the columns
+        sent to R.
+    run_native(options)
+        Runs the normality tests with polars, without R, using the given dialog options.
     activate_R()
         Activates the R environment for running the normality test.
     """
@@ -33,13 +38,19 @@ class NormalityTest:
         self.view = view
         self.selected_columns = selected_columns
         self.result =""
+        self.table = None
         self.plot = None
         self.error = False
 
-    def run_model(self, r_script):
+    def run_model(self, r_script, options=None):
         self.r_script = r_script
+        self.options = options
         run_normality_test(self)
 
+    def run_native(self, options):
+        self.options = options
+        run_native_normality_test(self)
+
     def activate_R(self):
         from rpy2.robjects import pandas2ri
         pandas2ri.activate()
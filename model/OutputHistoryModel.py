@@ -0,0 +1,126 @@
+import itertools
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+OUTPUT_KINDS = ["All Outputs", "With Plots", "With Errors"]
+
+def make_output_record(script_text="", result_text="", error_text="", plots=None):
+    """Builds an output record: the R script, its text output and error, and the encoded plot images."""
+    return {
+        "script_text": script_text or "",
+        "result_text": result_text or "",
+        "error_text": error_text or "",
+        "plots": list(plots or []),
+    }
+
+class OutputHistoryModel(QAbstractListModel):
+    """
+    List model of the output history, one record per analysis run.
+    The records are plain dictionaries (see `make_output_record`); widgets are only built by
+    the view for the rows that are visible, so the history can grow to thousands of runs.
+    Attributes:
+        RecordRole (int): Role returning the whole record.
+        SearchTextRole (int): Role returning the lower-cased text searched by the output filter.
+        KindRole (int): Role returning the set of kinds of the record ("plot", "error").
+        IdRole (int): Role returning the record id, unique for the lifetime of the model.
+        version (int): Incremented whenever records are added or removed; used to detect changes
+            without comparing the records.
+    Methods:
+        rowCount(parent=QModelIndex()):
+            Returns the number of outputs.
+        data(index, role=Qt.ItemDataRole.DisplayRole):
+            Returns the data for the given role.
+        record(row):
+            Returns the record at the given row.
+        record_id(row):
+            Returns the id of the record at the given row; ids are never reused.
+        records():
+            Returns all records, oldest first.
+        append_record(record):
+            Appends one record.
+        extend_records(records):
+            Appends several records at once.
+        remove_record(row):
+            Removes the record at the given row.
+        clear():
+            Removes all records.
+    """
+
+    RecordRole = Qt.ItemDataRole.UserRole + 1
+    SearchTextRole = Qt.ItemDataRole.UserRole + 2
+    KindRole = Qt.ItemDataRole.UserRole + 3
+    IdRole = Qt.ItemDataRole.UserRole + 4
+
+    def __init__(self, records=None, parent=None):
+        super().__init__(parent)
+        self._records = [make_output_record(**self._fields(record)) for record in records or []]
+        self._next_id = itertools.count()
+        self._ids = [next(self._next_id) for _ in self._records]
+        self.version = 0
+
+    @staticmethod
+    def _fields(record):
+        return {key: record.get(key) for key in ("script_text", "result_text", "error_text", "plots")}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._records)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._records):
+            return None
+        record = self._records[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return record["script_text"].strip().split("\n", 1)[0]
+        if role == self.RecordRole:
+            return record
+        if role == self.SearchTextRole:
+            return "\n".join((record["script_text"], record["result_text"], record["error_text"])).lower()
+        if role == self.KindRole:
+            kinds = set()
+            if record["plots"]:
+                kinds.add("plot")
+            if record["error_text"]:
+                kinds.add("error")
+            return kinds
+        if role == self.IdRole:
+            return self._ids[index.row()]
+        return None
+
+    def record(self, row):
+        return self._records[row]
+
+    def record_id(self, row):
+        return self._ids[row]
+
+    def records(self):
+        return list(self._records)
+
+    def append_record(self, record):
+        self.extend_records([record])
+
+    def extend_records(self, records):
+        records = [make_output_record(**self._fields(record)) for record in records]
+        if not records:
+            return
+        first = len(self._records)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self._records.extend(records)
+        self._ids.extend(next(self._next_id) for _ in records)
+        self.version += 1
+        self.endInsertRows()
+
+    def remove_record(self, row):
+        if 0 <= row < len(self._records):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._records[row]
+            del self._ids[row]
+            self.version += 1
+            self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._records = []
+        self._ids = []
+        self.version += 1
+        self.endResetModel()
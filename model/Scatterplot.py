@@ -1,4 +1,4 @@
-from service.graph.Scatterplot import run_scatterplot
+from service.graph.Scatterplot import run_scatterplot, run_native_scatterplot
 
 class Scatterplot:
     """
@@ -19,8 +19,10 @@ class Scatterplot:
         The result object, initialized as None.
     Methods
     -------
-    run_model(r_script)
+    run_model(r_script, options=None)
         Runs the scatterplot model using the provided R script.
+    run_native(options)
+        Renders the scatterplot in Python without R, using the given dialog options.
     activate_R()
         Activates the R environment using rpy2's pandas2ri.
     """
@@ -54,10 +56,15 @@ class Scatterplot:
         self.error = None
         self.result = None
 
-    def run_model(self, r_script):
+    def run_model(self, r_script, options=None):
         self.r_script = r_script
+        self.options = options
         run_scatterplot(self)
 
+    def run_native(self, options):
+        self.options = options
+        run_native_scatterplot(self)
+
     def activate_R(self):
         from rpy2.robjects import pandas2ri
         pandas2ri.activate()
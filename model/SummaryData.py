@@ -1,4 +1,4 @@
-from service.exploration.SummaryData import run_summary_data
+from service.exploration.SummaryData import run_summary_data, run_native_summary_data
 
 class SummaryData:
     """
@@ -13,12 +13,17 @@ class SummaryData:
         The view associated with the summary data.
     result : str
         The result of the summary data processing.
+    table : pl.DataFrame
+        The summary table, when it was computed with polars.
     error : bool
         A flag indicating if there was an error during processing.
     Methods
     -------
-    run_model(r_script)
-        Executes the summary data model using the provided R script.
+    run_model(r_script, options=None)
+        Executes the summary data model using the provided R script; `options` selects the
+        columns sent to R.
+    run_native(options)
+        Computes the summary with polars, without R, using the given dialog options.
     activate_R()
         Activates the R environment for data processing using rpy2.
     """
@@ -49,12 +54,18 @@ class SummaryData:
         self.model2 = model2
         self.view = view
         self.result =""
+        self.table = None
         self.error = False
 
-    def run_model(self, r_script):
+    def run_model(self, r_script, options=None):
         self.r_script = r_script
+        self.options = options
         run_summary_data(self)
 
+    def run_native(self, options):
+        self.options = options
+        run_native_summary_data(self)
+
     def activate_R(self):
         from rpy2.robjects import pandas2ri
         pandas2ri.activate()
\ No newline at end of file
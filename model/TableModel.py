@@ -9,17 +9,29 @@ from service.command.DeleteColumnsCommand import DeleteColumnsCommand
 from PyQt6.QtGui import QUndoStack
 from service.command.ChangeColumnTypeCommand import ChangeColumnTypeCommand
 from service.command.RenameColumnCommand import RenameColumnCommand
+from service.command.ReplaceValuesCommand import ReplaceValuesCommand
+from service.command.UndoPayload import arrow_buffers
+from model.ChunkedFrame import ChunkedFrame, blank_rows
+from service.table.SortFilter import build_filter_expression, compute_view_rows
+import tempfile
+import shutil
+import weakref
+
+DEFAULT_UNDO_MEMORY_LIMIT = 512 * 1024 * 1024  # 512 MB
 
 class TableModel(QtCore.QAbstractTableModel):
     """A custom table model for handling data in a Qt application with support for undo/redo operations.
     Attributes:
-        _data (pl.DataFrame): The data to be displayed in the table.
+        _data (pl.DataFrame): The data to be displayed in the table, backed by a ChunkedFrame.
+        _store (ChunkedFrame): Chunked row storage so row inserts/deletes/edits only touch the affected chunks.
+        _view_rows (pl.Series or None): Row permutation of the active sort/filter view, None when the view shows all rows in order.
         undo_stack (QUndoStack): Stack to manage undo/redo operations.
+        undo_memory_limit (int): Maximum bytes of undo data kept in memory before the oldest entries are spilled to disk.
         batch_size (int): Number of rows to load initially.
         loaded_rows (int): Number of rows currently loaded.
     Methods:
-        __init__(data, batch_size=100):
-            Initializes the table model with data and batch size.
+        __init__(data, batch_size=100, undo_memory_limit=DEFAULT_UNDO_MEMORY_LIMIT):
+            Initializes the table model with data, batch size and undo memory limit.
         data(index, role):
             Returns the data for the given index and role.
         rowCount(_):
@@ -65,18 +77,69 @@ class TableModel(QtCore.QAbstractTableModel):
         get_column_type(column_index):
             Returns the data type of the column at the given index.
         set_column_type(column_index, new_type):
-            Sets the data type of the column at the given index to the new type."""
+            Sets the data type of the column at the given index to the new type.
+        set_cell(row, column, value):
+            Sets a single cell value in place.
+        insert_rows(row, rows):
+            Inserts a DataFrame of rows before the given row.
+        remove_rows(start_row, count):
+            Removes rows and returns them as a DataFrame.
+        append_rows(rows):
+            Appends rows at the end without an undo entry (used while a file is being imported).
+        sort_view(column_index, descending=False):
+            Sorts the visible rows by the given column.
+        filter_view(column_index, operator, value):
+            Shows only the rows matching the given condition.
+        clear_view():
+            Removes the active sort and filter.
+        is_view_active():
+            Returns True if a sort or filter is active.
+        get_view_data():
+            Returns the rows of the active view, in view order.
+        view_row_count():
+            Returns the number of rows in the active view.
+        view_positions():
+            Returns the displayed row of every row in the underlying data (inverse view permutation).
+        view_row_of(row):
+            Returns the displayed row of a row in the underlying data, or None if it is filtered out.
+        ensure_row_loaded(row):
+            Loads rows up to the given displayed row in one step.
+        replace_columns(new_columns, count):
+            Replaces whole columns as one undoable edit (used by replace-all).
+        data_version():
+            Returns a counter that changes whenever the data changes.
+        apply_view(frame):
+            Applies the active view to another DataFrame with the same rows (e.g. the output sheet).
+        set_undo_memory_limit(limit):
+            Sets the memory limit of the undo history and applies it immediately.
+        undo_memory_usage():
+            Returns the number of bytes held in memory by the undo history."""
     
-    def __init__(self, data, batch_size=100):
+    def __init__(self, data, batch_size=100, undo_memory_limit=DEFAULT_UNDO_MEMORY_LIMIT):
         super().__init__()
-        self._data = data
+        self._store = ChunkedFrame(data)
+        self._view_rows = None
+        self._view_filter = None
+        self._view_sort = None
+        self._view_positions = None
         self.undo_stack = QUndoStack()
+        self.undo_memory_limit = undo_memory_limit
+        self._undo_spill_dir = None
+        self.undo_stack.indexChanged.connect(self._enforce_undo_memory_limit)
         self.batch_size = batch_size
         self.loaded_rows = min(batch_size, self._data.shape[0])
 
+    @property
+    def _data(self):
+        return self._store.frame()
+
+    @_data.setter
+    def _data(self, value):
+        self._store.set_frame(value)
+
     def data(self, index, role):
         if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.EditRole:
-            value = self._data[index.row(), index.column()]
+            value = self._data[self._source_row(index.row()), index.column()]
             return str(value)
 
     def rowCount(self, _):
@@ -93,7 +156,7 @@ class TableModel(QtCore.QAbstractTableModel):
                     return f"{column_name}"
                 return ""
             if orientation == Qt.Orientation.Vertical:
-                return str(section + 1)
+                return str(self._source_row(section) + 1)
         elif role == Qt.ItemDataRole.DecorationRole or role == Qt.ItemDataRole.DisplayRole:
             if orientation == Qt.Orientation.Horizontal:
                 if section < len(self._data.columns):
@@ -114,7 +177,7 @@ class TableModel(QtCore.QAbstractTableModel):
 
     def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
         if role == Qt.ItemDataRole.EditRole:
-            row = index.row()
+            row = self._source_row(index.row())
             column = index.column()
 
             column_name = self._data.columns[column]
@@ -164,7 +227,7 @@ class TableModel(QtCore.QAbstractTableModel):
                     else:
                         return False
 
-            self._data[row, column] = value
+            self.set_cell(row, column, value)
             self.dataChanged.emit(index, index)
             command = EditDataCommand(self, row, column, old_value, value)  # Pass row, column to command
             self.undo_stack.push(command)
@@ -176,6 +239,7 @@ class TableModel(QtCore.QAbstractTableModel):
         if isinstance(new_data, pl.DataFrame):
             self.beginResetModel()
             self._data = new_data
+            self._view_rows = self._view_filter = self._view_sort = self._view_positions = None
             self.loaded_rows = min(self.batch_size, self._data.shape[0])
             self.endResetModel()
         else:
@@ -184,6 +248,107 @@ class TableModel(QtCore.QAbstractTableModel):
     def get_data(self):
         return self._data
 
+    def _source_row(self, row):
+        """Map a row of the displayed view to its row in the underlying data."""
+        if self._view_rows is None:
+            return row
+        return self._view_rows[row]
+
+    def view_row_count(self):
+        return self._data.shape[0] if self._view_rows is None else self._view_rows.len()
+
+    def data_version(self):
+        return self._store.version
+
+    def view_positions(self):
+        """
+        Displayed row of every row in the underlying data (null if filtered out), the inverse of
+        the view permutation; built once per view. None when no view is active.
+        """
+        if self._view_rows is None:
+            return None
+        if self._view_positions is None:
+            positions = pl.repeat(None, self._data.shape[0], dtype=pl.Int64, eager=True)
+            self._view_positions = positions.scatter(self._view_rows, pl.int_range(0, self._view_rows.len(), eager=True))
+        return self._view_positions
+
+    def view_row_of(self, row):
+        if self._view_rows is None:
+            return row
+        return self.view_positions()[row]
+
+    def source_cell_changed(self, row, column):
+        """Emit dataChanged for a cell given by its row in the underlying data."""
+        row = self.view_row_of(row)
+        if row is None:
+            return
+        index = self.createIndex(row, column)
+        self.dataChanged.emit(index, index)
+
+    def _load_rows_through(self, row):
+        """Load rows until the first `row` rows are loaded, so rows inserted or removed there are within rowCount."""
+        if row > 0:
+            self.ensure_row_loaded(row - 1)
+
+    def ensure_row_loaded(self, row):
+        if row < self.loaded_rows:
+            return
+        last_row = min(row + self.batch_size, self.view_row_count())
+        self.beginInsertRows(QtCore.QModelIndex(), self.loaded_rows, last_row - 1)
+        self.loaded_rows = last_row
+        self.endInsertRows()
+
+    def replace_columns(self, new_columns, count):
+        if new_columns:
+            old_columns = {name: self._data.get_column(name) for name in new_columns}
+            self.undo_stack.push(ReplaceValuesCommand(self, old_columns, new_columns, count))
+
+    def _set_view(self, filter_expression, sort):
+        # A rename, delete or type change can leave the active filter or sort pointing at a
+        # column that no longer exists; such parts of the view are dropped.
+        if filter_expression is not None and not set(filter_expression.meta.root_names()) <= set(self._data.columns):
+            filter_expression = None
+        if sort and sort[0] not in self._data.columns:
+            sort = None
+        rows = compute_view_rows(
+            self._data, filter_expression,
+            sort[0] if sort else None, sort[1] if sort else False,
+        )
+        self.beginResetModel()
+        self._view_filter = filter_expression
+        self._view_sort = sort
+        self._view_rows = rows
+        self._view_positions = None
+        self.loaded_rows = min(self.batch_size, self.view_row_count())
+        self.endResetModel()
+
+    def sort_view(self, column_index, descending=False):
+        if isinstance(column_index, int) and 0 <= column_index < len(self._data.columns):
+            self._set_view(self._view_filter, (self._data.columns[column_index], descending))
+
+    def filter_view(self, column_index, operator, value):
+        if isinstance(column_index, int) and 0 <= column_index < len(self._data.columns):
+            column_name = self._data.columns[column_index]
+            expression = build_filter_expression(column_name, self._data.schema[column_name], operator, value)
+            self._set_view(expression, self._view_sort)
+
+    def clear_view(self):
+        if self.is_view_active():
+            self._set_view(None, None)
+
+    def is_view_active(self):
+        return self._view_rows is not None
+
+    def get_view_data(self):
+        if self._view_rows is None:
+            return self._data
+        return self._data[self._view_rows]
+
+    def apply_view(self, frame):
+        if self._view_rows is None or frame.height != self._data.height:
+            return frame
+        return frame[self._view_rows]
+
     def copy(self, index):
         if index.isValid():
             value = self.data(index, Qt.ItemDataRole.DisplayRole)
@@ -197,30 +362,101 @@ class TableModel(QtCore.QAbstractTableModel):
             self.setData(index, value)
 
     def undo(self):
+        self._clear_view_for(self.undo_stack.command(self.undo_stack.index() - 1))
         self.undo_stack.undo()
 
     def redo(self):
+        self._clear_view_for(self.undo_stack.command(self.undo_stack.index()))
         self.undo_stack.redo()
 
+    def _clear_view_for(self, command):
+        """Row inserts/deletes address rows of the underlying data, so the view is dropped and their rows loaded before replaying them."""
+        if isinstance(command, AddRowsCommand):
+            self.clear_view()
+            self._load_rows_through(command.row + command.row_count)
+        elif isinstance(command, DeleteRowsCommand):
+            self.clear_view()
+            self._load_rows_through(command.start_row + command.row_count)
+
+    def set_undo_memory_limit(self, limit):
+        self.undo_memory_limit = limit
+        self._enforce_undo_memory_limit()
+
+    def _undo_payloads(self):
+        """Yield the data payloads of every command in the undo stack, oldest first."""
+        for i in range(self.undo_stack.count()):
+            command = self.undo_stack.command(i)
+            if hasattr(command, "payloads"):
+                yield from command.payloads()
+
+    def _undo_residency(self):
+        """
+        Yield (payload, bytes) for every undo payload, oldest first, where bytes is the memory
+        only that payload keeps alive: buffers still held by the table or by an older payload
+        cost nothing, since spilling the payload would not free them.
+        """
+        held = set(arrow_buffers(self._data))
+        for payload in self._undo_payloads():
+            yield payload, payload.resident_bytes(held)
+            held.update(payload.buffers())
+
+    def undo_memory_usage(self):
+        return sum(size for _, size in self._undo_residency())
+
+    def _enforce_undo_memory_limit(self, *_):
+        """Spill the oldest undo payloads to disk until the history fits in `undo_memory_limit`."""
+        if self.undo_memory_limit is None:
+            return
+        while self.undo_memory_usage() > self.undo_memory_limit:
+            payload = next((payload for payload, size in self._undo_residency() if size), None)
+            if payload is None:
+                break
+            if self._undo_spill_dir is None:
+                self._undo_spill_dir = tempfile.mkdtemp(prefix="sae_pisan_undo_")
+                weakref.finalize(self, shutil.rmtree, self._undo_spill_dir, True)
+            payload.spill(self._undo_spill_dir)
+
     def canFetchMore(self, _):
-        return self.loaded_rows < self._data.shape[0]
+        return self.loaded_rows < self.view_row_count()
 
     def fetchMore(self, _):
-        if self.loaded_rows >= self._data.shape[0]:
+        if self.loaded_rows >= self.view_row_count():
             return
-        remaining_rows = self._data.shape[0] - self.loaded_rows
+        remaining_rows = self.view_row_count() - self.loaded_rows
         rows_to_fetch = min(self.batch_size, remaining_rows)
         self.beginInsertRows(QtCore.QModelIndex(), self.loaded_rows, self.loaded_rows + rows_to_fetch - 1)
         self.loaded_rows += rows_to_fetch
         self.endInsertRows()
     
+    def set_cell(self, row, column, value):
+        self._store.set_value(row, column, value)
+
+    def insert_rows(self, row, rows):
+        self._store.insert_rows(row, rows)
+        self._compact_if_fragmented()
+
+    def remove_rows(self, start_row, count):
+        removed = self._store.delete_rows(start_row, count)
+        self._compact_if_fragmented()
+        return removed
+
+    def append_rows(self, rows):
+        self.insert_rows(self._store.height(), rows)
+        if self.loaded_rows < self.batch_size:
+            self.fetchMore(QtCore.QModelIndex())
+
+    def _compact_if_fragmented(self):
+        if self._store.needs_compaction():
+            self._store.compact_in_background()
+
     def addRowsBefore(self, index, count):
         if index.isValid() and count > 0:
-            print("Adding rows before")
-            row = index.row()
-            new_rows = [{col: None if self._data[col].dtype in [pl.Int64, pl.Float64] else "" for col in self._data.columns} for _ in range(count)]
+            row = self._source_row(index.row())
+            self.clear_view()
+            self._load_rows_through(row)
+            new_rows = blank_rows(self._data.schema, count)
             self.beginInsertRows(QtCore.QModelIndex(), row, row + count - 1)
-            self._data = pl.concat([self._data[:row], pl.DataFrame(new_rows), self._data[row:]])
+            self.insert_rows(row, new_rows)
             self.loaded_rows += count
             self.endInsertRows()
             command = AddRowsCommand(self, row, new_rows)
@@ -228,10 +464,12 @@ class TableModel(QtCore.QAbstractTableModel):
 
     def addRowsAfter(self, index, count):
         if index.isValid() and count > 0:
-            row = index.row() + 1
-            new_rows = [{col: None if self._data[col].dtype in [pl.Int64, pl.Float64] else "" for col in self._data.columns} for _ in range(count)]
+            row = self._source_row(index.row()) + 1
+            self.clear_view()
+            self._load_rows_through(row)
+            new_rows = blank_rows(self._data.schema, count)
             self.beginInsertRows(QtCore.QModelIndex(), row, row + count - 1)
-            self._data = pl.concat([self._data[:row], pl.DataFrame(new_rows), self._data[row:]])
+            self.insert_rows(row, new_rows)
             self.loaded_rows += count
             self.endInsertRows()
             command = AddRowsCommand(self, row, new_rows)
@@ -263,9 +501,12 @@ class TableModel(QtCore.QAbstractTableModel):
     
     def deleteRows(self, start_row, count):
         if start_row >= 0 and count > 0:
-            old_rows = self._data[start_row:start_row + count].to_dict(as_series=False)
+            start_row = self._source_row(start_row)
+            self.clear_view()
+            count = min(count, self._data.shape[0] - start_row)
+            self._load_rows_through(start_row + count)
             self.beginRemoveRows(QtCore.QModelIndex(), start_row, start_row + count - 1)
-            self._data = pl.concat([self._data[:start_row], self._data[start_row + count:]])
+            old_rows = self.remove_rows(start_row, count)
             self.loaded_rows -= count
             self.endRemoveRows()
             command = DeleteRowsCommand(self, start_row, old_rows)
@@ -285,7 +526,7 @@ class TableModel(QtCore.QAbstractTableModel):
 
             # Store the deleted columns and their data
             old_columns = {
-                self._data.columns[i]: self._data[:, i].to_list()
+                self._data.columns[i]: self._data.to_series(i)
                 for i in range(start_column, start_column + count)
             }
             self.beginResetModel()
@@ -320,7 +561,7 @@ class TableModel(QtCore.QAbstractTableModel):
         if isinstance(column_index, int) and 0 <= column_index < len(self._data.columns):
             column_name = self._data.columns[column_index]
             old_dtype = self._data[column_name].dtype
-            old_data = self._data[column_name].to_list()
+            old_data = self._data.get_column(column_name)
 
             if new_type == "String":
                 new_dtype = pl.Utf8
@@ -377,6 +618,6 @@ class TableModel(QtCore.QAbstractTableModel):
             self._data = self._data.with_columns([pl.col(column_name).cast(new_dtype)])
             self.endResetModel()
 
-            command = ChangeColumnTypeCommand(self, column_index, old_dtype, new_dtype, old_data, self._data[column_name].to_list())
+            command = ChangeColumnTypeCommand(self, column_index, old_dtype, new_dtype, old_data, self._data.get_column(column_name))
             self.undo_stack.push(command)
             
@@ -1,4 +1,4 @@
-from service.exploration.VariableSelection import run_variable_selection
+from service.exploration.VariableSelection import run_variable_selection, run_native_variable_selection
 
 class VariableSelection:
     """
@@ -13,12 +13,20 @@ class VariableSelection:
         The view associated with the variable selection process.
     result : str
         The result of the variable selection process.
+    selected : dict
+        The columns kept by every direction (and by "lasso"), when the selection was computed
+        with polars.
+    trace : dict
+        The search path of every direction as a pl.DataFrame, when computed with polars.
     error : bool
         A flag indicating if there was an error during the variable selection process.
     Methods
     -------
-    run_model(r_script)
-        Executes the variable selection process using the provided R script.
+    run_model(r_script, options=None)
+        Executes the variable selection process using the provided R script; `options`
+        selects the columns sent to R.
+    run_native(options)
+        Runs the stepwise selection with polars, without R, using the given dialog options.
     activate_R()
         Activates the R environment using rpy2.
     """
@@ -28,12 +36,19 @@ class VariableSelection:
         self.model2 = model2
         self.view = view
         self.result =""
+        self.selected = {}
+        self.trace = {}
         self.error = False
 
-    def run_model(self, r_script):
+    def run_model(self, r_script, options=None):
         self.r_script = r_script
+        self.options = options
         run_variable_selection(self)
 
+    def run_native(self, options):
+        self.options = options
+        run_native_variable_selection(self)
+
     def activate_R(self):
         from rpy2.robjects import pandas2ri
         pandas2ri.activate()
@@ -1,6 +1,7 @@
 from PyQt6.QtGui import QUndoCommand
 import polars as pl
 from PyQt6 import QtCore
+from service.command.UndoPayload import UndoPayload
 
 class AddRowsCommand(QUndoCommand):
     """
@@ -8,7 +9,8 @@ class AddRowsCommand(QUndoCommand):
     Attributes:
         model (QAbstractItemModel): The model to which rows will be added.
         row (int): The position at which new rows will be inserted.
-        new_rows (list): The new rows to be added to the model.
+        new_rows (UndoPayload): The new rows to be added to the model, as a Polars DataFrame.
+        row_count (int): The number of added rows.
         executed (bool): A flag to prevent re-execution during the initial push.
     Methods:
         undo():
@@ -16,26 +18,32 @@ class AddRowsCommand(QUndoCommand):
         redo():
             Adds the new rows to the model. If the command has already been executed,
             it will insert the rows again.
+        payloads():
+            Returns the data payloads held by this command.
     """
     
     def __init__(self, model, row, new_rows):
         super().__init__()
         self.model = model
         self.row = row
-        self.new_rows = new_rows
+        self.new_rows = UndoPayload(new_rows if isinstance(new_rows, pl.DataFrame) else pl.DataFrame(new_rows))
+        self.row_count = self.new_rows.get().height
         self.executed = False
 
+    def payloads(self):
+        return [self.new_rows]
+
     def undo(self):
-        self.model.beginRemoveRows(QtCore.QModelIndex(), self.row, self.row + len(self.new_rows) - 1)
-        self.model._data = pl.concat([self.model._data[:self.row], self.model._data[self.row + len(self.new_rows):]])
-        self.model.loaded_rows -= len(self.new_rows)
+        self.model.beginRemoveRows(QtCore.QModelIndex(), self.row, self.row + self.row_count - 1)
+        self.model.remove_rows(self.row, self.row_count)
+        self.model.loaded_rows -= self.row_count
         self.model.endRemoveRows()
 
     def redo(self):
         if not self.executed:  # Cegah eksekusi ulang saat push
             self.executed = True
         else:
-            self.model.beginInsertRows(QtCore.QModelIndex(), self.row, self.row + len(self.new_rows) - 1)
-            self.model._data = pl.concat([self.model._data[:self.row], pl.DataFrame(self.new_rows), self.model._data[self.row:]])
-            self.model.loaded_rows += len(self.new_rows)
-            self.model.endInsertRows()
\ No newline at end of file
+            self.model.beginInsertRows(QtCore.QModelIndex(), self.row, self.row + self.row_count - 1)
+            self.model.insert_rows(self.row, self.new_rows.get())
+            self.model.loaded_rows += self.row_count
+            self.model.endInsertRows()
@@ -1,5 +1,6 @@
 from PyQt6.QtGui import QUndoCommand
 import polars as pl
+from service.command.UndoPayload import UndoPayload
 
 class ChangeColumnTypeCommand(QUndoCommand):
     """
@@ -9,31 +10,40 @@ class ChangeColumnTypeCommand(QUndoCommand):
         column_index (int): The index of the column to change.
         old_dtype (str): The original data type of the column.
         new_dtype (str): The new data type of the column.
-        old_data (list): The original data of the column.
-        new_data (list): The new data of the column.
+        old_data (UndoPayload): The original column as an immutable Polars Series.
+        new_data (UndoPayload): The converted column as an immutable Polars Series.
         column_name (str): The name of the column to change.
     Methods:
         undo(): Reverts the column to its original data type and data.
         redo(): Changes the column to the new data type and data.
+        payloads(): Returns the data payloads held by this command.
     """
-    
+
     def __init__(self, model, column_index, old_dtype, new_dtype, old_data, new_data):
         super().__init__()
         self.model = model
         self.column_index = column_index
         self.old_dtype = old_dtype
         self.new_dtype = new_dtype
-        self.old_data = old_data
-        self.new_data = new_data
         self.column_name = self.model._data.columns[self.column_index]
+        self.old_data = UndoPayload(self._as_series(old_data, old_dtype))
+        self.new_data = UndoPayload(self._as_series(new_data, new_dtype))
         self.setText(f"Change column type of {self.column_name} from {self.old_dtype} to {self.new_dtype}")
 
+    def _as_series(self, data, dtype):
+        if isinstance(data, pl.Series):
+            return data.alias(self.column_name)
+        return pl.Series(self.column_name, data).cast(dtype)
+
+    def payloads(self):
+        return [self.old_data, self.new_data]
+
     def undo(self):
         self.model.beginResetModel()
-        self.model._data = self.model._data.with_columns([pl.Series(self.column_name, self.old_data).cast(self.old_dtype)])
+        self.model._data = self.model._data.with_columns([self.old_data.get().alias(self.column_name)])
         self.model.endResetModel()
 
     def redo(self):
         self.model.beginResetModel()
-        self.model._data = self.model._data.with_columns([pl.Series(self.column_name, self.new_data).cast(self.new_dtype)])
-        self.model.endResetModel()
\ No newline at end of file
+        self.model._data = self.model._data.with_columns([self.new_data.get().alias(self.column_name)])
+        self.model.endResetModel()
@@ -1,5 +1,6 @@
 from PyQt6.QtGui import QUndoCommand
 import polars as pl
+from service.command.UndoPayload import UndoPayload
 
 class DeleteColumnsCommand(QUndoCommand):
     def __init__(self, model, start_column, deleted_columns, original_order):
@@ -9,22 +10,30 @@ class DeleteColumnsCommand(QUndoCommand):
         Args:
             model: The model to apply the changes to.
             start_column: The index of the first column to delete.
-            deleted_columns: A dictionary of deleted column names and their data.
+            deleted_columns: A dictionary of deleted column names and their data (Polars Series).
             original_order: The original order of columns before deletion.
         """
         super().__init__()
         self.model = model
         self.start_column = start_column
-        self.deleted_columns = deleted_columns
-        self.old_data = deleted_columns  # Store the columns that were deleted
+        # Keep the deleted Series themselves (shared Arrow buffers) instead of Python lists
+        self.deleted_columns = {
+            col_name: UndoPayload(col_values if isinstance(col_values, pl.Series) else pl.Series(col_name, col_values))
+            for col_name, col_values in deleted_columns.items()
+        }
+        self.old_data = self.deleted_columns  # Store the columns that were deleted
         self.original_order = original_order  # Store the original column order
         self.executed = False
 
+    def payloads(self):
+        return list(self.deleted_columns.values())
+
     def undo(self):
         """Undo the column deletion by restoring the deleted columns."""
         self.model.beginResetModel()
-        for col_name, col_values in self.deleted_columns.items():
-            self.model._data = self.model._data.with_columns(pl.Series(col_name, col_values))
+        self.model._data = self.model._data.with_columns(
+            [payload.get().alias(col_name) for col_name, payload in self.deleted_columns.items()]
+        )
 
         # Reorder columns to match the original order
         self.model._data = self.model._data.select(self.original_order)
@@ -40,4 +49,4 @@ class DeleteColumnsCommand(QUndoCommand):
             self.model._data = self.model._data.select(
                 [col for col in self.model._data.columns if col not in columns_to_remove]
             )
-            self.model.endResetModel()
\ No newline at end of file
+            self.model.endResetModel()
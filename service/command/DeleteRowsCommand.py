@@ -1,6 +1,7 @@
 from PyQt6.QtCore import QModelIndex
 from PyQt6.QtGui import QUndoCommand
 import polars as pl
+from service.command.UndoPayload import UndoPayload
 
 class DeleteRowsCommand(QUndoCommand):
     """
@@ -8,11 +9,13 @@ class DeleteRowsCommand(QUndoCommand):
     Attributes:
         model (QAbstractItemModel): The model from which rows will be deleted.
         start_row (int): The starting row index for deletion.
-        rows_data (pl.DataFrame): The data of the rows to be deleted.
+        rows_data (UndoPayload): The deleted rows as a zero-copy slice of the original DataFrame.
+        row_count (int): The number of deleted rows.
         executed (bool): A flag to indicate if the command has been executed.
     Methods:
         undo(): Reverts the deletion of rows by inserting them back into the model.
         redo(): Executes the deletion of rows from the model.
+        payloads(): Returns the data payloads held by this command.
     """
     """
     Initializes the DeleteRowsCommand with the model, starting row, and rows data.
@@ -32,13 +35,17 @@ class DeleteRowsCommand(QUndoCommand):
         super().__init__("Delete Rows")
         self.model = model
         self.start_row = start_row
-        self.rows_data = pl.DataFrame(rows_data) if not isinstance(rows_data, pl.DataFrame) else rows_data
+        self.rows_data = UndoPayload(pl.DataFrame(rows_data) if not isinstance(rows_data, pl.DataFrame) else rows_data)
+        self.row_count = self.rows_data.get().height
         self.executed = False
 
+    def payloads(self):
+        return [self.rows_data]
+
     def undo(self):
-        self.model.beginInsertRows(QModelIndex(), self.start_row, self.start_row + len(self.rows_data) - 1)
-        self.model._data = pl.concat([pl.DataFrame(self.model._data[:self.start_row]), self.rows_data, pl.DataFrame(self.model._data[self.start_row:])])
-        self.model.loaded_rows = min(self.model.loaded_rows + len(self.rows_data), self.model._data.shape[0])
+        self.model.beginInsertRows(QModelIndex(), self.start_row, self.start_row + self.row_count - 1)
+        self.model.insert_rows(self.start_row, self.rows_data.get())
+        self.model.loaded_rows = min(self.model.loaded_rows + self.row_count, self.model._data.shape[0])
         self.model.endInsertRows()
         self.model.layoutChanged.emit()
 
@@ -46,8 +53,8 @@ class DeleteRowsCommand(QUndoCommand):
         if not self.executed:  # Prevent re-execution when pushed
             self.executed = True
         else:
-            self.model.beginRemoveRows(QModelIndex(), self.start_row, self.start_row + len(self.rows_data) - 1)
-            self.model._data = pl.concat([self.model._data[:self.start_row], self.model._data[self.start_row + len(self.rows_data):]])
-            self.model.loaded_rows = max(self.model.loaded_rows - len(self.rows_data), 0)
+            self.model.beginRemoveRows(QModelIndex(), self.start_row, self.start_row + self.row_count - 1)
+            self.model.remove_rows(self.start_row, self.row_count)
+            self.model.loaded_rows = max(self.model.loaded_rows - self.row_count, 0)
             self.model.endRemoveRows()
             self.model.layoutChanged.emit()
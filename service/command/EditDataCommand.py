@@ -29,11 +29,11 @@ class EditDataCommand(QUndoCommand):
     def undo(self):
         """Kembalikan ke nilai sebelumnya"""
         # Update model data
-        self.model._data[self.row, self.column] = self.old_value
-        self.model.dataChanged.emit(self.model.createIndex(self.row, self.column), self.model.createIndex(self.row, self.column))
+        self.model.set_cell(self.row, self.column, self.old_value)
+        self.model.source_cell_changed(self.row, self.column)
 
     def redo(self):
         """Terapkan perubahan baru"""
         # Update model data
-        self.model._data[self.row, self.column] = self.new_value
-        self.model.dataChanged.emit(self.model.createIndex(self.row, self.column), self.model.createIndex(self.row, self.column))
\ No newline at end of file
+        self.model.set_cell(self.row, self.column, self.new_value)
+        self.model.source_cell_changed(self.row, self.column)
\ No newline at end of file
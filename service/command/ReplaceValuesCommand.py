@@ -0,0 +1,40 @@
+from PyQt6.QtGui import QUndoCommand
+from service.command.UndoPayload import UndoPayload
+
+class ReplaceValuesCommand(QUndoCommand):
+    """
+    A command to replace values in one or more columns as a single undo entry.
+    Attributes:
+        model (QAbstractTableModel): The model containing the data.
+        old_columns (dict): Column name to UndoPayload of the original Series.
+        new_columns (dict): Column name to UndoPayload of the replaced Series.
+        count (int): The number of replaced cells.
+    Methods:
+        undo(): Restores the original columns.
+        redo(): Applies the replaced columns.
+        payloads(): Returns the data payloads held by this command.
+    """
+
+    def __init__(self, model, old_columns, new_columns, count):
+        super().__init__()
+        self.model = model
+        self.old_columns = {name: UndoPayload(series) for name, series in old_columns.items()}
+        self.new_columns = {name: UndoPayload(series) for name, series in new_columns.items()}
+        self.count = count
+        self.setText(f"Replace {count} value(s)")
+
+    def payloads(self):
+        return list(self.old_columns.values()) + list(self.new_columns.values())
+
+    def _apply(self, columns):
+        self.model.beginResetModel()
+        self.model._data = self.model._data.with_columns(
+            [payload.get().alias(name) for name, payload in columns.items()]
+        )
+        self.model.endResetModel()
+
+    def undo(self):
+        self._apply(self.old_columns)
+
+    def redo(self):
+        self._apply(self.new_columns)
@@ -0,0 +1,83 @@
+import os
+import uuid
+import weakref
+import polars as pl
+
+def arrow_buffers(value):
+    """
+    Address and size of every Arrow buffer behind a Series or DataFrame, read from a zero-copy
+    export; two values that share memory report the same addresses.
+    """
+    frame = value.to_frame() if isinstance(value, pl.Series) else value
+    buffers = {}
+    for column in frame.to_arrow(compat_level=pl.CompatLevel.newest()).columns:
+        for chunk in column.chunks:
+            for buffer in chunk.buffers():
+                if buffer is not None:
+                    buffers[buffer.address] = buffer.size
+    return buffers
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+class UndoPayload:
+    """
+    A reference to the polars data kept alive by an undo command.
+    Polars Series and DataFrames are immutable Arrow buffers, so keeping the original object
+    shares memory with the table instead of boxing every value into a Python list. When the
+    undo history grows past its memory limit, the payload can be spilled to an Arrow IPC file
+    and is read back (memory-mapped) only when the command is undone or redone. The spill file
+    is removed as soon as the payload is dropped (e.g. its command leaves the undo stack).
+    Attributes:
+        nbytes (int): Estimated size of the referenced data in bytes.
+        is_series (bool): True if the payload wraps a pl.Series, False for a pl.DataFrame.
+    Methods:
+        get(): Returns the referenced Series/DataFrame, loading it from disk if it was spilled.
+        spill(directory): Writes the data to an IPC file in `directory` and drops the in-memory reference.
+        is_spilled(): Returns True if the data currently lives on disk.
+        buffers(): Returns the Arrow buffers held in memory by this payload.
+        resident_bytes(held=()): Returns the bytes of those buffers not in `held`, i.e. the
+            memory that spilling this payload would free.
+    """
+
+    def __init__(self, value):
+        if not isinstance(value, (pl.Series, pl.DataFrame)):
+            raise ValueError("UndoPayload only accepts a Polars Series or DataFrame")
+        self._value = value
+        self._path = None
+        self._buffers = None
+        self.is_series = isinstance(value, pl.Series)
+        self.nbytes = value.estimated_size()
+
+    def get(self):
+        if self._value is not None:
+            return self._value
+        frame = pl.read_ipc(self._path)
+        return frame.to_series(0) if self.is_series else frame
+
+    def spill(self, directory):
+        if self._value is None:
+            return
+        path = os.path.join(directory, f"{uuid.uuid4().hex}.arrow")
+        frame = self._value.to_frame() if self.is_series else self._value
+        frame.write_ipc(path)
+        weakref.finalize(self, _remove_file, path)
+        self._path = path
+        self._value = None
+        self._buffers = None
+
+    def is_spilled(self):
+        return self._value is None
+
+    def buffers(self):
+        if self._value is None:
+            return {}
+        if self._buffers is None:
+            self._buffers = arrow_buffers(self._value)
+        return self._buffers
+
+    def resident_bytes(self, held=()):
+        return sum(size for address, size in self.buffers().items() if address not in held)
@@ -0,0 +1,188 @@
+import numpy as np
+import polars as pl
+from service.utils.table_text import format_table
+
+COLLINEARITY_ENGINES = ["Polars", "R"]
+CHUNK_BYTES = 64 * 1024 * 1024
+ALIAS_TOLERANCE = 1e-7
+CONDITION_THRESHOLD = 30
+PROPORTION_THRESHOLD = 0.5
+MAX_PRINTED_DIMENSIONS = 20
+VIF_SCHEMA = {"variable": pl.Utf8, "vif": pl.Float64, "tolerance": pl.Float64, "r_squared": pl.Float64, "note": pl.Utf8}
+CONDITION_SCHEMA = {"dimension": pl.Int64, "eigenvalue": pl.Float64, "condition_index": pl.Float64, "high_proportions": pl.Utf8}
+COEFFICIENT_SCHEMA = {"term": pl.Utf8, "estimate": pl.Float64}
+
+def native_collinearity_script(r_script):
+    """Script text recorded for diagnostics computed with polars: the equivalent R script."""
+    return f"# Multicollinearity diagnostics computed with polars. Equivalent R script:\n{r_script}"
+
+def cross_products(data, columns, chunk_bytes=CHUNK_BYTES):
+    """
+    Reads the complete rows of `columns` (rows with a missing value are dropped, as `lm`
+    does) in chunks of at most `chunk_bytes` and accumulates their cross products.
+    Values are shifted by a pilot mean first so the centred sums keep their precision.
+    Returns:
+        tuple: (number of rows, np.ndarray of means, np.ndarray of centred cross products).
+    """
+    values = [pl.col(column).cast(pl.Float64) for column in columns]
+    frame = data.lazy().select(values).filter(pl.all_horizontal(pl.col(columns).is_finite()))
+    shift = frame.select(pl.col(columns).mean().fill_null(0.0)).collect().to_numpy()[0]
+    rows = frame.select(pl.len()).collect().item()
+    chunk_rows = max(1, chunk_bytes // (8 * len(columns)))
+    total = np.zeros(len(columns))
+    products = np.zeros((len(columns), len(columns)))
+    for offset in range(0, rows, chunk_rows):
+        chunk = frame.slice(offset, chunk_rows).collect().to_numpy() - shift
+        total += chunk.sum(axis=0)
+        products += chunk.T @ chunk
+    mean_shift = total / max(rows, 1)
+    return rows, shift + mean_shift, products - rows * np.outer(mean_shift, mean_shift)
+
+def _aliased(correlation, tolerance=ALIAS_TOLERANCE):
+    """
+    Positions of columns that are (numerically) linear combinations of earlier ones, found by
+    sweeping the columns in order, as `lm` reports them as aliased (NA coefficients).
+    """
+    matrix = correlation.copy()
+    aliased = []
+    for index in range(matrix.shape[0]):
+        pivot = matrix[index, index]
+        if not pivot > tolerance:
+            aliased.append(index)
+            continue
+        row = matrix[index].copy()
+        matrix -= np.outer(row, row) / pivot
+        matrix[index] = row / pivot
+        matrix[:, index] = row / pivot
+        matrix[index, index] = -1 / pivot
+    return aliased
+
+def variance_inflation(correlation):
+    """
+    Variance inflation factors of all columns at once: the diagonal of the inverse of their
+    correlation matrix, read from its Cholesky factor L as the column sums of squares of L⁻¹.
+    The squared diagonal of L is the share of each column's variance not explained by the
+    earlier ones; when one is below ALIAS_TOLERANCE (or the factorisation fails) the aliased
+    columns are found and left out, and the rest is factorised again.
+    Returns:
+        tuple: (np.ndarray of VIFs, NaN for constant and aliased columns; sorted list of their positions).
+    """
+    vif = np.full(correlation.shape[0], np.nan)
+    usable = [index for index in range(correlation.shape[0]) if not np.isnan(correlation[index, index])]
+    matrix = correlation[np.ix_(usable, usable)]
+    try:
+        factor = np.linalg.cholesky(matrix)
+        aliased = [] if np.all(np.diag(factor) ** 2 > ALIAS_TOLERANCE) else _aliased(matrix)
+    except np.linalg.LinAlgError:
+        aliased = _aliased(matrix)
+    kept = [position for position in range(len(usable)) if position not in aliased]
+    if aliased and kept:
+        factor = np.linalg.cholesky(matrix[np.ix_(kept, kept)])
+    if kept:
+        inverse = np.linalg.solve(factor, np.eye(len(kept)))
+        vif[[usable[position] for position in kept]] = (inverse ** 2).sum(axis=0)
+    return vif, [index for index in range(correlation.shape[0]) if np.isnan(vif[index])]
+
+def condition_diagnostics(rows, means, centred, names):
+    """
+    Belsley's collinearity diagnostics of the design with an intercept, its columns scaled to
+    unit length (as `perturb::colldiag` and `olsrr::ols_eigen_cindex`): the eigenvalues of the
+    scaled cross-product matrix (the squared singular values of the scaled design), the
+    condition indices √(λ_max / λ_k) and the share of every coefficient's variance that each
+    dimension accounts for.
+    Returns:
+        tuple: (np.ndarray of eigenvalues, descending; np.ndarray of condition indices;
+            pl.DataFrame of variance-decomposition proportions with a `dimension` column and
+            one column per term).
+    """
+    count = len(names)
+    products = np.empty((count + 1, count + 1))
+    products[0, 0] = rows
+    products[0, 1:] = products[1:, 0] = rows * means
+    products[1:, 1:] = centred + rows * np.outer(means, means)
+    scale = np.sqrt(np.diag(products))
+    scale[scale == 0] = 1.0
+    scaled = products / np.outer(scale, scale)
+    eigenvalues, vectors = np.linalg.eigh(scaled)
+    order = np.argsort(eigenvalues)[::-1]
+    eigenvalues, vectors = np.clip(eigenvalues[order], 0.0, None), vectors[:, order]
+    with np.errstate(divide="ignore"):
+        condition = np.sqrt(eigenvalues[0] / eigenvalues)
+        shares = vectors ** 2 / np.maximum(eigenvalues, eigenvalues[0] * np.finfo(float).eps ** 2)
+    proportions = shares / shares.sum(axis=1, keepdims=True)
+    table = pl.DataFrame({
+        "dimension": np.arange(1, count + 2),
+        **{term: proportions[position] for position, term in enumerate(["(Intercept)", *names])},
+    })
+    return eigenvalues, condition, table
+
+def collinearity_diagnostics(data, dependent, independents):
+    """
+    Computes the multicollinearity diagnostics of the regression of `dependent` on
+    `independents` from one pass over the data: all variance inflation factors from a single
+    Cholesky factorisation of the predictors' correlation matrix (no auxiliary regressions),
+    Belsley's condition indices and variance-decomposition proportions, and the least squares
+    coefficients that `print(lm(...))` shows. Rows with a missing value in any of the columns
+    are dropped, as `lm` does; aliased predictors get no VIF and no coefficient.
+    Args:
+        data (pl.LazyFrame or pl.DataFrame): Data holding the columns.
+        dependent (str): Response column.
+        independents (list): Predictor columns.
+    Returns:
+        dict: `rows`, `vif` (pl.DataFrame with VIF_SCHEMA), `condition` (pl.DataFrame with
+            CONDITION_SCHEMA), `proportions` (pl.DataFrame) and `coefficients` (pl.DataFrame
+            with COEFFICIENT_SCHEMA).
+    """
+    columns = [*independents, dependent]
+    rows, means, centred = cross_products(data, columns)
+    if rows <= len(independents):
+        raise ValueError(f"Only {rows} complete rows for {len(independents)} predictors.")
+    predictors = centred[:-1, :-1]
+    deviation = np.sqrt(np.diag(predictors))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = predictors / np.outer(deviation, deviation)
+    vif, aliased = variance_inflation(correlation)
+    notes = ["aliased" if index in aliased else "" for index in range(len(independents))]
+    vif_table = pl.DataFrame({
+        "variable": independents, "vif": vif, "tolerance": 1 / vif, "r_squared": 1 - 1 / vif, "note": notes,
+    }, schema=VIF_SCHEMA).with_columns(pl.col("vif", "tolerance", "r_squared").fill_nan(None))
+
+    kept = [index for index in range(len(independents)) if index not in aliased]
+    estimates = np.full(len(independents), np.nan)
+    if kept:
+        factor = np.linalg.cholesky(predictors[np.ix_(kept, kept)])
+        estimates[kept] = np.linalg.solve(factor.T, np.linalg.solve(factor, centred[kept, -1]))
+    intercept = means[-1] - float(np.nansum(estimates * means[:-1]))
+    coefficients = pl.DataFrame({"term": ["(Intercept)", *independents], "estimate": [intercept, *estimates]},
+                                schema=COEFFICIENT_SCHEMA).with_columns(pl.col("estimate").fill_nan(None))
+
+    eigenvalues, condition, proportions = condition_diagnostics(rows, means[:-1], predictors, independents)
+    terms = proportions.columns[1:]
+    high = [
+        ", ".join(f"{term} ({share:.2f})" for term, share in zip(terms, row[1:]) if share >= PROPORTION_THRESHOLD)
+        for row in proportions.iter_rows()
+    ]
+    condition_table = pl.DataFrame({
+        "dimension": proportions.get_column("dimension"), "eigenvalue": eigenvalues,
+        "condition_index": condition, "high_proportions": high,
+    }, schema=CONDITION_SCHEMA)
+    return {"rows": rows, "vif": vif_table, "condition": condition_table, "proportions": proportions, "coefficients": coefficients}
+
+def format_collinearity_result(diagnostics, regression=False):
+    """
+    Formats the diagnostics for the output pane: the coefficients (when `regression`), the
+    VIFs from highest to lowest and the condition indices; beyond MAX_PRINTED_DIMENSIONS
+    dimensions only those with a condition index of at least CONDITION_THRESHOLD are listed.
+    """
+    sections = []
+    if regression:
+        sections.append(f"Coefficients (n = {diagnostics['rows']:,}):\n" + format_table(diagnostics["coefficients"]))
+    sections.append("VIF Value (highest first):\n" + format_table(diagnostics["vif"].sort("vif", descending=True, nulls_last=True)))
+    condition = diagnostics["condition"]
+    if condition.height > MAX_PRINTED_DIMENSIONS:
+        condition = condition.filter(pl.col("condition_index") >= CONDITION_THRESHOLD)
+        title = f"Condition indices of at least {CONDITION_THRESHOLD} (scaled design with intercept):\n"
+    else:
+        title = "Condition indices (scaled design with intercept):\n"
+    sections.append(title + (format_table(condition) if condition.height else "None."))
+    return "\n\n".join(sections)
@@ -1,8 +1,10 @@
 import os
-import polars as pl
 from PyQt6.QtWidgets import QMessageBox
 import rpy2.robjects as ro
-import rpy2.robjects.lib.grdevices as grdevices
+from service.utils.plot_render import render_r_plots
+from service.exploration.SummaryStatistics import summary_source
+from service.exploration.CorrelationStatistics import correlation_matrix, matrix_table, top_pairs, format_correlation_result
+from service.utils.analysis_view import AnalysisView, output_key
 
 def run_correlation_matrix(parent):
     """
@@ -14,11 +16,13 @@ def run_correlation_matrix(parent):
         - model2: An object with a method get_data() that returns a Polars DataFrame.
         - r_script: A string containing the R script to be executed.
         - result: A string to store the correlation matrix result.
-        - plot: A list to store the path of the generated correlation plot.
+        - plot: A list to store the PNG bytes of the generated correlation plot.
         - error: A boolean to indicate if an error occurred.
     The function performs the following steps:
     1. Activates the R environment.
-    2. Retrieves data from model1 and model2, concatenates them, and removes null values.
+    2. Retrieves data from model1 and model2, concatenates them, and removes null values. When
+       `parent.options` is set (by the dialog), only the selected columns are sent and missing
+       values are kept, since the script uses pairwise-complete observations.
     3. Converts the Polars DataFrame to an R DataFrame.
     4. Loads necessary R libraries and prepares the data in R.
     5. Executes the provided R script to generate the correlation matrix.
@@ -33,10 +37,11 @@ def run_correlation_matrix(parent):
     parent.activate_R()
 
     # Mengambil data dari model1 dan model2
-    df1 = parent.model1.get_data()
-    df2 = parent.model2.get_data()
-    df = pl.concat([df1, df2], how="horizontal")
-    df = df.drop_nulls()  # Menghapus nilai null
+    options = getattr(parent, "options", None)
+    if options:
+        df = summary_source(parent.model1, parent.model2, options["columns"], output_key(parent)).collect()
+    else:
+        df = AnalysisView(parent.model1, parent.model2, output_key(parent)).complete().collect()
 
     # Mengonversi DataFrame Polars ke R DataFrame
     with rpy2polars.converter.context() as cv_ctx:
@@ -65,14 +70,35 @@ def run_correlation_matrix(parent):
         correlation_plot_exists = ro.r('exists("correlation_plot")')
 
         if correlation_plot_exists[0]:
-            plot_path =[]
-            plot_path.append("correlation_plot.png")
-            grdevices.png(file=plot_path, width=800, height=600)
-            ro.r('print(correlation_plot)')
-            grdevices.dev_off()
-            parent.plot = plot_path
+            parent.plot = render_r_plots(["correlation_plot"])
 
     except Exception as e:
         parent.error = True
         parent.result = str(e)
         return
+
+def run_native_correlation_matrix(parent):
+    """
+    Computes the correlation matrix with polars and NumPy only, without R.
+    Args:
+        parent: The CorrelationMatrix model; `options` holds `columns`, `method` ("pearson" or
+            "spearman"), `top_k` and the `plot` flag.
+            The matrix is stored as a DataFrame in `table`, the strongest pairs in `pairs`, the
+            text in `result` and the heatmap in `plot`. On failure `error` is set and `result`
+            holds the message.
+    """
+    from service.graph.NativePlot import render_correlation_heatmap
+
+    try:
+        options = parent.options
+        columns = options["columns"]
+        data = summary_source(parent.model1, parent.model2, columns, output_key(parent))
+        correlation, counts = correlation_matrix(data, columns, options["method"])
+        parent.table = matrix_table(correlation, columns)
+        parent.pairs = top_pairs(correlation, counts, columns, options["top_k"])
+        parent.result = format_correlation_result(correlation, counts, columns, options["method"], options["top_k"])
+        if options["plot"]:
+            parent.plot = render_correlation_heatmap(correlation, columns, f"{options['method'].capitalize()} Correlation Matrix")
+    except Exception as e:
+        parent.error = True
+        parent.result = str(e)
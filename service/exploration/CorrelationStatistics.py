@@ -0,0 +1,168 @@
+import numpy as np
+import polars as pl
+from service.utils.table_text import format_table
+
+CORRELATION_ENGINES = ["Polars", "R"]
+CORRELATION_METHODS = ["pearson", "spearman"]
+BLOCK_COLUMNS = 64
+CHUNK_BYTES = 64 * 1024 * 1024
+TOP_PAIRS = 20
+MAX_PRINTED_COLUMNS = 12
+RERANK_PAIRS = 256
+PAIRS_SCHEMA = {"variable_1": pl.Utf8, "variable_2": pl.Utf8, "correlation": pl.Float64, "n": pl.Int64}
+
+def native_correlation_script(r_script):
+    """Script text recorded for a correlation matrix computed with polars: the equivalent R script."""
+    return f"# Correlation matrix computed with polars. Equivalent R script:\n{r_script}"
+
+def _values(data, columns):
+    """Float64 columns with non-finite values as missing."""
+    values = [pl.col(column).cast(pl.Float64) for column in columns]
+    return data.lazy().select(pl.when(value.is_finite()).then(value).alias(column) for value, column in zip(values, columns))
+
+def _prepared(data, columns, method):
+    """
+    The values of `_values`, left lazy so they are read chunk by chunk; for Spearman, the ranks
+    (ties averaged), collected once. Ranking needs every row of a column, so the Spearman rank
+    matrix of all selected columns and rows is held in memory (8 bytes per value).
+    """
+    frame = _values(data, columns)
+    if method == "spearman":
+        return frame.select(pl.col(columns).rank("average").cast(pl.Float64)).collect()
+    return frame
+
+def _reranked_pairs(data, columns, correlation, counts, pair_batch=RERANK_PAIRS):
+    """
+    Spearman correlations of the pairs that involve a column with missing values, ranked
+    again on each pair's complete rows as R does, in place of the correlations of the
+    column-wise ranks. Pairs are computed `pair_batch` at a time, one polars query per batch.
+    """
+    frame = _values(data, columns)
+    nulls = frame.select(pl.col(columns).null_count()).collect().row(0)
+    incomplete = [index for index, count in enumerate(nulls) if count]
+    pairs = sorted({
+        (min(i, j), max(i, j)) for i in incomplete for j in range(len(columns)) if i != j and counts[i, j] >= 2
+    })
+    for start in range(0, len(pairs), pair_batch):
+        batch = pairs[start:start + pair_batch]
+        expressions = []
+        for number, (i, j) in enumerate(batch):
+            first, second = pl.col(columns[i]), pl.col(columns[j])
+            both = first.is_not_null() & second.is_not_null()
+            expressions.append(pl.corr(first.filter(both).rank("average"), second.filter(both).rank("average")).alias(str(number)))
+        for (i, j), value in zip(batch, frame.select(expressions).collect().row(0)):
+            value = np.nan if value is None or not np.isfinite(value) else min(1.0, max(-1.0, value))
+            correlation[i, j] = correlation[j, i] = value
+
+def _blocks(count, size):
+    return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+def correlation_matrix(data, columns, method="pearson", block_columns=BLOCK_COLUMNS, chunk_bytes=CHUNK_BYTES):
+    """
+    Computes the correlation matrix of `columns` with pairwise-complete observations, as R's
+    `cor(use = "pairwise.complete.obs")`: every pair uses the rows where both values are present.
+    The rows are read in chunks of at most `chunk_bytes` and the matrix is accumulated tile by
+    tile over blocks of `block_columns` columns, so for Pearson memory stays bounded however
+    many rows and columns there are. Spearman holds the ranks of all rows and columns once (see
+    `_prepared`); only the accumulation is chunked. Each tile adds the cross products of a chunk with one matrix product;
+    the counts and partial sums that pairwise deletion needs take four more products, only for
+    chunks that have missing values. Values are shifted by the column means first, so the sums
+    do not lose precision. Spearman correlations are Pearson correlations of the ranks, ranked
+    per column; pairs involving a column with missing values are ranked again on their
+    complete rows, as R does, with one more pass per RERANK_PAIRS such pairs.
+    Args:
+        data (pl.LazyFrame or pl.DataFrame): Data holding `columns`.
+        columns (list): Numeric columns.
+        method (str): "pearson" or "spearman".
+    Returns:
+        tuple: (k x k np.ndarray of correlations, NaN where undefined; k x k np.ndarray of the
+            number of rows used by every pair).
+    """
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"Unknown correlation method: {method}")
+    count = len(columns)
+    frame = _prepared(data, columns, method)
+    shift = frame.lazy().select(pl.col(columns).mean().fill_null(0.0)).collect().to_numpy()[0] if count else np.zeros(0)
+    rows = frame.lazy().select(pl.len()).collect().item()
+    chunk_rows = max(1, chunk_bytes // (8 * max(count, 1)))
+
+    n = np.zeros((count, count))
+    sums = {name: np.zeros((count, count)) for name in ("x", "y", "xx", "yy", "xy")}
+    blocks = _blocks(count, block_columns)
+    for offset in range(0, rows, chunk_rows):
+        chunk = frame.lazy().slice(offset, chunk_rows).collect().to_numpy() - shift
+        present = ~np.isnan(chunk)
+        complete = bool(present.all())
+        values = np.where(present, chunk, 0.0)
+        squares = values * values
+        mask = present.astype(np.float64)
+        for index, (a_start, a_end) in enumerate(blocks):
+            for b_start, b_end in blocks[index:]:
+                tile = (slice(a_start, a_end), slice(b_start, b_end))
+                sums["xy"][tile] += values[:, a_start:a_end].T @ values[:, b_start:b_end]
+                if complete:
+                    n[tile] += chunk.shape[0]
+                    sums["x"][tile] += values[:, a_start:a_end].sum(axis=0)[:, None]
+                    sums["y"][tile] += values[:, b_start:b_end].sum(axis=0)[None, :]
+                    sums["xx"][tile] += squares[:, a_start:a_end].sum(axis=0)[:, None]
+                    sums["yy"][tile] += squares[:, b_start:b_end].sum(axis=0)[None, :]
+                else:
+                    n[tile] += mask[:, a_start:a_end].T @ mask[:, b_start:b_end]
+                    sums["x"][tile] += values[:, a_start:a_end].T @ mask[:, b_start:b_end]
+                    sums["y"][tile] += mask[:, a_start:a_end].T @ values[:, b_start:b_end]
+                    sums["xx"][tile] += squares[:, a_start:a_end].T @ mask[:, b_start:b_end]
+                    sums["yy"][tile] += mask[:, a_start:a_end].T @ squares[:, b_start:b_end]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = sums["xy"] - sums["x"] * sums["y"] / n
+        variance_x = sums["xx"] - sums["x"] ** 2 / n
+        variance_y = sums["yy"] - sums["y"] ** 2 / n
+        correlation = covariance / np.sqrt(variance_x * variance_y)
+    correlation = np.where((n >= 2) & (variance_x > 0) & (variance_y > 0), np.clip(correlation, -1.0, 1.0), np.nan)
+    upper = np.triu(np.ones((count, count), dtype=bool), 1)
+    correlation = np.where(upper, correlation, correlation.T)
+    n = np.where(upper, n, n.T)
+    np.fill_diagonal(correlation, np.where(np.diag(variance_x) > 0, 1.0, np.nan))
+    if method == "spearman" and count:
+        _reranked_pairs(data, columns, correlation, n)
+    return correlation, n.astype(np.int64)
+
+def matrix_table(correlation, columns):
+    """The correlation matrix as a DataFrame with a `variable` column and one column per variable."""
+    return pl.DataFrame({"variable": columns, **{column: correlation[:, index] for index, column in enumerate(columns)}})
+
+def top_pairs(correlation, counts, columns, top_k=TOP_PAIRS):
+    """
+    The `top_k` most strongly correlated pairs (by absolute correlation), strongest first.
+    Returns:
+        pl.DataFrame: PAIRS_SCHEMA; pairs with an undefined correlation are left out.
+    """
+    first, second = np.triu_indices(len(columns), 1)
+    values = correlation[first, second]
+    keep = ~np.isnan(values)
+    first, second, values = first[keep], second[keep], values[keep]
+    if top_k is not None and values.size > top_k:
+        chosen = np.argpartition(-np.abs(values), top_k - 1)[:top_k]
+        first, second, values = first[chosen], second[chosen], values[chosen]
+    order = np.lexsort((first * len(columns) + second, -np.abs(values)))
+    names = np.array(columns, dtype=object)
+    return pl.DataFrame({
+        "variable_1": names[first[order]].tolist(),
+        "variable_2": names[second[order]].tolist(),
+        "correlation": values[order],
+        "n": counts[first[order], second[order]],
+    }, schema=PAIRS_SCHEMA)
+
+def format_correlation_result(correlation, counts, columns, method="pearson", top_k=TOP_PAIRS):
+    """
+    Formats the result for the output pane: the full matrix for up to MAX_PRINTED_COLUMNS
+    variables, and the most strongly correlated pairs.
+    """
+    sections = []
+    if len(columns) <= MAX_PRINTED_COLUMNS:
+        sections.append(f"{method.capitalize()} correlation matrix (pairwise-complete observations):\n"
+                        + format_table(matrix_table(correlation, columns)))
+    pairs = top_pairs(correlation, counts, columns, top_k)
+    sections.append(f"Top {pairs.height} of {len(columns) * (len(columns) - 1) // 2:,} pairs by absolute {method} correlation:\n"
+                    + format_table(pairs))
+    return "\n\n".join(sections)
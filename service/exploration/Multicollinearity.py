@@ -1,7 +1,9 @@
-import polars as pl
 from PyQt6.QtWidgets import QMessageBox
 import rpy2.robjects as ro
 import rpy2_arrow.polars as rpy2polars
+from service.exploration.SummaryStatistics import summary_source
+from service.exploration.CollinearityStatistics import collinearity_diagnostics, format_collinearity_result
+from service.utils.analysis_view import AnalysisView, output_key
 
 def run_multicollinearity(parent):
     """
@@ -9,7 +11,9 @@ def run_multicollinearity(parent):
     This function performs the following steps:
     1. Activates R environment.
     2. Retrieves data from two models in the parent object.
-    3. Combines the data using Polars and removes any null values.
+    3. Combines the data using Polars and removes any null values. When `parent.options` is
+       set (by the dialog), only the model's columns are taken, so missing values elsewhere
+       in the sheet drop no rows.
     4. Converts the Polars DataFrame to an R DataFrame.
     5. Loads the 'car' library in R and prepares the data for analysis.
     6. Executes a pre-generated R script stored in the parent object.
@@ -25,12 +29,12 @@ def run_multicollinearity(parent):
     parent.activate_R()  # Pastikan R aktif
 
     # Ambil data dari model
-    df1 = parent.model1.get_data()
-    df2 = parent.model2.get_data()
-
-    # Gabungkan data menggunakan Polars
-    df = pl.concat([df1, df2], how="horizontal")
-    df = df.drop_nulls()  # Hapus data kosong
+    options = getattr(parent, "options", None)
+    if options:
+        columns = list(dict.fromkeys([options["dependent"], *options["independents"]]))
+        df = summary_source(parent.model1, parent.model2, columns, output_key(parent)).collect().drop_nulls()
+    else:
+        df = AnalysisView(parent.model1, parent.model2, output_key(parent)).complete().collect()
 
     # Konversi Polars DataFrame ke R DataFrame
     with rpy2polars.converter.context() as cv_ctx:
@@ -70,4 +74,26 @@ def run_multicollinearity(parent):
     except Exception as e:
         parent.error = True
         parent.result = str(e)
-        return
\ No newline at end of file
+        return
+
+def run_native_multicollinearity(parent):
+    """
+    Computes the multicollinearity diagnostics with polars and NumPy only, without R.
+    Args:
+        parent: The Multicollinearity model; `options` holds `dependent` and `independents`,
+            and `reg_model` whether the coefficients are shown.
+            The diagnostics are stored as DataFrames in `vif`, `condition` and `proportions`
+            and as text in `result`. On failure `error` is set and `result` holds the message.
+    """
+    try:
+        options = parent.options
+        columns = list(dict.fromkeys([options["dependent"], *options["independents"]]))
+        data = summary_source(parent.model1, parent.model2, columns, output_key(parent))
+        diagnostics = collinearity_diagnostics(data, options["dependent"], options["independents"])
+        parent.vif = diagnostics["vif"]
+        parent.condition = diagnostics["condition"]
+        parent.proportions = diagnostics["proportions"]
+        parent.result = format_collinearity_result(diagnostics, parent.reg_model)
+    except Exception as e:
+        parent.error = True
+        parent.result = str(e)
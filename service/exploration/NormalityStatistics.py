@@ -0,0 +1,275 @@
+import math
+import numpy as np
+import polars as pl
+from service.utils.table_text import format_table
+
+NORMALITY_ENGINES = ["Polars", "R"]
+NORMALITY_TESTS = ["shapiro", "jarque_bera", "lilliefors"]
+SHAPIRO_MAX_N = 5000
+SUBSAMPLE_STEP = (2654435769, 4294967296)  # Weyl sequence step (golden ratio as a 32-bit fraction), exact in doubles
+QQ_TAIL_POINTS = 25
+QQ_CENTER_POINTS = 150
+QUARTILE_Z = 0.6744897501960817
+RESULT_SCHEMA = {
+    "variable": pl.Utf8, "test": pl.Utf8, "n": pl.Int64, "statistic": pl.Float64, "p_value": pl.Float64, "note": pl.Utf8,
+}
+TEST_LABELS = {"shapiro": "Shapiro-Wilk W", "jarque_bera": "Jarque-Bera X-squared", "lilliefors": "Lilliefors D"}
+
+def native_normality_script(r_script):
+    """Script text recorded for normality tests run with polars: the equivalent R script."""
+    return f"# Normality tests computed with polars. Equivalent R script:\n{r_script}"
+
+def normal_quantile(p):
+    """Standard normal quantiles of an array of probabilities (algorithm AS 241, as R's `qnorm`)."""
+    p = np.asarray(p, dtype=np.float64)
+    q = p - 0.5
+    result = np.empty_like(p)
+    central = np.abs(q) <= 0.425
+    r = 0.180625 - q[central] ** 2
+    result[central] = q[central] * (((((((2509.0809287301226727 * r + 33430.575583588128105) * r + 67265.770927008700853) * r
+        + 45921.953931549871457) * r + 13731.693765509461125) * r + 1971.5909503065514427) * r + 133.14166789178437745) * r
+        + 3.387132872796366608) / (((((((5226.495278852545925 * r + 28729.085735721942674) * r + 39307.89580009271061) * r
+        + 21213.794301586595867) * r + 5394.1960214247511077) * r + 687.1870074920579083) * r + 42.313330701600911252) * r + 1.0)
+    tail = ~central
+    r = np.sqrt(-np.log(np.where(q[tail] < 0, p[tail], 1 - p[tail])))
+    near = r <= 5
+    s = np.where(near, r - 1.6, r - 5)
+    near_value = (((((((7.7454501427834140764e-4 * s + 0.0227238449892691845833) * s + 0.24178072517745061177) * s
+        + 1.27045825245236838258) * s + 3.64784832476320460504) * s + 5.7694972214606914055) * s + 4.6303378461565452959) * s
+        + 1.42343711074968357734) / (((((((1.05075007164441684324e-9 * s + 5.475938084995344946e-4) * s
+        + 0.0151986665636164571966) * s + 0.14810397642748007459) * s + 0.68976733498510000455) * s + 1.6763848301838038494) * s
+        + 2.05319162663775882187) * s + 1.0)
+    far_value = (((((((2.01033439929228813265e-7 * s + 2.71155556874348757815e-5) * s + 0.0012426609473880784386) * s
+        + 0.026532189526576123093) * s + 0.29656057182850489123) * s + 1.7848265399172913358) * s + 5.4637849111641143699) * s
+        + 6.6579046435011037772) / (((((((2.04426310338993978564e-15 * s + 1.4215117583164458887e-7) * s
+        + 1.8463183175100546818e-5) * s + 7.868691311456132591e-4) * s + 0.0148753612908506148525) * s
+        + 0.13692988092273580531) * s + 0.59983220655588793769) * s + 1.0)
+    value = np.where(near, near_value, far_value)
+    result[tail] = np.where(q[tail] < 0, -value, value)
+    return result
+
+def normal_cdf(z):
+    """Standard normal distribution function as a polars expression (Abramowitz and Stegun 7.1.26, error below 1.5e-7)."""
+    x = z.abs() / math.sqrt(2)
+    t = 1 / (1 + 0.3275911 * x)
+    erf = 1 - t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429)))) * (-(x * x)).exp()
+    return 0.5 * (1 + erf * z.sign())
+
+def _poly(coefficients, x):
+    result = 0.0
+    for coefficient in reversed(coefficients):
+        result = result * x + coefficient
+    return result
+
+def shapiro_wilk(values):
+    """
+    Shapiro-Wilk W test with Royston's (1995) approximation, as R's `shapiro.test`.
+    Args:
+        values (np.ndarray): Sorted sample of 3 to 5000 values.
+    Returns:
+        tuple: (W, p-value).
+    """
+    n = values.size
+    if n < 3 or n > SHAPIRO_MAX_N:
+        raise ValueError(f"Shapiro-Wilk needs between 3 and {SHAPIRO_MAX_N} values, got {n}.")
+    if values[-1] - values[0] <= 0:
+        raise ValueError("Shapiro-Wilk needs values that are not all identical.")
+    half = n // 2
+    if n == 3:
+        weights = np.array([math.sqrt(0.5)])
+    else:
+        m = normal_quantile((np.arange(1, half + 1) - 0.375) / (n + 0.25))
+        sum_m2 = 2 * float(np.sum(m * m))
+        root = 1 / math.sqrt(n)
+        a1 = _poly([0.0, 0.221157, -0.147981, -2.07119, 4.434685, -2.706056], root) - m[0] / math.sqrt(sum_m2)
+        weights = -m
+        if n > 5:
+            a2 = -m[1] / math.sqrt(sum_m2) + _poly([0.0, 0.042981, -0.293762, -1.752461, 5.682633, -3.582633], root)
+            factor = math.sqrt((sum_m2 - 2 * m[0] ** 2 - 2 * m[1] ** 2) / (1 - 2 * a1 ** 2 - 2 * a2 ** 2))
+            weights = weights / factor
+            weights[1] = a2
+        else:
+            factor = math.sqrt((sum_m2 - 2 * m[0] ** 2) / (1 - 2 * a1 ** 2))
+            weights = weights / factor
+        weights[0] = a1
+    coefficients = np.zeros(n)
+    coefficients[:half] = -weights
+    coefficients[n - half:] = weights[::-1]
+    w = min(1.0, float(np.corrcoef(coefficients, values)[0, 1] ** 2))
+
+    if n == 3:
+        return w, max(0.0, 1.90985931710274 * (math.asin(math.sqrt(w)) - 1.04719755119660))
+    y = math.log(1 - w) if w < 1 else -math.inf
+    if n <= 11:
+        gamma = _poly([-2.273, 0.459], n)
+        if y >= gamma:
+            return w, 1e-99
+        y = -math.log(gamma - y)
+        mean = _poly([0.544, -0.39978, 0.025054, -6.714e-4], n)
+        sd = math.exp(_poly([1.3822, -0.77857, 0.062767, -0.0020322], n))
+    else:
+        mean = _poly([-1.5861, -0.31082, -0.083751, 0.0038915], math.log(n))
+        sd = math.exp(_poly([-0.4803, -0.082676, 0.0030302], math.log(n)))
+    return w, 0.5 * math.erfc((y - mean) / sd / math.sqrt(2))
+
+def stratified_rows(n, size=SHAPIRO_MAX_N):
+    """
+    Row positions of a stratified subsample: the `n` rows are split into `size` blocks of
+    consecutive rows and one row is taken from each, so every part of the sheet (e.g. every
+    region when the data is ordered by region) is represented. The row within block `i` is
+    set by the fractional part of `i * SUBSAMPLE_STEP`, which spreads the picks like random
+    draws but uses only exact double arithmetic, so `shapiro_subsample_script` selects the
+    very same rows in R.
+    Returns:
+        np.ndarray: Ascending row positions (all rows when `n` is at most `size`).
+    """
+    if n <= size:
+        return np.arange(n)
+    bounds = np.floor(np.arange(size + 1, dtype=np.float64) * n / size)
+    steps = np.arange(1, size + 1, dtype=np.float64) * (SUBSAMPLE_STEP[0] / SUBSAMPLE_STEP[1])
+    return (bounds[:-1] + np.floor((steps - np.floor(steps)) * np.diff(bounds))).astype(np.int64)
+
+def shapiro_subsample_script(name, size=SHAPIRO_MAX_N):
+    """R code that reduces the finite values in the R vector `name` to the rows of `stratified_rows`."""
+    return (
+        f"{name} <- {name}[is.finite({name})]\n"
+        f"if (length({name}) > {size}) {{\n"
+        f"    bounds <- floor((0:{size}) * length({name}) / {size})\n"
+        f"    steps <- (1:{size}) * ({SUBSAMPLE_STEP[0]} / {SUBSAMPLE_STEP[1]})\n"
+        f"    {name} <- {name}[bounds[-{size + 1}] + floor((steps - floor(steps)) * diff(bounds)) + 1]\n"
+        f"}}\n"
+    )
+
+def lilliefors_p_value(statistic, n):
+    """Dallal-Wilkinson approximation of the Lilliefors p-value, as `nortest::lillie.test`."""
+    if n <= 100:
+        kd, nd = statistic, n
+    else:
+        kd, nd = statistic * (n / 100) ** 0.49, 100
+    p_value = math.exp(
+        -7.01256 * kd ** 2 * (nd + 2.78019) + 2.99587 * kd * math.sqrt(nd + 2.78019)
+        - 0.122119 + 0.974598 / math.sqrt(nd) + 1.67997 / nd
+    )
+    if p_value > 0.1:
+        kk = (math.sqrt(n) - 0.01 + 0.85 / math.sqrt(n)) * statistic
+        if kk <= 0.302:
+            p_value = 1.0
+        elif kk <= 0.5:
+            p_value = 2.76773 - 19.828315 * kk + 80.709644 * kk ** 2 - 138.55152 * kk ** 3 + 81.218052 * kk ** 4
+        elif kk <= 0.9:
+            p_value = -4.901232 + 40.662806 * kk - 97.490286 * kk ** 2 + 94.029866 * kk ** 3 - 32.355711 * kk ** 4
+        elif kk <= 1.31:
+            p_value = 6.198765 - 19.558097 * kk + 23.186922 * kk ** 2 - 12.234627 * kk ** 3 + 2.423045 * kk ** 4
+        else:
+            p_value = 0.0
+    return p_value
+
+def qq_positions(n, tail=QQ_TAIL_POINTS, center=QQ_CENTER_POINTS):
+    """Order statistic positions kept for a Q-Q plot: every one of the outer `tail` on each side and `center` evenly spaced in between."""
+    if n <= 2 * tail + center:
+        return np.arange(n)
+    return np.unique(np.concatenate([
+        np.arange(tail), np.linspace(tail, n - tail - 1, center).round().astype(np.int64), np.arange(n - tail, n),
+    ]))
+
+def _finite(column):
+    value = pl.col(column).cast(pl.Float64)
+    return value.filter(value.is_finite())
+
+def _statistics_query(data, column, tests):
+    """Lazy query of one column's test statistics, built in stages so every intermediate column is computed once."""
+    frame = data.lazy().select((_finite(column).sort() if "lilliefors" in tests else _finite(column)).alias("value"))
+    fields = {"n": pl.len()}
+    if "jarque_bera" in tests:
+        frame = frame.with_columns(centered=pl.col("value") - pl.col("value").mean())
+        fields.update(m2=(pl.col("centered") ** 2).mean(), m3=(pl.col("centered") ** 3).mean(), m4=(pl.col("centered") ** 4).mean())
+    if "lilliefors" in tests:
+        frame = (
+            frame.with_columns(z=(pl.col("value") - pl.col("value").mean()) / pl.col("value").std())
+            .with_columns(cdf=normal_cdf(pl.col("z")), rank=pl.int_range(1, pl.len() + 1, dtype=pl.Int64))
+        )
+        fields["d"] = pl.max_horizontal(
+            (pl.col("rank") / pl.len() - pl.col("cdf")).max(), (pl.col("cdf") - (pl.col("rank") - 1) / pl.len()).max()
+        )
+    return frame.select(**fields)
+
+def _values_query(data, column, n, shapiro, qq):
+    """Lazy query of the values one column needs beyond its statistics: the Shapiro-Wilk subsample and the Q-Q order statistics."""
+    fields = {}
+    if shapiro:
+        fields["sample"] = _finite(column).gather(stratified_rows(n)).sort().implode()
+    if qq:
+        fields["qq"] = _finite(column).sort().gather(qq_positions(n)).implode()
+        fields["q1"] = _finite(column).quantile(0.25, interpolation="linear")
+        fields["q3"] = _finite(column).quantile(0.75, interpolation="linear")
+    return data.lazy().select(**fields)
+
+def normality_tests(data, columns, tests=NORMALITY_TESTS, qq=False):
+    """
+    Runs the normality tests over all columns with one polars query per column, all collected
+    together with `collect_all` so the columns are processed in parallel. Each query computes
+    the number of values, the moments for Jarque-Bera (as `tseries::jarque.bera.test`) and the
+    Lilliefors distance between the empirical distribution and the fitted normal (as
+    `nortest::lillie.test`). A second pass gathers only the rows Shapiro-Wilk (as
+    `shapiro.test`) needs, a stratified subsample of SHAPIRO_MAX_N rows when a column
+    has more, and the order statistics kept for the Q-Q plots.
+    Missing and non-finite values are dropped per column.
+    Args:
+        data (pl.LazyFrame or pl.DataFrame): Data holding `columns`.
+        columns (list): Numeric columns to test.
+        tests (list): Names from NORMALITY_TESTS.
+        qq (bool): Also return Q-Q plot summaries.
+    Returns:
+        tuple: (results pl.DataFrame with RESULT_SCHEMA, dict of column to Q-Q pl.DataFrame
+            with `theoretical` and `sample` quantiles and the `line` through the quartiles,
+            as `stat_qq_line`; empty without `qq`).
+    """
+    statistics = [row for frame in pl.collect_all([_statistics_query(data, column, tests) for column in columns]) for row in frame.to_dicts()]
+    wanted = [(column, row["n"]) for column, row in zip(columns, statistics) if row["n"] and ("shapiro" in tests or qq)]
+    values = dict(zip(
+        [column for column, _ in wanted],
+        pl.collect_all([_values_query(data, column, n, "shapiro" in tests, qq) for column, n in wanted]),
+    ))
+
+    records, qq_data = [], {}
+    for column, row in zip(columns, statistics):
+        n = row["n"]
+        for test in tests:
+            statistic = p_value = None
+            note = ""
+            if test == "jarque_bera" and n >= 2 and row["m2"] > 0:
+                skewness = row["m3"] / row["m2"] ** 1.5
+                kurtosis = row["m4"] / row["m2"] ** 2
+                statistic = n / 6 * (skewness ** 2 + (kurtosis - 3) ** 2 / 4)
+                p_value = math.exp(-statistic / 2)
+            elif test == "lilliefors" and n >= 5 and row["d"] is not None:
+                statistic = row["d"]
+                p_value = lilliefors_p_value(statistic, n)
+            elif test == "shapiro" and n >= 3:
+                sample = values[column].get_column("sample").explode().to_numpy()
+                if sample[-1] > sample[0]:
+                    statistic, p_value = shapiro_wilk(sample)
+                    if sample.size < n:
+                        note = f"stratified subsample of {sample.size:,} rows (one per block)"
+            if statistic is None:
+                note = "not enough distinct values"
+            records.append({
+                "variable": column, "test": TEST_LABELS[test], "n": n,
+                "statistic": statistic, "p_value": p_value, "note": note,
+            })
+        if qq and n:
+            positions = qq_positions(n)
+            a = 3 / 8 if n <= 10 else 0.5
+            q1, q3 = values[column].row(0, named=True)["q1"], values[column].row(0, named=True)["q3"]
+            slope = (q3 - q1) / (2 * QUARTILE_Z)
+            theoretical = normal_quantile((positions + 1 - a) / (n + 1 - 2 * a))
+            qq_data[column] = pl.DataFrame({
+                "theoretical": theoretical,
+                "sample": values[column].get_column("qq").explode(),
+                "line": (q1 + q3) / 2 + slope * theoretical,
+            })
+    return pl.DataFrame(records, schema=RESULT_SCHEMA), qq_data
+
+def format_normality_table(table):
+    """Formats the test results as aligned text for the output pane."""
+    return format_table(table.with_columns(pl.col("p_value").map_elements(lambda p: f"{p:.4g}", return_dtype=pl.Utf8)))
@@ -1,8 +1,10 @@
 import os
-import polars as pl
 from PyQt6.QtWidgets import QMessageBox
 import rpy2.robjects as ro
-import rpy2.robjects.lib.grdevices as grdevices
+from service.utils.plot_render import render_r_plots
+from service.exploration.SummaryStatistics import summary_source
+from service.exploration.NormalityStatistics import normality_tests, format_normality_table
+from service.utils.analysis_view import AnalysisView, output_key
 
 def run_normality_test(parent):
     """
@@ -10,7 +12,8 @@ def run_normality_test(parent):
     This function performs the following steps:
     1. Activates the R environment.
     2. Retrieves data from two models in the parent object and concatenates them horizontally.
-    3. Drops any rows with null values.
+    3. Drops any rows with null values. When `parent.options` is set (by the dialog), only
+       the selected columns are taken, so missing values elsewhere in the sheet drop no rows.
     4. Converts the concatenated data to an R dataframe.
     5. Executes an R script provided by the parent object to perform normality tests.
     6. Collects the results of the normality tests and any generated plots.
@@ -22,7 +25,7 @@ def run_normality_test(parent):
         - r_script (str): An R script to be executed.
         - selected_columns (list): A list of column names to be tested for normality.
         - result (str): A string to store the results of the normality tests.
-        - plot (list): A list to store the paths of generated plots.
+        - plot (list): A list to store the PNG bytes of generated plots.
         - error (bool): A boolean to indicate if an error occurred.
     Raises:
     Exception: If any error occurs during the execution of the R script or data processing.
@@ -32,10 +35,11 @@ def run_normality_test(parent):
     import rpy2_arrow.polars as rpy2polars
     
     parent.activate_R()
-    df1 = parent.model1.get_data()
-    df2 = parent.model2.get_data()
-    df = pl.concat([df1, df2], how="horizontal")
-    df = df.drop_nulls() 
+    options = getattr(parent, "options", None)
+    if options:
+        df = summary_source(parent.model1, parent.model2, options["columns"], output_key(parent)).collect().drop_nulls()
+    else:
+        df = AnalysisView(parent.model1, parent.model2, output_key(parent)).complete().collect()
 
     with rpy2polars.converter.context() as cv_ctx:
         r_df = rpy2polars.converter.py2rpy(df)
@@ -54,7 +58,7 @@ def run_normality_test(parent):
 
         selected_vars = parent.selected_columns
         result_str = ""
-        plot_paths = []  
+        plot_names = []
         test_names = ["shapiro", "jarque", "lilliefors"]
 
         for var in selected_vars:
@@ -70,15 +74,39 @@ def run_normality_test(parent):
             for plot_type in ["histogram", "qqplot"]:
                 plot_name = f"{plot_type}_{safe_var}"
                 if ro.r(f"exists('{plot_name}')")[0]:
-                    plot_path = f"temp_{plot_name}.png"
-                    grdevices.png(file=plot_path, width=800, height=600)
-                    ro.r(f"print({plot_name})")
-                    grdevices.dev_off()
-                    plot_paths.append(plot_path)
+                    plot_names.append(plot_name)
 
         parent.result = result_str
-        parent.plot = plot_paths 
+        parent.plot = render_r_plots(plot_names)
         
     except Exception as e:
         parent.result = str(e)
         parent.error = True
+
+def run_native_normality_test(parent):
+    """
+    Runs the normality tests with polars only, without R.
+    Args:
+        parent: The NormalityTest model; `options` holds `columns`, `tests` (names from
+            NORMALITY_TESTS) and the `histogram` and `qqplot` flags.
+            The results are stored as a DataFrame in `table`, as text in `result` and the
+            charts in `plot`. On failure `error` is set and `result` holds the message.
+    """
+    from service.graph.NativePlot import plot_frame, render_histograms, render_qq_plots
+
+    try:
+        options = parent.options
+        columns = options["columns"]
+        data = summary_source(parent.model1, parent.model2, columns, output_key(parent))
+        parent.table, qq_data = normality_tests(data, columns, options["tests"], qq=options["qqplot"])
+        parent.result = format_normality_table(parent.table)
+        plots = []
+        for column in columns:
+            if options["histogram"]:
+                plots += render_histograms(plot_frame(parent.model1, parent.model2, [column], key=output_key(parent)), [column], bins=10)
+            if column in qq_data:
+                plots += render_qq_plots({column: qq_data[column]})
+        parent.plot = plots
+    except Exception as e:
+        parent.result = str(e)
+        parent.error = True
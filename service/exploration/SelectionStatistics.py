@@ -0,0 +1,582 @@
+import math
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import polars as pl
+from service.utils.table_text import format_table
+from service.exploration.CollinearityStatistics import cross_products, ALIAS_TOLERANCE
+
+SELECTION_ENGINES = ["Polars", "R"]
+SELECTION_DIRECTIONS = ["forward", "backward", "both"]
+SELECTION_CRITERIA = ["AIC", "BIC"]
+IMPROVEMENT_TOLERANCE = 1e-7
+LASSO_RULES = ["lambda.1se", "lambda.min"]
+LASSO_FOLDS = 10
+LASSO_LAMBDAS = 100
+LASSO_SEED = 20240101
+LASSO_TOLERANCE = 1e-7
+LASSO_MAX_PASSES = 10000
+LASSO_MAX_EXPLAINED = 0.999
+LASSO_MIN_GAIN = 1e-5
+LASSO_MIN_LAMBDAS = 5
+LASSO_GRAM_COLUMNS = 2000
+GRAM_BATCH = 32
+TRACE_SCHEMA = {"step": pl.Int64, "action": pl.Utf8, "df": pl.Int64, "rss": pl.Float64, "criterion": pl.Float64}
+COEFFICIENT_SCHEMA = {"term": pl.Utf8, "estimate": pl.Float64, "std_error": pl.Float64, "t_value": pl.Float64, "p_value": pl.Float64}
+CV_SCHEMA = {"rule": pl.Utf8, "lambda": pl.Float64, "cv_mse": pl.Float64, "cv_se": pl.Float64, "nonzero": pl.Int64}
+LASSO_COEFFICIENT_SCHEMA = {"term": pl.Utf8, "estimate": pl.Float64}
+PENDING_SELECTION = "# Auxiliary variables are chosen by stepwise selection with polars when the model runs"
+
+def native_selection_script(r_script):
+    """Script text recorded for a selection computed with polars: the equivalent R script."""
+    return f"# Variable selection computed with polars. Equivalent R script:\n{r_script}"
+
+def _incomplete_beta(x, a, b):
+    """Regularized incomplete beta function I_x(a, b) by Lentz's continued fraction."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - _incomplete_beta(1.0 - x, b, a)
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log1p(-x)) / a
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    fraction = d
+    for m in range(1, 500):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            fraction *= c * d
+        if abs(c * d - 1.0) < 1e-15:
+            break
+    return front * fraction
+
+def t_p_value(t, df):
+    """Two-sided p-value of a t statistic, as `2 * pt(-abs(t), df)`."""
+    if math.isnan(t) or df <= 0:
+        return float("nan")
+    return _incomplete_beta(df / (df + t * t), df / 2, 0.5)
+
+def f_p_value(f, df1, df2):
+    """Upper-tail p-value of an F statistic, as `pf(f, df1, df2, lower.tail = FALSE)`."""
+    if math.isnan(f) or df1 <= 0 or df2 <= 0:
+        return float("nan")
+    return _incomplete_beta(df2 / (df2 + df1 * f), df2 / 2, df1 / 2)
+
+class _Factor:
+    """
+    The Cholesky factor R (R'R = G_SS) of the centred cross products of the predictors in the
+    model, kept with W = R⁻ᵀ G_S,· (the projections of every predictor and of the response,
+    the last column, on the model), so that adding or dropping a predictor is a rank-one
+    update of both and every candidate can be scored from W at once.
+    """
+
+    def __init__(self, products):
+        self.products = products
+        self.count = products.shape[0] - 1
+        self.active = []
+        self.factor = np.zeros((0, 0))
+        self.projection = np.zeros((0, products.shape[0]))
+
+    def rss(self):
+        response = self.projection[:, -1]
+        return max(self.products[-1, -1] - response @ response, 0.0)
+
+    def residual_variances(self):
+        """Variance of every predictor left after projecting out the model, and its covariance with the response residual."""
+        predictors = self.projection[:, :-1]
+        remaining = np.diag(self.products)[:-1] - (predictors * predictors).sum(axis=0)
+        covariance = self.products[:-1, -1] - predictors.T @ self.projection[:, -1]
+        return remaining, covariance
+
+    def aliased(self, remaining):
+        scale = np.diag(self.products)[:-1]
+        return ~(remaining > ALIAS_TOLERANCE * scale)
+
+    def add(self, column, remaining):
+        size = len(self.active)
+        pivot = math.sqrt(remaining)
+        factor = np.zeros((size + 1, size + 1))
+        factor[:size, :size] = self.factor
+        factor[:size, size] = self.projection[:, column]
+        factor[size, size] = pivot
+        row = (self.products[column] - self.projection[:, column] @ self.projection) / pivot
+        self.factor = factor
+        self.projection = np.vstack([self.projection, row])
+        self.active.append(column)
+
+    def drop(self, position):
+        """Removes the predictor at `position` and restores the triangle with Givens rotations, applied to W too."""
+        factor = np.delete(self.factor, position, axis=1)
+        projection = self.projection.copy()
+        for row in range(position, factor.shape[1]):
+            a, b = factor[row, row], factor[row + 1, row]
+            radius = math.hypot(a, b)
+            if radius == 0.0:
+                continue
+            cos, sin = a / radius, b / radius
+            rotation = np.array([[cos, sin], [-sin, cos]])
+            factor[[row, row + 1]] = rotation @ factor[[row, row + 1]]
+            projection[[row, row + 1]] = rotation @ projection[[row, row + 1]]
+        self.factor = factor[:-1]
+        self.projection = projection[:-1]
+        del self.active[position]
+
+    def drop_increases(self):
+        """Increase of the RSS when each predictor in the model is dropped: b_j² / (G_SS⁻¹)_jj."""
+        inverse = np.linalg.solve(self.factor, np.eye(len(self.active)))
+        estimates = inverse @ self.projection[:, -1]
+        return estimates ** 2 / (inverse * inverse).sum(axis=1)
+
+def _criterion(rss, rows, size, penalty):
+    """`extractAIC` of an lm with an intercept and `size` predictors: n log(RSS / n) + k edf."""
+    return rows * math.log(max(rss, np.finfo(float).tiny) / rows) + penalty * (size + 1)
+
+def select_direction(products, rows, names, direction, penalty):
+    """
+    Runs one stepwise search on the centred cross products, as `step()` does for an lm: every
+    step scores all single additions (and/or deletions) from the factor, takes the best, and
+    stops when none lowers the criterion. Forward and both start from the intercept-only
+    model, backward from the full model (aliased predictors are left out, as `lm` does).
+    Returns:
+        tuple: (list of selected positions in model order, pl.DataFrame with TRACE_SCHEMA).
+    """
+    state = _Factor(products)
+    if direction == "backward":
+        for column in range(state.count):
+            remaining, _ = state.residual_variances()
+            if not state.aliased(remaining)[column]:
+                state.add(column, remaining[column])
+    current = _criterion(state.rss(), rows, len(state.active), penalty)
+    trace = [(0, "<start>", len(state.active) + 1, state.rss(), current)]
+    while True:
+        moves = []
+        if direction in ("backward", "both") and state.active:
+            increases = state.drop_increases()
+            for position, column in enumerate(state.active):
+                moves.append((_criterion(state.rss() + increases[position], rows, len(state.active) - 1, penalty),
+                              "drop", position, column))
+        if direction in ("forward", "both"):
+            remaining, covariance = state.residual_variances()
+            candidates = np.ones(state.count, dtype=bool)
+            candidates[state.active] = False
+            candidates &= ~state.aliased(remaining)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                reduced = state.rss() - covariance ** 2 / remaining
+            for column in np.flatnonzero(candidates):
+                moves.append((_criterion(reduced[column], rows, len(state.active) + 1, penalty), "add", None, int(column)))
+        if not moves:
+            break
+        score, kind, position, column = min(moves, key=lambda move: move[0])
+        if not score < current - IMPROVEMENT_TOLERANCE:
+            break
+        if kind == "drop":
+            state.drop(position)
+        else:
+            remaining, _ = state.residual_variances()
+            state.add(column, remaining[column])
+        current = _criterion(state.rss(), rows, len(state.active), penalty)
+        action = ("- " if kind == "drop" else "+ ") + names[column]
+        trace.append((len(trace), action, len(state.active) + 1, state.rss(), current))
+    return list(state.active), pl.DataFrame(trace, schema=TRACE_SCHEMA, orient="row")
+
+def _coefficients(products, rows, means, selected, names):
+    """The `summary(lm)` coefficient table of the selected model and its fit statistics."""
+    size = len(selected)
+    residual_df = rows - size - 1
+    block = products[np.ix_(selected, selected)]
+    estimates = np.linalg.solve(block, products[selected, -1]) if size else np.zeros(0)
+    rss = max(products[-1, -1] - estimates @ products[selected, -1], 0.0)
+    sigma2 = rss / residual_df if residual_df > 0 else float("nan")
+    inverse = np.linalg.inv(block) if size else np.zeros((0, 0))
+    centre = means[selected]
+    intercept = means[-1] - estimates @ centre
+    errors = np.sqrt(sigma2 * np.concatenate([[1 / rows + centre @ inverse @ centre], np.diag(inverse)]))
+    values = np.concatenate([[intercept], estimates])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_values = values / errors
+    table = pl.DataFrame({
+        "term": ["(Intercept)", *[names[column] for column in selected]],
+        "estimate": values, "std_error": errors, "t_value": t_values,
+        "p_value": [t_p_value(float(t), residual_df) for t in t_values],
+    }, schema=COEFFICIENT_SCHEMA)
+    total = products[-1, -1]
+    r_squared = 1 - rss / total if total > 0 else float("nan")
+    fit = {
+        "sigma": math.sqrt(sigma2), "residual_df": residual_df, "r_squared": r_squared,
+        "adj_r_squared": 1 - (1 - r_squared) * (rows - 1) / residual_df if residual_df > 0 else float("nan"),
+    }
+    if size and residual_df > 0:
+        fit["f_statistic"] = (total - rss) / size / sigma2
+        fit["f_p_value"] = f_p_value(fit["f_statistic"], size, residual_df)
+    return table, fit
+
+def stepwise_selection(data, dependent, independents, directions=SELECTION_DIRECTIONS, criterion="AIC"):
+    """
+    Stepwise selection of the regression of `dependent` on `independents` in several
+    directions. The data are read once into the centred cross-product matrix (rows with a
+    missing value are dropped, as `lm` does); each search then works on a Cholesky factor of
+    it that is updated in place as predictors enter and leave, so no model is refitted. The
+    directions run in parallel threads. The criterion is `extractAIC`, with k = 2 for AIC and
+    k = log(n) for BIC.
+    Args:
+        data (pl.LazyFrame or pl.DataFrame): Data holding the columns.
+        dependent (str): Response column.
+        independents (list): Candidate predictor columns.
+        directions (list): Any of "forward", "backward" and "both".
+        criterion (str): "AIC" or "BIC".
+    Returns:
+        dict: For every direction, a dict with `selected` (list of columns), `trace`
+            (pl.DataFrame with TRACE_SCHEMA), `coefficients` (pl.DataFrame with
+            COEFFICIENT_SCHEMA), `fit` (dict of summary statistics) and `rows`.
+    """
+    if criterion not in SELECTION_CRITERIA:
+        raise ValueError(f"Unknown selection criterion: {criterion}")
+    unknown = [direction for direction in directions if direction not in SELECTION_DIRECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown selection direction: {unknown[0]}")
+    rows, means, products = cross_products(data, [*independents, dependent])
+    if rows <= 1:
+        raise ValueError(f"Only {rows} complete rows.")
+    penalty = 2.0 if criterion == "AIC" else math.log(rows)
+
+    def run(direction):
+        selected, trace = select_direction(products, rows, independents, direction, penalty)
+        coefficients, fit = _coefficients(products, rows, means, selected, independents)
+        return {"selected": [independents[column] for column in selected], "trace": trace,
+                "coefficients": coefficients, "fit": fit, "rows": rows}
+
+    with ThreadPoolExecutor(max_workers=max(len(directions), 1)) as executor:
+        results = list(executor.map(run, directions))
+    return dict(zip(directions, results))
+
+def selected_auxiliaries(data, dependent, auxiliaries, direction, criterion="AIC"):
+    """The auxiliary variables kept by a stepwise search, in their original order."""
+    selected = stepwise_selection(data, dependent, auxiliaries, [direction], criterion)[direction]["selected"]
+    return [column for column in auxiliaries if column in selected]
+
+def selected_formula_script(data, of_interest, auxiliaries, factors, direction, criterion="AIC"):
+    """
+    The `final_formula` line of a modelling script, with the auxiliary variables chosen natively
+    by a stepwise search of the linear regression of `of_interest` on them (factor terms are
+    kept as they are). Entries are as the modelling dialogs list them ("name [Numeric]"), and
+    names are written with spaces replaced by underscores, as the scripts rename the columns.
+    When the search cannot run (e.g. no complete rows), the full formula is kept with a note.
+    """
+    auxiliaries = [_entry_name(entry) for entry in auxiliaries]
+    try:
+        chosen = selected_auxiliaries(data, _entry_name(of_interest), auxiliaries, direction, criterion)
+        script = f"# Auxiliary variables chosen by {direction} stepwise selection ({criterion}), computed with polars\n"
+    except (ValueError, pl.exceptions.PolarsError) as e:
+        chosen = auxiliaries
+        script = f"# Stepwise selection could not run ({str(e).splitlines()[0]}); all auxiliary variables are kept\n"
+    return script + _formula_line(of_interest, chosen, factors)
+
+def _entry_name(entry):
+    return entry.split(" [")[0]
+
+def _formula_line(of_interest, auxiliaries, factors):
+    terms = [column.replace(" ", "_") for column in auxiliaries]
+    terms += [f"as.factor({_entry_name(entry).replace(' ', '_')})" for entry in factors]
+    return f"final_formula <- {_entry_name(of_interest).replace(' ', '_')} ~ {' + '.join(terms) or '1'}\n"
+
+def pending_formula_script(of_interest, auxiliaries, factors, direction, criterion="AIC"):
+    """
+    The `final_formula` block a modelling dialog shows while the variables are being assigned:
+    the full formula, marked so that `resolve_formula_script` replaces it with the stepwise
+    selection when the model runs. Nothing is computed, so it is cheap to regenerate on every
+    change of the dialog.
+    """
+    return f"{PENDING_SELECTION} ({direction}, {criterion})\n" + _formula_line(of_interest, [_entry_name(entry) for entry in auxiliaries], factors)
+
+def resolve_formula_script(r_script, data, of_interest, auxiliaries, factors, direction, criterion="AIC"):
+    """
+    Replaces the block of `pending_formula_script` in `r_script` with `selected_formula_script`
+    run on `data`; meant for the worker thread that runs the model. A script without the block
+    (e.g. edited by hand) is returned unchanged.
+    """
+    pending = re.compile(re.escape(PENDING_SELECTION) + r".*\nfinal_formula <- .*\n")
+    if not pending.search(r_script):
+        return r_script
+    block = selected_formula_script(data, of_interest, auxiliaries, factors, direction, criterion)
+    return pending.sub(lambda match: block, r_script, count=1)
+
+def resolve_modelling_script(parent, r_script):
+    """
+    `resolve_formula_script` for a modelling dialog: the selection runs on the rows the model
+    is fitted to, the active view of the dialog's data with incomplete rows dropped.
+    """
+    if not parent.selection_method or parent.selection_method == "None" or not parent.of_interest_var or not parent.auxilary_vars:
+        return r_script
+    if PENDING_SELECTION not in r_script:
+        return r_script
+    data = parent.model.get_view_data().drop_nulls()
+    return resolve_formula_script(r_script, data, parent.of_interest_var[0], parent.auxilary_vars,
+                                  parent.as_factor_var, parent.selection_method.lower())
+
+def _complete_rows(data, columns):
+    """The complete rows of `columns` (rows with a missing value are dropped) as a Float64 NumPy matrix."""
+    values = [pl.col(column).cast(pl.Float64) for column in columns]
+    frame = data.lazy().select(values).filter(pl.all_horizontal(pl.col(columns).is_finite()))
+    return frame.collect().to_numpy()
+
+def _standardized(x, y):
+    """Centres y and centres and scales x to unit variance (divisor n, as glmnet); constant columns get scale 0."""
+    means = x.mean(axis=0)
+    scales = x.std(axis=0)
+    usable = scales > 0
+    standard = np.zeros_like(x)
+    standard[:, usable] = (x[:, usable] - means[usable]) / scales[usable]
+    return standard, y - y.mean(), means, scales
+
+def _moments(x, y, shift):
+    """Cross products shared by the full fit and every fold; `x` is already centred by its overall means `shift`, so the sums keep their precision."""
+    return {
+        "xx": x.T @ x, "x": x.sum(axis=0), "xy": x.T @ y, "y": y.sum(), "yy": y @ y, "rows": len(y),
+        "magnitude": np.einsum("ij,ij->j", x, x) / len(y) + shift ** 2,
+    }
+
+def _standardized_moments(moments, held_x=None, held_y=None):
+    """
+    Gram matrix, correlations with the response and response variance of the standardized
+    training rows (all rows but the held-out ones), with their means and scales as
+    `_standardized`, taken from the shared cross products instead of the data.
+    """
+    xx, sums, xy, y_sum, yy, rows = (moments[name] for name in ("xx", "x", "xy", "y", "yy", "rows"))
+    if held_x is not None:
+        xx, sums, xy = xx - held_x.T @ held_x, sums - held_x.sum(axis=0), xy - held_x.T @ held_y
+        y_sum, yy, rows = y_sum - held_y.sum(), yy - held_y @ held_y, rows - len(held_y)
+    means, y_mean = sums / rows, y_sum / rows
+    covariance = xx / rows - np.outer(means, means)
+    variances = np.diag(covariance)
+    usable = variances > (64 * np.finfo(float).eps) ** 2 * moments["magnitude"]
+    scales = np.sqrt(np.where(usable, variances, 0.0))
+    inverse = np.divide(1.0, scales, out=np.zeros_like(scales), where=usable)
+    gram = covariance * inverse[:, None] * inverse[None, :]
+    correlation = (xy / rows - means * y_mean) * inverse
+    return gram, correlation, yy / rows - y_mean ** 2, usable, means, scales, y_mean
+
+def coordinate_descent_path(x, y, lambdas, alpha=1.0, stop_early=False, dfmax=None):
+    """
+    Elastic-net coefficient path of standardized predictors (n x p, constant columns all zero)
+    and a centred response; see `_covariance_path`. The Gram matrix is computed in one product
+    for up to LASSO_GRAM_COLUMNS predictors, otherwise column by column as predictors enter.
+    Returns:
+        np.ndarray: (number of penalties fitted) x p coefficients on the standardized scale.
+    """
+    rows, count = x.shape
+    if count <= LASSO_GRAM_COLUMNS:
+        full = x.T @ x / rows
+        gram_columns = lambda batch: full[:, batch]
+    else:
+        gram_columns = lambda batch: x.T @ x[:, batch] / rows
+    return _covariance_path(gram_columns, x.T @ y / rows, y @ y / rows, np.any(x != 0, axis=0), lambdas, alpha, stop_early, dfmax)
+
+def _covariance_path(gram_columns, correlation, total, usable, lambdas, alpha=1.0, stop_early=False, dfmax=None):
+    """
+    Elastic-net coefficient path by cyclic coordinate descent, as glmnet's covariance updates:
+    minimises RSS / 2n + λ (α |b|₁ + (1 - α) |b|² / 2) for every λ of the decreasing sequence,
+    each fit warm-started from the previous one. Only the active predictors are cycled; the
+    others are checked at once against the KKT condition |x_j'r / n| ≤ λα after every sweep.
+    Gram columns are taken when a predictor first enters, together with those of the
+    GRAM_BATCH predictors with the largest gradients (the likeliest to enter next). With
+    `stop_early`, the path ends as glmnet's does: once the fit explains LASSO_MAX_EXPLAINED of
+    the variance, once the explained fraction grows by less than LASSO_MIN_GAIN of itself
+    (after LASSO_MIN_LAMBDAS penalties), or once more than `dfmax` predictors are nonzero.
+    Args:
+        gram_columns (callable): Returns the Gram matrix columns of a list of predictors.
+        correlation (np.ndarray): x'y / n of the standardized predictors.
+        total (float): y'y / n of the centred response.
+        usable (np.ndarray): Predictors that are not constant.
+        lambdas (np.ndarray): Decreasing penalties.
+    Returns:
+        np.ndarray: (number of penalties fitted) x p coefficients on the standardized scale.
+    """
+    count = len(correlation)
+    usable = np.flatnonzero(usable)
+    usable_set = set(usable.tolist())
+    gradient = correlation.copy()
+    beta = np.zeros(count)
+    gram = {}
+    active = []
+    threshold = LASSO_TOLERANCE * max(total, np.finfo(float).tiny)
+    path = []
+    explained = 0.0
+    for penalty in lambdas:
+        l1, l2 = penalty * alpha, penalty * (1 - alpha)
+        while True:
+            for _ in range(LASSO_MAX_PASSES):
+                change = 0.0
+                for column in active:
+                    old = beta[column]
+                    target = gradient[column] + old
+                    new = math.copysign(max(abs(target) - l1, 0.0), target) / (1 + l2)
+                    if new != old:
+                        gradient -= gram[column] * (new - old)
+                        beta[column] = new
+                        change = max(change, (new - old) ** 2)
+                if change < threshold:
+                    break
+            violating = np.zeros(count, dtype=bool)
+            violating[usable] = np.abs(gradient[usable]) > l1 * (1 + 1e-12)
+            violating[active] = False
+            entering = np.flatnonzero(violating)
+            if not entering.size:
+                break
+            missing = [int(column) for column in entering if int(column) not in gram]
+            if missing:
+                ahead = [int(column) for column in np.argsort(-np.abs(gradient)) if int(column) not in gram and column in usable_set]
+                batch = list(dict.fromkeys(missing + ahead[:max(GRAM_BATCH - len(missing), 0)]))
+                block = gram_columns(batch)
+                gram.update({column: block[:, position] for position, column in enumerate(batch)})
+            active.extend(int(column) for column in entering)
+        path.append(beta.copy())
+        previous, explained = explained, (1 - (total - beta @ (correlation + gradient)) / total if total > 0 else 1.0)
+        if stop_early and (
+            explained > LASSO_MAX_EXPLAINED
+            or (len(path) >= LASSO_MIN_LAMBDAS and explained - previous < LASSO_MIN_GAIN * explained)
+            or (dfmax is not None and np.count_nonzero(beta) > dfmax)
+        ):
+            break
+    return np.array(path).reshape(len(path), count)
+
+def _lambda_sequence(correlation, rows, alpha, count=LASSO_LAMBDAS):
+    """glmnet's default sequence: from the smallest λ that keeps every coefficient at zero, log-spaced down to a ratio of 1e-4 (1e-2 when n < p)."""
+    largest = np.max(np.abs(correlation)) / alpha if correlation.size else 0.0
+    if not largest > 0:
+        raise ValueError("No predictor varies with the response.")
+    ratio = 1e-4 if rows > correlation.size else 1e-2
+    return largest * np.logspace(0, math.log10(ratio), count)
+
+def _fold_errors(x, y, lambdas, alpha, test, moments=None):
+    """
+    Squared prediction errors on the held-out rows of the path fitted to the other rows,
+    standardized from the shared cross products (`moments`) when given, else from the data.
+    """
+    if moments is None:
+        standard, centred, means, scales = _standardized(x[~test], y[~test])
+        path = coordinate_descent_path(standard, centred, lambdas, alpha)
+        y_mean = y[~test].mean()
+    else:
+        gram, correlation, total, usable, means, scales, y_mean = _standardized_moments(moments, x[test], y[test])
+        path = _covariance_path(lambda batch: gram[:, batch], correlation, total, usable, lambdas, alpha)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = np.where(scales > 0, path / scales, 0.0)
+    intercepts = y_mean - slopes @ means
+    predictions = x[test] @ slopes.T + intercepts
+    return ((y[test][:, None] - predictions) ** 2).sum(axis=0)
+
+def lasso_selection(data, dependent, independents, alpha=1.0, folds=LASSO_FOLDS, rule=LASSO_RULES[0], seed=LASSO_SEED, dfmax=None):
+    """
+    Penalized (LASSO, or elastic net when `alpha` < 1) selection with a cross-validated
+    penalty, as `cv.glmnet`: the path is fitted on the complete rows, then on every fold's
+    training rows over the same penalties, in parallel threads, and the penalty is taken by
+    `rule` ("lambda.1se", the largest within one standard error of the minimum, or
+    "lambda.min"). Folds are assigned by a seeded numpy permutation, so results are reproducible;
+    they are not the folds R's `set.seed` would give, so the R script's lambda can differ slightly.
+    Up to LASSO_GRAM_COLUMNS candidates, the cross products of all rows are computed once and
+    every fold's Gram matrix is derived from them by subtracting its held-out rows, so the
+    data are read about twice in all instead of once per fold and per entering predictor.
+    Args:
+        data (pl.LazyFrame or pl.DataFrame): Data holding the columns.
+        dependent (str): Response column.
+        independents (list): Candidate predictor columns.
+        alpha (float): Mixing between the L1 (1) and L2 (0) penalties, in (0, 1].
+        dfmax (int): Stop the path once more predictors than this are nonzero (as glmnet's `dfmax`).
+    Returns:
+        dict: `selected` (columns with a nonzero coefficient at the chosen penalty),
+            `coefficients` (pl.DataFrame with LASSO_COEFFICIENT_SCHEMA, nonzero terms),
+            `cv` (pl.DataFrame with CV_SCHEMA for both rules), `lambdas`, `cv_mse`,
+            `cv_se` and `nonzero` (np.ndarray per penalty), `rule` and `rows`.
+    """
+    if not 0 < alpha <= 1:
+        raise ValueError("Alpha must be in (0, 1].")
+    if rule not in LASSO_RULES:
+        raise ValueError(f"Unknown lambda rule: {rule}")
+    values = _complete_rows(data, [*independents, dependent])
+    x, y = values[:, :-1], values[:, -1]
+    rows = len(y)
+    if rows < max(folds, 3):
+        raise ValueError(f"Only {rows} complete rows for {folds}-fold cross-validation.")
+    if x.shape[1] <= LASSO_GRAM_COLUMNS:
+        shift = x.mean(axis=0)
+        x = x - shift
+        moments = _moments(x, y, shift)
+        gram, correlation, total, usable, means, scales, y_mean = _standardized_moments(moments)
+        lambdas = _lambda_sequence(correlation, rows, alpha)
+        path = _covariance_path(lambda batch: gram[:, batch], correlation, total, usable, lambdas, alpha, True, dfmax)
+        means = means + shift
+    else:
+        moments = None
+        standard, centred, means, scales = _standardized(x, y)
+        lambdas = _lambda_sequence(standard.T @ centred / rows, rows, alpha)
+        path = coordinate_descent_path(standard, centred, lambdas, alpha, True, dfmax)
+        del standard
+        y_mean = y.mean()
+    lambdas = lambdas[:path.shape[0]]
+
+    assignment = np.random.default_rng(seed).permutation(np.arange(rows) % folds)
+    tests = [assignment == fold for fold in range(folds)]
+    with ThreadPoolExecutor(max_workers=min(folds, os.cpu_count() or 1)) as executor:
+        errors = np.array(list(executor.map(lambda test: _fold_errors(x, y, lambdas, alpha, test, moments), tests)))
+    sizes = np.array([test.sum() for test in tests])
+    fold_mse = errors / sizes[:, None]
+    cv_mse = errors.sum(axis=0) / rows
+    cv_se = np.sqrt((sizes[:, None] * (fold_mse - cv_mse) ** 2).sum(axis=0) / rows / (folds - 1))
+    nonzero = (path != 0).sum(axis=1)
+    best = int(np.argmin(cv_mse))
+    within = np.flatnonzero(cv_mse <= cv_mse[best] + cv_se[best])
+    chosen = {"lambda.min": best, "lambda.1se": int(within.min())}
+
+    index = chosen[rule]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slopes = np.where(scales > 0, path[index] / scales, 0.0)
+    kept = np.flatnonzero(slopes != 0)
+    coefficients = pl.DataFrame({
+        "term": ["(Intercept)", *[independents[column] for column in kept]],
+        "estimate": [y_mean - slopes @ means, *slopes[kept]],
+    }, schema=LASSO_COEFFICIENT_SCHEMA)
+    cv = pl.DataFrame({
+        "rule": LASSO_RULES, "lambda": [lambdas[chosen[name]] for name in LASSO_RULES],
+        "cv_mse": [cv_mse[chosen[name]] for name in LASSO_RULES], "cv_se": [cv_se[chosen[name]] for name in LASSO_RULES],
+        "nonzero": [nonzero[chosen[name]] for name in LASSO_RULES],
+    }, schema=CV_SCHEMA)
+    return {
+        "selected": [independents[column] for column in kept], "coefficients": coefficients, "cv": cv,
+        "lambdas": lambdas, "cv_mse": cv_mse, "cv_se": cv_se, "nonzero": nonzero, "rule": rule, "rows": rows,
+    }
+
+def format_lasso_result(result, alpha=1.0, folds=LASSO_FOLDS):
+    """Formats the cross-validated penalized selection for the output pane."""
+    title = "Lasso" if alpha == 1 else f"Elastic net (alpha = {alpha:g})"
+    return "\n".join([
+        f"{title} Result ({folds}-fold cross-validation, n = {result['rows']:,}, {len(result['lambdas'])} lambdas):",
+        "Cross-validation:\n" + format_table(result["cv"], float_precision=6),
+        f"Selected at {result['rule']}: " + (", ".join(result["selected"]) or "(intercept only)"),
+        "Coefficients:\n" + format_table(result["coefficients"]),
+    ])
+
+def format_selection_result(results, criterion="AIC"):
+    """Formats every direction's search path, coefficients and fit for the output pane."""
+    sections = []
+    for direction, result in results.items():
+        fit = result["fit"]
+        lines = [
+            f"{direction.capitalize()} Result ({criterion}, n = {result['rows']:,}):",
+            "Selected: " + (", ".join(result["selected"]) or "(intercept only)"),
+            "Steps:\n" + format_table(result["trace"]),
+            "Coefficients:\n" + format_table(result["coefficients"]),
+            f"Residual standard error: {fit['sigma']:.4g} on {fit['residual_df']:,} degrees of freedom",
+            f"Multiple R-squared: {fit['r_squared']:.4f},\tAdjusted R-squared: {fit['adj_r_squared']:.4f}",
+        ]
+        if "f_statistic" in fit:
+            lines.append(f"F-statistic: {fit['f_statistic']:.4g} on {len(result['selected'])} and "
+                         f"{fit['residual_df']:,} DF,  p-value: {fit['f_p_value']:.4g}")
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections)
@@ -1,22 +1,24 @@
-import polars as pl
 from PyQt6.QtWidgets import QMessageBox
 
 import rpy2.robjects as ro
 import rpy2_arrow.polars as rpy2polars
+from service.exploration.SummaryStatistics import summary_source, summary_table, format_summary_table
+from service.utils.analysis_view import AnalysisView, output_key
 
 def run_summary_data(parent):
     """
     Run data summary using Python (Polars) and R.
+    When `parent.options` is set (by the dialog), only the selected columns are sent to R and
+    rows with missing values are kept; R's `summary` reports them as NA's.
     """
-    parent.activate_R()  
+    parent.activate_R()
 
-    # Get data from model
-    df1 = parent.model1.get_data()
-    df2 = parent.model2.get_data()
-
-    # Combine data using Polars
-    df = pl.concat([df1, df2], how="horizontal")
-    df = df.drop_nulls()  # Remove null data
+    options = getattr(parent, "options", None)
+    if options:
+        df = summary_source(parent.model1, parent.model2, options["columns"], output_key(parent)).collect()
+    else:
+        # Get data from model
+        df = AnalysisView(parent.model1, parent.model2, output_key(parent)).complete().collect()
 
     # Convert Polars DataFrame to R DataFrame
     with rpy2polars.converter.context() as cv_ctx:
@@ -39,3 +41,19 @@ def run_summary_data(parent):
     except Exception as e:
         parent.result = str(e)
         parent.error = True
+
+def run_native_summary_data(parent):
+    """
+    Run data summary with polars only, without R.
+    Args:
+        parent: The SummaryData model; `options` holds `columns`.
+            The summary is stored as a DataFrame in `table` and as text in `result`. On
+            failure `error` is set and `result` holds the message.
+    """
+    try:
+        data = summary_source(parent.model1, parent.model2, parent.options["columns"], output_key(parent))
+        parent.table = summary_table(data, parent.options["columns"])
+        parent.result = format_summary_table(parent.table)
+    except Exception as e:
+        parent.result = str(e)
+        parent.error = True
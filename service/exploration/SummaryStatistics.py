@@ -0,0 +1,70 @@
+import polars as pl
+from service.utils.table_text import format_table
+from service.utils.analysis_view import AnalysisView
+
+SUMMARY_ENGINES = ["Polars", "R"]
+SUMMARY_SCHEMA = {
+    "variable": pl.Utf8, "type": pl.Utf8, "n": pl.Int64, "nulls": pl.Int64, "distinct": pl.Int64,
+    "mean": pl.Float64, "sd": pl.Float64, "min": pl.Float64, "q1": pl.Float64,
+    "median": pl.Float64, "q3": pl.Float64, "max": pl.Float64,
+}
+
+def native_summary_script(r_script):
+    """Script text recorded for a summary computed with polars: the equivalent R script."""
+    return f"# Summary computed with polars. Equivalent R script:\n{r_script}"
+
+def summary_source(model1, model2, columns, key=None):
+    """
+    Takes the summarised columns from the data editor and data output sheets as one lazy
+    frame (see AnalysisView); only these columns are read and the active view of the data
+    editor is applied. No rows are dropped, missing values are counted per column instead.
+    """
+    return AnalysisView(model1, model2, key).frame(columns)
+
+def _column_statistics(column, dtype):
+    value = pl.col(column)
+    fields = {"n": value.count(), "nulls": value.null_count(), "distinct": value.drop_nulls().n_unique()}
+    if dtype.is_numeric():
+        value = value.cast(pl.Float64)
+        fields.update(
+            mean=value.mean(),
+            sd=value.std(),
+            min=value.min(),
+            quartiles=value.quantile([0.25, 0.5, 0.75], interpolation="linear"),
+            max=value.max(),
+        )
+    return pl.struct(**fields)
+
+def summary_table(data, columns, streaming=True):
+    """
+    Computes the summary of every column with a single lazy polars `select`: the count of
+    non-missing values, missing values and distinct values for every column, plus the mean,
+    standard deviation, minimum, quartiles (type 7, as R's `summary`) and maximum of numeric
+    columns. With `streaming` the query runs on polars' streaming engine, so sheets backed by
+    memory-mapped files are read in batches instead of being materialised.
+    Args:
+        data (pl.LazyFrame or pl.DataFrame): Data holding `columns`.
+        columns (list): Columns to summarise.
+        streaming (bool): Collect with the streaming engine.
+    Returns:
+        pl.DataFrame: One row per column, with SUMMARY_SCHEMA.
+    """
+    data = data.lazy()
+    schema = data.collect_schema()
+    row = data.select([
+        _column_statistics(column, schema[column]).alias(str(index)) for index, column in enumerate(columns)
+    ]).collect(engine="streaming" if streaming else "auto").row(0) if columns else []
+    records = []
+    for column, statistics in zip(columns, row):
+        q1, median, q3 = statistics.get("quartiles") or (None, None, None)
+        records.append({
+            "variable": column,
+            "type": "Numeric" if schema[column].is_numeric() else str(schema[column]),
+            **{key: statistics.get(key) for key in ("n", "nulls", "distinct", "mean", "sd", "min", "max")},
+            "q1": q1, "median": median, "q3": q3,
+        })
+    return pl.DataFrame(records, schema=SUMMARY_SCHEMA)
+
+def format_summary_table(table):
+    """Formats the summary table as aligned text for the output pane."""
+    return format_table(table)
@@ -1,22 +1,28 @@
-import polars as pl
 from PyQt6.QtWidgets import QMessageBox
 
 import rpy2.robjects as ro
 import rpy2_arrow.polars as rpy2polars
+from service.exploration.SummaryStatistics import summary_source
+from service.exploration.SelectionStatistics import (
+    stepwise_selection, format_selection_result, lasso_selection, format_lasso_result, SELECTION_DIRECTIONS,
+)
+from service.utils.analysis_view import AnalysisView, output_key
 
 def run_variable_selection(parent):
     """
     Run data summary using Python (Polars) and R with additional debugging.
+    When `parent.options` is set (by the dialog), only the model's columns are sent to R,
+    so missing values elsewhere in the sheet drop no rows.
     """
     parent.activate_R()  # Activate R if needed
 
     # Get data from the model
-    df1 = parent.model1.get_data()
-    df2 = parent.model2.get_data()
-
-    # Merge data using Polars
-    df = pl.concat([df1, df2], how="horizontal")
-    df = df.drop_nulls()  # Remove null data
+    options = getattr(parent, "options", None)
+    if options:
+        columns = list(dict.fromkeys([options["dependent"], *options["independents"]]))
+        df = summary_source(parent.model1, parent.model2, columns, output_key(parent)).collect().drop_nulls()
+    else:
+        df = AnalysisView(parent.model1, parent.model2, output_key(parent)).complete().collect()
 
     # Convert Polars DataFrame to R DataFrame
     try:
@@ -41,7 +47,7 @@ def run_variable_selection(parent):
         result_strings = []
 
         # List of methods used
-        methods = ["forward", "backward", "both"]
+        methods = ["forward", "backward", "both", "lasso"]
 
         for method in methods:
             result_var = f"{method}_result"
@@ -62,3 +68,35 @@ def run_variable_selection(parent):
         parent.error = True
         parent.result = str(e)
         return
+
+def run_native_variable_selection(parent):
+    """
+    Runs the stepwise selection with polars and NumPy only, without R.
+    Args:
+        parent: The VariableSelection model; `options` holds `dependent`, `independents`,
+            `methods` (directions and/or "lasso"), `criterion`, and `alpha` and `rule` for lasso.
+            The selected columns of every method are stored in `selected`, the stepwise
+            search paths as DataFrames in `trace`, and the text in `result`. On failure
+            `error` is set and `result` holds the message.
+    """
+    try:
+        options = parent.options
+        columns = list(dict.fromkeys([options["dependent"], *options["independents"]]))
+        data = summary_source(parent.model1, parent.model2, columns, output_key(parent))
+        directions = [method for method in options["methods"] if method in SELECTION_DIRECTIONS]
+        sections = []
+        if directions:
+            results = stepwise_selection(data, options["dependent"], options["independents"],
+                                         directions, options["criterion"])
+            parent.selected = {method: result["selected"] for method, result in results.items()}
+            parent.trace = {method: result["trace"] for method, result in results.items()}
+            sections.append(format_selection_result(results, options["criterion"]))
+        if "lasso" in options["methods"]:
+            lasso = lasso_selection(data, options["dependent"], options["independents"],
+                                    options["alpha"], rule=options["rule"])
+            parent.selected["lasso"] = lasso["selected"]
+            sections.append(format_lasso_result(lasso, options["alpha"]))
+        parent.result = "\n\n".join(sections)
+    except Exception as e:
+        parent.error = True
+        parent.result = str(e)
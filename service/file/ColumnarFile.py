@@ -0,0 +1,53 @@
+import os
+import polars as pl
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+IPC_EXTENSIONS = (".arrow", ".feather", ".ipc")
+
+def is_parquet(file_path):
+    return file_path.lower().endswith(PARQUET_EXTENSIONS)
+
+def is_ipc(file_path):
+    return file_path.lower().endswith(IPC_EXTENSIONS)
+
+def read_columnar_schema(file_path):
+    """
+    Reads the column names and types of a Parquet or Arrow IPC file from its footer/metadata,
+    without loading any data.
+    Args:
+        file_path (str): Path to a Parquet or Arrow IPC (Feather v2) file.
+    Returns:
+        dict: Mapping of column name to Polars dtype.
+    Raises:
+        ValueError: If the file extension is not supported.
+    """
+    if is_parquet(file_path):
+        return dict(pl.read_parquet_schema(file_path))
+    if is_ipc(file_path):
+        return dict(pl.read_ipc_schema(file_path))
+    raise ValueError(f"Unsupported file type: {os.path.splitext(file_path)[1]}")
+
+def read_columnar(file_path, columns=None):
+    """
+    Loads a Parquet or Arrow IPC file, reading only the selected columns.
+    IPC files are opened from their path so Polars memory-maps them: uncompressed files are
+    not copied into the process but share pages with the OS file cache, which makes opening
+    a multi-GB file close to instant. Parquet is decoded column by column.
+    Args:
+        file_path (str): Path to the file.
+        columns (list, optional): Column names to load; all columns if None.
+    Returns:
+        pl.DataFrame: The loaded data.
+    """
+    if is_parquet(file_path):
+        return pl.read_parquet(file_path, columns=columns, memory_map=True)
+    if is_ipc(file_path):
+        return pl.read_ipc(file_path, columns=columns)
+    raise ValueError(f"Unsupported file type: {os.path.splitext(file_path)[1]}")
+
+def write_parquet(data, file_path):
+    data.write_parquet(file_path, compression="zstd", statistics=True)
+
+def write_ipc(data, file_path):
+    """Writes an uncompressed Arrow IPC (Feather v2) file so it can be memory-mapped when opened."""
+    data.write_ipc(file_path, compression="uncompressed")
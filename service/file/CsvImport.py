@@ -0,0 +1,178 @@
+import io
+import os
+import re
+import csv
+import polars as pl
+
+NULL_VALUES = ["NA", "NULL", "na", "null"]
+FIRST_BLOCK_SIZE = 4 * 1024 * 1024  # 4 MB so the first rows show up quickly
+BLOCK_SIZE = 64 * 1024 * 1024  # 64 MB
+SAMPLE_SIZE = 256 * 1024  # 256 KB sample for previews and sniffing
+CANDIDATE_SEPARATORS = ",;\t|"
+
+def _split_point(block, quote=b'"'):
+    """
+    Returns the position just after the last newline in `block` that is not inside a quoted
+    field, or -1 if there is none. A newline is outside quotes when the number of quote
+    characters before it is even.
+    """
+    end = len(block)
+    while True:
+        position = block.rfind(b"\n", 0, end)
+        if position < 0:
+            return -1
+        if block.count(quote, 0, position) % 2 == 0:
+            return position + 1
+        end = position
+
+def iter_csv_blocks(file_path, first_block_size=FIRST_BLOCK_SIZE, block_size=BLOCK_SIZE):
+    """
+    Reads a CSV file as byte blocks that always end on a record boundary.
+    Args:
+        file_path (str): Path to the CSV file.
+        first_block_size (int): Size of the first block, kept small so the first batch is quick.
+        block_size (int): Size of the following blocks.
+    Yields:
+        tuple: (block bytes, total bytes read so far)
+    """
+    with open(file_path, "rb") as file:
+        pending = b""
+        bytes_read = 0
+        size = first_block_size
+        while True:
+            chunk = file.read(size)
+            bytes_read += len(chunk)
+            if not chunk:
+                if pending.strip():
+                    yield pending, bytes_read
+                return
+            if bytes_read == len(chunk) and chunk.startswith(b"\xef\xbb\xbf"):
+                chunk = chunk[3:]
+            block = pending + chunk
+            split = _split_point(block)
+            if split <= 0:
+                # No complete record yet (e.g. a very long quoted field); keep reading
+                pending = block
+                continue
+            pending = block[split:]
+            size = block_size
+            yield block[:split], bytes_read
+
+def read_sample(file_path, size=SAMPLE_SIZE):
+    """
+    Reads the first `size` bytes of a file, cut back to the last complete record.
+    Args:
+        file_path (str): Path to the CSV file.
+        size (int): Maximum number of bytes to read.
+    Returns:
+        bytes: The sample, without a UTF-8 byte order mark.
+    """
+    with open(file_path, "rb") as file:
+        sample = file.read(size)
+        at_end = not file.read(1)
+    if sample.startswith(b"\xef\xbb\xbf"):
+        sample = sample[3:]
+    if not at_end:
+        split = _split_point(sample)
+        if split > 0:
+            sample = sample[:split]
+    return sample
+
+def detect_encoding(sample):
+    """Returns "utf-8" if the sample decodes as UTF-8, otherwise "cp1252" (common for Excel exports)."""
+    try:
+        sample.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut at the end of the sample is still valid UTF-8
+        if e.start >= len(sample) - 3:
+            return "utf-8"
+        return "cp1252"
+
+def sniff_csv(sample):
+    """
+    Guesses the parsing options of a CSV file from a sample of its first bytes.
+    Args:
+        sample (bytes): The first bytes of the file (see `read_sample`).
+    Returns:
+        dict: `separator` (str), `header` (bool), `encoding` (str) and `decimal_comma` (bool).
+    """
+    encoding = detect_encoding(sample)
+    text = sample.decode(encoding, errors="ignore")
+    sniffer = csv.Sniffer()
+    try:
+        separator = sniffer.sniff(text, delimiters=CANDIDATE_SEPARATORS).delimiter
+    except csv.Error:
+        first_line = text.split("\n", 1)[0]
+        separator = max(CANDIDATE_SEPARATORS, key=first_line.count) if first_line else ","
+        if first_line.count(separator) == 0:
+            separator = ","
+    try:
+        header = sniffer.has_header(text)
+    except csv.Error:
+        header = True
+
+    decimal_comma = False
+    if separator != ",":
+        fields = [field.strip().strip('"') for line in text.splitlines()[1:] for field in line.split(separator)]
+        numeric_comma = sum(1 for field in fields if re.fullmatch(r"-?\d+,\d+", field))
+        numeric_dot = sum(1 for field in fields if re.fullmatch(r"-?\d+\.\d+", field))
+        decimal_comma = numeric_comma > numeric_dot
+    return {"separator": separator, "header": header, "encoding": encoding, "decimal_comma": decimal_comma}
+
+def read_csv_bytes(data, separator=",", header=True, encoding="utf-8", decimal_comma=False, n_rows=None, schema=None):
+    """
+    Parses CSV bytes with the import options used throughout the application.
+    Args:
+        data (bytes): The CSV content.
+        separator (str): The field separator.
+        header (bool): Whether the first row holds the column names (ignored when `schema` is given).
+        encoding (str): Encoding of `data`; non UTF-8 input is transcoded first.
+        decimal_comma (bool): Parse "1,5" as 1.5.
+        n_rows (int, optional): Stop after this many rows.
+        schema (dict, optional): Column names and types to use instead of inferring them.
+    Returns:
+        pl.DataFrame: The parsed rows.
+    """
+    if encoding != "utf-8":
+        data = data.decode(encoding, errors="replace").encode("utf-8")
+    if schema is not None:
+        return pl.read_csv(
+            io.BytesIO(data), separator=separator, has_header=False, ignore_errors=True,
+            null_values=NULL_VALUES, schema=schema, decimal_comma=decimal_comma, n_rows=n_rows,
+        )
+    frame = pl.read_csv(
+        io.BytesIO(data), separator=separator, has_header=header, ignore_errors=True,
+        null_values=NULL_VALUES, infer_schema_length=None, decimal_comma=decimal_comma, n_rows=n_rows,
+    )
+    if not header:
+        frame.columns = [f"Column {i+1}" for i in range(frame.shape[1])]
+    return frame
+
+def stream_csv(file_path, separator=",", header=True, stop_event=None,
+               first_block_size=FIRST_BLOCK_SIZE, block_size=BLOCK_SIZE, encoding="utf-8", decimal_comma=False):
+    """
+    Parses a CSV file block by block with Polars.
+    The first block infers the column names and types; the following blocks are parsed with
+    that schema so all batches can be concatenated. Values that do not fit the schema become
+    null, as with `ignore_errors=True` on a full read.
+    Args:
+        file_path (str): Path to the CSV file.
+        separator (str): The field separator.
+        header (bool): Whether the first row holds the column names.
+        stop_event (threading.Event, optional): When set, parsing stops after the current block.
+        first_block_size (int): Size in bytes of the first block.
+        block_size (int): Size in bytes of the following blocks.
+        encoding (str): Encoding of the file ("utf-8" or a single-byte encoding such as "cp1252").
+        decimal_comma (bool): Parse "1,5" as 1.5.
+    Yields:
+        tuple: (batch DataFrame, bytes read, total bytes)
+    """
+    total_bytes = os.path.getsize(file_path)
+    schema = None
+    for block, bytes_read in iter_csv_blocks(file_path, first_block_size, block_size):
+        if stop_event is not None and stop_event.is_set():
+            return
+        batch = read_csv_bytes(block, separator, header, encoding, decimal_comma, schema=schema)
+        schema = batch.schema
+        yield batch, bytes_read, total_bytes
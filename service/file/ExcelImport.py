@@ -0,0 +1,94 @@
+import os
+import hashlib
+import json
+import zipfile
+import xml.etree.ElementTree as ET
+import fastexcel
+import polars as pl
+
+SPREADSHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+MAX_CACHE_ENTRIES = 20
+
+def list_sheet_names(file_path):
+    """
+    Lists the sheets of an XLSX workbook from `xl/workbook.xml` only, without parsing any sheet.
+    Args:
+        file_path (str): Path to the XLSX file.
+    Returns:
+        list: Sheet names in workbook order.
+    """
+    with zipfile.ZipFile(file_path) as workbook:
+        with workbook.open("xl/workbook.xml") as xml_file:
+            return [
+                element.get("name")
+                for _, element in ET.iterparse(xml_file)
+                if element.tag == f"{SPREADSHEET_NS}sheet"
+            ]
+
+def read_sheet_columns(file_path, sheet_name):
+    """
+    Returns the column names of a sheet from its header row, read by the calamine engine used by
+    read_sheet without loading any data row. Repeated names get a "_1", "_2", ... suffix, and
+    columns with a blank header are left out, as `pl.read_excel` leaves them out of a sheet
+    without data rows.
+    Raises:
+        ValueError: If the workbook has no such sheet.
+    """
+    try:
+        sheet = fastexcel.read_excel(file_path).load_sheet(sheet_name, n_rows=0)
+    except fastexcel.SheetNotFoundError as e:
+        raise ValueError(f"Sheet not found: {sheet_name}") from e
+    return [column.name for column in sheet.available_columns() if not column.name.startswith("__UNNAMED__")]
+
+def _cache_path(cache_dir, file_path, sheet_name, columns, n_rows):
+    """Builds the cache file path; the key changes whenever the workbook is modified."""
+    stat = os.stat(file_path)
+    key = json.dumps([os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, sheet_name, columns, n_rows])
+    return os.path.join(cache_dir, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.arrow")
+
+def _prune_cache(cache_dir, max_entries=MAX_CACHE_ENTRIES):
+    entries = sorted(
+        (os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith(".arrow")),
+        key=os.path.getmtime,
+    )
+    for path in entries[:-max_entries]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def read_sheet(file_path, sheet_name, columns=None, n_rows=None, cache_dir=None):
+    """
+    Reads one sheet with the native calamine engine, optionally using an import cache.
+    Only the selected columns and the first `n_rows` rows are materialized. When `cache_dir`
+    is given, the result is stored there as an Arrow IPC file keyed by path, modification time,
+    size, sheet and read options, so opening an unchanged workbook again is a memory-mapped read.
+    Args:
+        file_path (str): Path to the XLSX file.
+        sheet_name (str): The sheet to read.
+        columns (list, optional): Column names to read; all columns if None.
+        n_rows (int, optional): Maximum number of data rows to read; all rows if None.
+        cache_dir (str, optional): Directory of the import cache.
+    Returns:
+        pl.DataFrame: The sheet data.
+    """
+    cache_file = None
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_file = _cache_path(cache_dir, file_path, sheet_name, columns, n_rows)
+        if os.path.exists(cache_file):
+            try:
+                os.utime(cache_file)
+                return pl.read_ipc(cache_file)
+            except Exception:
+                os.remove(cache_file)
+
+    read_options = {"n_rows": n_rows} if n_rows else None
+    data = pl.read_excel(file_path, sheet_name=sheet_name, engine="calamine", columns=columns, read_options=read_options)
+
+    if cache_file is not None:
+        temp_file = f"{cache_file}.tmp"
+        data.write_ipc(temp_file, compression="uncompressed")
+        os.replace(temp_file, cache_file)
+        _prune_cache(cache_dir)
+    return data
@@ -0,0 +1,468 @@
+import os
+import zlib
+import struct
+import hashlib
+from PyQt6.QtGui import QImage, QPainter, QColor, QRawFont, QFontDatabase
+from service.session.Project import plot_bytes
+
+PAGE_WIDTH = 595.28  # A4 in points
+PAGE_HEIGHT = 841.89
+TOP_MARGIN = 4 * 28.3465  # 4 cm
+SIDE_MARGIN = 3 * 28.3465  # 3 cm
+FONT_SIZE = 9
+LINE_HEIGHT = 11
+CHAR_WIDTH = 0.6 * FONT_SIZE  # Courier advance width
+SECTION_GAP = 8
+RECORD_GAP = 18
+FONT_TABLES = ("OS/2", "cmap", "cvt ", "fpgm", "glyf", "head", "hhea", "hmtx", "loca", "maxp", "name", "post", "prep")
+
+class ExportCancelled(Exception):
+    """Raised inside the exporter when the user cancels an export."""
+
+def _pdf_string(text):
+    """Encodes text as a PDF literal string for the WinAnsi-encoded standard fonts."""
+    data = text.encode("cp1252", errors="replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b"") + b")"
+
+def _winansi(text):
+    """Whether the standard fonts can show the text (every character is in Windows-1252)."""
+    try:
+        text.encode("cp1252")
+        return True
+    except UnicodeEncodeError:
+        return False
+
+def _sfnt(tables):
+    """Assembles TrueType tables into a font file, with the table checksums and head checksum adjustment."""
+    def checksum(data):
+        data += b"\0" * (-len(data) % 4)
+        return sum(struct.unpack(">%dI" % (len(data) // 4), data)) & 0xFFFFFFFF
+
+    tags = sorted(tables)
+    power = 1 << (len(tags).bit_length() - 1)
+    header = struct.pack(">IHHHH", 0x00010000, len(tags), power * 16, power.bit_length() - 1, len(tags) * 16 - power * 16)
+    offset = len(header) + 16 * len(tags)
+    directory, body, offsets = [], [], {}
+    for tag in tags:
+        data = tables[tag]
+        if tag == "head":
+            data = data[:8] + b"\0\0\0\0" + data[12:]
+        directory.append(struct.pack(">4sIII", tag.encode("latin-1"), checksum(data), offset, len(data)))
+        body.append(data + b"\0" * (-len(data) % 4))
+        offsets[tag] = offset
+        offset += len(body[-1])
+    font = header + b"".join(directory) + b"".join(body)
+    if "head" in offsets:
+        adjustment = (0xB1B0AFBA - checksum(font)) & 0xFFFFFFFF
+        font = font[:offsets["head"] + 8] + struct.pack(">I", adjustment) + font[offsets["head"] + 12:]
+    return font
+
+class UnicodeFont:
+    """
+    The system monospace font, embedded as a composite (Type0) font for text the standard
+    Courier fonts cannot show. Text is written as glyph indexes (Identity-H), and a ToUnicode
+    map is added for the glyphs used, so the text can still be searched and copied.
+    Attributes:
+        raw_font (QRawFont): The font, at a pixel size of 1000 so advances are in PDF glyph units.
+        glyphs (dict): Character to glyph index, for the characters shown so far.
+    Methods:
+        load():
+            Returns the system monospace font, or None if it has no TrueType outlines.
+        advance(character):
+            Returns the advance width of the character in glyph units (1/1000 of the font size).
+        encode(text):
+            Returns the text as a PDF hex string of glyph indexes.
+        objects(font_id, next_id):
+            Returns the PDF objects of the font and its parts as (id, body) or, for streams,
+            (id, (dictionary, data)).
+    """
+
+    def __init__(self, raw_font):
+        self.raw_font = raw_font
+        self.glyphs = {}
+        self.advances = {}
+
+    @classmethod
+    def load(cls):
+        raw_font = QRawFont.fromFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        if not raw_font.isValid() or not raw_font.fontTable("glyf") or not raw_font.fontTable("head"):
+            return None
+        raw_font.setPixelSize(1000)
+        return cls(raw_font)
+
+    def glyph(self, character):
+        if character not in self.glyphs:
+            indexes = self.raw_font.glyphIndexesForString(character)
+            self.glyphs[character] = indexes[0] if len(indexes) == 1 else 0
+        return self.glyphs[character]
+
+    def advance(self, character):
+        if character not in self.advances:
+            self.advances[character] = self.raw_font.advancesForGlyphIndexes([self.glyph(character)])[0].x()
+        return self.advances[character]
+
+    def encode(self, text):
+        return b"<" + b"".join(b"%04X" % self.glyph(character) for character in text.replace("\r", "")) + b">"
+
+    def _to_unicode(self):
+        mapping = {}
+        for character, glyph in self.glyphs.items():
+            if glyph:
+                mapping.setdefault(glyph, character)
+        lines = [
+            b"/CIDInit /ProcSet findresource begin 12 dict begin begincmap",
+            b"/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+            b"/CMapName /Adobe-Identity-UCS def /CMapType 2 def",
+            b"1 begincodespacerange <0000> <FFFF> endcodespacerange",
+        ]
+        entries = sorted(mapping.items())
+        for start in range(0, len(entries), 100):
+            block = entries[start:start + 100]
+            lines.append(b"%d beginbfchar" % len(block))
+            lines += [b"<%04X> <%s>" % (glyph, character.encode("utf-16-be").hex().upper().encode()) for glyph, character in block]
+            lines.append(b"endbfchar")
+        lines.append(b"endcmap CMapName currentdict /CMap defineresource pop end end")
+        return b"\n".join(lines)
+
+    def objects(self, font_id, next_id):
+        descendant_id, descriptor_id, file_id, to_unicode_id = range(next_id, next_id + 4)
+        name = b"/" + "".join(c for c in self.raw_font.familyName() if c.isalnum()).encode("ascii", "ignore") or b"/Monospace"
+        head = self.raw_font.fontTable("head").data()
+        hhea = self.raw_font.fontTable("hhea").data()
+        scale = 1000 / self.raw_font.unitsPerEm()
+        bbox = [round(value * scale) for value in struct.unpack(">hhhh", head[36:44])]
+        ascent, descent = (round(value * scale) for value in struct.unpack(">hh", hhea[4:8]))
+        glyphs = sorted(set(self.glyphs.values()) | {0})
+        advances = self.raw_font.advancesForGlyphIndexes(glyphs)
+        widths = b" ".join(b"%d [%d]" % (glyph, round(advance.x())) for glyph, advance in zip(glyphs, advances))
+        font_file = _sfnt({tag: self.raw_font.fontTable(tag).data() for tag in FONT_TABLES if self.raw_font.fontTable(tag)})
+        return [
+            (font_id, b"<< /Type /Font /Subtype /Type0 /BaseFont %s /Encoding /Identity-H /DescendantFonts [%d 0 R] /ToUnicode %d 0 R >>"
+                % (name, descendant_id, to_unicode_id)),
+            (descendant_id, b"<< /Type /Font /Subtype /CIDFontType2 /BaseFont %s /CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> "
+                b"/FontDescriptor %d 0 R /CIDToGIDMap /Identity /DW 600 /W [%s] >>" % (name, descriptor_id, widths)),
+            (descriptor_id, b"<< /Type /FontDescriptor /FontName %s /Flags 33 /FontBBox [%d %d %d %d] /ItalicAngle 0 "
+                b"/Ascent %d /Descent %d /CapHeight %d /StemV 80 /FontFile2 %d 0 R >>" % (name, *bbox, ascent, descent, ascent, file_id)),
+            (file_id, (b"/Filter /FlateDecode /Length1 %d" % len(font_file), zlib.compress(font_file, 6))),
+            (to_unicode_id, (b"/Filter /FlateDecode", zlib.compress(self._to_unicode(), 6))),
+        ]
+
+def _png_image(data):
+    """
+    Reads the header of a PNG and returns an image description that embeds its compressed
+    IDAT stream unchanged (FlateDecode with the PNG predictor), or None if the PNG needs
+    decoding (alpha channel, transparency, 16-bit samples or interlacing).
+    """
+    if not data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return None
+    offset = 8
+    header = palette = None
+    idat = []
+    while offset + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[offset:offset + 8])
+        chunk = data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+        if chunk_type == b"IHDR":
+            header = struct.unpack(">IIBBBBB", chunk)
+        elif chunk_type == b"PLTE":
+            palette = chunk
+        elif chunk_type == b"tRNS":
+            return None
+        elif chunk_type == b"IDAT":
+            idat.append(chunk)
+        elif chunk_type == b"IEND":
+            break
+    if header is None or not idat:
+        return None
+    width, height, bit_depth, color_type, _, _, interlace = header
+    if interlace or bit_depth > 8 or color_type not in (0, 2, 3) or (color_type == 3 and palette is None):
+        return None
+    colors = 3 if color_type == 2 else 1
+    if color_type == 3:
+        color_space = b"[/Indexed /DeviceRGB " + str(len(palette) // 3 - 1).encode() + b" <" + palette.hex().encode() + b">]"
+    else:
+        color_space = b"/DeviceRGB" if color_type == 2 else b"/DeviceGray"
+    return {
+        "width": width,
+        "height": height,
+        "color_space": color_space,
+        "bits": bit_depth,
+        "filter": b"/FlateDecode",
+        "decode_parms": b"<< /Predictor 15 /Colors %d /BitsPerComponent %d /Columns %d >>" % (colors, bit_depth, width),
+        "data": b"".join(idat),
+    }
+
+def _jpeg_image(data):
+    """Returns an image description that embeds a baseline/progressive JPEG unchanged (DCTDecode)."""
+    if not data.startswith(b"\xff\xd8"):
+        return None
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        length = struct.unpack(">H", data[offset + 2:offset + 4])[0]
+        if marker in (0xC0, 0xC1, 0xC2):
+            bits, height, width, components = struct.unpack(">BHHB", data[offset + 4:offset + 10])
+            if components not in (1, 3):
+                return None
+            return {
+                "width": width,
+                "height": height,
+                "color_space": b"/DeviceRGB" if components == 3 else b"/DeviceGray",
+                "bits": bits,
+                "filter": b"/DCTDecode",
+                "decode_parms": None,
+                "data": data,
+            }
+        offset += 2 + length
+    return None
+
+def _decoded_image(data):
+    """Fallback for images that cannot be embedded as they are: decode, flatten on white, deflate."""
+    image = QImage.fromData(data)
+    if image.isNull():
+        return None
+    flattened = QImage(image.size(), QImage.Format.Format_RGB888)
+    flattened.fill(QColor("white"))
+    painter = QPainter(flattened)
+    painter.drawImage(0, 0, image)
+    painter.end()
+    row_bytes = flattened.width() * 3
+    bits = flattened.constBits()
+    bits.setsize(flattened.sizeInBytes())
+    raw = bytes(bits)
+    rows = b"".join(raw[y * flattened.bytesPerLine():y * flattened.bytesPerLine() + row_bytes] for y in range(flattened.height()))
+    return {
+        "width": flattened.width(),
+        "height": flattened.height(),
+        "color_space": b"/DeviceRGB",
+        "bits": 8,
+        "filter": b"/FlateDecode",
+        "decode_parms": None,
+        "data": zlib.compress(rows, 6),
+    }
+
+def pdf_image(data):
+    """Returns the PDF image description of an encoded image, embedding PNG and JPEG data as they are."""
+    return _png_image(data) or _jpeg_image(data) or _decoded_image(data)
+
+class PdfDocumentWriter:
+    """
+    Minimal streaming PDF writer: pages are written to the file as soon as they are finished,
+    so memory use does not grow with the length of the document.
+    Text uses the standard Courier fonts (nothing to embed); lines with characters outside
+    Windows-1252 use the embedded UnicodeFont, written once at the end with the glyphs used.
+    Images are written once per distinct image and shared by every page that shows them.
+    Methods:
+        unicode_font_for(text):
+            Returns the UnicodeFont if the text needs it, else None (Courier).
+        text_operand(text, font=None):
+            Returns (font resource, string operand) to show the text in Courier or `font`.
+        add_image(data):
+            Writes an image XObject for the encoded image and returns (name, width, height).
+        add_page(content, image_names):
+            Writes a page with the given content stream.
+        close():
+            Writes the page tree, cross-reference table and trailer.
+    """
+
+    def __init__(self, file):
+        self.file = file
+        self.offsets = {}
+        self.next_id = 5  # 1 catalog, 2 page tree, 3 regular font, 4 bold font
+        self.page_ids = []
+        self.images = {}
+        self.unicode_font = None
+        self.unicode_font_id = None
+        self.file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _object_id(self):
+        object_id = self.next_id
+        self.next_id += 1
+        return object_id
+
+    def _write_object(self, object_id, body):
+        self.offsets[object_id] = self.file.tell()
+        self.file.write(b"%d 0 obj\n" % object_id + body + b"\nendobj\n")
+
+    def _write_stream(self, object_id, dictionary, data):
+        self._write_object(object_id, b"<< " + dictionary + b" /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+
+    def unicode_font_for(self, text):
+        if _winansi(text):
+            return None
+        if self.unicode_font_id is None:
+            self.unicode_font = UnicodeFont.load()
+            self.unicode_font_id = self._object_id() if self.unicode_font is not None else 0
+        return self.unicode_font
+
+    def text_operand(self, text, font=None):
+        if font is not None:
+            return b"/F3", font.encode(text)
+        return None, _pdf_string(text)
+
+    def add_image(self, data):
+        key = hashlib.sha1(data).hexdigest()
+        if key not in self.images:
+            image = pdf_image(data)
+            if image is None:
+                self.images[key] = None
+            else:
+                object_id = self._object_id()
+                dictionary = b"/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace " % (image["width"], image["height"])
+                dictionary += image["color_space"] + b" /BitsPerComponent %d /Filter " % image["bits"] + image["filter"]
+                if image["decode_parms"] is not None:
+                    dictionary += b" /DecodeParms " + image["decode_parms"]
+                self._write_stream(object_id, dictionary, image["data"])
+                self.images[key] = (f"Im{object_id}", object_id, image["width"], image["height"])
+        entry = self.images[key]
+        return None if entry is None else (entry[0], entry[2], entry[3])
+
+    def add_page(self, content, image_names):
+        content_id = self._object_id()
+        page_id = self._object_id()
+        self._write_stream(content_id, b"/Filter /FlateDecode", zlib.compress(content, 6))
+        objects = {entry[0]: entry[1] for entry in self.images.values() if entry is not None and entry[0] in image_names}
+        x_objects = b" ".join(b"/%s %d 0 R" % (name.encode(), object_id) for name, object_id in objects.items())
+        unicode_font = b" /F3 %d 0 R" % self.unicode_font_id if self.unicode_font is not None else b""
+        self._write_object(page_id, (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R%s >> /XObject << %s >> >> >>"
+        ) % (PAGE_WIDTH, PAGE_HEIGHT, content_id, unicode_font, x_objects))
+        self.page_ids.append(page_id)
+
+    def close(self):
+        self._write_object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+        self._write_object(4, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier-Bold /Encoding /WinAnsiEncoding >>")
+        if self.unicode_font is not None:
+            objects = self.unicode_font.objects(self.unicode_font_id, self.next_id)
+            self.next_id += len(objects) - 1
+            for object_id, body in objects:
+                if isinstance(body, tuple):
+                    self._write_stream(object_id, *body)
+                else:
+                    self._write_object(object_id, body)
+        kids = b" ".join(b"%d 0 R" % page_id for page_id in self.page_ids)
+        self._write_object(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self.page_ids)))
+        self._write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        xref_offset = self.file.tell()
+        self.file.write(b"xref\n0 %d\n0000000000 65535 f \n" % self.next_id)
+        for object_id in range(1, self.next_id):
+            self.file.write(b"%010d 00000 n \n" % self.offsets.get(object_id, 0))
+        self.file.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (self.next_id, xref_offset))
+
+class _PageLayout:
+    """Flows text lines and images down A4 pages, handing each finished page to the writer."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.content = []
+        self.image_names = set()
+        self.y = PAGE_HEIGHT - TOP_MARGIN
+        self.line_width = PAGE_WIDTH - 2 * SIDE_MARGIN
+        self.max_chars = max(int(self.line_width / CHAR_WIDTH), 1)
+
+    def finish_page(self):
+        if self.content:
+            self.writer.add_page(b"\n".join(self.content), self.image_names)
+        self.content = []
+        self.image_names = set()
+        self.y = PAGE_HEIGHT - TOP_MARGIN
+
+    def space(self, height):
+        self.y -= height
+
+    def wrap(self, paragraph, font=None):
+        """Splits a paragraph into lines that fit the text width, measured with Courier or with the advances of `font`."""
+        if font is None:
+            return [paragraph[i:i + self.max_chars] for i in range(0, len(paragraph), self.max_chars)] or [""]
+        pieces, start, width = [], 0, 0.0
+        for index, character in enumerate(paragraph):
+            advance = font.advance(character) * FONT_SIZE / 1000
+            if width + advance > self.line_width and index > start:
+                pieces.append(paragraph[start:index])
+                start, width = index, 0.0
+            width += advance
+        pieces.append(paragraph[start:])
+        return pieces
+
+    def text(self, text, bold=False):
+        font = b"/F2" if bold else b"/F1"
+        for paragraph in text.expandtabs(4).splitlines() or [""]:
+            unicode_font = self.writer.unicode_font_for(paragraph)
+            for piece in self.wrap(paragraph, unicode_font):
+                if self.y - LINE_HEIGHT < TOP_MARGIN:
+                    self.finish_page()
+                self.y -= LINE_HEIGHT
+                piece_font, operand = self.writer.text_operand(piece, unicode_font)
+                self.content.append(b"BT %s %d Tf %.2f %.2f Td %s Tj ET" % (piece_font or font, FONT_SIZE, SIDE_MARGIN, self.y, operand))
+
+    def image(self, data):
+        image = self.writer.add_image(data)
+        if image is None:
+            return
+        name, width, height = image
+        draw_width = PAGE_WIDTH - 2 * SIDE_MARGIN
+        draw_height = height * draw_width / width
+        if draw_height > PAGE_HEIGHT - 2 * TOP_MARGIN:
+            draw_height = PAGE_HEIGHT - 2 * TOP_MARGIN
+            draw_width = width * draw_height / height
+        if self.y - draw_height < TOP_MARGIN:
+            self.finish_page()
+        self.y -= draw_height
+        self.content.append(b"q %.2f 0 0 %.2f %.2f %.2f cm /%s Do Q" % (draw_width, draw_height, SIDE_MARGIN, self.y, name.encode()))
+        self.image_names.add(name)
+
+def export_outputs_to_pdf(file_path, records, progress=None, stop_event=None):
+    """
+    Writes the output history to a PDF file, one record after another.
+    The document is produced by a small streaming writer instead of QPainter, so it can run in a
+    worker thread: each page is written as soon as it is full, and plot images are embedded from
+    their original PNG/JPEG bytes rather than re-rasterized. The file is written next to the
+    target and renamed into place when complete, so a cancelled export leaves nothing behind.
+    Args:
+        file_path (str): Path of the PDF file.
+        records (list): Output records with `script_text`, `result_text`, `error_text` and `plots`.
+        progress (callable, optional): Called with (records done, total records, pages written).
+        stop_event (threading.Event, optional): Set to cancel the export.
+    Returns:
+        int: Number of pages written, or None if the export was cancelled.
+    """
+    temp_path = f"{file_path}.tmp"
+    try:
+        with open(temp_path, "wb") as file:
+            writer = PdfDocumentWriter(file)
+            layout = _PageLayout(writer)
+            for done, record in enumerate(records, start=1):
+                if stop_event is not None and stop_event.is_set():
+                    raise ExportCancelled()
+                layout.text("R Script:", bold=True)
+                layout.text(record.get("script_text", ""))
+                if record.get("result_text"):
+                    layout.space(SECTION_GAP)
+                    layout.text("Output:", bold=True)
+                    layout.text(record["result_text"])
+                for plot in record.get("plots") or []:
+                    layout.space(SECTION_GAP)
+                    layout.image(plot_bytes(plot))
+                if record.get("error_text"):
+                    layout.space(SECTION_GAP)
+                    layout.text("Error:", bold=True)
+                    layout.text(record["error_text"])
+                layout.space(RECORD_GAP)
+                if progress is not None:
+                    progress(done, len(records), len(writer.page_ids))
+            layout.finish_page()
+            if not writer.page_ids:
+                writer.add_page(b"", set())
+            writer.close()
+    except ExportCancelled:
+        os.remove(temp_path)
+        return None
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, file_path)
+    return len(writer.page_ids)
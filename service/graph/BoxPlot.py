@@ -1,8 +1,10 @@
 import os
-import polars as pl
 from PyQt6.QtWidgets import QMessageBox
 import rpy2.robjects as ro
-import rpy2.robjects.lib.grdevices as grdevices
+from service.utils.plot_render import render_r_plots
+from service.graph.NativePlot import plot_frame, render_box_plots
+from service.graph.BoxStats import box_plot_table
+from service.utils.analysis_view import AnalysisView, output_key
 
 def run_box_plot(parent):
     """
@@ -16,11 +18,13 @@ def run_box_plot(parent):
     6. Sets up the data in the R environment.
     7. Executes an R script provided by the parent object.
     8. Retrieves the list of boxplot variables generated in the R environment.
-    9. Saves each boxplot as a PNG file and stores the file paths in a list.
-    10. Optionally stores the list of plot paths in the parent object.
+    9. Renders each boxplot to PNG bytes in memory and stores them in the parent object.
+    When `parent.options` is set (by the dialog), the five-number summaries and outliers are
+    computed in polars with `box_plot_table` and only those tables reach R, as `box_stats` and
+    `box_outliers`, so ggplot2 never sorts the raw data.
     Args:
         parent: An object that provides the R environment activation method, data retrieval methods,
-                and the R script to be executed. It also stores the resulting plot paths and error information.
+                and the R script to be executed. It also stores the rendered plots and error information.
     Raises:
         Exception: If any error occurs during the execution, it sets the error flag and result message in the parent object.
     """
@@ -28,25 +32,37 @@ def run_box_plot(parent):
     import rpy2_arrow.polars as rpy2polars
 
     parent.activate_R()
-    df1 = parent.model1.get_data()
-    df2 = parent.model2.get_data()
-    df = pl.concat([df1, df2], how="horizontal")
-    df = df.drop_nulls()  # Remove null values
+    options = getattr(parent, "options", None)
+    summary = None
+    if options:
+        frame = plot_frame(parent.model1, parent.model2, options["columns"], options["group"], key=output_key(parent))
+        stats, outliers = box_plot_table(frame, options["columns"], options["group"])
+        summary = describe_box_stats(frame, stats)
+        with rpy2polars.converter.context() as cv_ctx:
+            ro.globalenv['box_stats'] = rpy2polars.converter.py2rpy(stats)
+            ro.globalenv['box_outliers'] = rpy2polars.converter.py2rpy(outliers)
+        kept = '!(ls() %in% c("box_stats", "box_outliers"))'
+    else:
+        df = AnalysisView(parent.model1, parent.model2, output_key(parent)).complete().collect()
 
-    # Convert Polars DataFrame to R DataFrame
-    with rpy2polars.converter.context() as cv_ctx:
-        r_df = rpy2polars.converter.py2rpy(df)
-        ro.globalenv['r_df'] = r_df
+        # Convert Polars DataFrame to R DataFrame
+        with rpy2polars.converter.context() as cv_ctx:
+            r_df = rpy2polars.converter.py2rpy(df)
+            ro.globalenv['r_df'] = r_df
+        kept = 'ls() != "r_df"'
 
     try:
         # Load required R libraries
         ro.r('suppressMessages(library(ggplot2))')
         ro.r('suppressMessages(library(tidyr))')
 
-        ro.r('rm(list=ls()[ls() != "r_df"])')
+        ro.r(f'rm(list=ls()[{kept}])')
 
         # Set up data in R
-        ro.r('data <- as.data.frame(r_df)')
+        if options:
+            ro.r('box_stats <- as.data.frame(box_stats); box_outliers <- as.data.frame(box_outliers)')
+        else:
+            ro.r('data <- as.data.frame(r_df)')
 
         # Execute the script created in the dialog
         script = parent.r_script
@@ -56,21 +72,37 @@ def run_box_plot(parent):
         r_objects = ro.r("ls()")  # List all objects in R
         boxplot_vars = [obj for obj in r_objects if obj.startswith("boxplot_")]
 
-        plot_paths = []
+        # Store the rendered plots in parent
+        parent.plot = render_r_plots(boxplot_vars)
+        parent.result = summary
 
-        for plot_name in boxplot_vars:
-            plot_path = f"{plot_name}.png"
-            grdevices.png(file=plot_path, width=800, height=600)
-            ro.r(f"print({plot_name})")
-            grdevices.dev_off()
-            plot_paths.append(plot_path)
-
-        print("Saved boxplots:", plot_paths)
+    except Exception as e:
+        parent.error = True
+        parent.result = str(e)
+        return
 
-        # Store the results in parent (optional)
-        parent.plot = plot_paths  # All plots are stored in a list
+def describe_box_stats(frame, stats):
+    """Text for the output card: rows summarised, number of boxes and how the quartiles were found."""
+    boxes = stats.height
+    quartiles = "approximate (t-digest)" if stats.get_column("approximate").any() else "exact"
+    return f"{frame.height:,} rows summarised into {boxes:,} box{'es' if boxes != 1 else ''}; quartiles are {quartiles}."
 
+def run_native_box_plot(parent):
+    """
+    Renders box plots in Python, without R (the "Quick Preview" renderer).
+    Only the selected columns (and the group column) are read from the sheets; the quartiles,
+    whiskers and outliers are computed with `box_plot_table` and only that summary is drawn.
+    Args:
+        parent: The BoxPlot model; `options` holds `columns`, `group` and `method`.
+            The PNG bytes are stored in `plot`, and a short summary in `result`. On failure
+            `error` is set and `result` holds the message.
+    """
+    options = parent.options
+    try:
+        frame = plot_frame(parent.model1, parent.model2, options["columns"], options["group"], key=output_key(parent))
+        stats, outliers = box_plot_table(frame, options["columns"], options["group"])
+        parent.plot = render_box_plots(stats, outliers, options["method"])
+        parent.result = f"Quick preview. {describe_box_stats(frame, stats)}"
     except Exception as e:
         parent.error = True
         parent.result = str(e)
-        return
@@ -0,0 +1,220 @@
+import math
+from bisect import bisect_left
+import polars as pl
+
+EXACT_QUANTILE_ROWS = 20_000_000
+SKETCH_CHUNK_ROWS = 1_000_000
+DIGEST_COMPRESSION = 200
+MAX_OUTLIERS = 1000
+NO_GROUP = ""
+
+STATS_SCHEMA = {
+    "variable": pl.Utf8, "group": pl.Utf8, "n": pl.Int64, "q1": pl.Float64, "median": pl.Float64,
+    "q3": pl.Float64, "lower": pl.Float64, "upper": pl.Float64, "n_outliers": pl.Int64, "approximate": pl.Boolean,
+}
+OUTLIER_SCHEMA = {"variable": pl.Utf8, "group": pl.Utf8, "value": pl.Float64}
+
+def _k_scale(q, compression):
+    """t-digest k1 scale function: centroids are small near the tails and large near the median."""
+    return (compression / (2 * math.pi) * (2 * q - 1).clip(-1, 1).arcsin()).floor().cast(pl.Int64)
+
+def digest_chunk(frame, column, compression=DIGEST_COMPRESSION):
+    """
+    Builds t-digest centroids for every group of one chunk: the values are ranked within their
+    group, and runs of consecutive ranks falling in the same unit of the k1 scale become one
+    centroid (mean and weight).
+    Returns:
+        pl.DataFrame: Columns `group`, `mean` and `weight`.
+    """
+    return (
+        frame.lazy()
+        .select("group", pl.col(column).alias("value"))
+        .with_columns(q=(pl.col("value").rank("ordinal").over("group") - 0.5) / pl.len().over("group"))
+        .group_by("group", _k_scale(pl.col("q"), compression).alias("k"))
+        .agg(mean=pl.col("value").mean(), weight=pl.len())
+        .select("group", "mean", pl.col("weight").cast(pl.Int64))
+        .collect()
+    )
+
+def merge_digests(digests, compression=DIGEST_COMPRESSION):
+    """
+    Merges the centroids of several digests: the centroids of each group are ordered by mean
+    and the ones whose weight midpoints fall in the same unit of the k1 scale are combined.
+    Returns:
+        pl.DataFrame: Columns `group`, `mean` and `weight`, ordered by group and mean.
+    """
+    cumulative = pl.col("weight").cum_sum().over("group")
+    midpoint = (cumulative - pl.col("weight") / 2) / pl.col("weight").sum().over("group")
+    return (
+        pl.concat(digests)
+        .lazy()
+        .sort("group", "mean")
+        .group_by("group", _k_scale(midpoint, compression).alias("k"))
+        .agg(mean=(pl.col("mean") * pl.col("weight")).sum() / pl.col("weight").sum(), weight=pl.col("weight").sum())
+        .sort("group", "mean")
+        .select("group", "mean", "weight")
+        .collect()
+    )
+
+def digest_quantiles(digest, extremes, probabilities):
+    """
+    Reads quantiles from merged centroids by interpolating between the centroid means at
+    their weight midpoints; the exact minimum and maximum anchor both ends.
+    Args:
+        digest (pl.DataFrame): Output of `merge_digests`.
+        extremes (dict): Group to (minimum, maximum).
+        probabilities (list): Probabilities in [0, 1].
+    Returns:
+        dict: Group to the list of quantiles.
+    """
+    result = {}
+    for group, means, weights in digest.group_by("group").agg("mean", "weight").iter_rows():
+        low, high = extremes[group]
+        total = sum(weights)
+        positions, running = [0.0], 0
+        for weight in weights:
+            positions.append(running + weight / 2)
+            running += weight
+        positions.append(float(total))
+        values = [low, *means, high]
+        quantiles = []
+        for probability in probabilities:
+            target = probability * total
+            index = min(max(bisect_left(positions, target), 1), len(positions) - 1)
+            left, right = positions[index - 1], positions[index]
+            share = (target - left) / (right - left) if right > left else 0.0
+            quantiles.append(values[index - 1] + share * (values[index] - values[index - 1]))
+        result[group] = quantiles
+    return result
+
+def _grouped(frame, group):
+    if group is None:
+        return frame.with_columns(pl.lit(NO_GROUP).alias("group"))
+    return frame.rename({group: "group"}) if group != "group" else frame
+
+def _column_stats(frame, column, exact):
+    """Quartiles (exact type 7, or from a t-digest built chunk by chunk), counts and extremes per group."""
+    summary = frame.group_by("group").agg(
+        n=pl.col(column).count(),
+        low=pl.col(column).min(),
+        high=pl.col(column).max(),
+        **({
+            "q1": pl.col(column).quantile(0.25, interpolation="linear"),
+            "median": pl.col(column).median(),
+            "q3": pl.col(column).quantile(0.75, interpolation="linear"),
+        } if exact else {}),
+    )
+    if exact:
+        return summary
+    digests = [
+        digest_chunk(frame.slice(offset, SKETCH_CHUNK_ROWS), column)
+        for offset in range(0, frame.height, SKETCH_CHUNK_ROWS)
+    ]
+    extremes = {group: (low, high) for group, low, high in summary.select("group", "low", "high").iter_rows()}
+    quantiles = digest_quantiles(merge_digests(digests), extremes, [0.25, 0.5, 0.75])
+    return summary.join(
+        pl.DataFrame(
+            [(group, *values) for group, values in quantiles.items()],
+            schema={"group": summary.schema["group"], "q1": pl.Float64, "median": pl.Float64, "q3": pl.Float64},
+            orient="row",
+        ),
+        on="group",
+        how="left",
+    )
+
+def _capped_outliers(outliers):
+    """Keeps at most MAX_OUTLIERS distinct outliers per group, spread evenly and including the extremes."""
+    ranked = outliers.explode("value").drop_nulls("value").with_columns(
+        position=pl.int_range(pl.len()).over("group"), count=pl.len().over("group")
+    )
+    step = (pl.col("count") - 1) / (MAX_OUTLIERS - 1)
+    keep = (pl.col("count") <= MAX_OUTLIERS) | (((pl.col("position") / step).round() * step).round() == pl.col("position"))
+    return ranked.filter(keep).select("group", "value")
+
+def box_plot_table(frame, columns, group=None):
+    """
+    Computes the box plot summary of every column, per group, in polars.
+    Quartiles are exact (type 7, as in R) up to EXACT_QUANTILE_ROWS rows; beyond that they are
+    read from a t-digest merged from SKETCH_CHUNK_ROWS-row chunks, so no group is ever sorted
+    as a whole. Counts, whisker ends (the most extreme values within 1.5 IQR of the box) and
+    outliers are always exact; at most MAX_OUTLIERS outliers per box are kept for drawing.
+    Args:
+        frame (pl.DataFrame): Numeric columns, plus the group column if given.
+        columns (list): Columns to summarise.
+        group (str): Column whose values split the data into boxes, or None for one box per column.
+    Returns:
+        tuple: (stats pl.DataFrame with STATS_SCHEMA, outliers pl.DataFrame with OUTLIER_SCHEMA).
+    """
+    data = _grouped(frame.select([column for column in [group, *columns] if column is not None]), group)
+    data = data.with_columns(pl.col("group").cast(pl.Utf8).fill_null("NA"))
+    exact = data.height <= EXACT_QUANTILE_ROWS
+    value = pl.col("value")
+    stats, outliers = [], []
+    for column in columns:
+        present = data.filter(pl.col(column).is_not_null()) if data.get_column(column).has_nulls() else data
+        summary = _column_stats(present, column, exact).with_columns(
+            fence_low=pl.col("q1") - 1.5 * (pl.col("q3") - pl.col("q1")),
+            fence_high=pl.col("q3") + 1.5 * (pl.col("q3") - pl.col("q1")),
+        )
+        outside = (value < pl.col("fence_low")) | (value > pl.col("fence_high"))
+        whiskers = (
+            data.lazy()
+            .select("group", pl.col(column).alias("value"))
+            .join(summary.lazy().select("group", "fence_low", "fence_high"), on="group", how="inner")
+            .group_by("group")
+            .agg(
+                lower=value.filter(value >= pl.col("fence_low")).min(),
+                upper=value.filter(value <= pl.col("fence_high")).max(),
+                value=value.filter(outside),
+            )
+            .with_columns(n_outliers=pl.col("value").list.len().cast(pl.Int64), value=pl.col("value").list.unique().list.sort())
+            .collect()
+        )
+        stats.append(
+            summary.join(whiskers, on="group", how="left").select(
+                pl.lit(column).alias("variable"), "group", pl.col("n").cast(pl.Int64), "q1", "median", "q3",
+                "lower", "upper", "n_outliers", pl.lit(not exact).alias("approximate"),
+            ).sort("group")
+        )
+        outliers.append(
+            _capped_outliers(whiskers.select("group", "value").sort("group"))
+            .select(pl.lit(column).alias("variable"), "group", "value")
+        )
+    stats = pl.concat(stats) if stats else pl.DataFrame(schema=STATS_SCHEMA)
+    outliers = pl.concat(outliers) if outliers else pl.DataFrame(schema=OUTLIER_SCHEMA)
+    return stats.cast(STATS_SCHEMA), outliers.cast(OUTLIER_SCHEMA)
+
+def box_stats_r_script(columns, group=None):
+    """
+    R code that rebuilds `box_stats` and `box_outliers` from a data frame `data` holding the
+    plotted columns (and the group column), so that a recorded box plot script can be run on
+    its own. It uses exact type 7 quartiles and keeps every outlier; beyond EXACT_QUANTILE_ROWS
+    rows the app reads the quartiles from a t-digest and draws at most MAX_OUTLIERS outliers
+    per box, so the replayed plot may differ slightly there.
+    """
+    names = ", ".join("'" + column.replace("\\", "\\\\").replace("'", "\\'") + "'" for column in columns)
+    groups = "rep('', nrow(data))" if group is None else "as.character(data[['" + group.replace("'", "\\'") + "']])"
+    return (
+        f"# Rebuild box_stats and box_outliers from `data` (the plotted columns{' and ' + group if group else ''}).\n"
+        f"# Quartiles are exact (type 7) and all outliers are kept.\n"
+        f"box_group <- {groups}\n"
+        f"box_group[is.na(box_group)] <- 'NA'\n"
+        f"box_summary <- function(variable, group, x) {{\n"
+        f"    x <- x[!is.na(x)]\n"
+        f"    q <- quantile(x, c(0.25, 0.5, 0.75), type = 7, names = FALSE)\n"
+        f"    fence <- c(q[1] - 1.5 * (q[3] - q[1]), q[3] + 1.5 * (q[3] - q[1]))\n"
+        f"    outside <- x < fence[1] | x > fence[2]\n"
+        f"    value <- sort(unique(x[outside]))\n"
+        f"    list(\n"
+        f"        stats = data.frame(variable = variable, group = group, n = length(x), q1 = q[1], median = q[2], q3 = q[3],\n"
+        f"            lower = min(x[x >= fence[1]]), upper = max(x[x <= fence[2]]), n_outliers = sum(outside)),\n"
+        f"        outliers = data.frame(variable = rep(variable, length(value)), group = rep(group, length(value)), value = value)\n"
+        f"    )\n"
+        f"}}\n"
+        f"box_parts <- unlist(lapply(c({names}), function(variable) {{\n"
+        f"    values <- split(data[[variable]], box_group)\n"
+        f"    lapply(names(values), function(group) box_summary(variable, group, values[[group]]))\n"
+        f"}}), recursive = FALSE)\n"
+        f"box_stats <- do.call(rbind, lapply(box_parts, `[[`, 'stats'))\n"
+        f"box_outliers <- do.call(rbind, lapply(box_parts, `[[`, 'outliers'))\n\n"
+    )
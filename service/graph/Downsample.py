@@ -0,0 +1,102 @@
+import math
+import numpy as np
+import polars as pl
+
+DOWNSAMPLING_METHODS = ["LTTB", "Min-Max", "None"]
+DEFAULT_TARGET_POINTS = 2000
+
+def lttb_rows(x, y, target):
+    """
+    Largest-Triangle-Three-Buckets: picks `target` rows of a series ordered by `x`.
+    The first and last rows are always kept; the rows in between are split into `target - 2`
+    buckets, and from each bucket the row forming the largest triangle with the row kept from
+    the previous bucket and the average of the next bucket is kept.
+    The choice in each bucket depends on the previous one, so the loop runs over buckets (not
+    rows) on zero-copy views of the polars columns.
+    Args:
+        x (pl.Series): Sorted horizontal values without nulls.
+        y (pl.Series): Vertical values without nulls.
+        target (int): Number of rows to keep (at least 3).
+    Returns:
+        pl.Series: Row positions of the kept rows, ascending.
+    """
+    n = x.len()
+    if n <= target or target < 3:
+        return pl.int_range(0, n, eager=True)
+    xs = x.to_numpy()
+    ys = y.to_numpy()
+    buckets = target - 2
+    starts = np.arange(buckets + 1, dtype=np.int64) * (n - 2) // buckets + 1
+    sizes = np.diff(starts)
+    mean_x = np.add.reduceat(xs[1:n - 1], starts[:-1] - 1) / sizes
+    mean_y = np.add.reduceat(ys[1:n - 1], starts[:-1] - 1) / sizes
+    next_x = np.append(mean_x[1:], xs[n - 1])
+    next_y = np.append(mean_y[1:], ys[n - 1])
+
+    rows = np.empty(target, dtype=np.int64)
+    rows[0], rows[-1] = 0, n - 1
+    anchor = 0
+    for bucket in range(buckets):
+        start, end = starts[bucket], starts[bucket + 1]
+        ax, ay = xs[anchor], ys[anchor]
+        area = np.abs((ax - next_x[bucket]) * (ys[start:end] - ay) - (ax - xs[start:end]) * (next_y[bucket] - ay))
+        anchor = start + int(area.argmax())
+        rows[bucket + 1] = anchor
+    return pl.Series("row", rows)
+
+def minmax_rows(y, target):
+    """
+    Splits a series into `target / 2` buckets of consecutive rows and keeps the rows holding
+    the lowest and highest value of each bucket, so every spike survives.
+    Returns:
+        pl.Series: Row positions of the kept rows, ascending.
+    """
+    n = y.len()
+    if n <= target:
+        return pl.int_range(0, n, eager=True)
+    size = math.ceil(n / max(1, target // 2))
+    return (
+        y.alias("y").to_frame()
+        .lazy()
+        .with_row_index("row")
+        .group_by(pl.col("row") // size)
+        .agg(pl.col("row").get(pl.col("y").arg_min()).alias("low"), pl.col("row").get(pl.col("y").arg_max()).alias("high"))
+        .select(pl.concat_list("low", "high").explode().unique().sort())
+        .collect()
+        .to_series()
+    )
+
+def downsample_lines(frame, x, ys, method="LTTB", target=DEFAULT_TARGET_POINTS):
+    """
+    Orders the line plot data by `x` and reduces every series to about `target` points.
+    Each series is downsampled on its own and the union of the kept rows is returned, so the
+    result can still be reshaped to long format for a multi-series chart.
+    Args:
+        frame (pl.DataFrame): Data holding `x` and `ys`, without missing values.
+        x (str): Horizontal column.
+        ys (list): Vertical columns.
+        method (str): One of DOWNSAMPLING_METHODS.
+        target (int): Points to keep per series.
+    Returns:
+        pl.DataFrame: The columns `x` and `ys`, ordered by `x`.
+    """
+    data = frame.select(list(dict.fromkeys([x, *ys])))
+    if not data.get_column(x).is_sorted():
+        data = data.sort(x)
+    if method == "None" or data.height <= target:
+        return data
+    kept = [
+        lttb_rows(data.get_column(x), data.get_column(y), target) if method == "LTTB" else minmax_rows(data.get_column(y), target)
+        for y in ys
+    ]
+    rows = pl.concat([row.cast(pl.Int64) for row in kept]).unique().sort() if len(kept) > 1 else kept[0]
+    return data[rows]
+
+def describe_downsampling(total_rows, data, method, target):
+    """
+    Text for the output card saying how many rows were drawn. With several series this is the
+    union of the rows each series kept, so it can exceed the per-series target.
+    """
+    if data.height == total_rows:
+        return f"{total_rows:,} rows drawn."
+    return f"Downsampled with {method} (target {target:,} points per series): {total_rows:,} rows reduced to {data.height:,} rows drawn."
@@ -1,21 +1,24 @@
 import os
-import polars as pl
 from PyQt6.QtWidgets import QMessageBox
 import rpy2.robjects as ro
-import rpy2.robjects.lib.grdevices as grdevices
+from service.utils.plot_render import render_r_plots
+from service.graph.NativePlot import plot_frame, render_histograms
+from service.utils.analysis_view import AnalysisView, output_key
 
 def run_histogram(parent):
     """
     Executes an R script to generate histograms from data in a Polars DataFrame.
     This function performs the following steps:
     1. Activates the R environment using the parent object's `activate_R` method.
-    2. Retrieves data from two models in the parent object and concatenates them into a single Polars DataFrame.
+    2. Retrieves data from two models in the parent object as a single Polars DataFrame. When
+       `parent.options` is set (by the dialog), only the selected columns are taken, so missing
+       values elsewhere in the sheets drop no rows.
     3. Drops any null values from the DataFrame.
     4. Converts the Polars DataFrame to an R DataFrame and assigns it to the R global environment.
     5. Loads required R libraries (`ggplot2` and `tidyr`).
     6. Sets up the data in R and executes a script provided by the parent object.
     7. Identifies histogram variables created by the script in the R environment.
-    8. Generates PNG files for each histogram and stores their paths in the parent object's `plot` attribute.
+    8. Renders each histogram to PNG bytes in memory and stores them in the parent object's `plot` attribute.
     9. Handles any exceptions by setting the parent object's `error` attribute to True and storing the error message in the `result` attribute.
     Args:
         parent (object): An object that contains methods and attributes required for the function, including:
@@ -23,7 +26,7 @@ def run_histogram(parent):
             - `model1.get_data()`: Method to retrieve data from the first model.
             - `model2.get_data()`: Method to retrieve data from the second model.
             - `r_script`: A string containing the R script to be executed.
-            - `plot`: Attribute to store the paths of generated histogram PNG files.
+            - `plot`: Attribute to store the PNG bytes of the generated histograms.
             - `error`: Attribute to indicate if an error occurred.
             - `result`: Attribute to store the error message if an exception is raised.
     """
@@ -31,10 +34,9 @@ def run_histogram(parent):
     import rpy2_arrow.polars as rpy2polars
 
     parent.activate_R()
-    df1 = parent.model1.get_data()
-    df2 = parent.model2.get_data()
-    df = pl.concat([df1, df2], how="horizontal")
-    df = df.drop_nulls()  
+    options = getattr(parent, "options", None)
+    columns = options["columns"] if options else None
+    df = AnalysisView(parent.model1, parent.model2, output_key(parent)).complete(columns).collect()
 
     # Convert Polars DataFrame to R DataFrame
     with rpy2polars.converter.context() as cv_ctx:
@@ -58,18 +60,27 @@ def run_histogram(parent):
         r_objects = ro.r("ls()")  # List all objects in R
         histogram_vars = [obj for obj in r_objects if obj.startswith("histogram_")]
 
-        plot_paths = []
-
-        for plot_name in histogram_vars:
-            plot_path = f"{plot_name}.png"
-            grdevices.png(file=plot_path, width=800, height=600)
-            ro.r(f"print({plot_name})")
-            grdevices.dev_off()
-            plot_paths.append(plot_path)
-
-        parent.plot = plot_paths  
+        parent.plot = render_r_plots(histogram_vars)
 
     except Exception as e:
         parent.error = True
         parent.result = str(e)
         return
+
+def run_native_histogram(parent):
+    """
+    Renders histograms in Python, without R (the "Quick Preview" renderer).
+    Only the selected columns are read from the sheets; the bins are counted with polars expressions and only the bars are drawn.
+    Args:
+        parent: The Histogram model; `options` holds `columns`, `method`, `bins` and `binwidth`.
+            The PNG bytes are stored in `plot`, and a short summary in `result`. On failure
+            `error` is set and `result` holds the message.
+    """
+    options = parent.options
+    try:
+        frame = plot_frame(parent.model1, parent.model2, options["columns"], key=output_key(parent))
+        parent.plot = render_histograms(frame, options["columns"], options["method"], options.get("bins"), options.get("binwidth"))
+        parent.result = f"Quick preview of {frame.height:,} rows."
+    except Exception as e:
+        parent.error = True
+        parent.result = str(e)
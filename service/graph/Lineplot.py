@@ -1,8 +1,10 @@
 import os
-import polars as pl
 from PyQt6.QtWidgets import QMessageBox
 import rpy2.robjects as ro
-import rpy2.robjects.lib.grdevices as grdevices
+from service.utils.plot_render import render_r_plots
+from service.graph.NativePlot import plot_frame, render_line_plots, MAX_LINE_POINTS
+from service.graph.Downsample import downsample_lines, describe_downsampling
+from service.utils.analysis_view import AnalysisView, output_key
 
 def run_lineplot(parent):
     """
@@ -16,14 +18,17 @@ def run_lineplot(parent):
     6. Sets up the data in the R environment.
     7. Executes an R script provided by the parent object.
     8. Retrieves the list of line plot variables created in the R environment.
-    9. Saves each line plot as a PNG file and stores the file paths in the parent object.
+    9. Renders each line plot to PNG bytes in memory and stores them in the parent object.
+    When `parent.options` is set (by the dialog), only the plotted columns are sent to R,
+    ordered and downsampled with `downsample_lines` first, and the number of points drawn is
+    stored in `result`.
     Args:
         parent: An object that contains the following attributes and methods:
             - activate_R(): Method to activate the R environment.
             - model1: An object with a get_data() method that returns a Polars DataFrame.
             - model2: An object with a get_data() method that returns a Polars DataFrame.
             - r_script: A string containing the R script to be executed.
-            - plot: An attribute to store the list of plot file paths (optional).
+            - plot: An attribute to store the PNG bytes of the rendered plots.
             - error: An attribute to indicate if an error occurred.
             - result: An attribute to store the error message if an error occurred.
     Raises:
@@ -33,10 +38,15 @@ def run_lineplot(parent):
     import rpy2_arrow.polars as rpy2polars
 
     parent.activate_R()
-    df1 = parent.model1.get_data()
-    df2 = parent.model2.get_data()
-    df = pl.concat([df1, df2], how="horizontal")
-    df = df.drop_nulls()  # Remove null values
+    options = getattr(parent, "options", None)
+    summary = None
+    if options:
+        df = plot_frame(parent.model1, parent.model2, [options["x"], *options["ys"]], key=output_key(parent))
+        total_rows = df.height
+        df = downsample_lines(df, options["x"], options["ys"], options["downsampling"], options["target_points"])
+        summary = describe_downsampling(total_rows, df, options["downsampling"], options["target_points"])
+    else:
+        df = AnalysisView(parent.model1, parent.model2, output_key(parent)).complete().collect()
 
     # Convert Polars DataFrame to R DataFrame
     with rpy2polars.converter.context() as cv_ctx:
@@ -61,21 +71,38 @@ def run_lineplot(parent):
         r_objects = ro.r("ls()")  # List all objects in R
         lineplot_vars = [obj for obj in r_objects if obj.startswith("lineplot_")]
 
-        plot_paths = []
+        # Store the rendered plots in parent
+        parent.plot = render_r_plots(lineplot_vars)
+        parent.result = summary
 
-        for plot_name in lineplot_vars:
-            plot_path = f"{plot_name}.png"
-            grdevices.png(file=plot_path, width=800, height=600)
-            ro.r(f"print({plot_name})")
-            grdevices.dev_off()
-            plot_paths.append(plot_path)
-
-        print("Saved lineplots:", plot_paths)
-
-        # Store the results in parent (optional)
-        parent.plot = plot_paths  # All plots are stored in a list
+    except Exception as e:
+        parent.error = True
+        parent.result = str(e)
+        return
 
+def run_native_lineplot(parent):
+    """
+    Renders line plots in Python, without R (the "Quick Preview" renderer).
+    Only the selected columns are read from the sheets; each series is ordered and downsampled
+    with `downsample_lines` before it is drawn. With downsampling turned off, series longer than
+    MAX_LINE_POINTS are still reduced with min-max buckets, which at that density is lossless
+    at the chart's pixel width.
+    Args:
+        parent: The Lineplot model; `options` holds `x`, `ys`, `method`, `downsampling` and
+            `target_points`.
+            The PNG bytes are stored in `plot`, and a short summary in `result`. On failure
+            `error` is set and `result` holds the message.
+    """
+    options = parent.options
+    try:
+        frame = plot_frame(parent.model1, parent.model2, [options["x"], *options["ys"]], key=output_key(parent))
+        data = downsample_lines(frame, options["x"], options["ys"], options["downsampling"], options["target_points"])
+        method, target = options["downsampling"], options["target_points"]
+        if data.height > MAX_LINE_POINTS * len(options["ys"]):
+            data = downsample_lines(data, options["x"], options["ys"], "Min-Max", MAX_LINE_POINTS)
+            method, target = "Min-Max", MAX_LINE_POINTS
+        parent.plot = render_line_plots(data, options["x"], options["ys"], options["method"])
+        parent.result = f"Quick preview. {describe_downsampling(frame.height, data, method, target)}"
     except Exception as e:
         parent.error = True
         parent.result = str(e)
-        return
\ No newline at end of file
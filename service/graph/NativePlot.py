@@ -0,0 +1,537 @@
+import math
+import numpy as np
+import polars as pl
+from PyQt6.QtCore import Qt, QRectF, QPointF
+from PyQt6.QtGui import QImage, QPainter, QColor, QPen, QFont, QFontMetrics, QPolygonF, QLinearGradient
+from service.utils.plot_render import PLOT_WIDTH, PLOT_HEIGHT, encode_image
+from service.graph.BoxStats import NO_GROUP
+from service.utils.analysis_view import AnalysisView
+
+PALETTE = ["#F8766D", "#00BA38", "#619CFF", "#C77CFF", "#00BFC4", "#B79F00", "#F564E3", "#FF7F00"]
+MAX_BINS = 1000
+MAX_LINE_POINTS = 4000
+MAX_SCATTER_POINTS = 5000
+RENDERERS = ["Quick Preview", "Publication Quality (R)"]
+DENSITY_GRID = 128
+DENSITY_SAMPLE_ROWS = 200_000
+MAX_HEATMAP_LABELS = 15
+
+GRID_COLOR = QColor("#ebebeb")
+TEXT_COLOR = QColor("#333333")
+TICK_COLOR = QColor("#4d4d4d")
+
+def quick_preview_script(r_script):
+    """Script text recorded for a quick preview: the R script that renders the publication quality version."""
+    return f"# Quick preview rendered without R. Publication quality script:\n{r_script}"
+
+def plot_frame(model1, model2, columns, group=None, key=None, complete=True):
+    """
+    Collects the plotted columns from the data editor and data output sheets (see AnalysisView).
+    Only the requested columns are taken (and the active view of the data editor applied to
+    them), cast to Float64, and rows with a missing or non-finite value are dropped, which is
+    what ggplot2 does before drawing. A `group` column is carried along as it is. With
+    `complete` False every row is kept and non-finite values become missing, for plots whose
+    panels each drop the rows missing in their own columns.
+    """
+    columns = list(dict.fromkeys(columns))
+    carried = [group] if group is not None and group not in columns else []
+    frame = AnalysisView(model1, model2, key).frame(columns + carried)
+    frame = frame.select(pl.col(columns).cast(pl.Float64), *carried)
+    if not complete:
+        return frame.with_columns(pl.when(pl.col(column).is_finite()).then(pl.col(column)).alias(column) for column in columns).collect()
+    return frame.filter(pl.all_horizontal(pl.col(columns).is_finite())).collect()
+
+def nice_ticks(low, high, count=5):
+    """Returns round tick positions covering [low, high]."""
+    if high <= low:
+        return [low]
+    raw = (high - low) / max(count, 1)
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(factor * magnitude for factor in (1, 2, 2.5, 5, 10) if factor * magnitude >= raw)
+    first = math.ceil(low / step - 1e-9)
+    last = math.floor(high / step + 1e-9)
+    return [round(index * step, 12) for index in range(first, last + 1)]
+
+def format_number(value):
+    if value == 0:
+        return "0"
+    if abs(value) >= 1e6 or abs(value) < 1e-3:
+        return f"{value:.3g}"
+    return f"{value:,.6g}"
+
+def _padded(low, high, fraction=0.05):
+    if low is None or high is None:
+        return 0.0, 1.0
+    if high <= low:
+        return low - 0.5, high + 0.5
+    pad = (high - low) * fraction
+    return low - pad, high + pad
+
+def _bin_counts(frame, column, start, width, count):
+    """Counts the values of a column in `count` bins of equal width from `start` (the ends are clamped)."""
+    bin_index = ((pl.col(column) - start) / width).floor().clip(0, count - 1).cast(pl.Int64).alias("bin")
+    counts = [0] * count
+    for index, length in frame.lazy().select(bin_index).group_by("bin").len().collect().iter_rows():
+        counts[index] = length
+    return counts
+
+def histogram_bins(frame, columns, bins=None, binwidth=None):
+    """
+    Bins the columns on a shared set of edges with polars expressions.
+    Args:
+        frame (pl.DataFrame): Numeric data.
+        columns (list): Columns to bin.
+        bins (int): Number of bins, used when `binwidth` is not given.
+        binwidth (float): Width of every bin; edges are aligned to multiples of it.
+    Returns:
+        tuple: (list of bin edges, dict of column name to list of counts).
+    """
+    low, high = frame.select(
+        pl.min_horizontal([pl.col(column).min() for column in columns]).alias("low"),
+        pl.max_horizontal([pl.col(column).max() for column in columns]).alias("high"),
+    ).row(0)
+    if low is None:
+        return [], {column: [] for column in columns}
+    if binwidth:
+        width = float(binwidth)
+        start = math.floor(low / width) * width
+        count = max(1, math.ceil((high - start) / width))
+        if count > MAX_BINS:
+            raise ValueError(f"Binwidth {binwidth} gives {count} bins; the maximum is {MAX_BINS}.")
+    else:
+        count = max(1, int(bins or 30))
+        start, width = (low, (high - low) / count) if high > low else (low - 0.5, 1.0 / count)
+    edges = [start + index * width for index in range(count + 1)]
+
+    return edges, {column: _bin_counts(frame, column, start, width, count) for column in columns}
+
+def scatter_sample(frame, max_points=MAX_SCATTER_POINTS):
+    """Takes evenly spaced rows so that at most `max_points` points are drawn."""
+    if frame.height <= max_points:
+        return frame
+    return frame.gather_every(math.ceil(frame.height / max_points))
+
+def density_curves(frame, columns, grid=DENSITY_GRID):
+    """
+    Gaussian kernel density estimates (Silverman bandwidth) evaluated on a grid. The moments
+    and range of all columns come from one polars pass over every row; the quartiles and the
+    binned counts that are smoothed come from an evenly spaced sample of at most
+    DENSITY_SAMPLE_ROWS rows, which does not visibly change the curve.
+    Returns:
+        dict: Column name to (list of grid positions, list of densities); empty lists for
+            columns without spread.
+    """
+    sample = scatter_sample(frame, DENSITY_SAMPLE_ROWS)
+    summary = frame.select([
+        pl.struct(
+            n=pl.col(column).count(),
+            sd=pl.col(column).std(),
+            low=pl.col(column).min(),
+            high=pl.col(column).max(),
+        ).alias(column)
+        for column in columns
+    ]).row(0, named=True)
+    quartiles = sample.select([
+        pl.struct(
+            q1=pl.col(column).quantile(0.25, interpolation="linear"),
+            q3=pl.col(column).quantile(0.75, interpolation="linear"),
+        ).alias(column)
+        for column in columns
+    ]).row(0, named=True)
+    curves = {}
+    for column in columns:
+        n, sd, low, high = (summary[column][key] for key in ("n", "sd", "low", "high"))
+        q1, q3 = quartiles[column]["q1"], quartiles[column]["q3"]
+        if not n or high is None or high <= low:
+            curves[column] = ([], [])
+            continue
+        spreads = [value for value in (sd, (q3 - q1) / 1.34) if value]
+        bandwidth = 0.9 * (min(spreads) if spreads else high - low) * n ** -0.2
+        low, high = low - 3 * bandwidth, high + 3 * bandwidth
+        width = (high - low) / grid
+        counts = _bin_counts(sample, column, low, width, grid)
+        reach = max(1, math.ceil(3 * bandwidth / width))
+        kernel = [math.exp(-0.5 * (offset * width / bandwidth) ** 2) for offset in range(-reach, reach + 1)]
+        scale = 1.0 / (sample.height * bandwidth * math.sqrt(2 * math.pi))
+        curves[column] = (
+            [low + (index + 0.5) * width for index in range(grid)],
+            [
+                scale * sum(counts[index + offset] * kernel[offset + reach]
+                            for offset in range(-reach, reach + 1) if 0 <= index + offset < grid)
+                for index in range(grid)
+            ],
+        )
+    return curves
+
+class Axes:
+    """Maps data coordinates to a rectangle of the image and draws its grid, ticks and labels."""
+
+    def __init__(self, painter, rect, x_range, y_range):
+        self.painter = painter
+        self.rect = rect
+        self.x_range = x_range
+        self.y_range = y_range
+
+    def x(self, value):
+        low, high = self.x_range
+        return self.rect.left() + (value - low) / ((high - low) or 1.0) * self.rect.width()
+
+    def y(self, value):
+        low, high = self.y_range
+        return self.rect.bottom() - (value - low) / ((high - low) or 1.0) * self.rect.height()
+
+    def draw_grid(self, x_ticks=None, y_ticks=None, x_labels=None, tick_labels=True):
+        painter = self.painter
+        painter.save()
+        painter.setPen(QPen(GRID_COLOR, 1))
+        x_positions = list(x_labels) if x_labels is not None else (x_ticks or [])
+        for value in x_positions:
+            painter.drawLine(QPointF(self.x(value), self.rect.top()), QPointF(self.x(value), self.rect.bottom()))
+        for value in y_ticks or []:
+            painter.drawLine(QPointF(self.rect.left(), self.y(value)), QPointF(self.rect.right(), self.y(value)))
+        if tick_labels:
+            painter.setPen(TICK_COLOR)
+            metrics = painter.fontMetrics()
+            for value in x_positions:
+                text = x_labels[value] if x_labels is not None else format_number(value)
+                width = metrics.horizontalAdvance(text)
+                painter.drawText(QPointF(self.x(value) - width / 2, self.rect.bottom() + metrics.ascent() + 4), text)
+            for value in y_ticks or []:
+                text = format_number(value)
+                width = metrics.horizontalAdvance(text)
+                painter.drawText(QPointF(self.rect.left() - width - 5, self.y(value) + metrics.ascent() / 2 - 1), text)
+        painter.restore()
+
+class Figure:
+    """
+    A QImage canvas for one chart, styled after ggplot2's `theme_minimal()`.
+    Methods:
+        axes(x_range, y_range, ...):
+            Lays out a plot panel with room for a title, axis labels and a legend.
+        panel(rect, x_range, y_range):
+            Returns axes on an explicit rectangle (used by the scatter plot matrix).
+        legend(title, entries):
+            Draws the legend to the right of the panel.
+        legend_width_for(labels):
+            Returns the width to reserve for a legend with the given labels.
+        to_png():
+            Finishes painting and returns the PNG bytes.
+    """
+
+    def __init__(self, width=PLOT_WIDTH, height=PLOT_HEIGHT):
+        self.width = width
+        self.height = height
+        self.image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+        self.image.fill(Qt.GlobalColor.white)
+        self.painter = QPainter(self.image)
+        self.painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self.font = QFont()
+        self.font.setPixelSize(12)
+        self.painter.setFont(self.font)
+        self.legend_width = 0
+
+    def axes(self, x_range, y_range, title="", x_label="", y_label="", legend_width=0):
+        painter = self.painter
+        title_font = QFont(self.font)
+        title_font.setPixelSize(16)
+        painter.save()
+        painter.setPen(TEXT_COLOR)
+        painter.setFont(title_font)
+        painter.drawText(QPointF(20, 28), title)
+        painter.restore()
+
+        metrics = painter.fontMetrics()
+        left, top, right, bottom = 75, 45, self.width - 20 - legend_width, self.height - 50
+        rect = QRectF(left, top, right - left, bottom - top)
+        painter.save()
+        painter.setPen(TEXT_COLOR)
+        painter.drawText(QPointF(rect.center().x() - metrics.horizontalAdvance(x_label) / 2, self.height - 14), x_label)
+        painter.translate(18, rect.center().y() + metrics.horizontalAdvance(y_label) / 2)
+        painter.rotate(-90)
+        painter.drawText(QPointF(0, 0), y_label)
+        painter.restore()
+        self.legend_rect = QRectF(right + 10, top, legend_width - 10, bottom - top)
+        return Axes(painter, rect, x_range, y_range)
+
+    def panel(self, rect, x_range, y_range):
+        return Axes(self.painter, rect, x_range, y_range)
+
+    def legend(self, title, entries):
+        painter = self.painter
+        painter.save()
+        painter.setPen(TEXT_COLOR)
+        metrics = painter.fontMetrics()
+        x, y = self.legend_rect.left(), self.legend_rect.top() + self.legend_rect.height() / 2 - 10 * len(entries)
+        painter.drawText(QPointF(x, y), title)
+        for index, (label, color) in enumerate(entries):
+            row_y = y + 10 + index * 20
+            painter.fillRect(QRectF(x, row_y, 14, 14), QColor(color))
+            painter.drawText(QPointF(x + 20, row_y + metrics.ascent()), metrics.elidedText(label, Qt.TextElideMode.ElideRight, int(self.legend_rect.width() - 20)))
+        painter.restore()
+
+    def legend_width_for(self, labels):
+        metrics = QFontMetrics(self.font)
+        return min(200, 40 + max([metrics.horizontalAdvance(label) for label in labels] + [60]))
+
+    def to_png(self):
+        self.painter.end()
+        return encode_image(self.image)
+
+def _color(index, alpha=255):
+    color = QColor(PALETTE[index % len(PALETTE)])
+    color.setAlpha(alpha)
+    return color
+
+def _draw_bars(axes, edges, counts, color):
+    painter = axes.painter
+    painter.save()
+    painter.setPen(QPen(QColor("black"), 0.6))
+    painter.setBrush(color)
+    baseline = axes.y(0)
+    for index, count in enumerate(counts):
+        if count:
+            left, right = axes.x(edges[index]), axes.x(edges[index + 1])
+            top = axes.y(count)
+            painter.drawRect(QRectF(left, top, right - left, baseline - top))
+    painter.restore()
+
+def render_histograms(frame, columns, method="Single Histogram", bins=None, binwidth=None):
+    """
+    Renders histograms: one chart per column, or all columns overlaid in one chart.
+    Returns:
+        list: PNG bytes of the charts.
+    """
+    if method == "Multiple Histogram":
+        edges, counts = histogram_bins(frame, columns, bins=bins, binwidth=binwidth)
+        groups = [(columns, "Multiple Histogram", "Value")]
+    else:
+        groups = [([column], f"Histogram: {column}", column) for column in columns]
+    images = []
+    for group_columns, title, x_label in groups:
+        if method != "Multiple Histogram":
+            edges, counts = histogram_bins(frame, group_columns, bins=bins, binwidth=binwidth)
+        figure = Figure()
+        top = max([max(values, default=0) for values in counts.values()] + [1])
+        x_range = _padded(edges[0], edges[-1], 0.03) if edges else (0.0, 1.0)
+        y_ticks = nice_ticks(0, top)
+        legend_width = figure.legend_width_for(group_columns) if len(group_columns) > 1 else 0
+        axes = figure.axes(x_range, (0, max(top, y_ticks[-1]) * 1.04), title, x_label, "Frequency", legend_width)
+        axes.draw_grid(nice_ticks(*x_range), y_ticks)
+        for index, column in enumerate(group_columns):
+            color_index = columns.index(column)
+            _draw_bars(axes, edges, counts[column], _color(color_index, 153 if len(group_columns) > 1 else 255))
+        if len(group_columns) > 1:
+            figure.legend("variable", [(column, PALETTE[columns.index(column) % len(PALETTE)]) for column in group_columns])
+        images.append(figure.to_png())
+    return images
+
+def _draw_box(axes, position, half_width, stats, outliers, color):
+    painter = axes.painter
+    painter.save()
+    painter.setPen(QPen(QColor("#333333"), 1))
+    center = axes.x(position)
+    left, right = axes.x(position - half_width), axes.x(position + half_width)
+    painter.drawLine(QPointF(center, axes.y(stats["upper"])), QPointF(center, axes.y(stats["q3"])))
+    painter.drawLine(QPointF(center, axes.y(stats["q1"])), QPointF(center, axes.y(stats["lower"])))
+    painter.setBrush(color)
+    painter.drawRect(QRectF(QPointF(left, axes.y(stats["q3"])), QPointF(right, axes.y(stats["q1"]))))
+    painter.setPen(QPen(QColor("#333333"), 2))
+    painter.drawLine(QPointF(left, axes.y(stats["median"])), QPointF(right, axes.y(stats["median"])))
+    painter.setPen(QPen(QColor("#333333"), 1))
+    painter.setBrush(QColor("#333333"))
+    for value in outliers:
+        painter.drawEllipse(QPointF(center, axes.y(value)), 1.5, 1.5)
+    painter.restore()
+
+def render_box_plots(stats, outliers, method="Single Box plot"):
+    """
+    Renders box plots from the summary tables of `BoxStats.box_plot_table`: one chart per
+    variable, or all variables in one chart. Grouped boxes are placed along the horizontal
+    axis (side by side per variable in the combined chart); when their labels would overlap
+    only every few are written.
+    Returns:
+        list: PNG bytes of the charts.
+    """
+    stats = stats.filter(pl.col("q1").is_not_null())
+    variables = list(dict.fromkeys(stats.get_column("variable").to_list()))
+    groups = list(dict.fromkeys(stats.get_column("group").to_list()))
+    grouped = groups != [NO_GROUP]
+    points = {
+        (variable, group): values for variable, group, values in
+        outliers.group_by("variable", "group", maintain_order=True).agg("value").iter_rows()
+    }
+    if method == "Multiple Box Plot":
+        charts = [(variables, "Multiple Box Plot", "Group" if grouped else "Variable", "Value")] if variables else []
+    else:
+        charts = [([variable], f"Box Plot: {variable}", "Group" if grouped else "", variable) for variable in variables]
+    images = []
+    for chart_variables, title, x_label, y_label in charts:
+        entries = stats.filter(pl.col("variable").is_in(chart_variables)).to_dicts()
+        slots = groups if grouped else (chart_variables if len(chart_variables) > 1 else [NO_GROUP])
+        dodge = len(chart_variables) if grouped else 1
+        figure = Figure()
+        low = min(min([entry["lower"], *points.get((entry["variable"], entry["group"]), [])]) for entry in entries)
+        high = max(max([entry["upper"], *points.get((entry["variable"], entry["group"]), [])]) for entry in entries)
+        y_range = _padded(low, high)
+        legend_width = figure.legend_width_for(chart_variables) if len(chart_variables) > 1 else 0
+        metrics = QFontMetrics(figure.font)
+        widest = max(metrics.horizontalAdvance(str(slot)) for slot in slots) + 12
+        step = max(1, math.ceil(len(slots) * widest / (figure.width - 95 - legend_width)))
+        labels = {index: str(slot) for index, slot in enumerate(slots) if index % step == 0}
+        axes = figure.axes((-0.6, len(slots) - 0.4), y_range, title, x_label, y_label, legend_width)
+        axes.draw_grid(y_ticks=nice_ticks(*y_range), x_labels=labels if len(slots) > 1 else {0: ""})
+        half_width = 0.375 / dodge
+        for entry in entries:
+            order = chart_variables.index(entry["variable"])
+            if grouped:
+                position = slots.index(entry["group"]) - 0.375 + half_width * (2 * order + 1)
+            else:
+                position = slots.index(entry["variable"]) if len(slots) > 1 else 0
+            color = _color(variables.index(entry["variable"]))
+            _draw_box(axes, position, half_width, entry, points.get((entry["variable"], entry["group"]), []), color)
+        if len(chart_variables) > 1:
+            figure.legend("variable", [(variable, PALETTE[variables.index(variable) % len(PALETTE)]) for variable in chart_variables])
+        images.append(figure.to_png())
+    return images
+
+def _draw_polyline(axes, series, color, width=1.2):
+    polygon = QPolygonF([QPointF(axes.x(x), axes.y(y)) for x, y in series.iter_rows()])
+    axes.painter.save()
+    axes.painter.setClipRect(axes.rect)
+    axes.painter.setPen(QPen(color, width))
+    axes.painter.drawPolyline(polygon)
+    axes.painter.restore()
+
+def render_line_plots(frame, x, ys, method="Single Lineplot"):
+    """
+    Renders line plots of `ys` against `x`: one chart per series, or all series in one chart.
+    The rows are drawn in order, so the data should already be ordered (and downsampled) with
+    `service.graph.Downsample.downsample_lines`.
+    Returns:
+        list: PNG bytes of the charts.
+    """
+    if method == "Multiple Lineplot":
+        groups = [(ys, f"Multiple Line Plot: {x} vs. {', '.join(ys)}", "Value")]
+    else:
+        groups = [([y], f"Line Plot: {x} vs. {y}", y) for y in ys]
+    images = []
+    for group, title, y_label in groups:
+        figure = Figure()
+        x_bounds = frame.select(pl.col(x).min().alias("low"), pl.col(x).max().alias("high")).row(0)
+        y_bounds = frame.select(
+            pl.min_horizontal([pl.col(y).min() for y in group]).alias("low"),
+            pl.max_horizontal([pl.col(y).max() for y in group]).alias("high"),
+        ).row(0)
+        x_range, y_range = _padded(*x_bounds), _padded(*y_bounds)
+        legend_width = figure.legend_width_for(group) if len(group) > 1 else 0
+        axes = figure.axes(x_range, y_range, title, x, y_label, legend_width)
+        axes.draw_grid(nice_ticks(*x_range), nice_ticks(*y_range))
+        for y in group:
+            _draw_polyline(axes, frame.select(x, y), _color(ys.index(y)))
+        if len(group) > 1:
+            figure.legend("variable", [(y, PALETTE[ys.index(y) % len(PALETTE)]) for y in group])
+        images.append(figure.to_png())
+    return images
+
+def render_qq_plots(qq_data):
+    """
+    Renders a normal Q-Q plot per column, like ggplot2's `stat_qq` with `stat_qq_line`: the
+    sample quantiles against the theoretical ones and a line through the quartiles.
+    Args:
+        qq_data (dict): Column to a pl.DataFrame of `theoretical` and `sample` quantiles and the
+            reference `line`, as returned by `service.exploration.NormalityStatistics.normality_tests`.
+    Returns:
+        list: PNG bytes of the charts.
+    """
+    images = []
+    for column, points in qq_data.items():
+        figure = Figure()
+        x_range = _padded(points.get_column("theoretical").min(), points.get_column("theoretical").max())
+        y_range = _padded(points.get_column("sample").min(), points.get_column("sample").max())
+        axes = figure.axes(x_range, y_range, f"Q-Q Plot of {column}", "Theoretical Quantiles", "Sample Quantiles")
+        axes.draw_grid(nice_ticks(*x_range), nice_ticks(*y_range))
+        painter = figure.painter
+        painter.save()
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("black"))
+        for x_value, y_value in points.select("theoretical", "sample").iter_rows():
+            painter.drawEllipse(QPointF(axes.x(x_value), axes.y(y_value)), 1.8, 1.8)
+        painter.restore()
+        _draw_polyline(axes, points.select("theoretical", "line"), QColor("red"))
+        images.append(figure.to_png())
+    return images
+
+def _diverging_pixels(values):
+    """ARGB pixels of a blue-white-red scale over [-1, 1], as ggcorrplot's default colours; NaN is grey."""
+    share = np.nan_to_num(np.clip(np.abs(values), 0, 1))
+    fade = np.round(255 * (1 - share)).astype(np.uint32)
+    red = np.where(values >= 0, 255, fade)
+    blue = np.where(values >= 0, fade, 255)
+    pixels = (np.uint32(0xFF) << 24) | (red << 16) | (fade << 8) | blue
+    return np.where(np.isnan(values), np.uint32(0xFFBEBEBE), pixels).astype(np.uint32)
+
+def render_correlation_heatmap(correlation, columns, title="Correlation Matrix"):
+    """
+    Renders a correlation matrix as a heatmap, like `ggcorrplot(type = "upper")`: the upper
+    triangle is painted from the matrix in one image, one pixel per cell, scaled to the panel,
+    so the cost does not grow with the number of cells drawn. Variable names are written
+    when they fit and the correlations when there are at most MAX_HEATMAP_LABELS variables.
+    Args:
+        correlation (np.ndarray): k x k correlation matrix.
+        columns (list): Variable names.
+    Returns:
+        list: PNG bytes of the chart.
+    """
+    count = len(columns)
+    figure = Figure()
+    painter = figure.painter
+    metrics = painter.fontMetrics()
+    painter.save()
+    title_font = QFont(figure.font)
+    title_font.setPixelSize(16)
+    painter.setFont(title_font)
+    painter.setPen(TEXT_COLOR)
+    painter.drawText(QPointF(20, 28), title)
+    painter.restore()
+
+    named = count <= figure.height // (metrics.height() + 2)
+    margin = min(160, max(metrics.horizontalAdvance(column) for column in columns) + 10) if named and count else 20
+    side = min(figure.width - margin - 110, figure.height - 45 - margin)
+    rect = QRectF(margin + 10, 45, side, side)
+    upper = np.triu(np.ones((count, count), dtype=bool))
+    pixels = np.where(upper, _diverging_pixels(correlation), np.uint32(0xFFFFFFFF))
+    image = QImage(np.ascontiguousarray(pixels).tobytes(), count, count, 4 * count, QImage.Format.Format_ARGB32).copy()
+    painter.save()
+    painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, False)
+    painter.drawImage(rect, image)
+    painter.restore()
+
+    cell = side / max(count, 1)
+    painter.save()
+    painter.setPen(TEXT_COLOR)
+    if named:
+        for index, column in enumerate(columns):
+            text = metrics.elidedText(column, Qt.TextElideMode.ElideRight, int(margin - 10))
+            painter.drawText(QPointF(rect.left() - metrics.horizontalAdvance(text) - 5, rect.top() + (index + 0.5) * cell + metrics.ascent() / 2 - 1), text)
+            painter.save()
+            painter.translate(rect.left() + (index + 0.5) * cell + metrics.ascent() / 2 - 1, rect.bottom() + 5)
+            painter.rotate(90)
+            painter.drawText(QPointF(0, 0), text)
+            painter.restore()
+    if count <= MAX_HEATMAP_LABELS:
+        for row in range(count):
+            for column in range(row, count):
+                value = correlation[row, column]
+                if not np.isnan(value):
+                    painter.drawText(QRectF(rect.left() + column * cell, rect.top() + row * cell, cell, cell), Qt.AlignmentFlag.AlignCenter, f"{value:.2f}")
+    bar = QRectF(rect.right() + 30, rect.top() + side * 0.25, 16, side * 0.5)
+    gradient = QLinearGradient(bar.topLeft(), bar.bottomLeft())
+    gradient.setColorAt(0, QColor("red"))
+    gradient.setColorAt(0.5, QColor("white"))
+    gradient.setColorAt(1, QColor("blue"))
+    painter.fillRect(bar, gradient)
+    painter.drawText(QPointF(bar.left(), bar.top() - 8), "Corr")
+    for value, y in ((1, bar.top()), (0, bar.center().y()), (-1, bar.bottom())):
+        painter.drawText(QPointF(bar.right() + 5, y + metrics.ascent() / 2 - 1), str(value))
+    painter.restore()
+    return [figure.to_png()]
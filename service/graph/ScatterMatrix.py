@@ -0,0 +1,244 @@
+import os
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import polars as pl
+from PyQt6.QtCore import Qt, QRectF, QPointF
+from PyQt6.QtGui import QImage, QPainter, QColor, QFont, QPolygonF
+from service.session.Autosave import block_fingerprint
+from service.graph.NativePlot import (
+    Axes, Figure, TEXT_COLOR, TICK_COLOR, MAX_SCATTER_POINTS,
+    scatter_sample, density_curves, nice_ticks, format_number, _padded, _draw_polyline,
+)
+
+PANEL_SIZE = 200
+HEXBIN_THRESHOLD = 20_000
+HEX_RADIUS = 6
+MAX_CACHED_PANELS = 200
+HEX_LOW_COLOR = QColor("#56B1F7")
+HEX_HIGH_COLOR = QColor("#132B43")
+
+class PanelCache:
+    """
+    Least recently used cache of rendered scatter matrix panels (QImages).
+    Keys hold the panel kind, the column pair, the content fingerprints of both columns and
+    the drawing options, so a panel is reused for as long as its data and options are the same.
+    Attributes:
+        max_panels (int): Number of panels kept.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to render.
+    """
+
+    def __init__(self, max_panels=MAX_CACHED_PANELS):
+        self.max_panels = max_panels
+        self.hits = 0
+        self.misses = 0
+        self._panels = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            panel = self._panels.get(key)
+            if panel is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._panels.move_to_end(key)
+            return panel
+
+    def put(self, key, panel):
+        with self._lock:
+            self._panels[key] = panel
+            self._panels.move_to_end(key)
+            while len(self._panels) > self.max_panels:
+                self._panels.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._panels.clear()
+            self.hits = self.misses = 0
+
+PANEL_CACHE = PanelCache()
+
+def hexbin_counts(frame, x, y, x_range, y_range, size=PANEL_SIZE, radius=HEX_RADIUS):
+    """
+    Counts the points of every hexagon of a pointy-top grid laid over a `size` pixel panel.
+    A hexagonal grid is the union of two rectangular lattices offset by half a cell; each
+    point goes to the nearer of its two candidate centres, computed with polars expressions
+    over all rows (no sampling).
+    Returns:
+        pl.DataFrame: Columns `cx`, `cy` (hexagon centres in panel pixels) and `count`.
+    """
+    width, height = math.sqrt(3) * radius, 3 * radius
+    px = (pl.col(x) - x_range[0]) / ((x_range[1] - x_range[0]) or 1.0) * size
+    py = size - (pl.col(y) - y_range[0]) / ((y_range[1] - y_range[0]) or 1.0) * size
+    a_i, a_j = (px / width).round(), (py / height).round()
+    b_i, b_j = (px / width).floor(), (py / height).floor()
+    a_x, a_y = a_i * width, a_j * height
+    b_x, b_y = b_i * width + width / 2, b_j * height + height / 2
+    nearer_a = (px - a_x) ** 2 + (py - a_y) ** 2 <= (px - b_x) ** 2 + (py - b_y) ** 2
+    return (
+        frame.lazy()
+        .select(
+            cx=pl.when(nearer_a).then(a_x).otherwise(b_x),
+            cy=pl.when(nearer_a).then(a_y).otherwise(b_y),
+        )
+        .group_by("cx", "cy")
+        .agg(count=pl.len())
+        .collect()
+    )
+
+def _hex_color(count, top):
+    share = math.log1p(count) / math.log1p(top) if top > 1 else 1.0
+    return QColor.fromRgbF(*[
+        low + (high - low) * share
+        for low, high in zip(HEX_LOW_COLOR.getRgbF()[:3], HEX_HIGH_COLOR.getRgbF()[:3])
+    ])
+
+def _new_panel(fill):
+    image = QImage(PANEL_SIZE, PANEL_SIZE, QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(QColor(fill))
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    font = QFont()
+    font.setPixelSize(12)
+    painter.setFont(font)
+    return image, painter
+
+def render_scatter_panel(frame, x, y, x_range, y_range, regression=False):
+    """Renders one lower panel: thinned points, or hexagon counts above HEXBIN_THRESHOLD rows, and optionally a least squares line."""
+    image, painter = _new_panel("#f7f7f7")
+    axes = Axes(painter, QRectF(0, 0, PANEL_SIZE, PANEL_SIZE), x_range, y_range)
+    axes.draw_grid(nice_ticks(*x_range, 3), nice_ticks(*y_range, 3), tick_labels=False)
+    data = frame.select(x, y).drop_nulls()
+    painter.save()
+    painter.setPen(Qt.PenStyle.NoPen)
+    if data.height > HEXBIN_THRESHOLD:
+        counts = hexbin_counts(data, x, y, x_range, y_range)
+        top = counts.get_column("count").max() or 1
+        corners = [
+            QPointF(HEX_RADIUS * math.cos(math.radians(30 + 60 * side)), HEX_RADIUS * math.sin(math.radians(30 + 60 * side)))
+            for side in range(6)
+        ]
+        for center_x, center_y, count in counts.iter_rows():
+            painter.setBrush(_hex_color(count, top))
+            painter.drawPolygon(QPolygonF([QPointF(center_x, center_y) + corner for corner in corners]))
+    else:
+        painter.setBrush(QColor(0, 0, 0, 110))
+        sample = scatter_sample(data, MAX_SCATTER_POINTS)
+        radius = 1.6 if sample.height < 2000 else 1.0
+        for x_value, y_value in sample.iter_rows():
+            painter.drawEllipse(QPointF(axes.x(x_value), axes.y(y_value)), radius, radius)
+    painter.restore()
+    if regression:
+        slope, mean_x, mean_y = data.select(
+            (pl.cov(x, y) / pl.col(x).var()).alias("slope"), pl.col(x).mean().alias("mean_x"), pl.col(y).mean().alias("mean_y")
+        ).row(0)
+        if slope is not None and math.isfinite(slope):
+            line = [(x_value, mean_y + slope * (x_value - mean_x)) for x_value in x_range]
+            _draw_polyline(axes, pl.DataFrame(line, schema=["x", "y"], orient="row"), QColor("#3366FF"), 1.5)
+    painter.end()
+    return image
+
+def render_correlation_panel(frame, x, y, correlation=False):
+    """Renders one upper panel: the Pearson correlation of the pair, or nothing."""
+    image, painter = _new_panel("#f7f7f7")
+    if correlation:
+        r = frame.select(x, y).drop_nulls().select(pl.corr(x, y)).item()
+        if r is not None:
+            painter.setPen(TEXT_COLOR)
+            painter.drawText(QRectF(0, 0, PANEL_SIZE, PANEL_SIZE), Qt.AlignmentFlag.AlignCenter, f"Corr:\n{r:.3f}")
+    painter.end()
+    return image
+
+def render_density_panel(frame, column, x_range, density=False):
+    """Renders one diagonal panel: the kernel density of the column, or nothing."""
+    image, painter = _new_panel("#ffffff")
+    if density:
+        xs, ys = density_curves(frame.select(column).drop_nulls(), [column])[column]
+        if xs:
+            axes = Axes(painter, QRectF(0, 0, PANEL_SIZE, PANEL_SIZE), x_range, (0, max(ys) * 1.05))
+            _draw_polyline(axes, pl.DataFrame({"x": xs, "y": ys}), QColor("#333333"))
+    painter.end()
+    return image
+
+def render_scatter_matrix(frame, columns, regression=False, correlation=False, density=False, cache=PANEL_CACHE):
+    """
+    Renders a scatter plot matrix like GGally's `ggpairs`: points (and optionally a least
+    squares line) below the diagonal, correlations above it and densities on it.
+    Every panel is rendered on its own at PANEL_SIZE pixels from the rows complete in its own
+    columns (missing and non-finite values are dropped per panel, not per matrix) and kept in
+    `cache` under its column pair, the content fingerprints of both columns and the options;
+    panels not in the cache are rendered in parallel and the matrix is assembled from them.
+    Adding a variable therefore renders only its new row and column, also when it has missing
+    values. Above HEXBIN_THRESHOLD rows the points are replaced by hexagon counts over every row.
+    Returns:
+        tuple: (list with the PNG bytes of the chart, number of panels rendered).
+    """
+    size = len(columns)
+    frame = frame.select(pl.when(pl.col(column).is_finite()).then(pl.col(column)).alias(column) for column in columns)
+    fingerprints = {column: block_fingerprint(frame.get_column(column)) for column in columns}
+    bounds = frame.select([pl.struct(low=pl.col(c).min(), high=pl.col(c).max()).alias(c) for c in columns]).row(0, named=True)
+    ranges = {column: _padded(bounds[column]["low"], bounds[column]["high"]) for column in columns}
+
+    jobs = {}
+    for i, row_column in enumerate(columns):
+        for j, column in enumerate(columns):
+            if i > j:
+                key = ("scatter", column, row_column, fingerprints[column], fingerprints[row_column], regression, PANEL_SIZE)
+                job = (render_scatter_panel, frame, column, row_column, ranges[column], ranges[row_column], regression)
+            elif i < j:
+                key = ("correlation", row_column, column, fingerprints[row_column], fingerprints[column], correlation, PANEL_SIZE)
+                job = (render_correlation_panel, frame, row_column, column, correlation)
+            else:
+                key = ("density", column, fingerprints[column], density, PANEL_SIZE)
+                job = (render_density_panel, frame, column, ranges[column], density)
+            jobs[(i, j)] = (key, job)
+
+    panels = {position: cache.get(key) for position, (key, _) in jobs.items()}
+    missing = [position for position, panel in panels.items() if panel is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(len(missing), os.cpu_count() or 1)) as executor:
+            futures = {position: executor.submit(*jobs[position][1]) for position in missing}
+            for position, future in futures.items():
+                panels[position] = future.result()
+                cache.put(jobs[position][0], panels[position])
+
+    margin, strip, cell = 60, 22, PANEL_SIZE + 6
+    figure = Figure(margin + size * cell + strip + 10, 10 + strip + size * cell + 30)
+    painter = figure.painter
+    for i, row_column in enumerate(columns):
+        for j, column in enumerate(columns):
+            rect = QRectF(margin + j * cell + 3, 10 + strip + i * cell + 3, PANEL_SIZE, PANEL_SIZE)
+            painter.drawImage(rect.topLeft(), panels[(i, j)])
+            if i == size - 1:
+                axes = figure.panel(rect, ranges[column], (0, 1))
+                painter.save()
+                painter.setPen(TICK_COLOR)
+                for value in nice_ticks(*ranges[column], 3):
+                    text = format_number(value)
+                    painter.drawText(QPointF(axes.x(value) - painter.fontMetrics().horizontalAdvance(text) / 2,
+                                             rect.bottom() + painter.fontMetrics().ascent() + 4), text)
+                painter.restore()
+            if j == 0 and i > 0:
+                axes = figure.panel(rect, (0, 1), ranges[row_column])
+                painter.save()
+                painter.setPen(TICK_COLOR)
+                for value in nice_ticks(*ranges[row_column], 3):
+                    text = format_number(value)
+                    painter.drawText(QPointF(rect.left() - painter.fontMetrics().horizontalAdvance(text) - 5,
+                                             axes.y(value) + painter.fontMetrics().ascent() / 2 - 1), text)
+                painter.restore()
+        painter.save()
+        painter.setPen(TEXT_COLOR)
+        top_strip = QRectF(margin + i * cell, 10, cell, strip)
+        painter.fillRect(top_strip.adjusted(3, 0, -3, -2), QColor("#d9d9d9"))
+        painter.drawText(top_strip, Qt.AlignmentFlag.AlignCenter, painter.fontMetrics().elidedText(row_column, Qt.TextElideMode.ElideRight, int(cell - 8)))
+        side_strip = QRectF(margin + size * cell, 10 + strip + i * cell, strip, cell)
+        painter.fillRect(side_strip.adjusted(2, 3, 0, -3), QColor("#d9d9d9"))
+        painter.translate(side_strip.center())
+        painter.rotate(90)
+        painter.drawText(QRectF(-cell / 2, -strip / 2, cell, strip), Qt.AlignmentFlag.AlignCenter, painter.fontMetrics().elidedText(row_column, Qt.TextElideMode.ElideRight, int(cell - 8)))
+        painter.restore()
+    return [figure.to_png()], len(missing)
@@ -1,23 +1,26 @@
 import os
-import polars as pl
 from PyQt6.QtWidgets import QMessageBox
 
 import rpy2.robjects as ro
-import rpy2.robjects.lib.grdevices as grdevices
+from service.utils.plot_render import render_r_plots
+from service.graph.NativePlot import plot_frame
+from service.graph.ScatterMatrix import render_scatter_matrix
+from service.utils.analysis_view import AnalysisView, output_key
 
 def run_scatterplot(parent):
     """
     Generates scatterplots using data from two models and saves them as images.
-    This function activates the R environment, retrieves data from two models,
-    merges the data, converts it to an R DataFrame, and executes an R script
-    to generate scatterplots. The scatterplots are then saved as PNG images.
+    This function activates the R environment, retrieves data from two models
+    (only the selected columns when `parent.options` is set by the dialog),
+    converts it to an R DataFrame, and executes an R script
+    to generate scatterplots. The scatterplots are then rendered to PNG bytes in memory.
     Args:
         parent: An object that contains the following attributes:
             - activate_R(): A method to activate the R environment.
             - model1: An object with a get_data() method that returns a Polars DataFrame.
             - model2: An object with a get_data() method that returns a Polars DataFrame.
             - r_script: A string containing the R script to be executed.
-            - plot: An attribute to store the list of generated plot image paths.
+            - plot: An attribute to store the PNG bytes of the generated plots.
             - error: An attribute to indicate if an error occurred.
             - result: An attribute to store the error message if an error occurred.
     Raises:
@@ -33,12 +36,9 @@ def run_scatterplot(parent):
         parent.activate_R()
 
         # Get data from model1 and model2
-        df1 = parent.model1.get_data()
-        df2 = parent.model2.get_data()
-
-        # Merge the data into one dataframe
-        df = pl.concat([df1, df2], how="horizontal")
-        df = df.drop_nulls() 
+        options = getattr(parent, "options", None)
+        columns = options["columns"] if options else None
+        df = AnalysisView(parent.model1, parent.model2, output_key(parent)).complete(columns).collect()
 
         # Convert Polars DataFrame to R DataFrame
         with rpy2polars.converter.context() as cv_ctx:
@@ -64,29 +64,33 @@ def run_scatterplot(parent):
         # Find scatterplot objects
         scatterplot_vars = [obj for obj in r_objects if obj.startswith("scatterplot_")]
 
-        plot_paths = []
-
-        # Save scatterplots as images
-        for plot_name in scatterplot_vars:
-            plot_path = f"{plot_name}.png"
-            
-            # Specify the output file for the image
-            grdevices.png(file=plot_path, width=800, height=600)
-
-            # Print the plot
-            ro.r(f"print({plot_name})")
-            
-            # Close the image device
-            grdevices.dev_off()
-
-            # Save the image path to the list
-            plot_paths.append(plot_path)
-
-        # Save the plot results in the parent (optional)
-        parent.plot = plot_paths  # All plots are stored in a list
+        # Render the scatterplots in memory and store them in the parent
+        parent.plot = render_r_plots(scatterplot_vars)
 
     except Exception as e:
         parent.error = True
         parent.result = str(e)
         print(str(e))
         return
+
+def run_native_scatterplot(parent):
+    """
+    Renders the scatter plot matrix in Python, without R (the "Quick Preview" renderer).
+    Only the selected columns are read from the sheets. The matrix is assembled from panels
+    cached by `render_scatter_matrix`, so only panels whose columns or options changed since
+    an earlier run are rendered (in parallel). Rows are kept whole; each panel drops the rows
+    missing in its own columns, as ggpairs does.
+    Args:
+        parent: The Scatterplot model; `options` holds `columns`, `regression`, `correlation` and `density`.
+            The PNG bytes are stored in `plot`, and a short summary in `result`. On failure
+            `error` is set and `result` holds the message.
+    """
+    options = parent.options
+    try:
+        frame = plot_frame(parent.model1, parent.model2, options["columns"], key=output_key(parent), complete=False)
+        parent.plot, rendered = render_scatter_matrix(frame, options["columns"], options["regression"], options["correlation"], options["density"])
+        panels = len(options["columns"]) ** 2
+        parent.result = f"Quick preview of {frame.height:,} rows; {rendered} of {panels} panels rendered, the rest reused."
+    except Exception as e:
+        parent.error = True
+        parent.result = str(e)
@@ -1,5 +1,6 @@
 from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QComboBox
 from PyQt6.QtWidgets import QMessageBox
+from service.exploration.SelectionStatistics import pending_formula_script
 
 def assign_of_interest(parent):
     """
@@ -73,6 +74,27 @@ def assign_auxilary(parent):
             parent.variables_list.model().removeRow(index.row())  # Remove from variables list
         show_r_script(parent)
 
+def assign_selected_auxilary(parent):
+    """
+    Assigns the auxiliary variables chosen by the last LASSO selection of the Variable Selection
+    dialog to the parent's auxiliary variables list. The main window hands the selection to one
+    SAE dialog only, and drops it when the data editor changed after the selection was run.
+    Parameters:
+    parent (object): The parent object containing the variables list and auxiliary variables list.
+    Only the selected variables that are numeric columns of the parent's data are assigned; they
+    are removed from the variables list and the R script display is updated.
+    """
+    
+    take = getattr(parent.parent, "take_selected_auxiliaries", None)
+    selected = [f"{name} [Numeric]" for name in (take() if take else [])]
+    new_vars = [var for var in selected if var in parent.variables_model.stringList()]
+    if not new_vars:
+        return
+    parent.auxilary_vars = list(dict.fromkeys(parent.auxilary_vars + new_vars))
+    parent.auxilary_model.setStringList(parent.auxilary_vars)
+    parent.variables_model.setStringList([var for var in parent.variables_model.stringList() if var not in new_vars])
+    show_r_script(parent)
+
 def assign_vardir(parent):
     """
     Assigns a variable directory (vardir) from the selected variables in the parent object's variables list.
@@ -240,9 +262,9 @@ def generate_r_script(parent):
     r_script += f'vardir_var <- data["{vardir_var}"]\n'
     if parent.selection_method=="Stepwise":
         parent.selection_method = "both"
-    if parent.selection_method and parent.selection_method != "None" and auxilary_vars:
-        r_script += f'stepwise_model <- step(formula, direction="{parent.selection_method.lower()}")\n'
-        r_script += f'final_formula <- formula(stepwise_model)\n'
+    if parent.selection_method and parent.selection_method != "None" and parent.of_interest_var and parent.auxilary_vars:
+        r_script += pending_formula_script(parent.of_interest_var[0], parent.auxilary_vars, parent.as_factor_var,
+                                           parent.selection_method.lower())
         r_script += f'model<-mseFH(final_formula, {vardir_var}, method = "{parent.method}", data=data)'
     else:
         r_script += f'model<-mseFH(formula, {vardir_var}, method = "{parent.method}", data=data)'
@@ -289,12 +311,13 @@ def show_options(parent):
 
     layout = QVBoxLayout()
 
-    # method_label = QLabel("Stepwise Selection Method:")
-    # layout.addWidget(method_label)
+    selection_label = QLabel("Stepwise Selection Method:")
+    layout.addWidget(selection_label)
 
-    # parent.method_combo = QComboBox()
-    # parent.method_combo.addItems(["None", "Stepwise", "Forward", "Backward"])
-    # layout.addWidget(parent.method_combo)
+    parent.method_combo = QComboBox()
+    parent.method_combo.addItems(["None", "Stepwise", "Forward", "Backward"])
+    parent.method_combo.setCurrentText("Stepwise" if parent.selection_method == "both" else parent.selection_method)
+    layout.addWidget(parent.method_combo)
 
     method_label = QLabel("Method:")
     layout.addWidget(method_label)
@@ -333,7 +356,7 @@ def set_selection_method(parent, dialog):
         None
     """
     
-    # parent.selection_method = parent.method_combo.currentText()
+    parent.selection_method = parent.method_combo.currentText()
     parent.method = parent.method_selection.currentText()
     dialog.accept()
     show_r_script(parent)
\ No newline at end of file
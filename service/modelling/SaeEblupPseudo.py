@@ -1,5 +1,6 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QPushButton, QHBoxLayout
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QPushButton, QHBoxLayout, QLabel, QComboBox
 from PyQt6.QtWidgets import QMessageBox
+from service.exploration.SelectionStatistics import pending_formula_script
 
 def assign_of_interest(parent):
     """
@@ -263,9 +264,9 @@ def generate_r_script(parent):
     r_script += f'vardir_var <- data["{vardir_var}"]\n'
     if parent.selection_method=="Stepwise":
         parent.selection_method = "both"
-    if parent.selection_method and parent.selection_method != "None" and auxilary_vars:
-        r_script += f'stepwise_model <- step(formula, direction="{parent.selection_method.lower()}")\n'
-        r_script += f'final_formula <- formula(stepwise_model)\n'
+    if parent.selection_method and parent.selection_method != "None" and parent.of_interest_var and parent.auxilary_vars:
+        r_script += pending_formula_script(parent.of_interest_var[0], parent.auxilary_vars, parent.as_factor_var,
+                                           parent.selection_method.lower())
         r_script += f'model<-fh(final_formula, vardir="{vardir_var}", combined_data =data, domains={domain_var}, method = "reblupbc", MSE=TRUE, mse_type = "pseudo")'
     else:
         r_script += f'model<-fh(formula, vardir="{vardir_var}", combined_data =data, domains={domain_var}, method = "reblupbc", MSE=TRUE, mse_type = "pseudo")'
@@ -309,12 +310,13 @@ def show_options(parent):
 
     layout = QVBoxLayout()
 
-    # method_label = QLabel("Stepwise Selection Method:")
-    # layout.addWidget(method_label)
+    selection_label = QLabel("Stepwise Selection Method:")
+    layout.addWidget(selection_label)
 
-    # parent.method_combo = QComboBox()
-    # parent.method_combo.addItems(["None", "Stepwise", "Forward", "Backward"])
-    # layout.addWidget(parent.method_combo)
+    parent.method_combo = QComboBox()
+    parent.method_combo.addItems(["None", "Stepwise", "Forward", "Backward"])
+    parent.method_combo.setCurrentText("Stepwise" if parent.selection_method == "both" else parent.selection_method)
+    layout.addWidget(parent.method_combo)
 
     button_layout = QHBoxLayout()
     ok_button = QPushButton("OK")
@@ -344,6 +346,6 @@ def set_selection_method(parent, dialog):
         None
     """
     
-    # parent.selection_method = parent.method_combo.currentText()
+    parent.selection_method = parent.method_combo.currentText()
     dialog.accept()
     show_r_script(parent)
\ No newline at end of file
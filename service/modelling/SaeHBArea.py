@@ -1,6 +1,7 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QLineEdit
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QLineEdit, QComboBox
 from PyQt6.QtGui import QIntValidator
 from PyQt6.QtWidgets import QMessageBox
+from service.exploration.SelectionStatistics import pending_formula_script
 
 def assign_of_interest(parent):
     """
@@ -73,6 +74,27 @@ def assign_auxilary(parent):
             parent.variables_list.model().removeRow(index.row())  # Remove from variables list
         show_r_script(parent)
 
+def assign_selected_auxilary(parent):
+    """
+    Assigns the auxiliary variables chosen by the last LASSO selection of the Variable Selection
+    dialog to the parent's auxiliary variables list. The main window hands the selection to one
+    SAE dialog only, and drops it when the data editor changed after the selection was run.
+    Parameters:
+    parent (object): The parent object containing the variables list and auxiliary variables list.
+    Only the selected variables that are numeric columns of the parent's data are assigned; they
+    are removed from the variables list and the R script display is updated.
+    """
+    
+    take = getattr(parent.parent, "take_selected_auxiliaries", None)
+    selected = [f"{name} [Numeric]" for name in (take() if take else [])]
+    new_vars = [var for var in selected if var in parent.variables_model.stringList()]
+    if not new_vars:
+        return
+    parent.auxilary_vars = list(dict.fromkeys(parent.auxilary_vars + new_vars))
+    parent.auxilary_model.setStringList(parent.auxilary_vars)
+    parent.variables_model.setStringList([var for var in parent.variables_model.stringList() if var not in new_vars])
+    show_r_script(parent)
+
 def assign_vardir(parent):
     """
     Assigns a variable directory (vardir) from the selected variables in the parent object's variables list.
@@ -240,9 +262,9 @@ def generate_r_script(parent):
     r_script += f'formula <- {formula}\n'
     if parent.selection_method=="Stepwise":
         parent.selection_method = "both"
-    if parent.selection_method and parent.selection_method != "None" and auxilary_vars:
-        r_script += f'stepwise_model <- step(formula, direction="{parent.selection_method.lower()}")\n'
-        r_script += f'final_formula <- formula(stepwise_model)\n'
+    if parent.selection_method and parent.selection_method != "None" and parent.of_interest_var and parent.auxilary_vars:
+        r_script += pending_formula_script(parent.of_interest_var[0], parent.auxilary_vars, parent.as_factor_var,
+                                           parent.selection_method.lower())
         r_script += f'model<-{parent.model_method} (final_formula, iter.update={parent.iter_update}, iter.mcmc = {parent.iter_mcmc}, burn.in ={parent.burn_in} , data=data)'
     else:
         r_script += f'model<-{parent.model_method} (formula, iter.update={parent.iter_update}, iter.mcmc = {parent.iter_mcmc}, burn.in ={parent.burn_in}, data=data)'
@@ -288,12 +310,13 @@ def show_options(parent):
 
     layout = QVBoxLayout()
 
-    method_label = QLabel("Stepwise Selection Method:")
-    # layout.addWidget(method_label)
+    selection_label = QLabel("Stepwise Selection Method:")
+    layout.addWidget(selection_label)
 
-    # parent.method_combo = QComboBox()
-    # parent.method_combo.addItems(["None", "Stepwise", "Forward", "Backward"])
-    # layout.addWidget(parent.method_combo)
+    parent.method_combo = QComboBox()
+    parent.method_combo.addItems(["None", "Stepwise", "Forward", "Backward"])
+    parent.method_combo.setCurrentText("Stepwise" if parent.selection_method == "both" else parent.selection_method)
+    layout.addWidget(parent.method_combo)
 
     iter_update_label = QLabel("Number of Iteration Update (minimum 2):")
     layout.addWidget(iter_update_label)
@@ -350,7 +373,7 @@ def set_selection_method(parent, dialog):
         Accepts the dialog and calls the show_r_script function with the parent object.
     """
     
-    # parent.selection_method = parent.method_combo.currentText()
+    parent.selection_method = parent.method_combo.currentText()
     parent.iter_update = parent.iter_update.text()
     parent.iter_mcmc = parent.iter_mcmc.text()
     parent.burn_in = parent.burn_in.text()
@@ -25,7 +25,7 @@ def run_model_eblup_pseudo(parent):
     
     import rpy2.robjects as ro
     parent.activate_R()
-    df = parent.model1.get_data()
+    df = parent.model1.get_view_data()
     df = df.drop_nulls()
     convert_df(df, parent)
     result = ""
@@ -0,0 +1,193 @@
+import os
+import io
+import json
+import uuid
+import hashlib
+import datetime
+import threading
+
+MANIFEST_NAME = "manifest.json"
+PREVIOUS_MANIFEST_NAME = "manifest.prev.json"
+MANIFEST_VERSION = 1
+BLOCK_ROWS = 262144
+
+def block_fingerprint(series):
+    """
+    Returns a content fingerprint of a column block (name, dtype and values), computed with
+    Polars' vectorized row hashing so it costs a single pass over the block.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{series.name}\x00{series.dtype}\x00{series.len()}".encode("utf-8"))
+    digest.update(series.hash(seed=0).to_numpy().tobytes())
+    return digest.hexdigest()
+
+def write_atomic(path, payload):
+    """Writes bytes to `path` through a temporary file and an atomic rename."""
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(payload)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+class AutosaveWriter:
+    """
+    Incremental binary autosave of the session.
+    Every column of a sheet is split into blocks of `block_rows` rows and each block is stored as
+    an uncompressed Arrow IPC file named after its content fingerprint. A snapshot only writes
+    the blocks that do not exist on disk yet, so editing a few cells rewrites one block of one
+    column instead of the whole dataset. The JSON manifest that lists the blocks of each sheet
+    is written last with an atomic rename: a crash in the middle of a snapshot always leaves
+    the previous complete snapshot in place. The manifest being replaced is kept as
+    `manifest.prev.json` together with its blocks, and each block records its size and
+    BLAKE2 checksum, so recovery can verify a snapshot and fall back to the previous one.
+    Snapshots run in a background thread; `snapshot()` returns immediately and does nothing
+    when the state is unchanged since the last snapshot.
+    Attributes:
+        directory (str): The autosave directory.
+        block_rows (int): Number of rows per column block.
+        last_key (tuple): Change key of the last written snapshot.
+    Methods:
+        is_dirty(key):
+            Returns True if `key` differs from the last snapshot.
+        snapshot(sheets, output, key, wait=False):
+            Starts a snapshot of the given sheets and output records.
+        wait():
+            Waits for a running snapshot to finish.
+        write_snapshot(sheets, output):
+            Writes a snapshot synchronously and returns the number of blocks written.
+        read_manifest(name=MANIFEST_NAME):
+            Returns the current (or previous) manifest, or None if there is none.
+    """
+
+    def __init__(self, directory, block_rows=BLOCK_ROWS):
+        self.directory = directory
+        self.block_rows = block_rows
+        self.last_key = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def read_manifest(self, name=MANIFEST_NAME):
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def is_dirty(self, key):
+        return key != self.last_key
+
+    def snapshot(self, sheets, output, key, wait=False):
+        """
+        Args:
+            sheets (dict): Sheet name to pl.DataFrame (immutable, safe to hand to a thread).
+            output (list): JSON-serializable output records.
+            key (tuple): Change key of this state; nothing is written if it equals the last one.
+            wait (bool): Block until the snapshot is written (used on exit).
+        Returns:
+            bool: True if a snapshot was started.
+        """
+        if not self.is_dirty(key):
+            return False
+        if self._thread is not None and self._thread.is_alive():
+            if not wait:
+                return False  # Still dirty, the next autosave retries
+            self._thread.join()
+
+        def autosave_thread():
+            try:
+                self.write_snapshot(sheets, output)
+                self.last_key = key
+            except Exception as e:
+                print(f"Autosave failed: {e}")
+
+        self._thread = threading.Thread(target=autosave_thread, name="Autosave", daemon=not wait)
+        self._thread.start()
+        if wait:
+            self._thread.join()
+        return True
+
+    def wait(self):
+        if self._thread is not None:
+            self._thread.join()
+
+    def _write_block(self, series, existing):
+        fingerprint = block_fingerprint(series)
+        file_name = f"{fingerprint}.arrow"
+        if file_name in existing:
+            return existing[file_name], False
+        buffer = io.BytesIO()
+        series.to_frame().write_ipc(buffer, compression="uncompressed")
+        payload = buffer.getvalue()
+        write_atomic(os.path.join(self.directory, file_name), payload)
+        block = {
+            "file": file_name,
+            "rows": series.len(),
+            "size": len(payload),
+            "checksum": hashlib.blake2b(payload, digest_size=16).hexdigest(),
+        }
+        existing[file_name] = block
+        return block, True
+
+    @staticmethod
+    def _blocks(manifest):
+        return [
+            block
+            for sheet in (manifest or {}).get("sheets", {}).values()
+            for column in sheet.get("columns", [])
+            for block in column.get("blocks", [])
+        ]
+
+    def _existing_blocks(self):
+        """Blocks of the current and previous manifests whose files are still on disk, keyed by file name."""
+        on_disk = set(os.listdir(self.directory))
+        blocks = self._blocks(self.read_manifest(PREVIOUS_MANIFEST_NAME)) + self._blocks(self.read_manifest())
+        return {block["file"]: block for block in blocks if block["file"] in on_disk}
+
+    def write_snapshot(self, sheets, output):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            existing = self._existing_blocks()
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "timestamp": datetime.datetime.now().isoformat(),
+                "sheets": {},
+                "output": output,
+            }
+            written = 0
+            referenced = set()
+            for sheet_name, data in sheets.items():
+                columns = []
+                for series in data.iter_columns():
+                    blocks = []
+                    for offset in range(0, max(series.len(), 1), self.block_rows):
+                        block, changed = self._write_block(series.slice(offset, self.block_rows), existing)
+                        written += changed
+                        referenced.add(block["file"])
+                        blocks.append(block)
+                    columns.append({"name": series.name, "dtype": str(series.dtype), "blocks": blocks})
+                manifest["sheets"][sheet_name] = {"height": data.height, "columns": columns}
+
+            manifest_path = os.path.join(self.directory, MANIFEST_NAME)
+            previous_path = os.path.join(self.directory, PREVIOUS_MANIFEST_NAME)
+            temp_path = f"{manifest_path}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(json.dumps(manifest).encode("utf-8"))
+                file.flush()
+                os.fsync(file.fileno())
+            if os.path.exists(manifest_path):
+                os.replace(manifest_path, previous_path)
+            os.replace(temp_path, manifest_path)
+
+            # Blocks referenced by neither manifest and leftovers of interrupted writes
+            referenced.update(block["file"] for block in self._blocks(self.read_manifest(PREVIOUS_MANIFEST_NAME)))
+            for name in os.listdir(self.directory):
+                if (name.endswith(".arrow") and name not in referenced) or name.endswith(".tmp"):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+            return written
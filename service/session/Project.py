@@ -0,0 +1,292 @@
+import io
+import os
+import json
+import struct
+import shutil
+import hashlib
+import zipfile
+import datetime
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from service.session.Autosave import block_fingerprint
+
+PROJECT_FORMAT = "sae-pisan-project"
+PROJECT_VERSION = 1
+PROJECT_EXTENSION = ".saep"
+MANIFEST_ENTRY = "manifest.json"
+SHEET_BATCH_ROWS = 262_144
+LOCAL_HEADER_SIZE = 30
+
+def frame_fingerprint(data):
+    """Content fingerprint of a DataFrame, combined from the vectorized hashes of its columns."""
+    digest = hashlib.blake2b(digest_size=16)
+    for series in data.iter_columns():
+        digest.update(block_fingerprint(series).encode("ascii"))
+    digest.update(str(data.height).encode("ascii"))
+    return digest.hexdigest()
+
+def _image_extension(image):
+    if image.startswith(b"\x89PNG"):
+        return "png"
+    if image.startswith(b"\xff\xd8"):
+        return "jpg"
+    return "bin"
+
+def _read_manifest(archive):
+    try:
+        manifest = json.loads(archive.read(MANIFEST_ENTRY))
+    except (KeyError, ValueError) as e:
+        raise ValueError("The file is not a SAE Pisan project.") from e
+    if manifest.get("format") != PROJECT_FORMAT:
+        raise ValueError("The file is not a SAE Pisan project.")
+    if manifest.get("version", 0) > PROJECT_VERSION:
+        raise ValueError("The project was saved by a newer version of SAE Pisan.")
+    return manifest
+
+def _copy_entry(source, target, name):
+    """Copies a stored entry from one archive to another byte for byte, without re-encoding it."""
+    info = source.getinfo(name)
+    copied = zipfile.ZipInfo(name, date_time=info.date_time)
+    copied.compress_type = info.compress_type
+    with source.open(info) as reader, target.open(copied, "w", force_zip64=True) as writer:
+        shutil.copyfileobj(reader, writer, 1024 * 1024)
+
+def save_project(file_path, sheets, outputs):
+    """
+    Saves the session as a `.saep` project: a zip archive with one Parquet file per sheet,
+    the plot images of the outputs and a JSON manifest of the output cards.
+    Parquet and images are stored without zip compression (they are already compressed), so
+    when the project is saved again over the same file, every sheet whose content fingerprint
+    is unchanged and every plot already in the archive is copied across byte for byte instead
+    of being encoded again. The new archive is written next to the target and renamed over it,
+    so a failed save never damages the existing project.
+    Args:
+        file_path (str): Path of the project file.
+        sheets (dict): Sheet name to pl.DataFrame.
+        outputs (list): Output records with `script_text`, `result_text`, `error_text` and
+            `plots` (a list of encoded images or PlotEntry references; a referenced plot that is
+            already in the target archive is copied without being read).
+    Returns:
+        int: Number of entries that had to be encoded (the rest were copied).
+    """
+    previous = None
+    if os.path.exists(file_path):
+        try:
+            previous = zipfile.ZipFile(file_path)
+            previous_manifest = _read_manifest(previous)
+        except (zipfile.BadZipFile, ValueError):
+            if previous is not None:
+                previous.close()
+            previous = None
+    previous_sheets = previous_manifest.get("sheets", {}) if previous is not None else {}
+    previous_entries = set(previous.namelist()) if previous is not None else set()
+
+    manifest = {
+        "format": PROJECT_FORMAT,
+        "version": PROJECT_VERSION,
+        "saved": datetime.datetime.now().isoformat(),
+        "sheets": {},
+        "outputs": [],
+    }
+    encoded = 0
+    temp_path = f"{file_path}.tmp"
+    try:
+        with zipfile.ZipFile(temp_path, "w", allowZip64=True) as archive:
+            for sheet_name, data in sheets.items():
+                entry = f"data/{sheet_name}.parquet"
+                fingerprint = frame_fingerprint(data)
+                if previous_sheets.get(sheet_name, {}).get("fingerprint") == fingerprint and entry in previous_entries:
+                    _copy_entry(previous, archive, entry)
+                else:
+                    buffer = io.BytesIO()
+                    data.write_parquet(buffer, compression="zstd", statistics=True)
+                    archive.writestr(entry, buffer.getvalue(), compress_type=zipfile.ZIP_STORED)
+                    encoded += 1
+                manifest["sheets"][sheet_name] = {"file": entry, "fingerprint": fingerprint, "rows": data.height}
+
+            written_plots = set()
+            for output in outputs:
+                plot_entries = []
+                for image in output.get("plots") or []:
+                    if isinstance(image, PlotEntry):
+                        entry = image.entry
+                    else:
+                        entry = f"plots/{hashlib.sha1(image).hexdigest()}.{_image_extension(image)}"
+                    if entry not in written_plots:
+                        if entry in previous_entries:
+                            _copy_entry(previous, archive, entry)
+                        else:
+                            archive.writestr(entry, plot_bytes(image), compress_type=zipfile.ZIP_STORED)
+                            encoded += 1
+                        written_plots.add(entry)
+                    plot_entries.append(entry)
+                manifest["outputs"].append({
+                    "script_text": output.get("script_text", ""),
+                    "result_text": output.get("result_text", ""),
+                    "error_text": output.get("error_text", ""),
+                    "plots": plot_entries,
+                })
+
+            archive.writestr(MANIFEST_ENTRY, json.dumps(manifest), compress_type=zipfile.ZIP_DEFLATED)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    finally:
+        if previous is not None:
+            previous.close()
+    os.replace(temp_path, file_path)
+    return encoded
+
+def _data_offset(file, header_offset):
+    """Offset of an entry's data in the archive, past its local header."""
+    file.seek(header_offset)
+    header = file.read(LOCAL_HEADER_SIZE)
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    return header_offset + LOCAL_HEADER_SIZE + name_length + extra_length
+
+def _stored_data(file, header_offset, size):
+    """Reads an uncompressed entry straight from its offset in the archive."""
+    file.seek(_data_offset(file, header_offset))
+    return file.read(size)
+
+class PlotEntry:
+    """
+    A plot image of a project file, read from the archive only when it is first needed (when
+    its output card is shown or exported) and kept afterwards. Plots are stored without zip
+    compression, so they are read straight from their offset in the file; if the file has
+    changed since the project was opened, the entry is looked up in the archive again.
+    Attributes:
+        file_path (str): Path of the project file.
+        entry (str): Name of the entry in the archive (named by the hash of its content).
+    """
+
+    def __init__(self, file_path, info, stamp):
+        self.file_path = file_path
+        self.entry = info.filename
+        self._header_offset = info.header_offset
+        self._size = info.file_size
+        self._stored = info.compress_type == zipfile.ZIP_STORED
+        self._stamp = stamp
+        self._data = None
+
+    def read(self):
+        if self._data is None:
+            try:
+                stat = os.stat(self.file_path)
+                if self._stored and (stat.st_mtime_ns, stat.st_size) == self._stamp:
+                    with open(self.file_path, "rb") as file:
+                        self._data = _stored_data(file, self._header_offset, self._size)
+                else:
+                    with zipfile.ZipFile(self.file_path) as archive:
+                        self._data = archive.read(self.entry)
+            except (OSError, KeyError, zipfile.BadZipFile):
+                return b""
+        return self._data
+
+def plot_bytes(image):
+    """The encoded bytes of a plot, read from its project file first if it is a PlotEntry."""
+    return image.read() if isinstance(image, PlotEntry) else image
+
+class ProjectFile:
+    """
+    Reader for `.saep` project files.
+    Opening a project only reads the manifest. Each sheet is decoded from its Parquet entry
+    when requested, in row batches if wanted: stored entries are read through a memory map of
+    the archive, so only the row groups and columns being decoded are paged in. Plot images are
+    returned as PlotEntry references, so their bytes are only read when their output card is
+    shown.
+    Attributes:
+        file_path (str): Path of the project file.
+        manifest (dict): The project manifest.
+    Methods:
+        sheet_names():
+            Returns the names of the sheets in the project.
+        load_sheet(sheet_name, columns=None):
+            Returns the sheet as a pl.DataFrame, optionally only some columns.
+        sheet_batches(sheet_name, batch_rows=SHEET_BATCH_ROWS):
+            Yields the sheet in row batches with (batch, rows read, total rows).
+        output_records():
+            Returns the output records with PlotEntry references to their plot images.
+        close():
+            Closes the archive.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._mapped = None
+        try:
+            self.archive = zipfile.ZipFile(file_path)
+        except zipfile.BadZipFile as e:
+            raise ValueError("The file is not a SAE Pisan project.") from e
+        try:
+            self.manifest = _read_manifest(self.archive)
+        except ValueError:
+            self.archive.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.archive.close()
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def sheet_names(self):
+        return list(self.manifest["sheets"])
+
+    def _parquet(self, sheet_name):
+        """The sheet's Parquet entry, over a zero-copy slice of the memory-mapped archive when it is stored."""
+        info = self.archive.getinfo(self.manifest["sheets"][sheet_name]["file"])
+        if info.compress_type != zipfile.ZIP_STORED:
+            return pq.ParquetFile(pa.BufferReader(self.archive.read(info)))
+        if self._mapped is None:
+            self._mapped = pa.memory_map(self.file_path)
+        start = _data_offset(self.archive.fp, info.header_offset)
+        self._mapped.seek(0)
+        return pq.ParquetFile(pa.BufferReader(self._mapped.read_buffer().slice(start, info.file_size)))
+
+    def load_sheet(self, sheet_name, columns=None):
+        return pl.from_arrow(self._parquet(sheet_name).read(columns=columns))
+
+    def sheet_batches(self, sheet_name, batch_rows=SHEET_BATCH_ROWS):
+        parquet = self._parquet(sheet_name)
+        total = parquet.metadata.num_rows
+        if total == 0:
+            yield pl.from_arrow(parquet.schema_arrow.empty_table()), 0, 0
+            return
+        rows_read = 0
+        for batch in parquet.iter_batches(batch_size=batch_rows):
+            rows_read += batch.num_rows
+            yield pl.from_arrow(batch), rows_read, total
+
+    def output_records(self):
+        stat = os.stat(self.file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        return [
+            {
+                "script_text": output.get("script_text", ""),
+                "result_text": output.get("result_text", ""),
+                "error_text": output.get("error_text", ""),
+                "plots": [PlotEntry(self.file_path, self.archive.getinfo(entry), stamp) for entry in output.get("plots", [])],
+            }
+            for output in self.manifest.get("outputs", [])
+        ]
+
+def load_project(file_path):
+    """
+    Loads a `.saep` project; plot images are PlotEntry references (see plot_bytes).
+    Returns:
+        tuple: (dict of sheet name to pl.DataFrame, list of output records).
+    Raises:
+        ValueError: If the file is not a valid project.
+    """
+    with ProjectFile(file_path) as project:
+        sheets = {sheet_name: project.load_sheet(sheet_name) for sheet_name in project.sheet_names()}
+        return sheets, project.output_records()
@@ -0,0 +1,143 @@
+import os
+import mmap
+import hashlib
+import polars as pl
+from service.session.Autosave import AutosaveWriter, MANIFEST_NAME, PREVIOUS_MANIFEST_NAME, MANIFEST_VERSION
+
+class SnapshotError(Exception):
+    """Raised when an autosave snapshot is incomplete or fails its integrity checks."""
+
+def file_checksum(path):
+    """BLAKE2 checksum of a file, hashed from a memory map so the file is not copied into Python."""
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.blake2b(mapped, digest_size=16).hexdigest()
+
+class AutosaveSnapshot:
+    """
+    A read-only view of one autosave manifest.
+    Opening a snapshot only parses the manifest. Sheets are read when requested: every block is
+    checked against the size and checksum recorded by the writer, then opened with `pl.read_ipc`
+    from its path, which memory-maps the uncompressed IPC file instead of copying it. A sheet is
+    read once and then kept. Output records stay plain dictionaries so the caller can build the
+    output cards when needed.
+    Attributes:
+        directory (str): The autosave directory.
+        manifest (dict): The parsed manifest.
+        timestamp (str): When the snapshot was written.
+        previous (AutosaveSnapshot): The older snapshot to fall back to, or None.
+    Methods:
+        sheet_names():
+            Returns the names of the sheets in the snapshot.
+        verify():
+            Checks that every block exists with the recorded size; raises SnapshotError otherwise.
+        load_sheet(sheet_name, verify=True):
+            Returns the sheet as a memory-mapped pl.DataFrame.
+        output_records():
+            Returns the saved output records.
+    """
+
+    def __init__(self, directory, manifest):
+        if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION or "sheets" not in manifest:
+            raise SnapshotError("Unsupported or damaged autosave manifest.")
+        self.directory = directory
+        self.manifest = manifest
+        self.timestamp = manifest.get("timestamp")
+        self.previous = None
+        self._sheets = {}
+
+    def sheet_names(self):
+        return list(self.manifest["sheets"])
+
+    def _block_path(self, block):
+        return os.path.join(self.directory, os.path.basename(block["file"]))
+
+    def verify(self):
+        for sheet_name, sheet in self.manifest["sheets"].items():
+            for column in sheet["columns"]:
+                for block in column["blocks"]:
+                    path = self._block_path(block)
+                    if not os.path.exists(path) or os.path.getsize(path) != block["size"]:
+                        raise SnapshotError(f"Autosave block of column '{column['name']}' in {sheet_name} is missing or incomplete.")
+
+    def load_sheet(self, sheet_name, verify=True):
+        if sheet_name in self._sheets:
+            return self._sheets[sheet_name]
+        sheet = self.manifest["sheets"][sheet_name]
+        columns = []
+        for column in sheet["columns"]:
+            blocks = []
+            for block in column["blocks"]:
+                path = self._block_path(block)
+                if verify and file_checksum(path) != block["checksum"]:
+                    raise SnapshotError(f"Autosave block of column '{column['name']}' in {sheet_name} is corrupted.")
+                data = pl.read_ipc(path)
+                if data.height != block["rows"]:
+                    raise SnapshotError(f"Autosave block of column '{column['name']}' in {sheet_name} has the wrong length.")
+                blocks.append(data)
+            columns.append(pl.concat(blocks, rechunk=False) if len(blocks) > 1 else blocks[0])
+        data = pl.concat(columns, how="horizontal") if columns else pl.DataFrame()
+        if data.height != sheet["height"]:
+            raise SnapshotError(f"Autosave of {sheet_name} has {data.height} rows, expected {sheet['height']}.")
+        self._sheets[sheet_name] = data
+        return data
+
+    def output_records(self):
+        return [record for record in self.manifest.get("output", []) if isinstance(record, dict)]
+
+def has_snapshot(directory):
+    return any(os.path.exists(os.path.join(directory, name)) for name in (MANIFEST_NAME, PREVIOUS_MANIFEST_NAME))
+
+def recover_session(directory):
+    """
+    Opens the most recent autosave snapshot whose blocks are all on disk with their recorded sizes.
+    The current manifest is tried first, then the previous one, which the writer keeps together
+    with its blocks; a snapshot interrupted by a crash is therefore never loaded half-written.
+    Only the manifests and block sizes are checked here. The checksums of a sheet are checked
+    when it is first loaded (see `open_sheet`), so recovery can show the first sheet without
+    reading the others.
+    Args:
+        directory (str): The autosave directory.
+    Returns:
+        AutosaveSnapshot: The snapshot, with `previous` set to the older intact one, or None if
+        there is no snapshot.
+    Raises:
+        SnapshotError: If snapshots exist but none of them is complete.
+    """
+    if not has_snapshot(directory):
+        return None
+    reader = AutosaveWriter(directory)
+    snapshots, errors = [], []
+    for name in (MANIFEST_NAME, PREVIOUS_MANIFEST_NAME):
+        manifest = reader.read_manifest(name)
+        if manifest is None:
+            continue
+        try:
+            snapshot = AutosaveSnapshot(directory, manifest)
+            snapshot.verify()
+            snapshots.append(snapshot)
+        except (SnapshotError, OSError, KeyError, TypeError) as e:
+            errors.append(str(e))
+    if not snapshots:
+        raise SnapshotError("No intact autosave snapshot was found. " + " ".join(errors))
+    for newer, older in zip(snapshots, snapshots[1:]):
+        newer.previous = older
+    return snapshots[0]
+
+def open_sheet(snapshot, sheet_name):
+    """
+    Loads one sheet of `snapshot`, checking its checksums. When the sheet is damaged, the older
+    snapshots are tried in turn.
+    Returns:
+        tuple: (the snapshot the sheet was loaded from, pl.DataFrame).
+    Raises:
+        SnapshotError: If no snapshot has an intact copy of the sheet.
+    """
+    errors = []
+    while snapshot is not None:
+        try:
+            return snapshot, snapshot.load_sheet(sheet_name)
+        except (SnapshotError, OSError, KeyError, TypeError) as e:
+            errors.append(str(e))
+            snapshot = snapshot.previous
+    raise SnapshotError(f"No intact autosave of {sheet_name} was found. " + " ".join(errors))
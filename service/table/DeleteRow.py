@@ -3,6 +3,9 @@ from PyQt6.QtWidgets import QMessageBox
 def delete_selected_rows(parent):
     """Delete selected rows in the spreadsheet."""
     selection = parent.spreadsheet.selectionModel().selectedIndexes()
+    if selection and parent.model1.is_view_active() and len({index.row() for index in selection}) > 1:
+        QMessageBox.information(parent, 'Sorted/Filtered View', 'Clear the sort and filter before deleting several rows at once.')
+        return
     if selection:
         parent.model1.deleteRows(selection[0].row(), len(selection))
         parent.update_table(1, parent.model1)
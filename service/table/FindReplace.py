@@ -0,0 +1,105 @@
+import re
+import polars as pl
+
+def _match_expression(column_name, pattern, regex=False, match_case=False, whole_cell=False):
+    """Build a boolean expression marking the cells of `column_name` that match `pattern`."""
+    text = pl.col(column_name).cast(pl.Utf8)
+    if not regex and match_case:
+        if whole_cell:
+            return (text == pattern).fill_null(False)
+        return text.str.contains(pattern, literal=True).fill_null(False)
+    body = pattern if regex else re.escape(pattern)
+    if whole_cell:
+        body = f"^(?:{body})$"
+    if not match_case:
+        body = f"(?i){body}"
+    return text.str.contains(body).fill_null(False)
+
+def find_matches(data, pattern, columns=None, regex=False, match_case=False, whole_cell=False):
+    """
+    Finds all cells matching `pattern` using one vectorized Polars pass per column.
+    Args:
+        data (pl.DataFrame): The data to search.
+        pattern (str): The text or regular expression to look for.
+        columns (list, optional): Column names to search; all columns if None.
+        regex (bool): Treat `pattern` as a regular expression.
+        match_case (bool): Case-sensitive matching.
+        whole_cell (bool): Only match cells whose whole text equals the pattern.
+    Returns:
+        pl.DataFrame: A compact hit index with `row` (UInt32) and `column` (UInt16) columns,
+        ordered row by row so it can be used directly for next/previous navigation.
+    Raises:
+        ValueError: If the pattern is empty or is not a valid regular expression.
+    """
+    if not pattern:
+        raise ValueError("Search text cannot be empty")
+    columns = data.columns if columns is None else columns
+    try:
+        masks = data.select([
+            _match_expression(name, pattern, regex, match_case, whole_cell).alias(name) for name in columns
+        ])
+    except pl.exceptions.ComputeError as e:
+        raise ValueError(f"Invalid search pattern: {e}")
+
+    hits = [
+        pl.DataFrame({
+            "row": masks.get_column(name).arg_true().cast(pl.UInt32),
+            "column": pl.repeat(data.columns.index(name), masks.get_column(name).sum(), dtype=pl.UInt16, eager=True),
+        })
+        for name in columns
+        if masks.get_column(name).any()
+    ]
+    if not hits:
+        return pl.DataFrame(schema={"row": pl.UInt32, "column": pl.UInt16})
+    return pl.concat(hits).sort(["row", "column"])
+
+def replace_values(data, pattern, replacement, columns=None, regex=False, match_case=False, whole_cell=False):
+    """
+    Computes the replaced columns for a replace-all, one vectorized expression per column.
+    Only columns containing at least one match are returned, so the caller can apply them
+    with a single `with_columns` and keep the untouched columns shared.
+    Args:
+        data (pl.DataFrame): The data to search.
+        pattern (str): The text or regular expression to replace.
+        replacement (str): The replacement text (may use $1 group references in regex mode).
+        columns (list, optional): Column names to search; all columns if None.
+        regex (bool): Treat `pattern` as a regular expression.
+        match_case (bool): Case-sensitive matching.
+        whole_cell (bool): Replace the whole cell instead of the matched text.
+    Returns:
+        tuple: (dict of column name to replaced pl.Series, number of replaced cells)
+    Raises:
+        ValueError: If the pattern is invalid or a replacement makes a numeric column non-numeric.
+    """
+    hits = find_matches(data, pattern, columns, regex, match_case, whole_cell)
+    if hits.height == 0:
+        return {}, 0
+    matched_columns = [data.columns[index] for index in hits.get_column("column").unique().sort()]
+
+    if not regex:
+        body = re.escape(pattern)
+        replacement_text = replacement.replace("$", "$$")
+    else:
+        body = pattern
+        replacement_text = replacement
+    if whole_cell:
+        body = f"^(?:{body})$"
+    if not match_case:
+        body = f"(?i){body}"
+
+    new_columns = {}
+    for name in matched_columns:
+        dtype = data.schema[name]
+        text = pl.col(name).cast(pl.Utf8)
+        if not regex and match_case and not whole_cell:
+            replaced = text.str.replace_all(pattern, replacement, literal=True)
+        else:
+            replaced = text.str.replace_all(body, replacement_text)
+        series = data.select(replaced.alias(name)).to_series()
+        if dtype != pl.Utf8:
+            converted = series.cast(dtype, strict=False)
+            if converted.null_count() > series.null_count():
+                raise ValueError(f"Replacing in column {name} would produce non-numeric values.")
+            series = converted
+        new_columns[name] = series
+    return new_columns, hits.height
@@ -0,0 +1,68 @@
+import polars as pl
+
+FILTER_OPERATORS = ["=", "!=", ">", ">=", "<", "<=", "contains", "is empty", "is not empty"]
+
+def build_filter_expression(column_name, dtype, operator, value):
+    """
+    Builds a vectorized Polars boolean expression for a filter bar condition.
+    Args:
+        column_name (str): The column to filter on.
+        dtype (pl.DataType): The data type of the column, used to cast `value`.
+        operator (str): One of FILTER_OPERATORS.
+        value (str): The value typed by the user.
+    Returns:
+        pl.Expr: An expression evaluating to True for rows that pass the filter.
+    Raises:
+        ValueError: If the operator is unknown or the value cannot be cast to the column type.
+    """
+    column = pl.col(column_name)
+    if operator == "is empty":
+        return column.is_null() | (column.cast(pl.Utf8) == "")
+    if operator == "is not empty":
+        return column.is_not_null() & (column.cast(pl.Utf8) != "")
+    if operator == "contains":
+        return column.cast(pl.Utf8).str.contains(value, literal=True).fill_null(False)
+
+    if dtype.is_numeric():
+        try:
+            value = float(value.replace(",", ".")) if isinstance(value, str) else float(value)
+        except ValueError:
+            raise ValueError(f"Invalid value: {value} for column {column_name}. Expected a numeric value.")
+    elif dtype != pl.Utf8:
+        column = column.cast(pl.Utf8)
+
+    comparisons = {
+        "=": lambda: column == value,
+        "!=": lambda: column != value,
+        ">": lambda: column > value,
+        ">=": lambda: column >= value,
+        "<": lambda: column < value,
+        "<=": lambda: column <= value,
+    }
+    if operator not in comparisons:
+        raise ValueError(f"Unsupported filter operator: {operator}")
+    return comparisons[operator]().fill_null(False)
+
+def compute_view_rows(data, filter_expression=None, sort_column=None, descending=False):
+    """
+    Computes the row permutation of a sorted/filtered view without touching the data itself.
+    The filter is evaluated as one boolean mask and the sort as one `arg_sort`, so the cost is a
+    couple of vectorized passes over the affected columns regardless of the number of rows.
+    Args:
+        data (pl.DataFrame): The full data.
+        filter_expression (pl.Expr, optional): Boolean expression selecting the visible rows.
+        sort_column (str, optional): The column to sort the visible rows by.
+        descending (bool): Sort in descending order.
+    Returns:
+        pl.Series or None: UInt32 row indices into `data`, or None when no view is active.
+    """
+    rows = None
+    if filter_expression is not None:
+        rows = data.select(pl.arg_where(filter_expression)).to_series().cast(pl.UInt32)
+    if sort_column is not None:
+        values = data.get_column(sort_column)
+        if rows is not None:
+            values = values.gather(rows)
+        order = values.arg_sort(descending=descending, nulls_last=True)
+        rows = order if rows is None else rows.gather(order)
+    return rows
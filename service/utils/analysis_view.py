@@ -0,0 +1,85 @@
+import polars as pl
+
+ROW_POSITION = "Row position"
+
+def output_key(parent):
+    """Key column chosen in the main window to match output rows to data rows, None to match them by position."""
+    return getattr(getattr(parent, "view", None), "output_key", None)
+
+class AnalysisView:
+    """
+    The data editor and data output sheets presented as one table for exploration and graphs.
+    Nothing is combined up front: `frame(columns)` resolves only the requested columns as a
+    lazy frame, each taken from the first sheet that has it, with the active sort/filter view
+    of the data editor applied to them. Output rows are matched to data rows by position, or,
+    when `key` is set, by a left join on that column (e.g. the domain code), so that one output
+    row per domain is matched to every data row of that domain. Matching by position under a
+    sort/filter view needs both sheets to have the same height, as the view only reorders the
+    output sheet then.
+    Attributes:
+        model1 (TableModel): Data editor sheet.
+        model2 (TableModel): Data output sheet.
+        key (str or None): Column of both sheets used to match output rows, None for row position.
+    """
+
+    def __init__(self, model1, model2, key=None):
+        self.model1 = model1
+        self.model2 = model2
+        self.key = key
+
+    def columns(self):
+        """Names of all columns, data editor first; output columns with a name already in use are hidden."""
+        data = self.model1.get_data().columns
+        return data + [column for column in self.model2.get_data().columns if column not in data]
+
+    def frame(self, columns=None):
+        """
+        Lazy frame of `columns` (all columns when None, leaving out the output columns that
+        cannot be matched by position). No rows are dropped; data rows without a matching output
+        row get missing values in the output columns (also when matching by position and the
+        output sheet is shorter). The key is only needed, and only joined on, when an output
+        column is requested.
+        Raises:
+            ValueError: If a column is in neither sheet, if output columns are matched by
+                position while a sort/filter view is active and the sheets differ in height, or
+                if the key is not a column of both sheets or is repeated in the output sheet.
+        """
+        data = self.model1.get_data()
+        output = self.model2.get_data()
+        if columns is None:
+            columns = data.columns if self._unmatched(data, output) else self.columns()
+        columns = list(dict.fromkeys(columns))
+        first = [column for column in columns if column in data.columns]
+        second = [column for column in columns if column not in data.columns and column in output.columns]
+        missing = [column for column in columns if column not in first and column not in second]
+        if missing:
+            raise ValueError(f"Column not found: {', '.join(missing)}")
+        if not second:
+            return self.model1.apply_view(data.select(first)).lazy()
+
+        if self.key is None:
+            if self._unmatched(data, output):
+                raise ValueError(
+                    f"The data output sheet has {output.height} rows and the data editor {data.height}; "
+                    "its rows cannot be matched by position while the data editor is sorted or filtered. "
+                    "Clear the view or match the output rows by a key column."
+                )
+            parts = [self.model1.apply_view(sheet.select(names)).lazy() for sheet, names in ((data, first), (output, second)) if names]
+            return pl.concat(parts, how="horizontal_extend").select(columns)
+
+        if self.key not in data.columns or self.key not in output.columns:
+            raise ValueError(f"Key column not found in both sheets: {self.key}")
+        keys = output.get_column(self.key)
+        if keys.drop_nulls().is_duplicated().any():
+            raise ValueError(f"Key column {self.key} has repeated values in the data output sheet")
+        frame = self.model1.apply_view(data.select(list(dict.fromkeys([*first, self.key])))).lazy()
+        matched = output.lazy().select(pl.col(self.key).cast(data.schema[self.key], strict=False), *second)
+        return frame.join(matched, on=self.key, how="left", maintain_order="left").select(columns)
+
+    def _unmatched(self, data, output):
+        """Whether output rows cannot be matched by position: a view is active and the heights differ."""
+        return self.key is None and self.model1.is_view_active() and output.height != data.height
+
+    def complete(self, columns=None):
+        """Lazy frame of `columns` keeping only the rows without a missing value in these columns."""
+        return self.frame(columns).drop_nulls()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+from PyQt6.QtGui import QImage
+from PyQt6.QtCore import QBuffer, QIODevice
+
+PLOT_WIDTH = 800
+PLOT_HEIGHT = 600
+
+def encode_image(image):
+    """Encodes a QImage as PNG bytes."""
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+def encode_rgba(data, width, height):
+    """Encodes a raw RGBA buffer (row-major, 4 bytes per pixel) as PNG bytes."""
+    return encode_image(QImage(data, width, height, width * 4, QImage.Format.Format_RGBA8888))
+
+def _capture_plot(ro, plot_name, width, height):
+    """Renders one plot into an in-memory ragg capture device and returns its raw RGBA pixels."""
+    ro.r(
+        f'.sae_capture <- ragg::agg_capture(width = {width}, height = {height}, units = "px");'
+        f'print({plot_name});'
+        f'.sae_raster <- .sae_capture(native = TRUE);'
+        f'invisible(dev.off())'
+    )
+    try:
+        raster = ro.r(".sae_raster")
+        rows, columns = ro.r("dim(.sae_raster)")
+        # A nativeRaster stores packed 0xAABBGGRR pixels row by row, i.e. RGBA bytes on little-endian hosts
+        return bytes(raster.memoryview()), int(columns), int(rows)
+    finally:
+        ro.r("rm(.sae_capture, .sae_raster)")
+
+def _png_plot(ro, grdevices, plot_name, directory, width, height):
+    """Renders one plot with the png() device into a private temporary directory."""
+    plot_path = os.path.join(directory, "plot.png")
+    grdevices.png(file=plot_path, width=width, height=height)
+    try:
+        ro.r(f"print({plot_name})")
+    finally:
+        grdevices.dev_off()
+    with open(plot_path, "rb") as plot_file:
+        return plot_file.read()
+
+def render_r_plots(plot_names, width=PLOT_WIDTH, height=PLOT_HEIGHT):
+    """
+    Renders R plot objects (ggplot or base recorded plots) to PNG bytes.
+    When the `ragg` package is available each plot is drawn into an `agg_capture` device and
+    the pixels are read straight from R memory, so nothing touches the disk. Otherwise the
+    `png()` device writes into a private temporary directory that is removed afterwards,
+    which still avoids the working directory and file name collisions between runs.
+    The embedded R session is single-threaded, so plots are rendered one after another.
+    Args:
+        plot_names (list): Names of the plot objects in the R global environment.
+        width (int): Image width in pixels.
+        height (int): Image height in pixels.
+    Returns:
+        list: PNG bytes of every plot, in the order of `plot_names`.
+    """
+    import rpy2.robjects as ro
+    import rpy2.robjects.lib.grdevices as grdevices
+
+    if not plot_names:
+        return []
+    images = []
+    use_capture = bool(ro.r('requireNamespace("ragg", quietly = TRUE)')[0])
+    with tempfile.TemporaryDirectory(prefix="sae-plot-") as directory:
+        for plot_name in plot_names:
+            if use_capture:
+                try:
+                    images.append(encode_rgba(*_capture_plot(ro, plot_name, width, height)))
+                    continue
+                except Exception:
+                    use_capture = False
+                    ro.r("while (dev.cur() > 1) dev.off()")
+            images.append(_png_plot(ro, grdevices, plot_name, directory, width, height))
+    return images
@@ -0,0 +1,10 @@
+import polars as pl
+
+def format_table(table, float_precision=4):
+    """Formats a result table as aligned text for the output pane, without truncating rows, columns or names."""
+    with pl.Config(
+        tbl_rows=-1, tbl_cols=-1, tbl_width_chars=-1, fmt_str_lengths=200,
+        tbl_hide_dataframe_shape=True, tbl_hide_column_data_types=True,
+        tbl_formatting="ASCII_FULL_CONDENSED", float_precision=float_precision, thousands_separator=",",
+    ):
+        return str(table)
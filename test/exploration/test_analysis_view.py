@@ -0,0 +1,72 @@
+import sys
+import pytest
+import polars as pl
+from PyQt6.QtWidgets import QApplication
+from model.TableModel import TableModel
+from service.utils.analysis_view import AnalysisView
+
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+@pytest.fixture
+def sheets():
+    """Membuat Data Editor per unit dan Data Output per domain untuk pengujian analysis view"""
+    data = TableModel(pl.DataFrame({
+        "domain": [1, 2, 1, 3, 2],
+        "y": [3.0, 1.0, None, 5.0, 2.0],
+        "x": [10, 20, 30, 40, 50],
+    }))
+    output = TableModel(pl.DataFrame({
+        "domain": ["2", "1", "4"],
+        "Estimated Value": [1.5, 3.5, 9.0],
+        "CV": [0.1, None, 0.3],
+    }))
+    return data, output
+
+def test_positional_view_resolves_only_selected_columns(sheets):
+    """Test apakah hanya kolom terpilih diambil menurut posisi baris dengan urutan tampilan Data Editor"""
+    data, output = sheets
+    data.sort_view(2, descending=True)
+    output.set_data(pl.DataFrame({"CV": [0.1, 0.2, 0.3, 0.4, 0.5]}))
+    view = AnalysisView(data, output)
+    frame = view.frame(["CV", "x"])
+    assert isinstance(frame, pl.LazyFrame)
+    assert frame.collect_schema().names() == ["CV", "x"]
+    assert frame.collect().rows() == [(0.5, 50), (0.4, 40), (0.3, 30), (0.2, 20), (0.1, 10)]
+    assert view.complete(["y", "x"]).collect().get_column("x").to_list() == [50, 40, 20, 10]
+    assert view.columns() == ["domain", "y", "x", "CV"]
+    with pytest.raises(ValueError, match="Column not found: z"):
+        view.frame(["x", "z"])
+
+def test_positional_view_refuses_output_of_other_height(sheets):
+    """Test apakah pencocokan menurut posisi ditolak saat view aktif dan tinggi Data Output berbeda"""
+    data, output = sheets
+    view = AnalysisView(data, output)
+    assert view.frame(["x", "CV"]).collect().get_column("CV").to_list() == [0.1, None, 0.3, None, None]
+    data.filter_view(2, ">", "20")
+    assert view.frame(["x"]).collect().get_column("x").to_list() == [30, 40, 50]
+    with pytest.raises(ValueError, match="cannot be matched by position"):
+        view.frame(["x", "CV"])
+    assert view.complete().collect_schema().names() == ["domain", "y", "x"]
+
+def test_key_view_matches_output_rows_by_domain(sheets):
+    """Test apakah baris Data Output dicocokkan ke setiap baris Data Editor menurut kolom kunci"""
+    data, output = sheets
+    data.sort_view(2, descending=True)
+    frame = AnalysisView(data, output, key="domain").frame(["x", "Estimated Value"]).collect()
+    assert frame.rows() == [(50, 1.5), (40, None), (30, 3.5), (20, 1.5), (10, 3.5)]
+    complete = AnalysisView(data, output, key="domain").complete(["y", "CV"]).collect()
+    assert complete.rows() == [(2.0, 0.1), (1.0, 0.1)]
+    output.set_data(pl.DataFrame({"domain": ["1", "1"], "CV": [0.1, 0.2]}))
+    with pytest.raises(ValueError, match="repeated values"):
+        AnalysisView(data, output, key="domain").frame(["CV"])
+
+def test_key_is_needed_only_for_output_columns(sheets):
+    """Test apakah kolom kunci hanya diperlukan bila kolom Data Output diminta"""
+    data, output = sheets
+    data.sort_view(2, descending=True)
+    view = AnalysisView(data, output, key="region")
+    assert view.frame(["x", "y"]).collect().get_column("x").to_list() == [50, 40, 30, 20, 10]
+    with pytest.raises(ValueError, match="Key column not found in both sheets: region"):
+        view.frame(["x", "CV"])
@@ -0,0 +1,56 @@
+import numpy as np
+import polars as pl
+from service.exploration.CollinearityStatistics import (
+    collinearity_diagnostics, format_collinearity_result, variance_inflation, VIF_SCHEMA,
+)
+
+def _design(rows=300, seed=5):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(rows, 4))
+    x[:, 2] = x[:, 0] - 0.5 * x[:, 1] + 0.1 * rng.normal(size=rows)
+    x[:, 3] += 500
+    y = x @ np.array([1.0, -2.0, 0.5, 3.0]) + rng.normal(size=rows)
+    return x, y
+
+def test_vif_matches_auxiliary_regressions():
+    """Test apakah VIF dari faktor Cholesky sama dengan 1 / (1 - R²) regresi bantu"""
+    x, y = _design()
+    data = pl.DataFrame({"x1": x[:, 0], "x2": x[:, 1], "x3": x[:, 2], "x4": x[:, 3], "y": y})
+    diagnostics = collinearity_diagnostics(data.lazy(), "y", ["x1", "x2", "x3", "x4"])
+    assert diagnostics["vif"].schema == pl.Schema(VIF_SCHEMA)
+    for index, vif in enumerate(diagnostics["vif"].get_column("vif")):
+        others = np.column_stack([np.ones(len(y)), np.delete(x, index, axis=1)])
+        residual = x[:, index] - others @ np.linalg.lstsq(others, x[:, index], rcond=None)[0]
+        r_squared = 1 - residual @ residual / np.sum((x[:, index] - x[:, index].mean()) ** 2)
+        assert abs(vif - 1 / (1 - r_squared)) < 1e-8 * vif
+    design = np.column_stack([np.ones(len(y)), x])
+    expected = np.linalg.lstsq(design, y, rcond=None)[0]
+    assert np.allclose(diagnostics["coefficients"].get_column("estimate").to_numpy(), expected)
+
+def test_condition_indices_match_scaled_svd():
+    """Test apakah indeks kondisi dan proporsi dekomposisi varians sama dengan SVD desain berskala"""
+    x, y = _design()
+    data = pl.DataFrame({"x1": x[:, 0], "x2": x[:, 1], "x3": x[:, 2], "x4": x[:, 3], "y": y})
+    diagnostics = collinearity_diagnostics(data, "y", ["x1", "x2", "x3", "x4"])
+    design = np.column_stack([np.ones(len(y)), x])
+    scaled = design / np.sqrt((design ** 2).sum(axis=0))
+    _, singular, vt = np.linalg.svd(scaled, full_matrices=False)
+    assert np.allclose(diagnostics["condition"].get_column("condition_index").to_numpy(), singular.max() / singular)
+    shares = vt.T ** 2 / singular ** 2
+    proportions = (shares / shares.sum(axis=1, keepdims=True)).T
+    assert np.allclose(diagnostics["proportions"].drop("dimension").to_numpy(), proportions)
+    assert "Condition indices" in format_collinearity_result(diagnostics, regression=True)
+
+def test_aliased_and_constant_predictors_get_no_vif():
+    """Test apakah prediktor yang merupakan kombinasi linear atau konstan ditandai aliased seperti lm"""
+    x, y = _design()
+    data = pl.DataFrame({
+        "x1": x[:, 0], "x2": x[:, 1], "sum": x[:, 0] + x[:, 1], "one": np.ones(len(y)), "x4": x[:, 3], "y": y,
+    })
+    diagnostics = collinearity_diagnostics(data, "y", ["x1", "x2", "sum", "one", "x4"])
+    vif = diagnostics["vif"]
+    assert vif.get_column("note").to_list() == ["", "", "aliased", "aliased", ""]
+    assert vif.get_column("vif").null_count() == 2
+    assert diagnostics["coefficients"].get_column("estimate").null_count() == 2
+    correlation = np.array([[1.0, 0.5], [0.5, 1.0]])
+    assert np.allclose(variance_inflation(correlation)[0], 1 / 0.75)
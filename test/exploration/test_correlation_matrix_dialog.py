@@ -93,7 +93,7 @@ def test_get_selected_columns(correlation_matrix_dialog):
     "selected_columns, plot_checked, expected_in_script",
     [
         ([], False, ""), 
-        (["var1 [Numeric]", "var2 [Numeric]"], False, 'correlation_matrix <- cor(data[, c("var1", "var2")], use="complete.obs", method="pearson")'),  # Hanya kolom numerik
+        (["var1 [Numeric]", "var2 [Numeric]"], False, 'correlation_matrix <- cor(data[, c("var1", "var2")], use="pairwise.complete.obs", method="pearson")'),  # Hanya kolom numerik
         (["var1 [Numeric]", "var2 [Numeric]"], True, 'ggcorrplot(correlation_matrix'), 
     ],
 )
@@ -0,0 +1,71 @@
+import sys
+import numpy as np
+import polars as pl
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage
+from service.exploration.CorrelationStatistics import correlation_matrix, top_pairs, format_correlation_result, PAIRS_SCHEMA
+from service.graph.NativePlot import render_correlation_heatmap
+
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+def test_blocked_correlation_uses_pairwise_complete_rows():
+    """Test apakah korelasi per blok sama dengan perhitungan per pasangan pada baris yang lengkap"""
+    rng = np.random.default_rng(3)
+    values = rng.normal(size=(400, 5))
+    values[:, 1] = values[:, 0] * 3 + 1e6
+    values[10:60, 2] = np.nan
+    values[200:230, 4] = np.nan
+    columns = list("abcde")
+    data = pl.DataFrame(values, schema=columns).with_columns(pl.col("c").fill_nan(None))
+    correlation, counts = correlation_matrix(data.lazy(), columns, block_columns=2, chunk_bytes=8 * 5 * 37)
+    for i in range(5):
+        for j in range(5):
+            rows = ~np.isnan(values[:, i]) & ~np.isnan(values[:, j])
+            assert counts[i, j] == rows.sum()
+            assert abs(correlation[i, j] - np.corrcoef(values[rows, i], values[rows, j])[0, 1]) < 1e-12
+
+def test_spearman_correlates_ranks_and_constant_columns_are_undefined():
+    """Test apakah Spearman memakai peringkat dan kolom konstan menghasilkan NaN"""
+    x = np.arange(1.0, 51.0)
+    data = pl.DataFrame({"x": x, "cube": x ** 3, "constant": np.ones(50)})
+    correlation, _ = correlation_matrix(data, data.columns, "spearman")
+    assert correlation[0, 1] == 1.0
+    assert np.isnan(correlation[0, 2]) and np.isnan(correlation[2, 2])
+    pearson, _ = correlation_matrix(data, data.columns)
+    assert pearson[0, 1] < 1.0
+
+def test_top_pairs_and_heatmap():
+    """Test apakah pasangan terkuat diurutkan menurut korelasi mutlak dan heatmap dapat dibuat"""
+    columns = ["a", "b", "c", "d"]
+    correlation = np.array([
+        [1.0, 0.2, -0.9, 0.5],
+        [0.2, 1.0, 0.1, np.nan],
+        [-0.9, 0.1, 1.0, 0.3],
+        [0.5, np.nan, 0.3, 1.0],
+    ])
+    counts = np.full((4, 4), 10)
+    pairs = top_pairs(correlation, counts, columns, 3)
+    assert pairs.schema == pl.Schema(PAIRS_SCHEMA)
+    assert pairs.select("variable_1", "variable_2").rows() == [("a", "c"), ("a", "d"), ("c", "d")]
+    assert top_pairs(correlation, counts, columns, None).height == 5
+    assert "Top 3 of 6 pairs" in format_correlation_result(correlation, counts, columns, top_k=3)
+    images = render_correlation_heatmap(correlation, columns)
+    assert not QImage.fromData(images[0]).isNull()
+
+def test_spearman_ranks_again_on_complete_rows():
+    """Test apakah Spearman dengan nilai kosong diperingkat ulang per pasangan seperti R"""
+    rng = np.random.default_rng(5)
+    values = rng.normal(size=(300, 3))
+    values[:, 1] += values[:, 0]
+    values[:100, 1] = np.nan
+    values[250:, 2] = np.nan
+    data = pl.DataFrame(values, schema=list("abc"))
+    correlation, counts = correlation_matrix(data, list("abc"), "spearman", chunk_bytes=8 * 3 * 70)
+    for i in range(3):
+        for j in range(3):
+            rows = ~np.isnan(values[:, i]) & ~np.isnan(values[:, j])
+            ranks = pl.DataFrame({"x": values[rows, i], "y": values[rows, j]}).select(pl.all().rank("average")).to_numpy()
+            assert counts[i, j] == rows.sum()
+            assert abs(correlation[i, j] - np.corrcoef(ranks[:, 0], ranks[:, 1])[0, 1]) < 1e-12
@@ -0,0 +1,82 @@
+import math
+import numpy as np
+import polars as pl
+import pytest
+from service.exploration.NormalityStatistics import (
+    normal_quantile, shapiro_wilk, stratified_rows, shapiro_subsample_script, qq_positions, normality_tests, format_normality_table,
+    SHAPIRO_MAX_N, RESULT_SCHEMA,
+)
+
+HEIGHTS = [148.0, 154.0, 158.0, 160.0, 161.0, 162.0, 166.0, 170.0, 182.0, 195.0, 236.0]
+
+def test_normal_quantile_matches_qnorm():
+    """Test apakah kuantil normal sama dengan qnorm() R, termasuk di ekor"""
+    values = normal_quantile([0.5, 0.975, 0.1, 1e-10])
+    assert values[0] == 0.0
+    assert values[1] == pytest.approx(1.959963984540054, abs=1e-12)
+    assert values[2] == pytest.approx(-1.2815515655446004, abs=1e-12)
+    assert values[3] == pytest.approx(-6.361340902404056, abs=1e-9)
+
+def test_shapiro_wilk_matches_shapiro_test():
+    """Test apakah statistik W dan p-value sama dengan shapiro.test() R"""
+    w, p_value = shapiro_wilk(np.array(HEIGHTS))
+    assert w == pytest.approx(0.7888, abs=1e-4)
+    assert p_value == pytest.approx(0.0067, abs=1e-4)
+
+def test_stratified_rows_is_stable_and_covers_every_block():
+    """Test apakah subsampel Shapiro-Wilk selalu sama dan mengambil satu baris dari setiap blok"""
+    rows = stratified_rows(1_000_000)
+    assert rows.size == SHAPIRO_MAX_N
+    assert np.array_equal(rows, stratified_rows(1_000_000))
+    assert np.array_equal(rows // 200, np.arange(SHAPIRO_MAX_N))
+    assert len(np.unique(rows % 200)) > 150
+    assert np.array_equal(stratified_rows(10), np.arange(10))
+    rows = stratified_rows(12_345)
+    assert np.all(np.diff(rows) > 0) and rows[-1] < 12_345
+
+def test_shapiro_subsample_script_matches_stratified_rows():
+    """Test apakah script R memilih baris yang sama dengan subsampel polars"""
+    script = shapiro_subsample_script("x")
+    assert "set.seed" not in script and "x <- x[is.finite(x)]" in script
+    n = 12_345
+    bounds = np.floor(np.arange(SHAPIRO_MAX_N + 1) * n / SHAPIRO_MAX_N)
+    steps = np.arange(1, SHAPIRO_MAX_N + 1) * (2654435769 / 4294967296)
+    assert "(2654435769 / 4294967296)" in script
+    assert np.array_equal(bounds[:-1] + np.floor((steps - np.floor(steps)) * np.diff(bounds)), stratified_rows(n))
+
+def test_normality_tests_match_direct_computation():
+    """Test apakah Jarque-Bera dan Lilliefors sama dengan perhitungan langsung dan nilai kosong dibuang"""
+    values = np.array(HEIGHTS)
+    data = pl.DataFrame({"height": HEIGHTS + [None, float("nan")]})
+    table, qq = normality_tests(data.lazy(), ["height"], ["jarque_bera", "lilliefors"])
+    assert table.schema == pl.Schema(RESULT_SCHEMA)
+    assert table.get_column("n").to_list() == [11, 11]
+    assert qq == {}
+
+    centered = values - values.mean()
+    skewness = np.mean(centered ** 3) / np.mean(centered ** 2) ** 1.5
+    kurtosis = np.mean(centered ** 4) / np.mean(centered ** 2) ** 2
+    statistic = 11 / 6 * (skewness ** 2 + (kurtosis - 3) ** 2 / 4)
+    jarque = table.row(0, named=True)
+    assert jarque["statistic"] == pytest.approx(statistic)
+    assert jarque["p_value"] == pytest.approx(math.exp(-statistic / 2))
+
+    cdf = np.array([0.5 * math.erfc(-z / math.sqrt(2)) for z in centered / values.std(ddof=1)])
+    ranks = np.arange(1, 12)
+    distance = max(np.max(ranks / 11 - cdf), np.max(cdf - (ranks - 1) / 11))
+    lilliefors = table.row(1, named=True)
+    assert lilliefors["statistic"] == pytest.approx(distance, abs=1e-6)
+    assert lilliefors["p_value"] < 0.05
+
+def test_normality_tests_subsample_large_columns_and_summarise_qq():
+    """Test apakah kolom besar diuji pada subsampel dan Q-Q plot hanya memuat ringkasan kuantil"""
+    rng = np.random.default_rng(7)
+    data = pl.DataFrame({"normal": rng.normal(size=50_000), "skewed": rng.exponential(size=50_000)})
+    table, qq = normality_tests(data, ["normal", "skewed"], ["shapiro"], qq=True)
+    normal, skewed = table.row(0, named=True), table.row(1, named=True)
+    assert normal["n"] == 50_000 and "subsample" in normal["note"]
+    assert normal["p_value"] > 0.01
+    assert skewed["p_value"] < 1e-10
+    assert qq["normal"].height == qq_positions(50_000).size < 250
+    assert qq["normal"].get_column("sample").is_sorted()
+    assert "Shapiro-Wilk W" in format_normality_table(table)
@@ -82,8 +82,8 @@ import pytest
         (
             ["var1 [Numeric]", "var3 [Numeric]"], True, True, False, False, False,
             [
-                "shapiro.test(data$var1)", "tseries::jarque.bera.test(data$var1)",
-                "shapiro.test(data$var3)", "tseries::jarque.bera.test(data$var3)"
+                "shapiro.test(shapiro_var1)", "tseries::jarque.bera.test(data$var1)",
+                "shapiro.test(shapiro_var3)", "tseries::jarque.bera.test(data$var3)"
             ],
             [
                 "nortest::lillie.test(data$var1)", "nortest::lillie.test(data$var3)",
@@ -94,8 +94,8 @@ import pytest
         (
             ["var1 [Numeric]", "var3 [Numeric]"], True, True, True, False, False,
             [
-                "shapiro.test(data$var1)", "tseries::jarque.bera.test(data$var1)", "nortest::lillie.test(data$var1)",
-                "shapiro.test(data$var3)", "tseries::jarque.bera.test(data$var3)", "nortest::lillie.test(data$var3)"
+                "shapiro.test(shapiro_var1)", "tseries::jarque.bera.test(data$var1)", "nortest::lillie.test(data$var1)",
+                "shapiro.test(shapiro_var3)", "tseries::jarque.bera.test(data$var3)", "nortest::lillie.test(data$var3)"
             ],
             []
         ),
@@ -0,0 +1,161 @@
+import math
+import numpy as np
+import polars as pl
+import pytest
+import service.exploration.SelectionStatistics as SelectionStatistics
+from service.exploration.SelectionStatistics import (
+    _Factor, stepwise_selection, selected_formula_script, pending_formula_script, resolve_formula_script, format_selection_result, t_p_value, f_p_value,
+    coordinate_descent_path, lasso_selection, format_lasso_result, SELECTION_DIRECTIONS, TRACE_SCHEMA, CV_SCHEMA,
+)
+
+def _design(rows=150, seed=11):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(rows, 8))
+    x[:, 5] = x[:, 0] + x[:, 1]
+    x[:, 6] += 300
+    y = 1.2 * x[:, 0] - 0.6 * x[:, 2] + 0.4 * x[:, 6] + 0.15 * x[:, 7] + 2 * rng.normal(size=rows)
+    return x, y
+
+def _refit_search(x, y, direction, penalty):
+    """Pencarian bertahap dengan menghitung ulang setiap model kandidat dengan lstsq"""
+    rows, count = x.shape
+
+    def design(columns):
+        return np.column_stack([np.ones(rows), x[:, columns]])
+
+    def criterion(columns):
+        residual = y - design(columns) @ np.linalg.lstsq(design(columns), y, rcond=None)[0]
+        return rows * math.log(residual @ residual / rows) + penalty * (len(columns) + 1)
+
+    def full_rank(columns):
+        return np.linalg.matrix_rank(design(columns)) == len(columns) + 1
+
+    selected = []
+    if direction == "backward":
+        for column in range(count):
+            if full_rank(selected + [column]):
+                selected.append(column)
+    current = criterion(selected)
+    while True:
+        moves = []
+        if direction != "forward":
+            moves += [[other for other in selected if other != column] for column in selected]
+        if direction != "backward":
+            moves += [selected + [column] for column in range(count) if column not in selected and full_rank(selected + [column])]
+        if not moves:
+            break
+        best = min(moves, key=criterion)
+        if not criterion(best) < current - 1e-7:
+            break
+        selected, current = best, criterion(best)
+    return sorted(selected), current
+
+def test_stepwise_selection_matches_refitted_search():
+    """Test apakah seleksi dengan pembaruan faktor sama dengan pencarian yang menghitung ulang setiap model"""
+    x, y = _design()
+    names = [f"x{index}" for index in range(8)]
+    data = pl.DataFrame({**{name: x[:, index] for index, name in enumerate(names)}, "y": y})
+    for criterion, penalty in [("AIC", 2.0), ("BIC", math.log(len(y)))]:
+        results = stepwise_selection(data.lazy(), "y", names, SELECTION_DIRECTIONS, criterion)
+        for direction in SELECTION_DIRECTIONS:
+            expected, value = _refit_search(x, y, direction, penalty)
+            result = results[direction]
+            assert sorted(names.index(name) for name in result["selected"]) == expected
+            assert result["trace"].schema == pl.Schema(TRACE_SCHEMA)
+            assert result["trace"].get_column("criterion")[-1] == pytest.approx(value)
+    chosen = results["both"]["selected"]
+    design = np.column_stack([np.ones(len(y)), x[:, [names.index(name) for name in chosen]]])
+    estimates = np.linalg.lstsq(design, y, rcond=None)[0]
+    assert np.allclose(results["both"]["coefficients"].get_column("estimate").to_numpy(), estimates)
+    assert "Backward Result (BIC" in format_selection_result(results, "BIC")
+
+def test_factor_updates_match_refactorisation():
+    """Test apakah faktor Cholesky setelah menambah dan menghapus prediktor sama dengan faktorisasi ulang"""
+    rng = np.random.default_rng(2)
+    values = rng.normal(size=(50, 6))
+    values -= values.mean(axis=0)
+    products = values.T @ values
+    state = _Factor(products)
+    for column in [3, 0, 4, 1]:
+        remaining, _ = state.residual_variances()
+        state.add(column, remaining[column])
+    state.drop(1)
+    assert state.active == [3, 4, 1]
+    factor = np.linalg.cholesky(products[np.ix_(state.active, state.active)]).T
+    assert np.allclose(np.abs(state.factor), np.abs(factor))
+    residual = values[:, 5] - values[:, state.active] @ np.linalg.lstsq(values[:, state.active], values[:, 5], rcond=None)[0]
+    assert state.rss() == pytest.approx(residual @ residual)
+
+def test_p_values_and_formula_script():
+    """Test apakah p-value t dan F sama dengan bentuk tertutupnya dan formula terpilih ditulis untuk skrip R"""
+    assert t_p_value(1.5, 1) == pytest.approx(1 - 2 / math.pi * math.atan(1.5), abs=1e-12)
+    assert t_p_value(2.0, 10) == pytest.approx(0.07338803477074, abs=1e-12)
+    assert f_p_value(3.0, 2, 10) == pytest.approx((10 / 16) ** 5, abs=1e-12)
+    x, y = _design()
+    data = pl.DataFrame({"x a": x[:, 0], "noise": np.random.default_rng(0).normal(size=len(y)), "y value": y})
+    script = selected_formula_script(data, "y value [Numeric]", ["x a [Numeric]", "noise [Numeric]"], ["region [String]"], "backward")
+    assert script.splitlines()[-1] == "final_formula <- y_value ~ x_a + as.factor(region)"
+
+def test_pending_formula_is_resolved_when_the_model_runs():
+    """Test apakah formula sementara tidak menghitung apa pun dan diganti hasil seleksi saat model dijalankan"""
+    x, y = _design()
+    data = pl.DataFrame({"x a": x[:, 0], "noise": np.random.default_rng(0).normal(size=len(y)), "y value": y})
+    pending = pending_formula_script("y value [Numeric]", ["x a [Numeric]", "noise [Numeric]"], [], "backward")
+    assert pending.splitlines()[-1] == "final_formula <- y_value ~ x_a + noise"
+    script = "formula <- y ~ 1\n" + pending + "model <- mseFH(final_formula, v, data=data)"
+    resolved = resolve_formula_script(script, data, "y value [Numeric]", ["x a [Numeric]", "noise [Numeric]"], [], "backward")
+    assert "final_formula <- y_value ~ x_a\n" in resolved and "noise" not in resolved
+    assert resolved.startswith("formula <- y ~ 1\n") and resolved.endswith("model <- mseFH(final_formula, v, data=data)")
+    edited = "final_formula <- y_value ~ noise\n"
+    assert resolve_formula_script(edited, data, "y value [Numeric]", ["noise [Numeric]"], [], "backward") == edited
+
+def test_coordinate_descent_path_satisfies_kkt_conditions():
+    """Test apakah setiap titik jalur elastic net memenuhi syarat KKT dan dimulai dari nol"""
+    rng = np.random.default_rng(4)
+    x = rng.normal(size=(120, 30))
+    x = (x - x.mean(axis=0)) / x.std(axis=0)
+    y = x[:, 0] * 2 - x[:, 5] + rng.normal(size=120)
+    y -= y.mean()
+    largest = np.max(np.abs(x.T @ y)) / 120 / 0.7
+    lambdas = largest * np.logspace(0, -3, 40)
+    path = coordinate_descent_path(x, y, lambdas, alpha=0.7)
+    assert not path[0].any()
+    for penalty, beta in zip(lambdas, path):
+        gradient = x.T @ (y - x @ beta) / 120
+        nonzero = beta != 0
+        expected = penalty * 0.7 * np.sign(beta[nonzero]) + penalty * 0.3 * beta[nonzero]
+        # Toleransi sesuai ambang konvergensi glmnet (perubahan koefisien² < 1e-7 × varians y)
+        assert np.allclose(gradient[nonzero], expected, atol=1e-3)
+        assert np.all(np.abs(gradient[~nonzero]) <= penalty * 0.7 + 1e-3)
+
+def test_lasso_selection_keeps_the_signal_and_is_reproducible():
+    """Test apakah LASSO dengan validasi silang memilih prediktor yang berpengaruh dan hasilnya selalu sama"""
+    rng = np.random.default_rng(8)
+    x = rng.normal(size=(400, 40))
+    x[:, 7] *= 1000
+    y = 3 * x[:, 0] - 2 * x[:, 1] + 0.002 * x[:, 7] + rng.normal(size=400)
+    names = [f"x{index}" for index in range(40)]
+    data = pl.DataFrame({**{name: x[:, index] for index, name in enumerate(names)}, "y": y, "constant": np.ones(400)})
+    result = lasso_selection(data.lazy(), "y", names + ["constant"])
+    assert {"x0", "x1", "x7"} <= set(result["selected"])
+    assert "constant" not in result["selected"]
+    assert result["cv"].schema == pl.Schema(CV_SCHEMA)
+    assert result["cv"].get_column("lambda")[0] >= result["cv"].get_column("lambda")[1]
+    assert lasso_selection(data, "y", names + ["constant"])["selected"] == result["selected"]
+    assert "Lasso Result (10-fold" in format_lasso_result(result)
+
+def test_lasso_from_shared_cross_products_matches_per_fold_standardization(monkeypatch):
+    """Test apakah LASSO dari cross product bersama sama dengan standarisasi per fold dan dfmax menghentikan jalur"""
+    rng = np.random.default_rng(9)
+    x = rng.normal(size=(300, 12)) + 50
+    y = 2 * x[:, 0] - x[:, 3] + rng.normal(size=300)
+    names = [f"x{index}" for index in range(12)]
+    data = pl.DataFrame({**{name: x[:, index] for index, name in enumerate(names)}, "y": y})
+    shared = lasso_selection(data, "y", names)
+    monkeypatch.setattr(SelectionStatistics, "LASSO_GRAM_COLUMNS", 0)
+    direct = lasso_selection(data, "y", names)
+    assert shared["selected"] == direct["selected"]
+    assert np.allclose(shared["cv_mse"], direct["cv_mse"], rtol=1e-8)
+    assert np.allclose(shared["coefficients"]["estimate"], direct["coefficients"]["estimate"], rtol=1e-8)
+    limited = lasso_selection(data, "y", names, dfmax=1)
+    assert limited["nonzero"][-1] == 2 and limited["nonzero"][:-1].max() <= 1
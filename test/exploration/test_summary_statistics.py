@@ -0,0 +1,45 @@
+import polars as pl
+from service.exploration.SummaryStatistics import summary_source, summary_table, format_summary_table, SUMMARY_SCHEMA
+
+class FakeModel:
+    def __init__(self, data):
+        self.data = data
+
+    def get_data(self):
+        return self.data
+
+    def is_view_active(self):
+        return False
+
+    def apply_view(self, frame):
+        return frame
+
+def test_summary_source_keeps_rows_with_missing_values():
+    """Test apakah hanya kolom terpilih diambil tanpa membuang baris yang kosong"""
+    model1 = FakeModel(pl.DataFrame({"a": [1, None, 3], "b": ["x", "y", None]}))
+    model2 = FakeModel(pl.DataFrame({"c": [1.5, 2.5, None]}))
+    data = summary_source(model1, model2, ["c", "a"]).collect()
+    assert data.columns == ["c", "a"]
+    assert data.height == 3
+
+def test_summary_table_matches_r_summary():
+    """Test apakah statistik sama dengan summary() R (quantile type 7) dan menghitung nilai kosong"""
+    data = pl.DataFrame({
+        "x": [1.0, 2.0, 3.0, 4.0, None, 10.0],
+        "s": ["a", "b", None, "a", "a", "c"],
+    })
+    table = summary_table(data.lazy(), ["x", "s"])
+    assert table.schema == pl.Schema(SUMMARY_SCHEMA)
+    x = table.row(0, named=True)
+    assert (x["n"], x["nulls"], x["distinct"]) == (5, 1, 5)
+    assert (x["min"], x["q1"], x["median"], x["q3"], x["max"]) == (1.0, 2.0, 3.0, 4.0, 10.0)
+    assert x["mean"] == 4.0
+    s = table.row(1, named=True)
+    assert (s["type"], s["n"], s["nulls"], s["distinct"], s["mean"]) == ("String", 5, 1, 3, None)
+
+def test_format_summary_table_lists_every_column():
+    """Test apakah tabel teks memuat semua variabel tanpa dipotong"""
+    data = pl.DataFrame({f"variable_{index}": [float(index), 1.0] for index in range(30)})
+    text = format_summary_table(summary_table(data, data.columns, streaming=False))
+    assert all(f"variable_{index} " in text for index in range(30))
+    assert "…" not in text
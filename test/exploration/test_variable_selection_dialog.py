@@ -106,7 +106,7 @@ from unittest.mock import MagicMock
                 "                      scope = list(lower = null_model, upper = full_model), \n"
                 "                      direction = \"forward\")\n\n"
                 "forward_result <- summary(forward_model)\n\n"
-                "backward_model <- step(null_model, \n"
+                "backward_model <- step(full_model, \n"
                 "                      scope = list(lower = null_model, upper = full_model), \n"
                 "                      direction = \"backward\")\n\n"
                 "backward_result <- summary(backward_model)\n\n"
@@ -0,0 +1,32 @@
+import pytest
+import polars as pl
+from service.file.ColumnarFile import read_columnar_schema, read_columnar, write_parquet, write_ipc
+
+@pytest.fixture
+def data():
+    """Membuat data contoh untuk pengujian Parquet dan Arrow IPC"""
+    return pl.DataFrame({
+        "kab": ["Bogor", "Depok", "Bekasi"],
+        "y": [1.5, 2.5, None],
+        "n": [10, 20, 30],
+    })
+
+@pytest.mark.parametrize("name, writer", [("data.parquet", write_parquet), ("data.arrow", write_ipc), ("data.feather", write_ipc)])
+def test_roundtrip(tmp_path, data, name, writer):
+    """Test apakah data yang disimpan dapat dibaca kembali tanpa perubahan"""
+    path = str(tmp_path / name)
+    writer(data, path)
+    assert read_columnar(path).equals(data)
+
+@pytest.mark.parametrize("name, writer", [("data.parquet", write_parquet), ("data.arrow", write_ipc)])
+def test_schema_and_column_pruning(tmp_path, data, name, writer):
+    """Test apakah skema dibaca tanpa data dan hanya kolom terpilih yang dimuat"""
+    path = str(tmp_path / name)
+    writer(data, path)
+    assert read_columnar_schema(path) == dict(data.schema)
+    assert read_columnar(path, ["n", "kab"]).columns == ["n", "kab"]
+
+def test_unsupported_extension(tmp_path):
+    """Test apakah ekstensi yang tidak didukung ditolak"""
+    with pytest.raises(ValueError):
+        read_columnar_schema(str(tmp_path / "data.csv"))
@@ -0,0 +1,71 @@
+import threading
+import polars as pl
+from service.file.CsvImport import stream_csv, iter_csv_blocks, read_sample, sniff_csv, read_csv_bytes
+
+def write_csv(tmp_path, text, name="data.csv"):
+    path = tmp_path / name
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+def sample_text(rows=500):
+    lines = ["kab,nama,y"]
+    for i in range(rows):
+        lines.append(f'{i},"area {i}\nbaris, dua",{i * 0.5}' if i % 7 == 0 else f"{i},area {i},{i * 0.5}")
+    return "\n".join(lines) + "\n"
+
+def test_blocks_end_on_record_boundary(tmp_path):
+    """Test apakah blok tidak memotong field yang berisi newline di dalam tanda kutip"""
+    path = write_csv(tmp_path, sample_text())
+    blocks = [block for block, _ in iter_csv_blocks(path, first_block_size=64, block_size=128)]
+    assert len(blocks) > 1
+    assert all(block.count(b'"') % 2 == 0 for block in blocks)
+    assert b"".join(blocks) == open(path, "rb").read()
+
+def test_stream_matches_full_read(tmp_path):
+    """Test apakah hasil pembacaan bertahap sama dengan pembacaan penuh"""
+    path = write_csv(tmp_path, sample_text())
+    batches = list(stream_csv(path, first_block_size=256, block_size=512))
+    assert len(batches) > 1
+    assert batches[-1][1] == batches[-1][2]
+    data = pl.concat([batch for batch, _, _ in batches])
+    expected = pl.read_csv(path, null_values=["NA", "NULL", "na", "null"])
+    assert data.equals(expected)
+
+def test_stream_without_header_and_bom(tmp_path):
+    """Test apakah file tanpa header dan dengan BOM dibaca dengan nama kolom default"""
+    path = write_csv(tmp_path, "﻿1;a\n2;NA\n3;c")
+    data = pl.concat([batch for batch, _, _ in stream_csv(path, separator=";", header=False)])
+    assert data.columns == ["Column 1", "Column 2"]
+    assert data["Column 1"].to_list() == [1, 2, 3]
+    assert data["Column 2"].to_list() == ["a", None, "c"]
+
+def test_stream_stops_when_cancelled(tmp_path):
+    """Test apakah pembacaan berhenti saat stop_event diset"""
+    path = write_csv(tmp_path, sample_text())
+    stop_event = threading.Event()
+    batches = []
+    for batch, _, _ in stream_csv(path, stop_event=stop_event, first_block_size=256, block_size=256):
+        batches.append(batch)
+        stop_event.set()
+    assert len(batches) == 1
+
+def test_sniff_semicolon_decimal_comma(tmp_path):
+    """Test apakah delimiter, header dan koma desimal terdeteksi dari sampel"""
+    text = "kab;nama;y\n" + "".join(f"{i};area {i};{i},5\n" for i in range(50))
+    path = write_csv(tmp_path, text)
+    options = sniff_csv(read_sample(path))
+    assert options == {"separator": ";", "header": True, "encoding": "utf-8", "decimal_comma": True}
+    preview = read_csv_bytes(read_sample(path), ";", True, decimal_comma=True, n_rows=10)
+    assert preview.height == 10
+    assert preview["y"][1] == 1.5
+
+def test_sample_is_bounded_and_detects_cp1252(tmp_path):
+    """Test apakah sampel dibatasi ukurannya dan encoding non UTF-8 dikenali"""
+    path = tmp_path / "latin.csv"
+    path.write_bytes(("kab,nama\n" + "".join(f"{i},Pe\xf1a {i}\n" for i in range(20000))).encode("cp1252"))
+    sample = read_sample(str(path), size=1024)
+    assert len(sample) <= 1024
+    assert sample.endswith(b"\n")
+    options = sniff_csv(sample)
+    assert options["encoding"] == "cp1252"
+    assert read_csv_bytes(sample, encoding="cp1252")["nama"][0] == "Pe\xf1a 0"
@@ -0,0 +1,56 @@
+import os
+import datetime
+import polars as pl
+import pytest
+from service.file.ExcelImport import list_sheet_names, read_sheet_columns, read_sheet
+
+@pytest.fixture
+def workbook(tmp_path):
+    """Membuat workbook dengan beberapa sheet untuk pengujian"""
+    import xlsxwriter
+    path = str(tmp_path / "kab.xlsx")
+    with xlsxwriter.Workbook(path) as wb:
+        for name in ["Bogor", "Depok", "Bekasi"]:
+            pl.DataFrame({"desa": [f"{name} {i}" for i in range(50)], "y": list(range(50)), "n": [1.5] * 50}).write_excel(wb, worksheet=name)
+    return path
+
+def test_list_sheet_names_from_metadata(workbook):
+    """Test apakah nama sheet dibaca dari workbook.xml sesuai urutan"""
+    assert list_sheet_names(workbook) == ["Bogor", "Depok", "Bekasi"]
+    assert read_sheet_columns(workbook, "Depok") == ["desa", "y", "n"]
+
+def test_read_sheet_columns_and_rows(workbook):
+    """Test apakah pemilihan kolom dan batas baris diterapkan saat membaca"""
+    data = read_sheet(workbook, "Depok", columns=["y", "desa"], n_rows=10)
+    assert data.shape == (10, 2)
+    assert set(data.columns) == {"y", "desa"}
+    assert data["desa"][0] == "Depok 0"
+
+def test_import_cache_reused_until_file_changes(workbook, tmp_path):
+    """Test apakah cache impor dipakai ulang dan diganti saat workbook berubah"""
+    cache_dir = str(tmp_path / "cache")
+    first = read_sheet(workbook, "Bekasi", cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    second = read_sheet(workbook, "Bekasi", cache_dir=cache_dir)
+    assert second.equals(first)
+    assert len(os.listdir(cache_dir)) == 1
+
+    stat = os.stat(workbook)
+    os.utime(workbook, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    read_sheet(workbook, "Bekasi", cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+
+def test_header_names_follow_calamine(tmp_path):
+    """Test apakah nama kolom dari baris header sama dengan nama kolom hasil pembacaan calamine"""
+    import xlsxwriter
+    path = str(tmp_path / "header.xlsx")
+    with xlsxwriter.Workbook(path) as wb:
+        sheet = wb.add_worksheet("Data")
+        sheet.write_row(1, 1, ["kab", "", "kab", 2024, 2.5, True])
+        sheet.write_datetime(1, 7, datetime.datetime(2024, 1, 5), wb.add_format({"num_format": "yyyy-mm-dd"}))
+        sheet.write_rich_string(1, 8, "rata", wb.add_format({"bold": True}), "-rata")
+        sheet.write_row(2, 0, list(range(10)))
+    expected = pl.read_excel(path, sheet_name="Data", engine="calamine", read_options={"n_rows": 0}).columns
+    assert read_sheet_columns(path, "Data") == expected == ["kab", "kab_1", "2024", "2.5", "rata-rata"]
+    with pytest.raises(ValueError):
+        read_sheet_columns(path, "Missing")
@@ -0,0 +1,87 @@
+import io
+import sys
+import threading
+import pytest
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage, QColor
+from PyQt6.QtCore import QBuffer, QIODevice
+from PyQt6.QtPdf import QPdfDocument
+from service.file.PdfExport import export_outputs_to_pdf, pdf_image, PdfDocumentWriter, _PageLayout, FONT_SIZE, PAGE_WIDTH, SIDE_MARGIN
+
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+def encode_image(image_format, alpha=False):
+    image = QImage(120, 80, QImage.Format.Format_ARGB32 if alpha else QImage.Format.Format_RGB32)
+    image.fill(QColor(200, 30, 30, 120) if alpha else QColor("steelblue"))
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, image_format)
+    return bytes(buffer.data())
+
+@pytest.fixture
+def records():
+    """Membuat riwayat output contoh dengan teks dan plot"""
+    return [
+        {"script_text": f"summary(y{i})", "result_text": "Min (1.5) \\ Max 3\n" * 80, "error_text": "", "plots": [encode_image("PNG")]}
+        for i in range(5)
+    ] + [{"script_text": "plot(z)", "result_text": "", "error_text": "object 'z' not found", "plots": [encode_image("JPG"), encode_image("PNG", alpha=True)]}]
+
+def test_export_is_readable(tmp_path, records):
+    """Test apakah PDF hasil ekspor dapat dibuka dan berisi teks output"""
+    path = str(tmp_path / "output.pdf")
+    progress = []
+    pages = export_outputs_to_pdf(path, records, progress=lambda *args: progress.append(args))
+    document = QPdfDocument(None)
+    document.load(path)
+    assert document.pageCount() == pages > 1
+    assert "summary(y0)" in document.getAllText(0).text()
+    assert [done for done, _, _ in progress] == list(range(1, len(records) + 1))
+
+def test_images_embedded_without_reencoding(tmp_path, records):
+    """Test apakah gambar PNG dan JPEG disisipkan dari data aslinya"""
+    png, jpeg = records[0]["plots"][0], records[-1]["plots"][0]
+    assert pdf_image(png)["filter"] == b"/FlateDecode" and pdf_image(png)["decode_parms"] is not None
+    assert pdf_image(jpeg)["data"] == jpeg
+    path = tmp_path / "output.pdf"
+    export_outputs_to_pdf(str(path), records)
+    content = path.read_bytes()
+    assert jpeg in content
+    assert pdf_image(png)["data"] in content
+    assert content.count(b"/Subtype /Image") == 3  # Plot yang sama hanya disisipkan sekali
+
+def test_cancel_removes_partial_file(tmp_path, records):
+    """Test apakah ekspor yang dibatalkan tidak meninggalkan file"""
+    path = tmp_path / "output.pdf"
+    stop_event = threading.Event()
+    stop_event.set()
+    assert export_outputs_to_pdf(str(path), records, stop_event=stop_event) is None
+    assert not path.exists()
+    assert list(tmp_path.iterdir()) == []
+
+def test_unicode_text_is_kept(tmp_path):
+    """Test apakah teks di luar Latin-1 ditulis dengan font Unicode dan tidak menjadi '?'"""
+    path = tmp_path / "output.pdf"
+    text = "Ωμέγα абв ≤ 5%"
+    export_outputs_to_pdf(str(path), [{"script_text": "summary(y)", "result_text": text, "error_text": "", "plots": []}])
+    content = path.read_bytes()
+    assert b"/Subtype /Type0" in content and b"/FontFile2" in content
+    document = QPdfDocument(None)
+    document.load(str(path))
+    assert text in document.getAllText(0).text()
+    assert "summary(y)" in document.getAllText(0).text()
+
+class WideFont:
+    def advance(self, character):
+        return 1000 if character == "W" else 500
+
+def test_unicode_lines_wrap_by_glyph_advances():
+    """Test apakah baris dengan font Unicode dipotong menurut lebar glyph, bukan lebar Courier"""
+    layout = _PageLayout(PdfDocumentWriter(io.BytesIO()))
+    paragraph = "W" * 100 + "i" * 100
+    pieces = layout.wrap(paragraph, WideFont())
+    assert "".join(pieces) == paragraph
+    for piece in pieces:
+        assert sum(WideFont().advance(c) for c in piece) * FONT_SIZE / 1000 <= PAGE_WIDTH - 2 * SIDE_MARGIN
+    assert len(pieces[0]) == int((PAGE_WIDTH - 2 * SIDE_MARGIN) / FONT_SIZE)
@@ -88,9 +88,11 @@ def test_get_selected_columns(boxplot_dialog):
         "Single Box plot",
         (
             "# Box plot for Var1\n"
-            "boxplot_Var1 <- ggplot(data, aes(y = Var1)) +\n"
-            "    geom_boxplot(fill = sample(colors(), 1)) +\n"
+            "boxplot_Var1 <- ggplot(subset(box_stats, variable == 'Var1'), aes(x = group)) +\n"
+            "    geom_boxplot(aes(ymin = lower, lower = q1, middle = median, upper = q3, ymax = upper), stat = 'identity', fill = sample(colors(), 1)) +\n"
+            "    geom_point(data = subset(box_outliers, variable == 'Var1'), aes(x = group, y = value), size = 1) +\n"
             "    ggtitle('Box Plot: Var1') +\n"
+            "    xlab('') +\n"
             "    ylab('Var1') +\n"
             "    theme_minimal()\n\n"
         ).strip()
@@ -100,30 +102,31 @@ def test_get_selected_columns(boxplot_dialog):
         ["Var1", "Var2"],
         "Single Box plot",
         (
-            "# Box plot for Var1\n"
-            "boxplot_Var1 <- ggplot(data, aes(y = Var1)) +\n"
-            "    geom_boxplot(fill = sample(colors(), 1)) +\n"
-            "    ggtitle('Box Plot: Var1') +\n"
-            "    ylab('Var1') +\n"
-            "    theme_minimal()\n\n"
-        ).strip()
+            "# Box plot for Var2\n"
+            "boxplot_Var2 <- ggplot(subset(box_stats, variable == 'Var2'), aes(x = group)) +\n"
+            "    geom_boxplot(aes(ymin = lower, lower = q1, middle = median, upper = q3, ymax = upper), stat = 'identity', fill = sample(colors(), 1)) +\n"
+            "    geom_point(data = subset(box_outliers, variable == 'Var2'), aes(x = group, y = value), size = 1) +\n"
+            "    ggtitle('Box Plot: Var2') +\n"
+            "    xlab('') +\n"
+            "    ylab('Var2') +\n"
+            "    theme_minimal()"
+        )
     ),
     # Case 4: Multiple Box Plot with two columns.\n
     (
         ["Var1", "Var2"],
         "Multiple Box Plot",
         (
-            "# Convert to long format for ggplot compatibility\n"
-            "data_long <- pivot_longer(data, cols = c(\"Var1\", \"Var2\"), \n"
-            "    names_to = 'variable', values_to = 'value')\n\n"
             "# Create multiple box plot\n"
-            "boxplot_multiple <- ggplot(data_long, aes(x = variable, y = value, fill = variable)) +\n"
-            "    geom_boxplot() +\n"
+            "boxplot_multiple <- ggplot(box_stats, aes(x = variable, fill = variable, group = interaction(group, variable))) +\n"
+            "    geom_boxplot(aes(ymin = lower, lower = q1, middle = median, upper = q3, ymax = upper), stat = 'identity', position = position_dodge(width = 0.9)) +\n"
+            "    geom_point(data = box_outliers, aes(x = variable, y = value, group = variable), inherit.aes = FALSE,\n"
+            "        size = 1, position = position_dodge(width = 0.9)) +\n"
             "    ggtitle('Multiple Box Plot') +\n"
             "    xlab('Variable') +\n"
             "    ylab('Value') +\n"
-            "    theme_minimal()\n"
-        ).strip()
+            "    theme_minimal()"
+        )
     ),
 ])
 def test_generate_r_script(boxplot_dialog, selected_columns, method, expected_script):
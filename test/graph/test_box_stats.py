@@ -0,0 +1,62 @@
+import numpy as np
+import polars as pl
+import service.graph.BoxStats as BoxStats
+from service.graph.BoxStats import box_plot_table, box_stats_r_script, STATS_SCHEMA, OUTLIER_SCHEMA
+
+def test_box_plot_table_matches_r():
+    """Test apakah kuartil, whisker dan outlier sama dengan boxplot R (quantile type 7)"""
+    frame = pl.DataFrame({"x": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 100.0]})
+    stats, outliers = box_plot_table(frame, ["x"])
+    row = stats.row(0, named=True)
+    assert (row["q1"], row["median"], row["q3"]) == (3.0, 5.0, 7.0)
+    assert (row["lower"], row["upper"]) == (1.0, 8.0)
+    assert row["n_outliers"] == 1 and not row["approximate"]
+    assert outliers.get_column("value").to_list() == [100.0]
+
+def test_box_plot_table_per_group():
+    """Test apakah ringkasan dihitung per grup dan per variabel dengan skema yang tetap"""
+    frame = pl.DataFrame({
+        "x": [1.0, 2.0, 3.0, 10.0, 20.0, 30.0, None],
+        "y": [5.0, 5.0, 5.0, 1.0, 2.0, 3.0, 4.0],
+        "g": ["a", "a", "a", "b", "b", "b", None],
+    })
+    stats, outliers = box_plot_table(frame, ["x", "y"], "g")
+    assert stats.schema == pl.Schema(STATS_SCHEMA)
+    assert outliers.schema == pl.Schema(OUTLIER_SCHEMA)
+    assert stats.select("variable", "group", "n").rows() == [
+        ("x", "a", 3), ("x", "b", 3), ("y", "NA", 1), ("y", "a", 3), ("y", "b", 3),
+    ]
+    assert stats.filter(variable="x", group="b").get_column("median").item() == 20.0
+
+def test_box_plot_table_caps_outliers():
+    """Test apakah outlier yang digambar dibatasi tetapi nilai ekstremnya tetap ada"""
+    values = [0.0] * 100 + [float(100 + index) for index in range(3000)]
+    frame = pl.DataFrame({"x": values[:100] * 100 + values[100:]})
+    stats, outliers = box_plot_table(frame, ["x"])
+    assert stats.get_column("n_outliers").item() == 3000
+    kept = outliers.get_column("value")
+    assert kept.len() == BoxStats.MAX_OUTLIERS
+    assert (kept.min(), kept.max()) == (100.0, 3099.0)
+
+def test_box_plot_table_digest(monkeypatch):
+    """Test apakah kuartil dari t-digest mendekati kuartil eksak untuk data besar"""
+    rng = np.random.default_rng(1)
+    frame = pl.DataFrame({"x": rng.lognormal(size=200_000), "g": rng.integers(0, 3, size=200_000).astype(str)})
+    exact, _ = box_plot_table(frame, ["x"], "g")
+    monkeypatch.setattr(BoxStats, "EXACT_QUANTILE_ROWS", 1000)
+    monkeypatch.setattr(BoxStats, "SKETCH_CHUNK_ROWS", 50_000)
+    approximate, _ = box_plot_table(frame, ["x"], "g")
+    assert approximate.get_column("approximate").all()
+    iqr = exact.get_column("q3") - exact.get_column("q1")
+    for column in ["q1", "median", "q3", "lower", "upper"]:
+        error = (approximate.get_column(column) - exact.get_column(column)).abs() / iqr
+        assert error.max() < 0.02
+    assert approximate.get_column("n").to_list() == exact.get_column("n").to_list()
+
+def test_box_stats_r_script_rebuilds_tables():
+    """Test apakah script R yang direkam membangun ulang box_stats dan box_outliers dari data"""
+    script = box_stats_r_script(["x", "it's"], "g")
+    assert "box_group <- as.character(data[['g']])" in script
+    assert "c('x', 'it\\'s')" in script
+    assert "box_stats <- do.call(rbind" in script and "box_outliers <- do.call(rbind" in script
+    assert "rep('', nrow(data))" in box_stats_r_script(["x"])
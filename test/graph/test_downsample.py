@@ -0,0 +1,53 @@
+import math
+import polars as pl
+from service.graph.Downsample import lttb_rows, minmax_rows, downsample_lines, describe_downsampling
+
+def reference_lttb(xs, ys, target):
+    """Implementasi LTTB sekuensial sebagai pembanding"""
+    n = len(xs)
+    every = (n - 2) / (target - 2)
+    anchor, rows = 0, [0]
+    for bucket in range(target - 2):
+        start, end = int(math.floor(bucket * every)) + 1, int(math.floor((bucket + 1) * every)) + 1
+        following = range(end, min(int(math.floor((bucket + 2) * every)) + 1, n - 1)) if bucket < target - 3 else [n - 1]
+        cx = sum(xs[i] for i in following) / len(following)
+        cy = sum(ys[i] for i in following) / len(following)
+        areas = [abs((xs[anchor] - cx) * (ys[i] - ys[anchor]) - (xs[anchor] - xs[i]) * (cy - ys[anchor])) for i in range(start, end)]
+        anchor = start + areas.index(max(areas))
+        rows.append(anchor)
+    return rows + [n - 1]
+
+def test_lttb_matches_reference():
+    """Test apakah LTTB memilih baris yang sama dengan algoritma sekuensial aslinya"""
+    xs = [float(i) for i in range(5003)]
+    ys = [math.sin(i / 50) * 10 + (i * 7919 % 13) for i in range(5003)]
+    rows = lttb_rows(pl.Series(xs), pl.Series(ys), 300)
+    assert rows.to_list() == reference_lttb(xs, ys, 300)
+
+def test_minmax_keeps_spikes():
+    """Test apakah min-max downsampling tidak menghilangkan lonjakan"""
+    values = [float(i % 7) for i in range(100_000)]
+    values[54_321] = 1000.0
+    values[12_345] = -1000.0
+    rows = minmax_rows(pl.Series(values), 1000)
+    assert rows.len() <= 1000
+    assert {54_321, 12_345} <= set(rows.to_list())
+
+def test_downsample_lines_orders_and_unions_series():
+    """Test apakah data diurutkan menurut sumbu horizontal dan baris tiap seri digabung"""
+    n = 20_000
+    frame = pl.DataFrame({
+        "t": [float(n - i) for i in range(n)],
+        "a": [float(i % 11) for i in range(n)],
+        "b": [float(i % 17) for i in range(n)],
+    })
+    data = downsample_lines(frame, "t", ["a", "b"], "LTTB", 500)
+    assert data.columns == ["t", "a", "b"]
+    assert data.get_column("t").is_sorted()
+    assert 500 <= data.height <= 1000
+    assert describe_downsampling(n, data, "LTTB", 500) == (
+        f"Downsampled with LTTB (target 500 points per series): {n:,} rows reduced to {data.height:,} rows drawn."
+    )
+    untouched = downsample_lines(frame, "t", ["a"], "None", 500)
+    assert untouched.height == n
+    assert describe_downsampling(n, untouched, "None", 500) == f"{n:,} rows drawn."
@@ -0,0 +1,65 @@
+import sys
+import polars as pl
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage
+from service.graph.NativePlot import (
+    plot_frame, histogram_bins, render_histograms, render_box_plots,
+    render_line_plots,
+)
+from service.graph.BoxStats import box_plot_table
+from service.graph.ScatterMatrix import render_scatter_matrix
+
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+class FakeModel:
+    def __init__(self, data):
+        self.data = data
+
+    def get_data(self):
+        return self.data
+
+    def is_view_active(self):
+        return False
+
+    def apply_view(self, frame):
+        return frame
+
+def test_plot_frame_selects_columns_and_drops_missing():
+    """Test apakah hanya kolom yang dipilih diambil dan baris kosong atau tak hingga dibuang"""
+    model1 = FakeModel(pl.DataFrame({"a": [1, 2, None, 4], "s": ["w", "x", "y", "z"]}))
+    model2 = FakeModel(pl.DataFrame({"b": [1.0, float("inf"), 3.0, 4.0]}))
+    frame = plot_frame(model1, model2, ["a", "b"])
+    assert frame.columns == ["a", "b"]
+    assert frame.get_column("a").to_list() == [1.0, 4.0]
+    grouped = plot_frame(model1, model2, ["a"], group="s")
+    assert grouped.columns == ["a", "s"]
+    assert grouped.get_column("s").to_list() == ["w", "x", "z"]
+    kept = plot_frame(model1, model2, ["a", "b"], complete=False)
+    assert kept.rows() == [(1.0, 1.0), (2.0, None), (None, 3.0), (4.0, 4.0)]
+
+def test_histogram_bins():
+    """Test apakah jumlah data per bin dihitung dengan benar untuk bins dan binwidth"""
+    frame = pl.DataFrame({"x": [0.0, 0.5, 1.0, 2.5, 10.0]})
+    edges, counts = histogram_bins(frame, ["x"], bins=4)
+    assert edges == [0.0, 2.5, 5.0, 7.5, 10.0]
+    assert counts["x"] == [3, 1, 0, 1]
+    edges, counts = histogram_bins(frame, ["x"], binwidth=5)
+    assert edges == [0.0, 5.0, 10.0]
+    assert counts["x"] == [4, 1]
+
+def test_render_charts_to_png():
+    """Test apakah keempat jenis grafik dirender menjadi PNG tanpa R"""
+    frame = pl.DataFrame({"a": [float(i % 13) for i in range(500)], "b": [float(i) for i in range(500)]})
+    images = (
+        render_histograms(frame, ["a", "b"], "Single Histogram", bins=10)
+        + render_box_plots(*box_plot_table(frame, ["a", "b"]), "Multiple Box Plot")
+        + render_line_plots(frame, "b", ["a"], "Single Lineplot")
+        + render_scatter_matrix(frame, ["a", "b"], regression=True, correlation=True, density=True)[0]
+    )
+    grouped = frame.with_columns(g=(pl.col("b") % 40).cast(pl.Int64).cast(pl.Utf8))
+    images += render_box_plots(*box_plot_table(grouped, ["a", "b"], "g"), "Multiple Box Plot")
+    assert len(images) == 6
+    for image in images:
+        assert not QImage.fromData(image).isNull()
@@ -0,0 +1,16 @@
+import sys
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage
+from service.utils.plot_render import encode_rgba
+
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+def test_encode_rgba_to_png():
+    """Test apakah buffer RGBA mentah dari R dikodekan menjadi PNG tanpa file sementara"""
+    width, height = 4, 3
+    pixels = bytes([255, 0, 0, 255]) * (width * height)
+    image = QImage.fromData(encode_rgba(pixels, width, height))
+    assert (image.width(), image.height()) == (width, height)
+    assert image.pixelColor(2, 1).name() == "#ff0000"
@@ -0,0 +1,56 @@
+import sys
+import math
+import polars as pl
+from PyQt6.QtWidgets import QApplication
+from PyQt6.QtGui import QImage
+import service.graph.ScatterMatrix as ScatterMatrix
+from service.graph.ScatterMatrix import PanelCache, hexbin_counts, render_scatter_matrix
+
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+def test_adding_a_variable_renders_only_new_panels():
+    """Test apakah panel yang sudah ada dipakai ulang saat satu variabel ditambahkan"""
+    frame = pl.DataFrame({name: [float((index * (offset + 3)) % 17) for index in range(300)] for offset, name in enumerate("abc")})
+    cache = PanelCache()
+    images, rendered = render_scatter_matrix(frame, ["a", "b"], regression=True, correlation=True, density=True, cache=cache)
+    assert rendered == 4
+    assert not QImage.fromData(images[0]).isNull()
+    _, rendered = render_scatter_matrix(frame, ["a", "b", "c"], regression=True, correlation=True, density=True, cache=cache)
+    assert rendered == 5
+    _, rendered = render_scatter_matrix(frame, ["a", "b", "c"], regression=True, correlation=True, density=True, cache=cache)
+    assert rendered == 0
+    _, rendered = render_scatter_matrix(frame.with_columns(pl.col("c") * 2), ["a", "b", "c"], regression=True, correlation=True, density=True, cache=cache)
+    assert rendered == 5
+
+def test_variable_with_missing_values_renders_only_new_panels():
+    """Test apakah variabel dengan nilai kosong tidak membuat panel pasangan lain dirender ulang"""
+    frame = pl.DataFrame({
+        "a": [float(index % 13) for index in range(60)],
+        "b": [float(index % 7) for index in range(60)],
+        "c": [None if index % 10 == 0 else float(index % 5) for index in range(60)],
+    })
+    cache = PanelCache()
+    _, rendered = render_scatter_matrix(frame, ["a", "b"], regression=True, correlation=True, density=True, cache=cache)
+    assert rendered == 4
+    images, rendered = render_scatter_matrix(frame, ["a", "b", "c"], regression=True, correlation=True, density=True, cache=cache)
+    assert rendered == 5
+    assert not QImage.fromData(images[0]).isNull()
+
+def test_hexbin_counts_every_row():
+    """Test apakah setiap titik masuk ke tepat satu heksagon, yaitu pusat terdekat"""
+    frame = pl.DataFrame({"x": [0.0, 0.0, 1.0, 0.5], "y": [1.0, 1.0, 0.0, 0.5]})
+    counts = hexbin_counts(frame, "x", "y", (0.0, 1.0), (0.0, 1.0), size=120, radius=6)
+    assert counts.get_column("count").sum() == 4
+    assert counts.filter(cx=0.0, cy=0.0).get_column("count").item() == 2
+    width = math.sqrt(3) * 6
+    for center_x, center_y, _ in counts.iter_rows():
+        assert round(center_x / (width / 2), 6).is_integer() and round(center_y / 9, 6).is_integer()
+
+def test_large_data_uses_hexbin(monkeypatch):
+    """Test apakah panel data besar dirender dengan heksagon tanpa error"""
+    monkeypatch.setattr(ScatterMatrix, "HEXBIN_THRESHOLD", 100)
+    frame = pl.DataFrame({"a": [float(index % 97) for index in range(5000)], "b": [float(index % 89) for index in range(5000)]})
+    images, rendered = render_scatter_matrix(frame, ["a", "b"], cache=PanelCache())
+    assert rendered == 4 and not QImage.fromData(images[0]).isNull()
@@ -0,0 +1,91 @@
+import sys
+import pytest
+from PyQt6.QtWidgets import QApplication, QLabel, QTextEdit
+from PyQt6.QtGui import QImage
+from PyQt6.QtCore import QBuffer, QIODevice
+from model.OutputHistoryModel import OutputHistoryModel, make_output_record
+from view.components.OutputHistoryView import OutputHistoryView, OutputFilterProxyModel, OutputCard
+
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+def png_bytes():
+    image = QImage(40, 30, QImage.Format.Format_RGB32)
+    image.fill(0xFF0000)
+    buffer = QBuffer()
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer.data())
+
+@pytest.fixture
+def model():
+    """Membuat riwayat output contoh"""
+    records = [make_output_record(f"summary(y{i})", f"Min {i}") for i in range(500)]
+    records[10]["error_text"] = "object 'z' not found"
+    records[20]["plots"] = [png_bytes()]
+    return OutputHistoryModel(records)
+
+def test_model_records(model):
+    """Test apakah record dapat ditambah, dihapus, dan dibaca kembali"""
+    version = model.version
+    model.append_record({"script_text": "plot(x)"})
+    assert model.rowCount() == 501
+    assert model.record(500) == make_output_record("plot(x)")
+    model.remove_record(0)
+    assert model.records()[0]["script_text"] == "summary(y1)"
+    model.clear()
+    assert model.rowCount() == 0
+    assert model.version == version + 3
+
+def test_search_and_kind_filter(model):
+    """Test apakah pencarian dan filter jenis output bekerja pada riwayat"""
+    proxy = OutputFilterProxyModel()
+    proxy.setSourceModel(model)
+    proxy.set_search_text("SUMMARY(Y42)")
+    assert proxy.rowCount() == 1
+    proxy.set_search_text("")
+    proxy.set_kind("With Errors")
+    assert proxy.rowCount() == 1
+    proxy.set_kind("With Plots")
+    assert proxy.mapToSource(proxy.index(0, 0)).row() == 20
+
+def test_only_visible_cards_built(model):
+    """Test apakah hanya card yang terlihat yang dibuat oleh view"""
+    proxy = OutputFilterProxyModel()
+    proxy.setSourceModel(model)
+    view = OutputHistoryView()
+    view.setModel(proxy)
+    view.resize(700, 600)
+    view.show()
+    app.processEvents()
+    view._sync_cards()
+    built = view.visible_card_count()
+    assert 0 < built < 20
+
+    view.scrollToBottom()
+    app.processEvents()
+    view._sync_cards()
+    assert view.visible_card_count() < 20
+    assert isinstance(view.indexWidget(proxy.index(499, 0)), OutputCard)
+    assert view.indexWidget(proxy.index(0, 0)) is None
+    view.close()
+
+def test_card_with_plot():
+    """Test apakah card menampilkan plot dari gambar yang tersimpan"""
+    card = OutputCard(make_output_record("plot(y)", "", "", [png_bytes()]))
+    pixmaps = [label.pixmap() for label in card.findChildren(QLabel) if not label.pixmap().isNull()]
+    assert len(pixmaps) == 1
+    assert len(card.findChildren(QTextEdit)) == 1
+
+def test_new_record_gets_own_height():
+    """Test apakah record baru setelah penghapusan tidak memakai tinggi card record lama"""
+    model = OutputHistoryModel([make_output_record("plot(y)", "", "", [png_bytes()]), make_output_record("a")])
+    view = OutputHistoryView()
+    view.setModel(model)
+    tall = view.card_height(model.index(0, 0))
+    old_id = model.record_id(0)
+    model.remove_record(0)
+    model.append_record(make_output_record("x"))
+    assert old_id not in (model.record_id(0), model.record_id(1))
+    assert view.card_height(model.index(1, 0)) < tall
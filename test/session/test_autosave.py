@@ -0,0 +1,71 @@
+import os
+import json
+import pytest
+import polars as pl
+from service.session.Autosave import AutosaveWriter, MANIFEST_NAME
+from service.session.Recovery import recover_session
+
+@pytest.fixture
+def sheets():
+    """Membuat data contoh untuk pengujian autosave"""
+    return {
+        "data1": pl.DataFrame({
+            "kab": [f"kab-{i}" for i in range(10)],
+            "y": [float(i) for i in range(10)],
+            "n": list(range(10)),
+        }),
+        "data2": pl.DataFrame({"Domain": [""] * 3, "EBLUP": [""] * 3}),
+    }
+
+def arrow_files(directory):
+    return {name for name in os.listdir(directory) if name.endswith(".arrow")}
+
+def test_snapshot_roundtrip(tmp_path, sheets):
+    """Test apakah snapshot dapat dibaca kembali tanpa perubahan"""
+    writer = AutosaveWriter(str(tmp_path), block_rows=4)
+    output = [{"script_text": "x <- 1", "result_text": "1"}]
+    assert writer.snapshot(sheets, output, key=1, wait=True)
+    snapshot = recover_session(str(tmp_path))
+    assert snapshot.load_sheet("data1").equals(sheets["data1"])
+    assert snapshot.load_sheet("data2").equals(sheets["data2"])
+    assert snapshot.output_records() == output
+
+def test_no_write_when_unchanged(tmp_path, sheets):
+    """Test apakah snapshot dilewati jika tidak ada perubahan"""
+    writer = AutosaveWriter(str(tmp_path))
+    assert writer.snapshot(sheets, [], key=1, wait=True)
+    manifest_mtime = os.stat(tmp_path / MANIFEST_NAME).st_mtime_ns
+    assert not writer.snapshot(sheets, [], key=1, wait=True)
+    assert os.stat(tmp_path / MANIFEST_NAME).st_mtime_ns == manifest_mtime
+
+def test_only_changed_blocks_written(tmp_path, sheets):
+    """Test apakah hanya blok kolom yang berubah yang ditulis ulang"""
+    writer = AutosaveWriter(str(tmp_path), block_rows=4)
+    writer.write_snapshot(sheets, [])
+    before = arrow_files(tmp_path)
+
+    edited = sheets["data1"].clone()
+    edited[5, "y"] = 99.0
+    written = writer.write_snapshot({"data1": edited, "data2": sheets["data2"]}, [])
+    after = arrow_files(tmp_path)
+
+    assert written == 1
+    assert len(after - before) == 1
+    assert before <= after  # Blocks of the previous snapshot are kept for recovery
+    assert recover_session(str(tmp_path)).load_sheet("data1").equals(edited)
+
+def test_failed_write_keeps_previous_snapshot(tmp_path, sheets, monkeypatch):
+    """Test apakah snapshot sebelumnya tetap utuh jika penulisan gagal di tengah jalan"""
+    writer = AutosaveWriter(str(tmp_path), block_rows=4)
+    writer.write_snapshot(sheets, [])
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr("service.session.Autosave.write_atomic", fail)
+    edited = sheets["data1"].with_columns(pl.col("n") * 2)
+    with pytest.raises(OSError):
+        writer.write_snapshot({"data1": edited, "data2": sheets["data2"]}, [])
+
+    assert json.loads((tmp_path / MANIFEST_NAME).read_text()) == manifest
+    assert recover_session(str(tmp_path)).load_sheet("data1").equals(sheets["data1"])
@@ -0,0 +1,78 @@
+import zipfile
+import pytest
+import polars as pl
+from service.session.Project import save_project, load_project, ProjectFile, PlotEntry, plot_bytes
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+
+@pytest.fixture
+def session():
+    """Membuat sheet dan output contoh untuk pengujian project"""
+    sheets = {
+        "data1": pl.DataFrame({"kab": ["Bogor", "Depok"], "y": [1.5, None]}),
+        "data2": pl.DataFrame({"Domain": ["1", "2"], "EBLUP": ["0.5", "0.7"]}),
+    }
+    outputs = [
+        {"script_text": "summary(y)", "result_text": "Min 1.5", "error_text": "", "plots": []},
+        {"script_text": "plot(y)", "result_text": "", "error_text": "", "plots": [PNG, PNG]},
+    ]
+    return sheets, outputs
+
+def test_project_roundtrip(tmp_path, session):
+    """Test apakah project dapat dibuka kembali lengkap dengan plot"""
+    path = str(tmp_path / "session.saep")
+    save_project(path, *session)
+    sheets, outputs = load_project(path)
+    assert sheets["data1"].equals(session[0]["data1"])
+    assert sheets["data2"].equals(session[0]["data2"])
+    assert [dict(output, plots=[plot_bytes(plot) for plot in output["plots"]]) for output in outputs] == session[1]
+    with zipfile.ZipFile(path) as archive:
+        assert len([name for name in archive.namelist() if name.startswith("plots/")]) == 1
+
+def test_incremental_save(tmp_path, session):
+    """Test apakah hanya sheet yang berubah yang ditulis ulang saat menyimpan lagi"""
+    path = str(tmp_path / "session.saep")
+    sheets, outputs = session
+    assert save_project(path, sheets, outputs) == 3
+    assert save_project(path, sheets, outputs) == 0
+    edited = dict(sheets, data2=sheets["data2"].with_columns(pl.lit("0.9").alias("EBLUP")))
+    assert save_project(path, edited, outputs) == 1
+    with ProjectFile(path) as project:
+        assert project.load_sheet("data2")["EBLUP"].to_list() == ["0.9", "0.9"]
+        assert project.load_sheet("data1", columns=["y"]).columns == ["y"]
+
+def test_lazy_project_open(tmp_path, session):
+    """Test apakah plot baru dibaca saat dibutuhkan dan sheet dapat dibaca per batch"""
+    path = str(tmp_path / "session.saep")
+    sheets, outputs = session
+    big = pl.DataFrame({"x": range(10)})
+    save_project(path, dict(sheets, data1=big), outputs)
+    with ProjectFile(path) as project:
+        records = project.output_records()
+        batches = list(project.sheet_batches("data1", batch_rows=4))
+        assert project._mapped is not None  # Sheet dibaca dari memory map arsip, bukan disalin ke bytes
+    plot = records[1]["plots"][0]
+    assert isinstance(plot, PlotEntry) and plot._data is None
+    assert plot.read() == PNG
+    assert [(batch.height, done, total) for batch, done, total in batches] == [(4, 4, 10), (4, 8, 10), (2, 10, 10)]
+    assert pl.concat([batch for batch, _, _ in batches]).equals(big)
+    assert save_project(path, sheets, records) == 1
+    assert load_project(path)[1][1]["plots"][1].read() == PNG
+
+def test_invalid_project(tmp_path):
+    """Test apakah file yang bukan project ditolak"""
+    path = tmp_path / "data.saep"
+    path.write_bytes(b"not a zip")
+    with pytest.raises(ValueError):
+        load_project(str(path))
+
+def test_failed_save_keeps_project(tmp_path, session):
+    """Test apakah project lama tetap utuh jika penyimpanan gagal"""
+    path = str(tmp_path / "session.saep")
+    save_project(path, *session)
+    with pytest.raises(Exception):
+        save_project(path, {"data1": session[0]["data1"]}, [{"plots": ["not bytes"]}])
+    sheets, outputs = load_project(path)
+    assert sheets["data1"].equals(session[0]["data1"])
+    assert len(outputs) == 2
+    assert not (tmp_path / "session.saep.tmp").exists()
@@ -0,0 +1,75 @@
+import os
+import json
+import pytest
+import polars as pl
+from service.session.Autosave import AutosaveWriter, MANIFEST_NAME
+import service.session.Recovery as Recovery
+from service.session.Recovery import AutosaveSnapshot, SnapshotError, recover_session, open_sheet
+
+@pytest.fixture
+def snapshots(tmp_path):
+    """Menulis dua snapshot berurutan dan mengembalikan data keduanya"""
+    writer = AutosaveWriter(str(tmp_path), block_rows=4)
+    first = {"data1": pl.DataFrame({"y": [1.0, 2.0, 3.0, 4.0, 5.0], "kab": list("abcde")}), "data2": pl.DataFrame({"EBLUP": [""]})}
+    second = {"data1": first["data1"].with_columns(pl.col("y") * 10), "data2": first["data2"]}
+    writer.write_snapshot(first, [{"script_text": "a"}])
+    writer.write_snapshot(second, [{"script_text": "a"}, {"script_text": "b"}])
+    return first, second
+
+def current_blocks(directory):
+    manifest = json.loads((directory / MANIFEST_NAME).read_text())
+    return [block["file"] for column in manifest["sheets"]["data1"]["columns"] for block in column["blocks"]]
+
+def test_recover_latest_snapshot(tmp_path, snapshots):
+    """Test apakah snapshot terakhir dipulihkan beserta output"""
+    snapshot = recover_session(str(tmp_path))
+    assert snapshot.load_sheet("data1").equals(snapshots[1]["data1"])
+    assert [record["script_text"] for record in snapshot.output_records()] == ["a", "b"]
+    assert snapshot.timestamp is not None
+
+def test_no_snapshot(tmp_path):
+    """Test apakah tidak ada data yang dipulihkan jika belum ada snapshot"""
+    assert recover_session(str(tmp_path)) is None
+
+def test_corrupted_block_falls_back_to_previous(tmp_path, snapshots):
+    """Test apakah blok yang rusak membuat pemulihan memakai snapshot sebelumnya"""
+    path = tmp_path / current_blocks(tmp_path)[0]
+    payload = bytearray(path.read_bytes())
+    payload[-20] ^= 0xFF
+    path.write_bytes(bytes(payload))
+    source, data = open_sheet(recover_session(str(tmp_path)), "data1")
+    assert data.equals(snapshots[0]["data1"])
+    assert len(source.output_records()) == 1
+
+def test_truncated_manifest_falls_back_to_previous(tmp_path, snapshots):
+    """Test apakah manifest yang terpotong tidak merusak pemulihan"""
+    manifest_path = tmp_path / MANIFEST_NAME
+    manifest_path.write_text(manifest_path.read_text()[:40])
+    assert recover_session(str(tmp_path)).load_sheet("data1").equals(snapshots[0]["data1"])
+
+def test_sheets_are_checksummed_when_loaded(tmp_path, snapshots, monkeypatch):
+    """Test apakah checksum sheet baru dihitung saat sheet tersebut dimuat"""
+    checked = []
+    checksum = Recovery.file_checksum
+    monkeypatch.setattr(Recovery, "file_checksum", lambda path: checked.append(path) or checksum(path))
+    snapshot = recover_session(str(tmp_path))
+    assert checked == []
+    snapshot.load_sheet("data2")
+    assert len(checked) == 1
+    snapshot.load_sheet("data2")
+    assert len(checked) == 1
+
+def test_missing_block_detected(tmp_path, snapshots):
+    """Test apakah blok yang hilang terdeteksi sebelum data dimuat"""
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+    os.remove(tmp_path / current_blocks(tmp_path)[0])
+    with pytest.raises(SnapshotError):
+        AutosaveSnapshot(str(tmp_path), manifest).verify()
+
+def test_no_intact_snapshot(tmp_path, snapshots):
+    """Test apakah kesalahan dilaporkan jika semua snapshot rusak"""
+    for name in os.listdir(tmp_path):
+        if name.endswith(".arrow"):
+            os.remove(tmp_path / name)
+    with pytest.raises(SnapshotError):
+        recover_session(str(tmp_path))
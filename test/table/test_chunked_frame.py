@@ -0,0 +1,104 @@
+import sys
+import time
+import polars as pl
+from PyQt6.QtWidgets import QApplication
+from model.ChunkedFrame import ChunkedFrame, blank_rows
+from model.TableModel import TableModel
+
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+def make_data(n):
+    return pl.DataFrame({
+        "a": pl.int_range(0, n, eager=True),
+        "b": pl.int_range(0, n, eager=True).cast(pl.Float64),
+        "c": pl.int_range(0, n, eager=True).cast(pl.Utf8),
+    })
+
+def test_blank_rows_follow_schema():
+    """Test apakah baris kosong dibuat sesuai tipe kolom tanpa list dict"""
+    rows = blank_rows(make_data(1).schema, 3)
+    assert rows.height == 3
+    assert rows.schema == make_data(1).schema
+    assert rows["a"].null_count() == 3
+    assert rows["c"].to_list() == ["", "", ""]
+
+def test_insert_and_delete_match_concat():
+    """Test apakah insert/delete pada chunk menghasilkan data yang sama dengan concat penuh"""
+    data = make_data(1000)
+    store = ChunkedFrame(data, chunk_rows=100)
+    new_rows = blank_rows(data.schema, 5)
+    store.insert_rows(450, new_rows)
+    expected = pl.concat([data[:450], new_rows, data[450:]])
+    assert store.frame().equals(expected)
+
+    removed = store.delete_rows(440, 30)
+    assert removed.equals(expected.slice(440, 30))
+    expected = pl.concat([expected[:440], expected[470:]])
+    assert store.frame().equals(expected)
+    assert store.height() == expected.height
+
+def test_set_value_touches_one_chunk():
+    """Test apakah edit sel hanya mengganti chunk yang berisi baris tersebut"""
+    store = ChunkedFrame(make_data(1000), chunk_rows=100)
+    store.set_value(0, 0, -1)
+    chunks_before = list(store._chunks)
+    store.set_value(550, 0, -2)
+    changed = [i for i, chunk in enumerate(store._chunks) if chunk is not chunks_before[i]]
+    assert changed == [5]
+    assert store.frame()["a"][0] == -1
+    assert store.frame()["a"][550] == -2
+
+def test_background_compaction_keeps_data():
+    """Test apakah kompaksi di background tidak mengubah isi data"""
+    data = make_data(2000)
+    store = ChunkedFrame(data, chunk_rows=100)
+    for row in range(0, 2000, 50):
+        store.insert_rows(row, blank_rows(data.schema, 1))
+    expected = store.frame()
+    assert store.needs_compaction()
+    store.compact_in_background()
+    for _ in range(100):
+        if not store._compacting:
+            break
+        time.sleep(0.05)
+    assert not store.needs_compaction()
+    assert store.frame().equals(expected)
+
+def test_compaction_does_not_overwrite_replaced_frame():
+    """Test apakah hasil kompaksi lama dibuang jika frame sudah diganti sebelum kompaksi selesai"""
+    data = make_data(2000)
+    store = ChunkedFrame(data, chunk_rows=100)
+    for row in range(0, 2000, 50):
+        store.insert_rows(row, blank_rows(data.schema, 1))
+    store.compact_in_background()
+    replaced = make_data(10)
+    store.set_frame(replaced)
+    for _ in range(100):
+        if not store._compacting:
+            break
+        time.sleep(0.05)
+    assert store.frame().equals(replaced)
+
+def test_table_model_rows_undo_redo():
+    """Test apakah tambah/hapus baris di TableModel tetap bisa di-undo dan di-redo"""
+    data = make_data(300)
+    model = TableModel(data)
+    index = model.index(10, 0)
+    model.addRowsAfter(index, 2)
+    assert model.get_data().height == 302
+    assert model.get_data()["c"][11] == ""
+    model.undo()
+    assert model.get_data().equals(data)
+    model.redo()
+    assert model.get_data().height == 302
+
+    model.deleteRows(0, 5)
+    model.undo()
+    assert model.get_data()[:5].equals(data[:5])
+
+    model.setData(model.index(3, 1), "7.5")
+    assert model.get_data()["b"][3] == 7.5
+    model.undo()
+    assert model.get_data()["b"][3] == 3.0
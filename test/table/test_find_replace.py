@@ -0,0 +1,66 @@
+import sys
+import pytest
+import polars as pl
+from PyQt6.QtWidgets import QApplication
+from model.TableModel import TableModel
+from service.table.FindReplace import find_matches, replace_values
+
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+@pytest.fixture
+def data():
+    """Membuat data contoh untuk pengujian find & replace"""
+    return pl.DataFrame({
+        "kab": ["Bogor", "bogor barat", "Depok", None],
+        "kode": [3201, 3202, 3276, 3201],
+        "y": [1.5, 2.0, 3201.0, 4.0],
+    })
+
+def test_find_literal_case_insensitive(data):
+    """Test apakah pencarian literal mengembalikan indeks hit (baris, kolom) yang terurut"""
+    hits = find_matches(data, "bogor")
+    assert hits.schema == {"row": pl.UInt32, "column": pl.UInt16}
+    assert hits.rows() == [(0, 0), (1, 0)]
+
+def test_find_per_column_and_whole_cell(data):
+    """Test apakah pencarian per kolom dan seluruh sel bekerja pada kolom numerik"""
+    assert find_matches(data, "3201", columns=["kode"]).rows() == [(0, 1), (3, 1)]
+    assert find_matches(data, "Bogor", match_case=True, whole_cell=True).rows() == [(0, 0)]
+
+def test_find_regex_and_invalid_pattern(data):
+    """Test apakah regex didukung dan pola tidak valid ditolak"""
+    assert find_matches(data, r"^\d{4}$", columns=["kode"], regex=True).height == 4
+    with pytest.raises(ValueError):
+        find_matches(data, "(", regex=True)
+
+def test_replace_values_keeps_dtype(data):
+    """Test apakah replace-all menghasilkan kolom baru dengan tipe data semula"""
+    new_columns, count = replace_values(data, "32", "33", columns=["kode"])
+    assert count == 4
+    assert new_columns["kode"].dtype == pl.Int64
+    assert new_columns["kode"].to_list() == [3301, 3302, 3376, 3301]
+    with pytest.raises(ValueError):
+        replace_values(data, "32", "x", columns=["kode"])
+
+def test_replace_all_is_one_undo_entry(data):
+    """Test apakah replace-all pada TableModel tercatat sebagai satu entri undo"""
+    model = TableModel(data)
+    new_columns, count = replace_values(data, "bogor", "Kota Bogor", whole_cell=False)
+    model.replace_columns(new_columns, count)
+    assert model.undo_stack.count() == 1
+    assert model.get_data()["kab"].to_list()[:2] == ["Kota Bogor", "Kota Bogor barat"]
+    model.undo()
+    assert model.get_data().equals(data)
+
+def test_view_positions_invert_the_view(data):
+    """Test apakah posisi tampilan setiap baris sumber adalah invers dari permutasi view"""
+    model = TableModel(data)
+    assert model.view_positions() is None
+    model.sort_view(2, descending=True)
+    model.filter_view(1, "<", "3276")
+    positions = model.view_positions()
+    assert positions.to_list() == [2, 1, None, 0]
+    assert model.view_positions() is positions
+    assert [model.view_row_of(row) for row in range(4)] == [2, 1, None, 0]
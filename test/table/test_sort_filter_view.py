@@ -0,0 +1,87 @@
+import sys
+import pytest
+import polars as pl
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication
+from model.TableModel import TableModel
+from service.table.SortFilter import build_filter_expression, compute_view_rows
+
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+@pytest.fixture
+def table_model():
+    """Membuat TableModel dengan data campuran untuk pengujian sort dan filter"""
+    data = pl.DataFrame({
+        "area": ["a", "b", "c", "d", "e"],
+        "y": [3.0, 1.0, None, 5.0, 2.0],
+        "n": [10, 20, 30, 40, 50],
+    })
+    return TableModel(data)
+
+def display(model, row, column):
+    return model.data(model.index(row, column), Qt.ItemDataRole.DisplayRole)
+
+def test_compute_view_rows_sort_and_filter():
+    """Test apakah permutasi baris dari mask dan arg_sort benar"""
+    data = pl.DataFrame({"x": [5, 1, 4, 2, 3]})
+    rows = compute_view_rows(data, pl.col("x") > 1, "x", descending=True)
+    assert rows.to_list() == [0, 2, 4, 3]
+    assert compute_view_rows(data) is None
+
+def test_sort_view_maps_rows(table_model):
+    """Test apakah sort hanya mengubah urutan tampilan, bukan data asli"""
+    table_model.sort_view(1)
+    assert [display(table_model, r, 0) for r in range(5)] == ["b", "e", "a", "d", "c"]
+    assert table_model.get_data()["area"].to_list() == ["a", "b", "c", "d", "e"]
+    assert table_model.headerData(0, Qt.Orientation.Vertical, Qt.ItemDataRole.DisplayRole) == "2"
+
+def test_filter_view_and_view_data(table_model):
+    """Test apakah filter menghasilkan subset baris untuk eksplorasi dan pemodelan"""
+    table_model.filter_view(2, ">=", "30")
+    assert table_model.rowCount(None) == 3
+    assert table_model.get_view_data()["area"].to_list() == ["c", "d", "e"]
+    other = pl.DataFrame({"est": [1, 2, 3, 4, 5]})
+    assert table_model.apply_view(other)["est"].to_list() == [3, 4, 5]
+
+    table_model.clear_view()
+    assert not table_model.is_view_active()
+    assert table_model.rowCount(None) == 5
+
+def test_edit_through_view_updates_source_row(table_model):
+    """Test apakah edit sel pada view tersortir mengubah baris sumber yang benar"""
+    table_model.sort_view(2, descending=True)
+    table_model.setData(table_model.index(0, 0), "z")
+    assert table_model.get_data()["area"][4] == "z"
+    table_model.undo()
+    assert table_model.get_data()["area"][4] == "e"
+    assert table_model.is_view_active()
+
+def test_invalid_numeric_filter_raises():
+    """Test apakah nilai non-numerik pada kolom numerik ditolak"""
+    with pytest.raises(ValueError):
+        build_filter_expression("y", pl.Float64, ">", "abc")
+
+def test_row_insert_through_sorted_view_stays_within_row_count():
+    """Test apakah sinyal insert/remove baris selalu berada di dalam rowCount setelah view dihapus"""
+    model = TableModel(pl.DataFrame({"x": pl.int_range(0, 1000, eager=True)}))
+    model.sort_view(0, descending=True)
+    inserted = []
+    model.rowsAboutToBeInserted.connect(lambda _, first, last: inserted.append((first, model.rowCount(None))))
+    model.addRowsBefore(model.index(0, 0), 1)
+    assert inserted[-1] == (999, 1000)
+    assert all(first <= count for first, count in inserted)
+    assert model.get_data()["x"][999] is None
+    removed = []
+    model.rowsAboutToBeRemoved.connect(lambda _, first, last: removed.append((last, model.rowCount(None))))
+    model.sort_view(0)
+    model.undo()
+    assert removed and all(last < count for last, count in removed)
+
+def test_stale_filter_is_dropped_after_rename(table_model):
+    """Test apakah filter pada kolom yang diganti namanya dibuang saat sort berikutnya"""
+    table_model.filter_view(2, ">=", "30")
+    table_model.rename_column(2, "count")
+    table_model.sort_view(0, descending=True)
+    assert table_model.get_view_data()["area"].to_list() == ["e", "d", "c", "b", "a"]
@@ -0,0 +1,86 @@
+import os
+import gc
+import sys
+import pytest
+import polars as pl
+from PyQt6.QtWidgets import QApplication
+from model.TableModel import TableModel
+
+app = QApplication.instance()
+if not app:
+    app = QApplication(sys.argv)
+
+@pytest.fixture
+def table_model():
+    """Membuat TableModel dengan data numerik untuk pengujian undo"""
+    data = pl.DataFrame({
+        "a": list(range(1000)),
+        "b": [float(i) for i in range(1000)],
+        "c": [str(i) for i in range(1000)],
+    })
+    return TableModel(data)
+
+def test_change_type_undo_keeps_series(table_model):
+    """Test apakah undo perubahan tipe memakai Series, bukan list Python"""
+    table_model.set_column_type(0, "Float")
+    command = table_model.undo_stack.command(0)
+    assert isinstance(command.old_data.get(), pl.Series)
+    assert table_model.get_data()["a"].dtype == pl.Float64
+
+    table_model.undo()
+    assert table_model.get_data()["a"].dtype == pl.Int64
+    assert table_model.get_data()["a"].to_list() == list(range(1000))
+
+    table_model.redo()
+    assert table_model.get_data()["a"].dtype == pl.Float64
+
+def test_delete_rows_undo(table_model):
+    """Test apakah baris yang dihapus dikembalikan dengan benar"""
+    original = table_model.get_data()
+    table_model.deleteRows(10, 5)
+    assert table_model.get_data().height == 995
+    table_model.undo()
+    assert table_model.get_data().equals(original)
+
+def test_delete_columns_undo(table_model):
+    """Test apakah kolom yang dihapus dikembalikan sesuai urutan awal"""
+    original = table_model.get_data()
+    table_model.deleteColumns(0, 2)
+    assert table_model.get_data().columns == ["c"]
+    table_model.undo()
+    assert table_model.get_data().equals(original)
+
+def test_undo_memory_limit_spills_oldest(table_model):
+    """Test apakah riwayat undo dipindahkan ke disk ketika melebihi batas memori"""
+    table_model.set_column_type(0, "Float")
+    table_model.set_column_type(1, "Integer")
+    assert table_model.undo_memory_usage() > 0
+
+    table_model.set_undo_memory_limit(0)
+    assert table_model.undo_memory_usage() == 0
+    assert table_model.undo_stack.command(0).old_data.is_spilled()
+
+    table_model.undo()
+    table_model.undo()
+    assert table_model.get_data()["a"].dtype == pl.Int64
+    assert table_model.get_data()["b"].to_list() == [float(i) for i in range(1000)]
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+def test_undo_memory_counts_only_data_outside_the_table(table_model):
+    """Test apakah data undo yang masih dipakai tabel tidak dihitung ke batas memori"""
+    table_model.set_column_type(0, "Float")
+    assert table_model.undo_memory_usage() == 1000 * 8
+    table_model.deleteRows(0, 10)
+    assert table_model.undo_memory_usage() == 1000 * 8
+
+def test_spill_files_removed_with_their_commands(table_model):
+    """Test apakah berkas undo di disk dihapus saat perintahnya keluar dari riwayat undo"""
+    table_model.set_column_type(0, "Float")
+    table_model.set_undo_memory_limit(0)
+    spilled = os.listdir(table_model._undo_spill_dir)
+    assert len(spilled) == 1
+    table_model.undo_stack.clear()
+    gc.collect()
+    assert os.listdir(table_model._undo_spill_dir) == []
@@ -1,16 +1,18 @@
 from PyQt6.QtWidgets import (
-    QMainWindow, QTableView, QVBoxLayout, QWidget, QTabWidget, QMenu, QFrame, QSpacerItem,
-    QAbstractItemView, QApplication, QSplitter, QScrollArea, QSizePolicy, QToolBar, QInputDialog, 
-    QTextEdit, QDialog, QComboBox, QPushButton, QHBoxLayout, QMessageBox, QLabel
+    QMainWindow, QTableView, QVBoxLayout, QWidget, QTabWidget, QMenu,
+    QAbstractItemView, QApplication, QSplitter, QSizePolicy, QToolBar, QInputDialog,
+    QDialog, QComboBox, QPushButton, QHBoxLayout, QMessageBox, QLabel
 )
 from PyQt6.QtCore import Qt, QSize, QTimer 
-from PyQt6.QtGui import QAction, QKeySequence, QIcon, QPixmap
+from PyQt6.QtGui import QAction, QKeySequence, QIcon
 import polars as pl
 from model.TableModel import TableModel
 import os
 from service.table.GoToRow import *
 from service.table.GoToColumn import *
 from view.components.MenuContext import show_context_menu
+from view.components.FilterBar import FilterBar
+from view.components.FindReplaceDialog import FindReplaceDialog
 from view.components.ModelingSaeEblupAreaDialog import ModelingSaeDialog
 from view.components.ModellingSaeHBDialog import ModelingSaeHBDialog
 from view.components.ModelingSaeEblupUnitDialog import ModelingSaeUnitDialog
@@ -31,10 +33,14 @@ from view.components.ProjectionDialog import ProjectionDialog
 from service.table.DeleteColumn import confirm_delete_selected_columns
 from service.table.AddColumn import show_add_column_before_dialog, show_add_column_after_dialog
 from view.components.ProjectionDialog import ProjectionDialog
-from PyQt6.QtWidgets import QLabel
+from PyQt6.QtWidgets import QLabel, QLineEdit
+from model.OutputHistoryModel import OutputHistoryModel, make_output_record, OUTPUT_KINDS
+from view.components.OutputHistoryView import OutputHistoryView, OutputFilterProxyModel, decode_plot
+from service.session.Autosave import AutosaveWriter
+from service.session.Recovery import recover_session, open_sheet, has_snapshot, SnapshotError
+from service.utils.analysis_view import ROW_POSITION
 import threading
 import json
-import datetime
 
 class MainWindow(QMainWindow):
     """Main application window for SAE Pisan: Small Area Estimation Programming for Statistical Analysis.
@@ -56,9 +62,11 @@ class MainWindow(QMainWindow):
         toolBar (QToolBar): Tool bar for the application.
         tab_widget (QTabWidget): Tab widget containing the different sheets.
         spreadsheet (QTableView): Table view for the first sheet.
+        filter_bar (FilterBar): Filter bar above the first sheet.
         table_view2 (QTableView): Table view for the second sheet.
-        scroll_area (QScrollArea): Scroll area for the output tab.
-        output_layout (QVBoxLayout): Layout for displaying output in the output tab.
+        output_model (OutputHistoryModel): The output history, one record per run.
+        output_proxy (OutputFilterProxyModel): Search and kind filter over the output history.
+        output_view (OutputHistoryView): Virtualized view of the output history in the output tab.
     Methods:
         init_ui(): Initializes the user interface.
         change_font_size(): Opens a dialog to change the font size.
@@ -82,6 +90,7 @@ class MainWindow(QMainWindow):
         open_multicollinearity_dialog(): Opens the multicollinearity dialog.
         open_histogram_dialog(): Opens the histogram dialog.
         open_variable_selection_dialog(): Opens the variable selection dialog.
+        set_output_key(): Chooses how Data Output rows are matched to Data Editor rows (row position or a key column).
         show_modeling_sae_dialog_lazy(): Lazily shows the SAE modeling dialog.
         show_modeling_saeHB_dialog_lazy(): Lazily shows the SAE HB modeling dialog.
         show_modeling_sae_unit_dialog_lazy(): Lazily shows the SAE unit modeling dialog.
@@ -101,13 +110,17 @@ class MainWindow(QMainWindow):
         group_by_row(selection): Groups selected indexes by row.
         show_output(title, content): Displays output in the Output tab.
         show_header_context_menu(pos): Shows the context menu for the header.
+        show_find_replace_dialog_lazy(): Shows the Find and Replace dialog.
+        sort_column(column_index, descending): Sorts the Data Editor view by the column at the given index.
         rename_column(column_index): Renames the column at the given index.
         edit_data_type(column_index): Edits the data type of the column at the given index.
         set_path(path): Sets the path for the application.
-        add_output(script_text, result_text=None, plot_paths=None, error_text=None): Adds output to the layout in the form of a card.
-        remove_output(card_frame): Removes output from the layout.
-        copy_output_image(card_frame): Copies the output image to the clipboard.
-        show_context_menu(pos, card_frame): Shows the context menu for each output."""
+        add_output(script_text, result_text=None, plot_paths=None, error_text=None, plot_images=None): Adds an output record to the output history.
+        update_output_count(): Shows how many outputs match the output search.
+        remove_output(row): Removes the output at the given row of the history.
+        clear_outputs(): Removes every output.
+        copy_output_image(row): Copies the first plot of an output to the clipboard.
+        show_context_menu(row, global_pos): Shows the context menu for an output."""
     
     def __init__(self):
         """
@@ -141,11 +154,15 @@ class MainWindow(QMainWindow):
         self.model2 = TableModel(self.data2)
         self.path = os.path.join(os.path.dirname(__file__), '..')
         self.font_size = 14
+        self.project_path = None
+        self.selected_auxiliaries = None  # Seleksi LASSO terakhir beserta versi data editor, dipakai sekali oleh dialog SAE berikutnya
+        self.output_key = None  # Kolom kunci pencocokan baris Data Output ke Data Editor, None berarti menurut posisi baris
 
         # Inisialisasi UI
         self.init_ui()
 
         # Set up autosave timer
+        self.autosave_writer = AutosaveWriter(os.path.join(self.path, 'file-data', 'autosave'))
         self.autosave_interval = 60000  # 60 seconds
         self.autosave_timer = QTimer(self)
         self.autosave_timer.timeout.connect(self.autosave_data)
@@ -203,6 +220,7 @@ class MainWindow(QMainWindow):
         self.show_modellig_sae_pseudo_dialog = None
         self.show_compute_variable_dialog = None
         self.show_projection_variabel_dialog = None
+        self.show_find_replace_dialog = None
         
 
         # Tab pertama (Data Editor)
@@ -217,7 +235,11 @@ class MainWindow(QMainWindow):
         self.spreadsheet.verticalHeader().setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.spreadsheet.verticalHeader().customContextMenuRequested.connect(lambda pos: show_context_menu(self, pos))
 
+        self.filter_bar = FilterBar(self)
+        self.filter_bar.set_columns(self.model1.get_data().columns)
+
         tab1_layout = QVBoxLayout(self.tab1)
+        tab1_layout.addWidget(self.filter_bar)
         tab1_layout.addWidget(self.spreadsheet)
         self.spreadsheet.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
 
@@ -232,24 +254,33 @@ class MainWindow(QMainWindow):
 
         # Tab ketiga (Output)
         self.tab3 = QWidget()
-        self.scroll_area = QScrollArea(self.tab3)
-        
-        # Tab output
-        self.output_tab = QWidget()
-        self.scroll_area = QScrollArea(self.output_tab)
-        self.scroll_area.setWidgetResizable(True)
-        self.output_container = QWidget()
-        self.output_layout = QVBoxLayout(self.output_container)
-        self.scroll_area.verticalScrollBar().rangeChanged.connect(lambda: self.scroll_area.verticalScrollBar().setValue(self.scroll_area.verticalScrollBar().maximum()))
-        self.output_container.setLayout(self.output_layout)
-        self.scroll_area.setWidget(self.output_container)
-        
-        # Atur layout output
-        self.output_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.output_layout.setSpacing(0)
+        self.output_tab = self.tab3
+        self.output_model = OutputHistoryModel()
+        self.output_proxy = OutputFilterProxyModel()
+        self.output_proxy.setSourceModel(self.output_model)
+        self.output_view = OutputHistoryView()
+        self.output_view.setModel(self.output_proxy)
+        self.output_view.card_context_menu_requested.connect(self.show_context_menu)
+
+        # Pencarian dan filter riwayat output
+        self.output_search = QLineEdit()
+        self.output_search.setPlaceholderText("Search outputs...")
+        self.output_search.setClearButtonEnabled(True)
+        self.output_search.textChanged.connect(self.output_proxy.set_search_text)
+        self.output_kind_combo = QComboBox()
+        self.output_kind_combo.addItems(OUTPUT_KINDS)
+        self.output_kind_combo.currentTextChanged.connect(self.output_proxy.set_kind)
+        self.output_count_label = QLabel()
+        for signal in (self.output_proxy.rowsInserted, self.output_proxy.rowsRemoved, self.output_proxy.modelReset):
+            signal.connect(self.update_output_count)
+        output_search_layout = QHBoxLayout()
+        output_search_layout.addWidget(self.output_search)
+        output_search_layout.addWidget(self.output_kind_combo)
+        output_search_layout.addWidget(self.output_count_label)
 
         tab3_layout = QVBoxLayout(self.tab3)
-        tab3_layout.addWidget(self.scroll_area)
+        tab3_layout.addLayout(output_search_layout)
+        tab3_layout.addWidget(self.output_view)
 
         # Menambahkan tab ke QTabWidget
         self.tab_widget.addTab(self.tab1, "Data Editor")
@@ -292,12 +323,24 @@ class MainWindow(QMainWindow):
         self.save_data_output_action.setIcon(QIcon(os.path.join(os.path.dirname(__file__), '..', 'assets', 'savedataoutput.svg')))
         self.save_action.setStatusTip("Ctrl+Shift+S")
         
+        self.open_project_action = QAction("Open Project", self)
+        self.open_project_action.setShortcut(QKeySequence(Qt.Modifier.CTRL | Qt.Modifier.SHIFT | Qt.Key.Key_O))
+        self.open_project_action.setIcon(QIcon(os.path.join(os.path.dirname(__file__), '..', 'assets', 'open.svg')))
+        self.open_project_action.setStatusTip("Ctrl+Shift+O")
+
+        self.save_project_action = QAction("Save Project", self)
+        self.save_project_action.setShortcut(QKeySequence(Qt.Modifier.CTRL | Qt.Modifier.ALT | Qt.Key.Key_S))
+        self.save_project_action.setIcon(QIcon(os.path.join(os.path.dirname(__file__), '..', 'assets', 'savedata.svg')))
+        self.save_project_action.setStatusTip("Ctrl+Alt+S")
+
         self.save_output_pdf = QAction("Save Output to PDF", self)
         self.save_output_pdf.setShortcut(QKeySequence(Qt.Modifier.CTRL | Qt.Key.Key_P))
         self.save_output_pdf.setIcon(QIcon(os.path.join(os.path.dirname(__file__), '..', 'assets', 'savepdf.svg')))
         self.save_output_pdf.setStatusTip("Ctrl+P")
 
         self.file_menu.addAction(self.recent_data)
+        self.file_menu.addAction(self.open_project_action)
+        self.file_menu.addAction(self.save_project_action)
         self.file_menu.addAction(self.load_action)
         self.file_menu.addAction(self.save_action)
         self.file_menu.addAction(self.save_data_output_action)
@@ -331,6 +374,11 @@ class MainWindow(QMainWindow):
         self.menu_exploration.addAction(self.action_correlation)
         self.menu_exploration.addAction(self.action_multicollinearity)
         self.menu_exploration.addAction(self.action_variable_selection)
+        self.menu_exploration.addSeparator()
+
+        self.action_output_key = QAction("Match Output Rows...", self)
+        self.action_output_key.triggered.connect(self.set_output_key)
+        self.menu_exploration.addAction(self.action_output_key)
 
         # Menu "Graph"
         self.menu_graph = self.menu_bar.addMenu("Graph")
@@ -477,6 +525,11 @@ class MainWindow(QMainWindow):
         self.go_to_end_column_action.triggered.connect(lambda : go_to_end_column(self))
         self.addAction(self.go_to_end_column_action)
 
+        self.find_replace_action = QAction("Find and Replace", self)
+        self.find_replace_action.setShortcuts([QKeySequence(QKeySequence.StandardKey.Find), QKeySequence(QKeySequence.StandardKey.Replace)])
+        self.find_replace_action.triggered.connect(self.show_find_replace_dialog_lazy)
+        self.addAction(self.find_replace_action)
+
         # Add spacer to push following items to the right
         spacer = QWidget(self)
         spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Preferred)
@@ -804,6 +857,31 @@ class MainWindow(QMainWindow):
         self.show_variable_selection_dialog.set_model(self.model1, self.model2)
         self.show_variable_selection_dialog.show()
 
+    def set_output_key(self):
+        """
+        Chooses how rows of the Data Output sheet are matched to rows of the Data Editor in
+        exploration and graphs: by row position, or by a key column present in both sheets
+        (e.g. the domain code, so that one estimate per domain is matched to all its rows).
+        """
+        data_columns = self.model1.get_data().columns
+        keys = [column for column in self.model2.get_data().columns if column in data_columns]
+        choices = [ROW_POSITION, *keys]
+        current = choices.index(self.output_key) if self.output_key in keys else 0
+        choice, ok = QInputDialog.getItem(self, "Match Output Rows", "Match Data Output rows by:", choices, current, False)
+        if ok:
+            self.output_key = None if choice == ROW_POSITION else choice
+
+    def take_selected_auxiliaries(self):
+        """
+        Returns the variables chosen by the last LASSO selection and forgets them, so that they
+        are given to the next SAE dialog only. Nothing is returned when the data editor has
+        changed since the selection was run.
+        """
+        selection, self.selected_auxiliaries = self.selected_auxiliaries, None
+        if selection is None or selection["data_version"] != self.model1.data_version():
+            return []
+        return selection["columns"]
+
     def show_modeling_sae_dialog_lazy(self):
         """
         Lazily initializes and displays the ModelingSaeDialog.
@@ -918,6 +996,19 @@ class MainWindow(QMainWindow):
         if self.show_projection_variabel_dialog.show_prerequisites():
             self.show_projection_variabel_dialog.show()
 
+    def show_find_replace_dialog_lazy(self):
+        """
+        Lazily initializes and displays the Find and Replace dialog for the Data Editor sheet.
+        """
+        
+        if self.show_find_replace_dialog is None:
+            self.show_find_replace_dialog = FindReplaceDialog(self)
+            self.show_find_replace_dialog.set_columns(self.model1.get_data().columns)
+        self.tab_widget.setCurrentWidget(self.tab1)
+        self.show_find_replace_dialog.show()
+        self.show_find_replace_dialog.raise_()
+        self.show_find_replace_dialog.find_input.setFocus()
+
     def open_about_dialog(self):
         """
         Opens the About dialog window.
@@ -952,6 +1043,9 @@ class MainWindow(QMainWindow):
         if sheet_number == 1:
             self.spreadsheet.setModel(model)
             self.model1 = model
+            self.filter_bar.set_columns(model.get_data().columns)
+            if not model.is_view_active():
+                self.spreadsheet.horizontalHeader().setSortIndicatorShown(False)
             self.spreadsheet.resizeColumnsToContents()
             self.tab_widget.setCurrentWidget(self.tab1)
             self.autosave_data()
@@ -969,6 +1063,8 @@ class MainWindow(QMainWindow):
                 self.show_compute_variable_dialog.set_model(model)
             if self.show_projection_variabel_dialog:
                 self.show_projection_variabel_dialog.set_model(model)
+            if self.show_find_replace_dialog:
+                self.show_find_replace_dialog.set_columns(model.get_data().columns)
         elif sheet_number == 2:
             self.table_view2.setModel(model)
             self.model2 = model
@@ -1012,10 +1108,12 @@ class MainWindow(QMainWindow):
     def undo_action(self):
         """Undo the last action."""
         self.model1.undo()
+        self.filter_bar.update_status()
 
     def redo_action(self):
         """Redo the last undone action."""
         self.model1.redo()
+        self.filter_bar.update_status()
 
     def group_by_row(self, selection):
         """Group selected indexes by row."""
@@ -1028,9 +1126,7 @@ class MainWindow(QMainWindow):
     
     def show_output(self, title, content):
         """Display output in the Output tab"""
-        label = QLabel(content)
-        self.output_layout.addWidget(label)
-        self.output_tab_widget.setCurrentIndex(0)
+        self.add_output(script_text=title, result_text=content)
 
     def show_header_context_menu(self, pos):
         """Show context menu for header."""
@@ -1044,6 +1140,21 @@ class MainWindow(QMainWindow):
         edit_type_action = QAction("Edit Data Type", self)
         edit_type_action.triggered.connect(lambda: self.edit_data_type(logical_index))
         menu.addAction(edit_type_action)
+
+        menu.addSeparator()
+        sort_ascending_action = QAction("Sort Ascending", self)
+        sort_ascending_action.triggered.connect(lambda: self.sort_column(logical_index, False))
+        menu.addAction(sort_ascending_action)
+
+        sort_descending_action = QAction("Sort Descending", self)
+        sort_descending_action.triggered.connect(lambda: self.sort_column(logical_index, True))
+        menu.addAction(sort_descending_action)
+
+        clear_view_action = QAction("Clear Sort && Filter", self)
+        clear_view_action.triggered.connect(self.filter_bar.clear_filter)
+        clear_view_action.setEnabled(self.model1.is_view_active())
+        menu.addAction(clear_view_action)
+        menu.addSeparator()
         
         selection = self.spreadsheet.selectionModel().selectedIndexes()
         has_selection = bool(selection)
@@ -1065,6 +1176,18 @@ class MainWindow(QMainWindow):
         
         menu.exec(header.mapToGlobal(pos))
 
+    def sort_column(self, column_index, descending):
+        """Sort the Data Editor view by the column at the given index."""
+        try:
+            self.model1.sort_view(column_index, descending)
+        except (ValueError, pl.exceptions.PolarsError) as e:
+            QMessageBox.warning(self, "Sort", str(e))
+            return
+        header = self.spreadsheet.horizontalHeader()
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(column_index, Qt.SortOrder.DescendingOrder if descending else Qt.SortOrder.AscendingOrder)
+        self.filter_bar.update_status()
+
     def rename_column(self, column_index):
         """Rename the column at the given index."""
         current_name = self.model1.headerData(column_index, Qt.Orientation.Horizontal, Qt.ItemDataRole.DisplayRole)
@@ -1098,334 +1221,159 @@ class MainWindow(QMainWindow):
         
         self.path=path
     
-    def add_output(self, script_text, result_text=None, plot_paths=None):
-        """Menambahkan output ke layout dalam bentuk card"""
-
-        card_frame = QFrame()
-        card_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f9f9f9;
-                border: 1px solid #ddd;
-                border-radius: 8px;
-                padding: 10px;
-            }
-        """)
-
-        card_layout = QVBoxLayout(card_frame)
-        card_layout.setSpacing(8)
-
-        label_script = QLabel("<b>Script R:</b>")
-        label_script.setStyleSheet("color: #333; margin-bottom: 5px;")
-        script_box = QTextEdit()
-        script_box.setPlainText(script_text)
-        script_box.setReadOnly(True)
-        script_box.setStyleSheet("""
-            QTextEdit {
-                background-color: #fff;
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                padding: 5px;
-                font-family: Consolas, Courier New, monospace;
-            }
-        """)
-        script_box.setFixedHeight(script_box.fontMetrics().lineSpacing() * (script_text.count('\n') + 3))
-
-        card_layout.addWidget(label_script)
-        card_layout.addWidget(script_box)
-
-        if result_text:
-            label_output = QLabel("<b>Output:</b>")
-            label_output.setStyleSheet("color: #333; margin-top: 10px; margin-bottom: 5px;")
-            result_box = QTextEdit()
-            result_box.setPlainText(result_text)
-            result_box.setReadOnly(True)
-            result_box.setStyleSheet("""
-                QTextEdit {
-                    background-color: #fff;
-                    border: 1px solid #ccc;
-                    border-radius: 4px;
-                    padding: 5px;
-                    font-family: Consolas, Courier New, monospace;
-                }
-            """)
-            max_height = 400
-            calculated_height = result_box.fontMetrics().lineSpacing() * (result_text.count('\n') + 3)
-            result_box.setFixedHeight(min(calculated_height, max_height))
-            result_box.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn if calculated_height > max_height else Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-
-            card_layout.addWidget(label_output)
-            card_layout.addWidget(result_box)
-
-        if plot_paths:
-            label_plot = QLabel("<b>Plot:</b>")
-            label_plot.setStyleSheet("color: #333; margin-top: 10px; margin-bottom: 5px;")
-            card_layout.addWidget(label_plot)
-
-            for plot_path in plot_paths:
-                if os.path.exists(plot_path):
-                    pixmap = QPixmap(plot_path)
-                    label = QLabel()
-                    label.setPixmap(pixmap)
-                    label.setFixedSize(500, 350) 
-                    label.setScaledContents(True)
-                    label.setStyleSheet("border: 1px solid #ccc; border-radius: 4px;")
-                    card_layout.addWidget(label)
-        card_frame.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        card_frame.customContextMenuRequested.connect(lambda pos: self.show_context_menu(pos, card_frame))
-
-        if self.output_layout.count() > 0:
-            last_item = self.output_layout.itemAt(self.output_layout.count() - 1)
-            if isinstance(last_item.spacerItem(), QSpacerItem):
-                self.output_layout.removeItem(last_item)
-
-        self.output_layout.addWidget(card_frame)
-
-        if self.output_layout.count() == 1:
-            self.output_layout.addStretch()
-
+    def add_output(self, script_text, result_text=None, plot_paths=None, error_text=None, plot_images=None):
+        """Add an output record to the output history; its card is built when it is scrolled into view"""
+        # Keep the encoded plot images so the output can be shown and saved without re-rendering
+        plot_images = list(plot_images or [])
+        for plot_path in plot_paths or []:
+            if os.path.exists(plot_path):
+                with open(plot_path, 'rb') as plot_file:
+                    plot_images.append(plot_file.read())
+
+        self.output_model.append_record(make_output_record(script_text, result_text, error_text, plot_images))
         self.tab_widget.setCurrentWidget(self.tab3)
+        self.output_view.scrollToBottom()
 
         if plot_paths:
             for plot_path in plot_paths:
                 if os.path.exists(plot_path):
                     os.remove(plot_path)
 
+    def update_output_count(self, *args):
+        """Menampilkan jumlah output yang cocok dengan pencarian"""
+        shown, total = self.output_proxy.rowCount(), self.output_model.rowCount()
+        self.output_count_label.setText(f"{shown} of {total} outputs" if shown != total else f"{total} outputs")
 
-    def add_output(self, script_text, result_text=None, plot_paths=None, error_text=None):
-        """Add output to the layout in the form of a card"""
-
-        # Create a frame as a card
-        card_frame = QFrame()
-        card_frame.setStyleSheet("""
-            QFrame {
-                background-color: #f9f9f9;
-                border: 1px solid #ddd;
-                border-radius: 8px;
-                padding: 10px;
-            }
-        """)
-
-
-        card_layout = QVBoxLayout(card_frame)
-        card_layout.setSpacing(8)
-
-        label_script = QLabel("<b>R Script:</b>")
-        label_script.setStyleSheet("color: #333; margin-bottom: 5px;")
-        script_box = QTextEdit()
-        script_box.setPlainText(script_text)
-        script_box.setReadOnly(True)
-        script_box.setStyleSheet("""
-            QTextEdit {
-                background-color: #fff;
-                border: 1px solid #ccc;
-                border-radius: 4px;
-                padding: 5px;
-                font-family: Consolas, Courier New, monospace;
-            }
-        """)
-        script_box.setFixedHeight(script_box.fontMetrics().lineSpacing() * (script_text.count('\n') + 3))
-
-        card_layout.addWidget(label_script)
-        card_layout.addWidget(script_box)
-
-        if result_text:
-            label_output = QLabel("<b>Output:</b>")
-            label_output.setStyleSheet("color: #333; margin-top: 10px; margin-bottom: 5px;")
-            result_box = QTextEdit()
-            result_box.setPlainText(result_text)
-            result_box.setReadOnly(True)
-            result_box.setStyleSheet("""
-                QTextEdit {
-                    background-color: #fff;
-                    border: 1px solid #ccc;
-                    border-radius: 4px;
-                    padding: 5px;
-                    font-family: Consolas, Courier New, monospace;
-                }
-            """)
-            max_height = 400
-            calculated_height = result_box.fontMetrics().lineSpacing() * (result_text.count('\n') + 3)
-            result_box.setFixedHeight(min(calculated_height, max_height))
-            result_box.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn if calculated_height > max_height else Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-
-            card_layout.addWidget(label_output)
-            card_layout.addWidget(result_box)
-
-        if plot_paths:
-            label_plot = QLabel("<b>Plot:</b>")
-            label_plot.setStyleSheet("color: #333; margin-top: 10px; margin-bottom: 5px;")
-            card_layout.addWidget(label_plot)
-
-            for plot_path in plot_paths:
-                if os.path.exists(plot_path):
-                    pixmap = QPixmap(plot_path)
-                    label = QLabel()
-                    label.setPixmap(pixmap)
-                    label.setFixedSize(500, 350)
-                    label.setScaledContents(True)
-                    label.setStyleSheet("border: 1px solid #ccc; border-radius: 4px;")
-                    card_layout.addWidget(label)
-
-        if error_text:
-            label_error = QLabel("<b>Error:</b>")
-            label_error.setStyleSheet("color: #a94442; margin-top: 10px; margin-bottom: 5px;")
-            error_box = QTextEdit()
-            error_box.setPlainText(error_text)
-            error_box.setReadOnly(True)
-            error_box.setStyleSheet("""
-                QTextEdit {
-                    background-color: #f8d7da;
-                    border: 1px solid #f5c6cb;
-                    border-radius: 4px;
-                    padding: 5px;
-                    font-family: Consolas, Courier New, monospace;
-                    color: #721c24;
-                }
-            """)
-            error_box.setFixedHeight(error_box.fontMetrics().lineSpacing() * (error_text.count('\n') + 3))
-
-            card_layout.addWidget(label_error)
-            card_layout.addWidget(error_box)
-
-        card_frame.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        card_frame.customContextMenuRequested.connect(lambda pos: self.show_context_menu(pos, card_frame))
-
-        if self.output_layout.count() > 0:
-            last_item = self.output_layout.itemAt(self.output_layout.count() - 1)
-            if isinstance(last_item.spacerItem(), QSpacerItem):
-                self.output_layout.removeItem(last_item)
-
-        self.output_layout.addWidget(card_frame)
-        if self.output_layout.count() == 1:
-            self.output_layout.addStretch()
-
-        self.tab_widget.setCurrentWidget(self.tab3)
-
-        if plot_paths:
-            for plot_path in plot_paths:
-                if os.path.exists(plot_path):
-                    os.remove(plot_path)
-
-    def remove_output(self, card_frame):
-        """Menghapus output dari layout"""
-        self.output_layout.removeWidget(card_frame)
-        card_frame.deleteLater()
+    def remove_output(self, row):
+        """Menghapus output dari riwayat"""
+        self.output_model.remove_record(row)
 
-        # Hapus spacer jika masih ada widget lain
-        if self.output_layout.count() > 0:
-            last_item = self.output_layout.itemAt(self.output_layout.count() - 1)
-            if isinstance(last_item.spacerItem(), QSpacerItem):
-                self.output_layout.removeItem(last_item)
+    def clear_outputs(self):
+        """Menghapus semua output"""
+        self.output_model.clear()
 
-        # Tambahkan stretch hanya jika tidak ada output tersisa
-        if self.output_layout.count() == 0:
-            self.output_layout.addStretch()
-
-    def copy_output_image(self, card_frame):
+    def copy_output_image(self, row):
         """Menyalin gambar output ke clipboard"""
-        for child in card_frame.findChildren(QLabel):
-            pixmap = child.pixmap()
-            
-            if pixmap and not pixmap.isNull():
-                temp_folder = os.path.join(self.path, 'temp')
-                temp_path = os.path.join(temp_folder, 'temp_image.png')
-
-                os.makedirs(temp_folder, exist_ok=True)
-
-                if pixmap.save(temp_path):
-                    print(f"Gambar disimpan di: {temp_path}")
-                    
-                    clipboard = QApplication.clipboard()
-                    clipboard.setPixmap(QPixmap(temp_path))
+        plots = self.output_model.record(row)["plots"]
+        if plots:
+            QApplication.clipboard().setPixmap(decode_plot(plots[0], size=None))
 
-                    if os.path.exists(temp_path):  
-                        os.remove(temp_path)
-                break
-
-    def show_context_menu(self, pos, card_frame):
+    def show_context_menu(self, row, global_pos):
         """Menampilkan menu klik kanan di setiap output"""
         menu = QMenu(self)
         delete_action = menu.addAction("Hapus Output")
         copy_image_action = menu.addAction("Copy Output Image")
-        action = menu.exec(card_frame.mapToGlobal(pos))
+        copy_image_action.setEnabled(bool(self.output_model.record(row)["plots"]))
+        action = menu.exec(global_pos)
 
         if action == delete_action:
-            self.remove_output(card_frame)
+            self.remove_output(row)
         elif action == copy_image_action:
-            self.copy_output_image(card_frame)
+            self.copy_output_image(row)
 
-    def autosave_data(self):
-        """
-        Save the current state of data1, data2, and output to a temporary file.
+    def autosave_data(self, wait=False):
         """
-        temp_file = os.path.join(self.path, 'file-data', 'sae_pisan_autosave.json')
-        data = {
-            'timestamp': datetime.datetime.now().isoformat(),
-            'data1': self.model1.get_data().to_dicts(),
-            'data2': self.model2.get_data().to_dicts(),
-            'output': self.get_output_data()
-        }
-        with open(temp_file, 'w') as file:
-            json.dump(data, file)
+        Save the current state of data1, data2, and output as an incremental binary snapshot.
+        The snapshot is written in a background thread and skipped when nothing changed.
+        Args:
+            wait (bool): Block until the snapshot is written (used when closing the app).
+        """
+        key = (
+            id(self.model1), self.model1.data_version(),
+            id(self.model2), self.model2.data_version(),
+            id(self.output_model), self.output_model.version,
+        )
+        if not self.autosave_writer.is_dirty(key):
+            return
+        output = self.get_output_data()
+        sheets = {'data1': self.model1.get_data(), 'data2': self.model2.get_data()}
+        self.autosave_writer.snapshot(sheets, output, key, wait=wait)
 
     def load_temp_data(self):
         """
-        Load data from the temporary file if it exists and is recent.
+        Load data from the last intact autosave snapshot if it exists.
+        Sheets are memory-mapped from the snapshot and checksummed as they are loaded, the Data
+        Editor first; output cards are only built when scrolled into view.
         """
+        self.autosave_writer.wait()
+        autosave_dir = os.path.join(self.path, 'file-data', 'autosave')
         temp_file = os.path.join(self.path, 'file-data', 'sae_pisan_autosave.json')
-        if os.path.exists(temp_file):
+        if has_snapshot(autosave_dir) or os.path.exists(temp_file):
             reply = QMessageBox.question(self, 'Load Temporary Data',
                                          'Temporary data was found. Do you want to load it?',
                                          QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                                          QMessageBox.StandardButton.No)
             if reply == QMessageBox.StandardButton.Yes:
+                try:
+                    snapshot = recover_session(autosave_dir)
+                except SnapshotError as e:
+                    if not os.path.exists(temp_file):
+                        QMessageBox.critical(self, 'Recovery Failed', str(e))
+                        return
+                    snapshot = None
+                if snapshot is not None:
+                    self.restore_snapshot(snapshot)
+                    return
+                # Autosave written by an older version
                 with open(temp_file, 'r') as file:
                     data = json.load(file)
-                    self.data1 = pl.DataFrame(data['data1'])
-                    self.data2 = pl.DataFrame(data['data2'])
-                    self.model1.set_data(self.data1)
-                    self.model2.set_data(self.data2)
-                    self.update_table(1, self.model1)
-                    self.update_table(2, self.model2)
-                    self.set_output_data(data['output'])
+                self.data1 = pl.DataFrame(data['data1'])
+                self.data2 = pl.DataFrame(data['data2'])
+                self.model1.set_data(self.data1)
+                self.model2.set_data(self.data2)
+                self.set_output_data(data['output'])
+                self.update_table(1, self.model1)
+                self.update_table(2, self.model2)
         else:
             QMessageBox.warning(self, 'No Recent Data', 'No recent data file was found.')
 
-    def get_output_data(self):
-        """
-        Get the current state of the output layout.
-        """
-        output_data = []
-        for i in range(self.output_layout.count()):
-            widget = self.output_layout.itemAt(i).widget()
-            if isinstance(widget, QFrame):
-                data = {}
-                for j in range(widget.layout().count()):
-                    sub_widget = widget.layout().itemAt(j).widget()
-                    if isinstance(sub_widget, QLabel) and "<b>Script R:</b>" in sub_widget.text():
-                        script_box = widget.layout().itemAt(j + 1).widget()
-                        data['script_text'] = script_box.toPlainText()
-                    elif isinstance(sub_widget, QLabel) and "<b>Output:</b>" in sub_widget.text():
-                        result_box = widget.layout().itemAt(j + 1).widget()
-                        data['result_text'] = result_box.toPlainText()
-                    elif isinstance(sub_widget, QLabel) and "<b>Error:</b>" in sub_widget.text():
-                        error_box = widget.layout().itemAt(j + 1).widget()
-                        data['error_text'] = error_box.toPlainText()
-                output_data.append(data)
+    def restore_snapshot(self, snapshot):
+        """
+        Shows the Data Editor sheet of a recovered autosave snapshot; the Data Output sheet and
+        the output history follow once it is on screen. A sheet that fails its checksums is taken
+        from the previous snapshot, and then the whole session is restored from that snapshot.
+        """
+        try:
+            snapshot, self.data1 = open_sheet(snapshot, 'data1')
+        except SnapshotError as e:
+            QMessageBox.critical(self, 'Recovery Failed', str(e))
+            return
+        self.model1.set_data(self.data1)
+        self.update_table(1, self.model1)
+        QTimer.singleShot(0, lambda: self.restore_snapshot_output(snapshot))
+
+    def restore_snapshot_output(self, snapshot):
+        """Loads the Data Output sheet and the output history of a snapshot restored by `restore_snapshot`."""
+        try:
+            source, self.data2 = open_sheet(snapshot, 'data2')
+        except SnapshotError as e:
+            QMessageBox.critical(self, 'Recovery Failed', str(e))
+            return
+        if source is not snapshot:
+            # Data Output snapshot terbaru rusak; seluruh sesi diambil dari snapshot sebelumnya
+            self.restore_snapshot(source)
+            return
+        self.model2.set_data(self.data2)
+        self.set_output_data(snapshot.output_records())
+        self.update_table(2, self.model2)
+
+    def get_output_data(self, include_plots=False):
+        """
+        Get the records of the output history.
+        Args:
+            include_plots (bool): Include the encoded plot images of each output.
+        """
+        output_data = self.output_model.records()
+        if not include_plots:
+            output_data = [{key: value for key, value in data.items() if key != 'plots'} for data in output_data]
         return output_data
 
     def set_output_data(self, output_data):
         """
-        Set the output layout from the saved state.
+        Set the output history from the saved state.
         """
-        for data in output_data:
-            self.add_output(
-                script_text=data.get('script_text', ''),
-                result_text=data.get('result_text', ''),
-                plot_paths=None,
-                error_text=data.get('error_text', '')
-            )
-            
+        self.output_model.extend_records(output_data)
+
     def closeEvent(self, event):
         """Handle the close event to show a confirmation dialog."""
         reply = QMessageBox.question(self, 'Confirm Exit',
@@ -1433,7 +1381,7 @@ class MainWindow(QMainWindow):
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                                      QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            self.autosave_data()
+            self.autosave_data(wait=True)
             import rpy2.robjects as ro
             if 'saeHB' in ro.r('loadedNamespaces()'):
                 ro.r('detach("package:saeHB", unload=TRUE)')
@@ -0,0 +1,71 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QListWidget, QListWidgetItem, QPushButton, QDialogButtonBox, QMessageBox
+from PyQt6.QtCore import Qt
+import polars as pl
+
+class ColumnSelectDialog(QDialog):
+    """
+    A dialog for choosing which columns to load from a file, built from the file schema only.
+    Attributes:
+        schema (dict): Mapping of column name to Polars dtype, read without loading any data.
+        column_list (QListWidget): Checkable list of columns.
+    Methods:
+        set_all(checked):
+            Checks or unchecks every column.
+        get_selected_columns():
+            Returns the checked column names if the dialog is accepted, otherwise None.
+    """
+
+    def __init__(self, schema, parent=None, title="Select Columns"):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.schema = schema
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"{len(schema)} columns found. Select the columns to load:"))
+
+        self.column_list = QListWidget()
+        for name, dtype in schema.items():
+            label = f"{name} [{'String' if dtype == pl.Utf8 else 'Numeric' if dtype.is_numeric() else dtype}]"
+            item = QListWidgetItem(label)
+            item.setData(Qt.ItemDataRole.UserRole, name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            self.column_list.addItem(item)
+        layout.addWidget(self.column_list)
+
+        select_layout = QHBoxLayout()
+        select_all_button = QPushButton("Select All")
+        select_all_button.clicked.connect(lambda: self.set_all(True))
+        select_none_button = QPushButton("Select None")
+        select_none_button.clicked.connect(lambda: self.set_all(False))
+        select_layout.addWidget(select_all_button)
+        select_layout.addWidget(select_none_button)
+        layout.addLayout(select_layout)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def set_all(self, checked):
+        state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        for i in range(self.column_list.count()):
+            self.column_list.item(i).setCheckState(state)
+
+    def checked_columns(self):
+        return [
+            self.column_list.item(i).data(Qt.ItemDataRole.UserRole)
+            for i in range(self.column_list.count())
+            if self.column_list.item(i).checkState() == Qt.CheckState.Checked
+        ]
+
+    def accept(self):
+        if not self.checked_columns():
+            QMessageBox.warning(self, "No Columns", "Please select at least one column.")
+            return
+        super().accept()
+
+    def get_selected_columns(self):
+        if self.exec() == QDialog.DialogCode.Accepted:
+            return self.checked_columns()
+        return None
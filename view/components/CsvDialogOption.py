@@ -1,14 +1,21 @@
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QCheckBox, QTableView, QDialogButtonBox, QPushButton, QFileDialog
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QLineEdit, QCheckBox, QTableView, QDialogButtonBox, QPushButton, QFileDialog, QComboBox
 import polars as pl
 from PyQt6.QtGui import QStandardItemModel, QStandardItem
+from service.file.CsvImport import read_sample, sniff_csv, read_csv_bytes
+
+PREVIEW_ROWS = 10
+ENCODINGS = ["utf-8", "cp1252", "latin-1"]
 
 class CSVOptionsDialog(QDialog):
     """
     A dialog for selecting CSV file options and previewing the CSV content.
+    The preview only parses a small sample from the start of the file. The sample is read once
+    per file, the options are guessed from it, and it is reused whenever an option changes.
     Attributes:
         file_path (str): The path to the selected CSV file.
         separator (str): The separator used in the CSV file.
         header (bool): Whether the first row is treated as a header.
+        sample (bytes): The cached first bytes of the file used for sniffing and previews.
     Methods:
         __init__(parent=None):
             Initializes the dialog with default values and sets up the UI.
@@ -16,10 +23,16 @@ class CSVOptionsDialog(QDialog):
             Sets up the user interface components of the dialog.
         select_file():
             Opens a file picker dialog to select a CSV file and updates the preview.
+        set_file(file_path):
+            Reads the sample of the file, applies the sniffed options and updates the preview.
         update_preview():
             Updates the preview table based on the selected file, separator, and header options.
         get_csv_options():
             Returns the selected CSV options if the dialog is accepted.
+        get_encoding():
+            Returns the selected file encoding.
+        get_decimal_comma():
+            Returns True if "1,5" should be read as 1.5.
     """
     
     def __init__(self, parent=None):
@@ -29,6 +42,7 @@ class CSVOptionsDialog(QDialog):
         self.file_path = None
         self.separator = ","
         self.header = True
+        self.sample = None
 
         self.init_ui()
 
@@ -54,6 +68,18 @@ class CSVOptionsDialog(QDialog):
         self.header_checkbox.toggled.connect(self.update_preview)
         layout.addWidget(self.header_checkbox)
 
+        # Decimal comma checkbox
+        self.decimal_comma_checkbox = QCheckBox("Decimal comma (1,5 = 1.5)")
+        self.decimal_comma_checkbox.toggled.connect(self.update_preview)
+        layout.addWidget(self.decimal_comma_checkbox)
+
+        # Encoding
+        layout.addWidget(QLabel("Encoding"))
+        self.encoding_combo = QComboBox()
+        self.encoding_combo.addItems(ENCODINGS)
+        self.encoding_combo.currentTextChanged.connect(self.update_preview)
+        layout.addWidget(self.encoding_combo)
+
         # Preview Table
         self.preview_label = QLabel("Preview")
         layout.addWidget(self.preview_label)
@@ -72,25 +98,53 @@ class CSVOptionsDialog(QDialog):
         """File picker untuk memilih file CSV."""
         file_path, _ = QFileDialog.getOpenFileName(self, "Open CSV File", "", "CSV Files (*.csv)")
         if file_path:
-            self.file_path = file_path
-            self.file_label.setText(f"Selected: {file_path}")
+            self.set_file(file_path)
+
+    def set_file(self, file_path):
+        """Baca sampel awal file sekali, tebak opsi CSV, lalu perbarui preview."""
+        self.file_path = file_path
+        self.file_label.setText(f"Selected: {file_path}")
+        try:
+            self.sample = read_sample(file_path)
+            options = sniff_csv(self.sample)
+        except OSError as e:
+            print(f"Error: {e}")
+            self.sample = None
             self.update_preview()
+            return
+        widgets = (self.separator_input, self.header_checkbox, self.decimal_comma_checkbox, self.encoding_combo)
+        for widget in widgets:
+            widget.blockSignals(True)
+        self.separator_input.setText(options["separator"])
+        self.header_checkbox.setChecked(options["header"])
+        self.decimal_comma_checkbox.setChecked(options["decimal_comma"])
+        self.encoding_combo.setCurrentText(options["encoding"])
+        for widget in widgets:
+            widget.blockSignals(False)
+        self.update_preview()
 
     def update_preview(self):
         """Perbarui preview tabel berdasarkan input."""
         if not self.file_path:
             self.preview_table.setModel(None)
             return
+        if self.sample is None:
+            try:
+                self.sample = read_sample(self.file_path)
+            except OSError as e:
+                print(f"Error: {e}")
+                self.preview_table.setModel(None)
+                return
 
         sep = self.separator_input.text()
         hdr = True if self.header_checkbox.isChecked() else False
         try:
-            preview_data = pl.read_csv(self.file_path, separator=sep, has_header=hdr, ignore_errors=True, null_values=["NA", "NULL", "na", "null"]).head(10)
+            preview_data = read_csv_bytes(
+                self.sample, separator=sep, header=hdr, encoding=self.get_encoding(),
+                decimal_comma=self.get_decimal_comma(), n_rows=PREVIEW_ROWS,
+            )
             model = QStandardItemModel()
             
-            if not self.header_checkbox.isChecked():
-                preview_data.columns = [f"Column {i+1}" for i in range(preview_data.shape[1])]
-            
             model.setHorizontalHeaderLabels(preview_data.columns)
 
             for row in preview_data.to_numpy():
@@ -107,3 +161,9 @@ class CSVOptionsDialog(QDialog):
         if self.exec() == QDialog.DialogCode.Accepted and self.file_path:
             return self.file_path, self.separator_input.text(), self.header_checkbox.isChecked()
         return None, None, None
+
+    def get_encoding(self):
+        return self.encoding_combo.currentText()
+
+    def get_decimal_comma(self):
+        return self.decimal_comma_checkbox.isChecked()
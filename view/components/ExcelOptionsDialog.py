@@ -0,0 +1,106 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QListWidget, QListWidgetItem, QPushButton, QSpinBox, QDialogButtonBox, QMessageBox
+from PyQt6.QtCore import Qt
+from service.file.ExcelImport import list_sheet_names, read_sheet_columns
+
+class ExcelOptionsDialog(QDialog):
+    """
+    A dialog for choosing the sheet, columns and row limit of an Excel import.
+    Sheet names come from the workbook metadata; a sheet's header row is only read (streaming
+    the sheet up to its first row) when the sheet is first selected, so large workbooks with
+    many sheets open quickly.
+    Attributes:
+        file_path (str): The path to the XLSX file.
+        sheet_combo (QComboBox): The sheet to import.
+        column_list (QListWidget): Checkable list of the sheet's columns.
+        row_limit_spin (QSpinBox): Maximum number of rows to read (0 = all rows).
+        sheet_columns (dict): Column names of the sheets read so far, by sheet name.
+    Methods:
+        load_columns(sheet_name):
+            Reads the header row of the sheet and fills the column list.
+        set_all(checked):
+            Checks or unchecks every column.
+        get_excel_options():
+            Returns (sheet name, columns, row limit) if the dialog is accepted, otherwise (None, None, None).
+    """
+
+    def __init__(self, file_path, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Excel Options")
+        self.file_path = file_path
+        self.sheet_columns = {}
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Sheet:"))
+        self.sheet_combo = QComboBox()
+        self.sheet_combo.addItems(list_sheet_names(file_path))
+        self.sheet_combo.currentTextChanged.connect(self.load_columns)
+        layout.addWidget(self.sheet_combo)
+
+        layout.addWidget(QLabel("Columns:"))
+        self.column_list = QListWidget()
+        layout.addWidget(self.column_list)
+
+        select_layout = QHBoxLayout()
+        select_all_button = QPushButton("Select All")
+        select_all_button.clicked.connect(lambda: self.set_all(True))
+        select_none_button = QPushButton("Select None")
+        select_none_button.clicked.connect(lambda: self.set_all(False))
+        select_layout.addWidget(select_all_button)
+        select_layout.addWidget(select_none_button)
+        layout.addLayout(select_layout)
+
+        row_layout = QHBoxLayout()
+        row_layout.addWidget(QLabel("Maximum rows (0 = all):"))
+        self.row_limit_spin = QSpinBox()
+        self.row_limit_spin.setRange(0, 1048576)
+        row_layout.addWidget(self.row_limit_spin)
+        layout.addLayout(row_layout)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        if self.sheet_combo.count() > 0:
+            self.load_columns(self.sheet_combo.currentText())
+
+    def load_columns(self, sheet_name):
+        self.column_list.clear()
+        if sheet_name not in self.sheet_columns:
+            try:
+                self.sheet_columns[sheet_name] = read_sheet_columns(self.file_path, sheet_name)
+            except Exception as e:
+                print(f"Error: {e}")
+                return
+        columns = self.sheet_columns[sheet_name]
+        for name in columns:
+            item = QListWidgetItem(name)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            self.column_list.addItem(item)
+
+    def set_all(self, checked):
+        state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        for i in range(self.column_list.count()):
+            self.column_list.item(i).setCheckState(state)
+
+    def checked_columns(self):
+        return [
+            self.column_list.item(i).text()
+            for i in range(self.column_list.count())
+            if self.column_list.item(i).checkState() == Qt.CheckState.Checked
+        ]
+
+    def accept(self):
+        if self.column_list.count() > 0 and not self.checked_columns():
+            QMessageBox.warning(self, "No Columns", "Please select at least one column.")
+            return
+        super().accept()
+
+    def get_excel_options(self):
+        if self.exec() == QDialog.DialogCode.Accepted and self.sheet_combo.currentText():
+            columns = self.checked_columns()
+            if len(columns) == self.column_list.count():
+                columns = None
+            return self.sheet_combo.currentText(), columns, self.row_limit_spin.value() or None
+        return None, None, None
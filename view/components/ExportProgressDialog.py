@@ -0,0 +1,109 @@
+from PyQt6.QtWidgets import QProgressDialog
+from PyQt6.QtCore import Qt, pyqtSignal
+from service.file.PdfExport import export_outputs_to_pdf
+from service.session.Project import save_project
+import threading
+
+class ExportProgressDialog(QProgressDialog):
+    """
+    A progress dialog that exports the output history to PDF in a worker thread.
+    The worker gets a copy of the output records, so the UI stays usable while pages are written.
+    Pressing Cancel stops the worker after the current output and removes the partial file.
+    Attributes:
+        file_path (str): The PDF file being written.
+        records (list): The output records to export.
+        stop_event (threading.Event): Set when the user cancels the export.
+        progress_changed (pyqtSignal): Emitted with (records done, total records, pages written).
+        export_finished (pyqtSignal): Emitted with (error, pages) when the worker ends; pages is None if cancelled.
+    Methods:
+        start():
+            Starts the worker thread.
+        on_progress_changed(done, total, pages):
+            Updates the progress bar.
+        cancel_export():
+            Asks the worker to stop.
+    """
+
+    progress_changed = pyqtSignal(object, object, object)
+    export_finished = pyqtSignal(object, object)
+
+    def __init__(self, parent, file_path, records):
+        super().__init__("Exporting outputs...", "Cancel", 0, max(len(records), 1), parent)
+        self.setWindowTitle("Export PDF")
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setMinimumDuration(0)
+        self.file_path = file_path
+        self.records = records
+        self.stop_event = threading.Event()
+        self.canceled.connect(self.cancel_export)
+        self.progress_changed.connect(self.on_progress_changed)
+
+    def start(self):
+        def export_thread():
+            error = pages = None
+            try:
+                pages = export_outputs_to_pdf(
+                    self.file_path, self.records,
+                    progress=lambda done, total, pages: self.progress_changed.emit(done, total, pages),
+                    stop_event=self.stop_event,
+                )
+            except Exception as e:
+                error = e
+            finally:
+                self.export_finished.emit(error, pages)
+
+        self.show()
+        threading.Thread(target=export_thread, name="PDF Export", daemon=True).start()
+
+    def on_progress_changed(self, done, total, pages):
+        self.setValue(done)
+        self.setLabelText(f"Exported {done:,} of {total:,} outputs ({pages:,} pages)")
+
+    def cancel_export(self):
+        self.stop_event.set()
+        self.setLabelText("Cancelling...")
+
+
+class ProjectSaveProgressDialog(QProgressDialog):
+    """
+    A busy dialog that saves a .saep project in a worker thread, so fingerprinting and writing
+    the sheets does not block the UI. The worker gets the sheets and output records as they
+    were when saving started. The save cannot be cancelled: the project is written next to the
+    target and renamed over it only when complete.
+    Attributes:
+        file_path (str): The project file being written.
+        sheets (dict): Sheet name to pl.DataFrame.
+        records (list): The output records to save.
+        save_finished (pyqtSignal): Emitted with (error, entries encoded) when the worker ends.
+    Methods:
+        start():
+            Starts the worker thread.
+    """
+
+    save_finished = pyqtSignal(object, object)
+
+    def __init__(self, parent, file_path, sheets, records):
+        super().__init__("Saving project...", None, 0, 0, parent)
+        self.setWindowTitle("Save Project")
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setMinimumDuration(0)
+        self.file_path = file_path
+        self.sheets = sheets
+        self.records = records
+
+    def start(self):
+        def save_thread():
+            error = encoded = None
+            try:
+                encoded = save_project(self.file_path, self.sheets, self.records)
+            except Exception as e:
+                error = e
+            finally:
+                self.save_finished.emit(error, encoded)
+
+        self.show()
+        threading.Thread(target=save_thread, name="Save Project", daemon=True).start()
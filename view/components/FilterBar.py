@@ -0,0 +1,95 @@
+import polars as pl
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QComboBox, QLineEdit, QPushButton, QMessageBox
+from service.table.SortFilter import FILTER_OPERATORS
+
+class FilterBar(QWidget):
+    """
+    A filter bar shown above the Data Editor sheet.
+    The condition is evaluated by the TableModel as a single Polars boolean mask, so filtering
+    stays fast on large sheets; the bar itself only collects the column, operator and value.
+    Attributes:
+        parent (QMainWindow): The main window holding `model1`.
+        column_combo (QComboBox): The column to filter on.
+        operator_combo (QComboBox): The comparison operator.
+        value_input (QLineEdit): The value to compare with.
+        status_label (QLabel): Shows how many rows are visible.
+    Methods:
+        set_columns(columns):
+            Refreshes the column list, keeping the current choice if it still exists.
+        apply_filter():
+            Applies the condition to `parent.model1`.
+        clear_filter():
+            Removes the sort and filter from `parent.model1`.
+        update_status():
+            Updates the visible row count label.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(QLabel("Filter:"))
+
+        self.column_combo = QComboBox()
+        self.column_combo.setMinimumWidth(150)
+        layout.addWidget(self.column_combo)
+
+        self.operator_combo = QComboBox()
+        self.operator_combo.addItems(FILTER_OPERATORS)
+        self.operator_combo.currentTextChanged.connect(
+            lambda operator: self.value_input.setEnabled(operator not in ("is empty", "is not empty"))
+        )
+        layout.addWidget(self.operator_combo)
+
+        self.value_input = QLineEdit()
+        self.value_input.setPlaceholderText("Value")
+        self.value_input.returnPressed.connect(self.apply_filter)
+        layout.addWidget(self.value_input)
+
+        self.apply_button = QPushButton("Apply")
+        self.apply_button.clicked.connect(self.apply_filter)
+        layout.addWidget(self.apply_button)
+
+        self.clear_button = QPushButton("Clear")
+        self.clear_button.clicked.connect(self.clear_filter)
+        layout.addWidget(self.clear_button)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        layout.addStretch()
+
+    def set_columns(self, columns):
+        current = self.column_combo.currentText()
+        self.column_combo.blockSignals(True)
+        self.column_combo.clear()
+        self.column_combo.addItems(columns)
+        if current in columns:
+            self.column_combo.setCurrentText(current)
+        self.column_combo.blockSignals(False)
+        self.update_status()
+
+    def apply_filter(self):
+        column_index = self.column_combo.currentIndex()
+        if column_index < 0:
+            return
+        try:
+            self.parent.model1.filter_view(column_index, self.operator_combo.currentText(), self.value_input.text())
+        except (ValueError, pl.exceptions.PolarsError) as e:
+            QMessageBox.warning(self, "Invalid Filter", str(e))
+            return
+        self.update_status()
+
+    def clear_filter(self):
+        self.parent.model1.clear_view()
+        self.parent.spreadsheet.horizontalHeader().setSortIndicatorShown(False)
+        self.update_status()
+
+    def update_status(self):
+        model = self.parent.model1
+        total = model.get_data().shape[0]
+        if model.is_view_active():
+            self.status_label.setText(f"{model.view_row_count()} of {total} rows")
+        else:
+            self.status_label.setText("")
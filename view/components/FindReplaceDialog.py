@@ -0,0 +1,245 @@
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit, QComboBox, QCheckBox, QPushButton, QMessageBox
+)
+from PyQt6.QtCore import pyqtSignal, QItemSelectionModel
+from service.table.FindReplace import find_matches, replace_values
+import threading
+
+ALL_COLUMNS = "All Columns"
+
+class FindReplaceDialog(QDialog):
+    """
+    A dialog to find and replace values in the Data Editor sheet.
+    Searching runs as Polars expressions in a worker thread and produces a compact hit index
+    (row, column) that Previous/Next walk through; Replace All computes the new columns the
+    same way and applies them as a single undoable edit.
+    Attributes:
+        parent (QMainWindow): The main window holding `model1` and `spreadsheet`.
+        hits (pl.DataFrame): The hit index of the last search, rows of the underlying data.
+        visible_hits (pl.DataFrame): `hits` mapped to displayed rows, in display order.
+        current_hit (int): Position of the selected hit in `visible_hits`.
+        search_finished (pyqtSignal): Emitted with (hits, error, search key) when a search ends.
+        replace_version (int): Data version the running replace-all started from; its result is
+            discarded when the data was edited in the meantime.
+        replace_finished (pyqtSignal): Emitted with (new columns, count, error) when replace-all ends.
+    Methods:
+        set_columns(columns):
+            Refreshes the column selector.
+        search_key():
+            Returns the options of the current search, used to reuse the hit index.
+        find_all():
+            Starts a search in a worker thread.
+        find_next():
+            Selects the next hit, searching first if the options changed.
+        find_previous():
+            Selects the previous hit, searching first if the options changed.
+        replace_all():
+            Replaces every match as one undo entry.
+    """
+
+    search_finished = pyqtSignal(object, object, object)
+    replace_finished = pyqtSignal(object, object, object)
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.parent = parent
+        self.setWindowTitle("Find and Replace")
+        self.hits = None
+        self.hits_key = None
+        self.visible_hits = None
+        self.visible_positions = None
+        self.current_hit = -1
+        self.pending_step = 0
+        self.replace_version = None
+        self.search_finished.connect(self.on_search_finished)
+        self.replace_finished.connect(self.on_replace_finished)
+
+        layout = QVBoxLayout(self)
+        form = QGridLayout()
+        form.addWidget(QLabel("Find:"), 0, 0)
+        self.find_input = QLineEdit()
+        self.find_input.returnPressed.connect(self.find_next)
+        form.addWidget(self.find_input, 0, 1)
+        form.addWidget(QLabel("Replace with:"), 1, 0)
+        self.replace_input = QLineEdit()
+        form.addWidget(self.replace_input, 1, 1)
+        form.addWidget(QLabel("Look in:"), 2, 0)
+        self.column_combo = QComboBox()
+        form.addWidget(self.column_combo, 2, 1)
+        layout.addLayout(form)
+
+        options = QHBoxLayout()
+        self.regex_checkbox = QCheckBox("Regular expression")
+        self.case_checkbox = QCheckBox("Match case")
+        self.whole_cell_checkbox = QCheckBox("Match entire cell")
+        options.addWidget(self.regex_checkbox)
+        options.addWidget(self.case_checkbox)
+        options.addWidget(self.whole_cell_checkbox)
+        layout.addLayout(options)
+
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+
+        buttons = QHBoxLayout()
+        self.find_all_button = QPushButton("Find All")
+        self.find_all_button.clicked.connect(self.find_all)
+        self.previous_button = QPushButton("Previous")
+        self.previous_button.clicked.connect(self.find_previous)
+        self.next_button = QPushButton("Next")
+        self.next_button.clicked.connect(self.find_next)
+        self.replace_all_button = QPushButton("Replace All")
+        self.replace_all_button.clicked.connect(self.replace_all)
+        self.close_button = QPushButton("Close")
+        self.close_button.clicked.connect(self.close)
+        for button in (self.find_all_button, self.previous_button, self.next_button, self.replace_all_button, self.close_button):
+            buttons.addWidget(button)
+        layout.addLayout(buttons)
+
+    def set_columns(self, columns):
+        current = self.column_combo.currentText()
+        self.column_combo.clear()
+        self.column_combo.addItems([ALL_COLUMNS] + list(columns))
+        if current in columns:
+            self.column_combo.setCurrentText(current)
+        self.hits = None
+
+    def selected_columns(self):
+        column = self.column_combo.currentText()
+        return None if column in ("", ALL_COLUMNS) else [column]
+
+    def search_key(self):
+        return (
+            id(self.parent.model1), self.parent.model1.data_version(), self.find_input.text(), self.column_combo.currentText(),
+            self.regex_checkbox.isChecked(), self.case_checkbox.isChecked(), self.whole_cell_checkbox.isChecked(),
+        )
+
+    def set_busy(self, busy, text=""):
+        for button in (self.find_all_button, self.previous_button, self.next_button, self.replace_all_button):
+            button.setEnabled(not busy)
+        if text:
+            self.status_label.setText(text)
+
+    def find_all(self, step=0):
+        if not self.find_input.text():
+            return
+        data = self.parent.model1.get_data()
+        key = self.search_key()
+        pattern, columns = self.find_input.text(), self.selected_columns()
+        regex, match_case, whole_cell = self.regex_checkbox.isChecked(), self.case_checkbox.isChecked(), self.whole_cell_checkbox.isChecked()
+        self.pending_step = step
+        self.set_busy(True, "Searching...")
+
+        def search_thread():
+            hits, error = None, None
+            try:
+                hits = find_matches(data, pattern, columns, regex, match_case, whole_cell)
+            except Exception as e:
+                error = e
+            finally:
+                self.search_finished.emit(hits, error, key)
+
+        threading.Thread(target=search_thread, name="Find", daemon=True).start()
+
+    def on_search_finished(self, hits, error, key):
+        self.set_busy(False)
+        if error is not None:
+            self.status_label.setText(str(error))
+            return
+        self.hits = hits
+        self.hits_key = key
+        self.visible_hits = None
+        self.current_hit = 0 if self.pending_step < 0 else -1
+        if hits.height == 0:
+            self.status_label.setText("No matches found.")
+            return
+        self.status_label.setText(f"{hits.height} match(es) found.")
+        if self.pending_step:
+            self.move_to_hit(self.pending_step)
+
+    def find_next(self):
+        self.step(1)
+
+    def find_previous(self):
+        self.step(-1)
+
+    def step(self, direction):
+        if self.hits is None or self.hits_key != self.search_key():
+            self.find_all(direction)
+            return
+        self.move_to_hit(direction)
+
+    def map_hits_to_view(self):
+        """
+        Maps the hits to displayed rows through the inverse view permutation, leaving out rows
+        hidden by the filter and ordering them as displayed; done once per search and view.
+        """
+        positions = self.parent.model1.view_positions()
+        if self.visible_hits is not None and self.visible_positions is positions:
+            return
+        hits = self.hits
+        if positions is not None:
+            hits = (
+                hits.with_columns(row=positions.gather(hits["row"]))
+                .drop_nulls("row")
+                .sort("row", "column")
+            )
+        if self.visible_hits is not None:
+            self.current_hit = -1
+        self.visible_hits = hits
+        self.visible_positions = positions
+
+    def move_to_hit(self, direction):
+        if self.hits is None or self.hits.height == 0:
+            return
+        self.map_hits_to_view()
+        hits = self.visible_hits
+        if hits.height == 0:
+            self.status_label.setText("All matches are hidden by the current filter.")
+            return
+        model = self.parent.model1
+        self.current_hit = (self.current_hit + direction) % hits.height
+        row = hits["row"][self.current_hit]
+        column = hits["column"][self.current_hit]
+        model.ensure_row_loaded(row)
+        index = model.index(row, column)
+        self.parent.spreadsheet.setCurrentIndex(index)
+        self.parent.spreadsheet.selectionModel().select(index, QItemSelectionModel.SelectionFlag.ClearAndSelect)
+        self.parent.spreadsheet.scrollTo(index)
+        self.status_label.setText(f"Match {self.current_hit + 1} of {hits.height}")
+
+    def replace_all(self):
+        if not self.find_input.text():
+            return
+        data = self.parent.model1.get_data()
+        self.replace_version = self.parent.model1.data_version()
+        pattern, replacement, columns = self.find_input.text(), self.replace_input.text(), self.selected_columns()
+        regex, match_case, whole_cell = self.regex_checkbox.isChecked(), self.case_checkbox.isChecked(), self.whole_cell_checkbox.isChecked()
+        self.set_busy(True, "Replacing...")
+
+        def replace_thread():
+            new_columns, count, error = None, 0, None
+            try:
+                new_columns, count = replace_values(data, pattern, replacement, columns, regex, match_case, whole_cell)
+            except Exception as e:
+                error = e
+            finally:
+                self.replace_finished.emit(new_columns, count, error)
+
+        threading.Thread(target=replace_thread, name="Replace All", daemon=True).start()
+
+    def on_replace_finished(self, new_columns, count, error):
+        self.set_busy(False)
+        if error is not None:
+            QMessageBox.warning(self, "Replace All", str(error))
+            self.status_label.setText("")
+            return
+        if self.parent.model1.data_version() != self.replace_version:
+            # Data diubah selama penggantian berjalan; kolom baru dihitung dari data lama sehingga dibuang
+            self.status_label.setText("")
+            QMessageBox.warning(self, "Replace All", "The data was edited while replacing, so nothing was replaced. Run Replace All again.")
+            return
+        self.parent.model1.replace_columns(new_columns, count)
+        self.hits = None
+        self.status_label.setText(f"{count} value(s) replaced." if count else "No matches found.")
+        if count:
+            self.parent.update_table(1, self.parent.model1)
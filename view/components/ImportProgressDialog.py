@@ -0,0 +1,104 @@
+from PyQt6.QtWidgets import QProgressDialog
+from PyQt6.QtCore import Qt, pyqtSignal
+from service.file.CsvImport import stream_csv
+import threading
+
+class ImportProgressDialog(QProgressDialog):
+    """
+    A progress dialog that imports a CSV file in a worker thread.
+    The file is parsed block by block; every parsed batch is handed to the UI thread through
+    `batch_ready`, so the first rows can be shown while the rest of the file is still loading.
+    Pressing Cancel stops the worker after the current block.
+    Attributes:
+        file_path (str): The CSV file being imported.
+        rows_read (int): Number of rows parsed so far.
+        stop_event (threading.Event): Set when the user cancels the import.
+        batch_ready (pyqtSignal): Emitted with (batch, bytes read, total bytes) for every parsed block.
+        import_finished (pyqtSignal): Emitted with (error, cancelled) when the worker ends.
+    Methods:
+        batches():
+            Returns the iterator of (batch, progress done, progress total) read by the worker.
+        start():
+            Starts the worker thread.
+        on_batch_ready(batch, bytes_read, total_bytes):
+            Updates the progress bar.
+        cancel_import():
+            Asks the worker to stop.
+    """
+
+    batch_ready = pyqtSignal(object, object, object)
+    import_finished = pyqtSignal(object, object)
+
+    def __init__(self, parent, file_path, separator, header, encoding="utf-8", decimal_comma=False):
+        super().__init__("Loading data...", "Cancel", 0, 1000, parent)
+        self.setWindowTitle("Import CSV")
+        self.setWindowModality(Qt.WindowModality.WindowModal)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.setMinimumDuration(0)
+        self.file_path = file_path
+        self.separator = separator
+        self.header = header
+        self.encoding = encoding
+        self.decimal_comma = decimal_comma
+        self.rows_read = 0
+        self.stop_event = threading.Event()
+        self.canceled.connect(self.cancel_import)
+        self.batch_ready.connect(self.on_batch_ready)
+
+    def batches(self):
+        return stream_csv(
+            self.file_path, self.separator, self.header, self.stop_event,
+            encoding=self.encoding, decimal_comma=self.decimal_comma,
+        )
+
+    def start(self):
+        def import_thread():
+            error = None
+            try:
+                for batch, bytes_read, total_bytes in self.batches():
+                    if self.stop_event.is_set():
+                        break
+                    self.batch_ready.emit(batch, bytes_read, total_bytes)
+            except Exception as e:
+                error = e
+            finally:
+                self.import_finished.emit(error, self.stop_event.is_set())
+
+        self.show()
+        threading.Thread(target=import_thread, name=self.windowTitle(), daemon=True).start()
+
+    def on_batch_ready(self, batch, bytes_read, total_bytes):
+        self.rows_read += batch.shape[0]
+        self.setValue(int(1000 * bytes_read / total_bytes) if total_bytes else 1000)
+        self.setLabelText(
+            f"Read {bytes_read / 1048576:.1f} MB of {total_bytes / 1048576:.1f} MB ({self.rows_read:,} rows)"
+        )
+
+    def cancel_import(self):
+        self.stop_event.set()
+        self.setLabelText("Cancelling...")
+
+
+class ProjectSheetProgressDialog(ImportProgressDialog):
+    """
+    A progress dialog that reads a sheet of an open project file in a worker thread, in row
+    batches, with the same signals as ImportProgressDialog (progress is counted in rows).
+    Attributes:
+        project (ProjectFile): The open project file; it is not closed by the dialog.
+        sheet_name (str): The sheet being read.
+    """
+
+    def __init__(self, parent, project, sheet_name):
+        super().__init__(parent, project.file_path, None, None)
+        self.setWindowTitle("Open Project")
+        self.project = project
+        self.sheet_name = sheet_name
+
+    def batches(self):
+        return self.project.sheet_batches(self.sheet_name)
+
+    def on_batch_ready(self, batch, rows_read, total_rows):
+        self.rows_read = rows_read
+        self.setValue(int(1000 * rows_read / total_rows) if total_rows else 1000)
+        self.setLabelText(f"Read {rows_read:,} of {total_rows:,} rows")
@@ -18,6 +18,7 @@ def show_context_menu(parent, position):
         - Add Column After: Adds a new column after the selected column(s).
         - Delete Row: Deletes the selected row(s).
         - Delete Column: Deletes the selected column(s).
+        - Find and Replace: Opens the Find and Replace dialog.
         The actions are enabled only if there is a selection in the spreadsheet.
         """
         
@@ -55,5 +56,10 @@ def show_context_menu(parent, position):
         delete_column_action.triggered.connect(lambda : confirm_delete_selected_columns(parent))
         delete_column_action.setEnabled(has_selection)
         context_menu.addAction(delete_column_action)
+
+        context_menu.addSeparator()
+        find_replace_action = QAction("Find and Replace", parent)
+        find_replace_action.triggered.connect(parent.show_find_replace_dialog_lazy)
+        context_menu.addAction(find_replace_action)
         
         context_menu.exec(parent.spreadsheet.viewport().mapToGlobal(position))
\ No newline at end of file
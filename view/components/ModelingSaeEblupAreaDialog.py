@@ -10,6 +10,7 @@ from model.SaeEblup import SaeEblup
 from PyQt6.QtWidgets import QMessageBox
 import polars as pl
 from service.utils.utils import display_script_and_output, check_script
+from service.exploration.SelectionStatistics import resolve_modelling_script
 from service.utils.enable_disable import enable_service, disable_service
 import threading
 import contextvars
@@ -247,6 +248,7 @@ class ModelingSaeDialog(QDialog):
         self.as_factor_var = []
         self.selection_method = "None"
         self.method = "REML"
+        assign_selected_auxilary(self)
     
     def accept(self):
         if (not self.vardir_var or self.vardir_var == [""]) and (not self.of_interest_var or self.of_interest_var == [""]):
@@ -281,8 +283,10 @@ class ModelingSaeDialog(QDialog):
         
         def run_model_thread():
             result, error, df = None, None, None
+            script = r_script
             try:
-                result, error, df = current_context.run(controller.run_model, r_script)
+                script = resolve_modelling_script(self, r_script)
+                result, error, df = current_context.run(controller.run_model, script)
                 if not error:
                     sae_model.model2.set_data(df)
             except Exception as e:
@@ -290,7 +294,7 @@ class ModelingSaeDialog(QDialog):
             finally:
                 if not self.stop_thread.is_set():
                     self.finnish = True
-                    self.run_model_finished.emit(result, error, sae_model, r_script)
+                    self.run_model_finished.emit(result, error, sae_model, script)
                 else:
                     return
 
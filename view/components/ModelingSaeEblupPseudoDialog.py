@@ -10,6 +10,7 @@ from model.SaeEblupPseudo import SaeEblupPseudo
 from PyQt6.QtWidgets import QMessageBox
 import polars as pl
 from service.utils.utils import display_script_and_output, check_script
+from service.exploration.SelectionStatistics import resolve_modelling_script
 from service.utils.enable_disable import enable_service, disable_service
 import threading
 import contextvars
@@ -303,15 +304,17 @@ class ModelingSaePseudoDialog(QDialog):
         
         def run_model_thread():
             result, error, df = None, None, None
+            script = r_script
             try:
-                result, error, df = current_context.run(controller.run_model, r_script)
+                script = resolve_modelling_script(self, r_script)
+                result, error, df = current_context.run(controller.run_model, script)
                 if not error:
                     sae_model.model2.set_data(df)
             except Exception as e:
                 error = e
             finally:
                 if not self.stop_thread.is_set():
-                    self.run_model_finished.emit(result, error, sae_model, r_script)
+                    self.run_model_finished.emit(result, error, sae_model, script)
                     self.finnish = True
 
         def check_run_time():
@@ -4,12 +4,13 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import QStringListModel, QTimer, Qt, QSize, pyqtSignal
 from PyQt6.QtGui import QFont, QIcon
-from service.modelling.SaeHBArea import assign_of_interest, assign_auxilary, assign_vardir, assign_as_factor, unassign_variable, show_options, get_script
+from service.modelling.SaeHBArea import assign_of_interest, assign_auxilary, assign_selected_auxilary, assign_vardir, assign_as_factor, unassign_variable, show_options, get_script
 from controller.modelling.SaeHBcontroller import SaeHBController
 from model.SaeHB import SaeHB
 from PyQt6.QtWidgets import QMessageBox
 import polars as pl
 from service.utils.utils import display_script_and_output, check_script
+from service.exploration.SelectionStatistics import resolve_modelling_script
 from service.utils.enable_disable import enable_service, disable_service
 import threading
 import contextvars
@@ -252,6 +253,7 @@ class ModelingSaeHBDialog(QDialog):
         self.iter_update="3"
         self.iter_mcmc="2000"
         self.burn_in="1000"
+        assign_selected_auxilary(self)
     
     def accept(self):
         if (not self.vardir_var or self.vardir_var == [""]) and (not self.of_interest_var or self.of_interest_var == [""]):
@@ -293,8 +295,10 @@ class ModelingSaeHBDialog(QDialog):
         
         def run_model_thread():
             result, error, df = None, None, None
+            script = r_script
             try:
-                result, error, df = current_context.run(controller.run_model, r_script)
+                script = resolve_modelling_script(self, r_script)
+                result, error, df = current_context.run(controller.run_model, script)
                 if not error:
                     sae_model.model2.set_data(df)
             except Exception as e:
@@ -303,7 +307,7 @@ class ModelingSaeHBDialog(QDialog):
                     result = str(e)
             finally:
                 if not self.stop_thread.is_set():
-                    self.run_model_finished.emit(result, error, sae_model, r_script)
+                    self.run_model_finished.emit(result, error, sae_model, script)
                     self.finnish = True
                     return
 
@@ -0,0 +1,284 @@
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QFrame, QVBoxLayout, QLabel, QTextEdit, QAbstractItemView
+from PyQt6.QtCore import Qt, QSize, QPoint, QTimer, QByteArray, QBuffer, QIODevice, QPersistentModelIndex, QSortFilterProxyModel, pyqtSignal
+from PyQt6.QtGui import QImageReader, QPixmap
+from model.OutputHistoryModel import OutputHistoryModel, OUTPUT_KINDS
+from service.session.Project import plot_bytes
+
+PLOT_SIZE = QSize(500, 350)
+MAX_RESULT_HEIGHT = 400
+OVERSCAN_ROWS = 2
+
+TEXT_BOX_STYLE = """
+    QTextEdit {
+        background-color: #fff;
+        border: 1px solid #ccc;
+        border-radius: 4px;
+        padding: 5px;
+        font-family: Consolas, Courier New, monospace;
+    }
+"""
+
+ERROR_BOX_STYLE = """
+    QTextEdit {
+        background-color: #f8d7da;
+        border: 1px solid #f5c6cb;
+        border-radius: 4px;
+        padding: 5px;
+        font-family: Consolas, Courier New, monospace;
+        color: #721c24;
+    }
+"""
+
+def decode_plot(image, size=PLOT_SIZE):
+    """Decodes an encoded plot image (or a project PlotEntry) straight to the display size, without a full-size copy."""
+    buffer = QBuffer()
+    buffer.setData(QByteArray(plot_bytes(image)))
+    buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+    reader = QImageReader(buffer)
+    if size is not None:
+        reader.setScaledSize(size)
+    return QPixmap.fromImage(reader.read())
+
+class OutputCard(QFrame):
+    """A card showing one output record: the R script, its output, plots and error."""
+
+    def __init__(self, record, parent=None):
+        super().__init__(parent)
+        self.setStyleSheet("""
+            QFrame {
+                background-color: #f9f9f9;
+                border: 1px solid #ddd;
+                border-radius: 8px;
+                padding: 10px;
+            }
+        """)
+        card_layout = QVBoxLayout(self)
+        card_layout.setSpacing(8)
+
+        self._add_text(card_layout, "<b>R Script:</b>", "color: #333; margin-bottom: 5px;", record["script_text"], TEXT_BOX_STYLE)
+        if record["result_text"]:
+            self._add_text(card_layout, "<b>Output:</b>", "color: #333; margin-top: 10px; margin-bottom: 5px;", record["result_text"], TEXT_BOX_STYLE, MAX_RESULT_HEIGHT)
+
+        if record["plots"]:
+            label_plot = QLabel("<b>Plot:</b>")
+            label_plot.setStyleSheet("color: #333; margin-top: 10px; margin-bottom: 5px;")
+            card_layout.addWidget(label_plot)
+            for image in record["plots"]:
+                label = QLabel()
+                label.setPixmap(decode_plot(image))
+                label.setFixedSize(PLOT_SIZE)
+                label.setScaledContents(True)
+                label.setStyleSheet("border: 1px solid #ccc; border-radius: 4px;")
+                card_layout.addWidget(label)
+
+        if record["error_text"]:
+            self._add_text(card_layout, "<b>Error:</b>", "color: #a94442; margin-top: 10px; margin-bottom: 5px;", record["error_text"], ERROR_BOX_STYLE)
+
+    @staticmethod
+    def _add_text(card_layout, title, title_style, text, box_style, max_height=None):
+        label = QLabel(title)
+        label.setStyleSheet(title_style)
+        box = QTextEdit()
+        box.setPlainText(text)
+        box.setReadOnly(True)
+        box.setStyleSheet(box_style)
+        height = box.fontMetrics().lineSpacing() * (text.count('\n') + 3)
+        if max_height is not None:
+            box.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn if height > max_height else Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+            height = min(height, max_height)
+        box.setFixedHeight(height)
+        card_layout.addWidget(label)
+        card_layout.addWidget(box)
+
+class OutputFilterProxyModel(QSortFilterProxyModel):
+    """Filters the output history by search text (script, output and error) and by kind."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.search_text = ""
+        self.kind = OUTPUT_KINDS[0]
+
+    def set_search_text(self, text):
+        self.search_text = text.strip().lower()
+        self.invalidateFilter()
+
+    def set_kind(self, kind):
+        self.kind = kind
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        if self.kind == "With Plots" and "plot" not in index.data(OutputHistoryModel.KindRole):
+            return False
+        if self.kind == "With Errors" and "error" not in index.data(OutputHistoryModel.KindRole):
+            return False
+        return not self.search_text or self.search_text in index.data(OutputHistoryModel.SearchTextRole)
+
+class OutputCardDelegate(QStyledItemDelegate):
+    """Reports the height of each card; the cards themselves are index widgets of the view."""
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+
+    def sizeHint(self, option, index):
+        return QSize(self.view.viewport().width(), self.view.card_height(index))
+
+    def paint(self, painter, option, index):
+        pass
+
+class OutputHistoryView(QListView):
+    """
+    Virtualized view of the output history.
+    Rows are laid out from estimated card heights, and an `OutputCard` widget is only built for
+    the rows inside the viewport (plus a few rows of overscan). Cards that scroll out of view
+    are destroyed, so memory and layout cost stay flat however long the history gets. The
+    measured height of a card replaces its estimate once it has been built.
+    Signals:
+        card_context_menu_requested (int, QPoint): Source row and global position of a right click on a card.
+    Methods:
+        record(index):
+            Returns the output record shown at the given index.
+        card_height(index):
+            Returns the measured or estimated height of the card at the given index.
+        visible_card_count():
+            Returns the number of cards currently built.
+    """
+
+    card_context_menu_requested = pyqtSignal(int, QPoint)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setUniformItemSizes(False)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.delegate = OutputCardDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self._cards = {}  # record id -> (QPersistentModelIndex, OutputCard)
+        self._heights = {}  # record id -> measured (or estimated) card height
+        self._proxy = None
+        self._source = None
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.timeout.connect(self._sync_cards)
+        self.verticalScrollBar().valueChanged.connect(self._schedule_sync)
+        self.verticalScrollBar().rangeChanged.connect(self._schedule_sync)
+
+    def setModel(self, model):
+        old_model = self.model()
+        if old_model is not None:
+            for signal in (old_model.rowsInserted, old_model.rowsRemoved, old_model.modelReset, old_model.layoutChanged):
+                signal.disconnect(self._on_rows_changed)
+        super().setModel(model)
+        self._proxy = model if isinstance(model, QSortFilterProxyModel) else None
+        self._source = model.sourceModel() if self._proxy is not None else model
+        for signal in (model.rowsInserted, model.rowsRemoved, model.modelReset, model.layoutChanged):
+            signal.connect(self._on_rows_changed)
+        self._on_rows_changed()
+
+    def _on_rows_changed(self, *args):
+        for key, (persistent, card) in list(self._cards.items()):
+            if not persistent.isValid():
+                del self._cards[key]
+                card.deleteLater()
+        if self.model().rowCount() == 0:
+            self._heights = {}
+        self._schedule_sync()
+
+    def _schedule_sync(self, *args):
+        self._sync_timer.start(0)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._schedule_sync()
+
+    def record(self, index):
+        """Returns the record behind a view index (the model's own dictionary, not a converted copy)."""
+        if self._proxy is not None:
+            index = self._proxy.mapToSource(index)
+        if not index.isValid():
+            return None
+        return self._source.record(index.row())
+
+    def _record_id(self, index):
+        """Returns the model's id of the record behind a view index; unlike id(record) it is never reused."""
+        return self.model().data(index, OutputHistoryModel.IdRole)
+
+    def card_height(self, index):
+        record = self.record(index)
+        if record is None:
+            return 0
+        key = self._record_id(index)
+        height = self._heights.get(key)
+        if height is None:
+            height = self._heights[key] = self._estimate_height(record)
+        return height
+
+    def _estimate_height(self, record):
+        line = self.fontMetrics().lineSpacing()
+        label = line + 20
+        height = 40 + label + line * (record["script_text"].count('\n') + 3)
+        if record["result_text"]:
+            height += label + min(line * (record["result_text"].count('\n') + 3), MAX_RESULT_HEIGHT)
+        if record["plots"]:
+            height += label + len(record["plots"]) * (PLOT_SIZE.height() + 8)
+        if record["error_text"]:
+            height += label + line * (record["error_text"].count('\n') + 3)
+        return height
+
+    def visible_card_count(self):
+        return len(self._cards)
+
+    def _visible_rows(self):
+        model = self.model()
+        if model is None or model.rowCount() == 0:
+            return range(0)
+        top = self.indexAt(QPoint(1, 0))
+        bottom = self.indexAt(QPoint(1, self.viewport().height() - 1))
+        first = top.row() if top.isValid() else 0
+        last = bottom.row() if bottom.isValid() else model.rowCount() - 1
+        return range(max(0, first - OVERSCAN_ROWS), min(model.rowCount() - 1, last + OVERSCAN_ROWS) + 1)
+
+    def _sync_cards(self):
+        model = self.model()
+        if model is None:
+            return
+        self.executeDelayedItemsLayout()
+        wanted = {}
+        for row in self._visible_rows():
+            index = model.index(row, 0)
+            wanted[self._record_id(index)] = index
+
+        for key, (persistent, card) in list(self._cards.items()):
+            if key not in wanted:
+                del self._cards[key]
+                if persistent.isValid():
+                    self.setIndexWidget(self.model().index(persistent.row(), 0), None)
+                else:
+                    card.deleteLater()
+
+        for key, index in wanted.items():
+            if key in self._cards:
+                continue
+            card = OutputCard(self.record(index))
+            card.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+            card.customContextMenuRequested.connect(lambda pos, card=card: self._show_card_menu(card, pos))
+            self.setIndexWidget(index, card)
+            self._cards[key] = (QPersistentModelIndex(index), card)
+            height = card.sizeHint().height()
+            if self._heights.get(key) != height:
+                # The measured height replaces the estimate
+                self._heights[key] = height
+                self.delegate.sizeHintChanged.emit(index)
+
+    def _show_card_menu(self, card, pos):
+        for persistent, other in self._cards.values():
+            if other is card and persistent.isValid():
+                index = self.model().index(persistent.row(), 0)
+                model = self.model()
+                if isinstance(model, QSortFilterProxyModel):
+                    index = model.mapToSource(index)
+                self.card_context_menu_requested.emit(index.row(), card.mapToGlobal(pos))
+                return
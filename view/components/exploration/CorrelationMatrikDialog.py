@@ -3,9 +3,10 @@ from PyQt6.QtGui import QIcon
 import polars as pl
 from model.CorrelationMatrix import CorrelationMatrix
 from controller.Eksploration.EksplorationController import CorrelationMatrixController
+from service.exploration.CorrelationStatistics import CORRELATION_ENGINES, CORRELATION_METHODS, TOP_PAIRS, native_correlation_script
 
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QTextEdit, QGroupBox, QCheckBox, QSizePolicy, QMessageBox, QSpacerItem
+    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QTextEdit, QGroupBox, QCheckBox, QComboBox, QSpinBox, QFormLayout, QSizePolicy, QMessageBox, QSpacerItem
 )
 
 class CorrelationMatrixDialog(QDialog):
@@ -29,6 +30,9 @@ class CorrelationMatrixDialog(QDialog):
         selected_model (QStringListModel): Model for the selected variables list view.
         selected_list (QListView): List view for the selected variables.
         correlation_plot_checkbox (QCheckBox): Checkbox to show correlation plot.
+        method_combo (QComboBox): Combo box to choose Pearson or Spearman correlation.
+        top_pairs_spin (QSpinBox): Number of most strongly correlated pairs listed by the polars engine.
+        engine_combo (QComboBox): Combo box to choose between the polars engine and R's cor().
         script_layout (QHBoxLayout): Layout for the R script section.
         script_label (QLabel): Label for the R script section.
         icon_label (QLabel): Label to show running icon.
@@ -121,6 +125,25 @@ class CorrelationMatrixDialog(QDialog):
         graph_group.setLayout(graph_layout)
         right_layout.addWidget(graph_group)
 
+        # Options group
+        options_group = QGroupBox("Options")
+        options_layout = QFormLayout()
+        self.method_combo = QComboBox(self)
+        self.method_combo.addItems([method.capitalize() for method in CORRELATION_METHODS])
+        self.method_combo.currentIndexChanged.connect(self.generate_r_script)
+        self.top_pairs_spin = QSpinBox(self)
+        self.top_pairs_spin.setRange(1, 1000)
+        self.top_pairs_spin.setValue(TOP_PAIRS)
+        self.top_pairs_spin.setToolTip("Number of most strongly correlated pairs listed (polars engine).")
+        self.engine_combo = QComboBox(self)
+        self.engine_combo.addItems(CORRELATION_ENGINES)
+        self.engine_combo.setToolTip("Polars computes the matrix in blocks without R; R runs the cor() script for reproducibility.")
+        options_layout.addRow("Method:", self.method_combo)
+        options_layout.addRow("Top pairs:", self.top_pairs_spin)
+        options_layout.addRow("Engine:", self.engine_combo)
+        options_group.setLayout(options_layout)
+        right_layout.addWidget(options_group)
+
         content_layout.addLayout(right_layout)
         main_layout.addLayout(content_layout)
 
@@ -234,7 +257,8 @@ class CorrelationMatrixDialog(QDialog):
         r_script = ""
 
         # Step 1: Generate the correlation matrix
-        r_script += f"""correlation_matrix <- cor(data[, c({formatted_columns})], use="complete.obs", method="pearson")"""
+        method = CORRELATION_METHODS[self.method_combo.currentIndex()]
+        r_script += f"""correlation_matrix <- cor(data[, c({formatted_columns})], use="pairwise.complete.obs", method="{method}")"""
         if self.correlation_plot_checkbox.isChecked():
             r_script += """
 correlation_plot <- ggcorrplot(correlation_matrix, method = "square", type = "upper", lab = TRUE)
@@ -252,14 +276,24 @@ correlation_plot <- ggcorrplot(correlation_matrix, method = "square", type = "up
         self.icon_label.setVisible(True)
         correlation_matrix = CorrelationMatrix(self.model1, self.model2, self.parent)
         controller = CorrelationMatrixController(correlation_matrix)
-        controller.run_model(r_script)
+        options = {
+            "columns": self.get_selected_columns(),
+            "method": CORRELATION_METHODS[self.method_combo.currentIndex()],
+            "top_k": self.top_pairs_spin.value(),
+            "plot": self.correlation_plot_checkbox.isChecked(),
+        }
+        if self.engine_combo.currentText() == CORRELATION_ENGINES[0]:
+            controller.run_native(options)
+            r_script = native_correlation_script(r_script)
+        else:
+            controller.run_model(r_script, options)
 
         if not correlation_matrix.error:
             QMessageBox.information(self, "Correlation Matrix", "Exploration has been completed.")
         else:
             QMessageBox.warning(self, "Correlation Matrix", correlation_matrix.result)
 
-        self.parent.add_output(script_text = r_script, result_text =  correlation_matrix.result ,plot_paths = correlation_matrix.plot)
+        self.parent.add_output(script_text = r_script, result_text =  correlation_matrix.result ,plot_images=correlation_matrix.plot)
         self.parent.tab_widget.setCurrentWidget(self.parent.output_tab)
 
         self.icon_label.setVisible(False)
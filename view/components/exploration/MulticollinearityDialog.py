@@ -1,11 +1,12 @@
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QCheckBox, QTextEdit, QGroupBox, QMessageBox, QMessageBox, QSpacerItem, QSizePolicy
+    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QCheckBox, QComboBox, QTextEdit, QGroupBox, QMessageBox, QMessageBox, QSpacerItem, QSizePolicy
 )
 from PyQt6.QtGui import QIcon
 import polars as pl
 from PyQt6.QtCore import Qt, QStringListModel, QSize
 from model.Multicollinearity import Multicollinearity
 from controller.Eksploration.EksplorationController import MulticollinearityController
+from service.exploration.CollinearityStatistics import COLLINEARITY_ENGINES, native_collinearity_script
 
 
 class MulticollinearityDialog(QDialog):
@@ -34,6 +35,7 @@ class MulticollinearityDialog(QDialog):
         independent_variable_model (QStringListModel): Model for the independent variable list view.
         independent_variable_list (QListView): List view for the independent variable.
         regression_line_checkbox (QCheckBox): Checkbox to show regression model.
+        engine_combo (QComboBox): Combo box to choose between the polars engine and car::vif in R.
         script_label (QLabel): Label for the R script section.
         icon_label (QLabel): Label to show running icon.
         script_box (QTextEdit): Text edit box to display the generated R script.
@@ -168,6 +170,11 @@ class MulticollinearityDialog(QDialog):
         self.regression_line_checkbox = QCheckBox("Show Regression Model", self)  # New checkbox for regression line
         self.regression_line_checkbox.stateChanged.connect(self.generate_r_script)
         model_options_layout.addWidget(self.regression_line_checkbox)  # Add the regression line checkbox to the layout
+        self.engine_combo = QComboBox(self)
+        self.engine_combo.addItems(COLLINEARITY_ENGINES)
+        self.engine_combo.setToolTip("Polars computes all VIFs and condition indices without R; R runs lm() and car::vif() for reproducibility.")
+        model_options_layout.addWidget(QLabel("Engine:", self))
+        model_options_layout.addWidget(self.engine_combo)
         model_options_group.setLayout(model_options_layout)
         right_layout.addWidget(model_options_group)
 
@@ -372,7 +379,15 @@ class MulticollinearityDialog(QDialog):
             multicollinearity.reg_model = True
         
         controller = MulticollinearityController(multicollinearity)
-        controller.run_model(r_script)
+        options = {
+            "dependent": self.get_selected_dependent_variable()[0],
+            "independents": self.get_selected_independent_variables(),
+        }
+        if self.engine_combo.currentText() == COLLINEARITY_ENGINES[0]:
+            controller.run_native(options)
+            r_script = native_collinearity_script(r_script)
+        else:
+            controller.run_model(r_script, options)
 
         if multicollinearity.error:
             QMessageBox.critical(self, "Multicollinearity", multicollinearity.result)
@@ -1,11 +1,12 @@
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QCheckBox, QTextEdit, QGroupBox, QSizePolicy, QMessageBox, QSpacerItem
+    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QCheckBox, QTextEdit, QGroupBox, QComboBox, QSizePolicy, QMessageBox, QSpacerItem
 )
 from PyQt6.QtCore import Qt, QStringListModel, QSize
 from PyQt6.QtGui import QIcon
 import polars as pl
 from model.NormalityTest import NormalityTest
 from controller.Eksploration.EksplorationController import NormalityTestController
+from service.exploration.NormalityStatistics import NORMALITY_ENGINES, shapiro_subsample_script, native_normality_script
 
 
 class NormalityTestDialog(QDialog):
@@ -34,6 +35,7 @@ class NormalityTestDialog(QDialog):
         lilliefors_checkbox (QCheckBox): Checkbox for the Lilliefors test.
         histogram_checkbox (QCheckBox): Checkbox for displaying histograms.
         qqplot_checkbox (QCheckBox): Checkbox for displaying Q-Q plots.
+        engine_combo (QComboBox): Combo box to choose between the polars engine and the R tests.
         script_layout (QHBoxLayout): Layout for the R script section.
         script_label (QLabel): Label for the R script section.
         icon_label (QLabel): Label for the running icon.
@@ -46,6 +48,7 @@ class NormalityTestDialog(QDialog):
         add_variable(): Adds selected variables to the selected list and updates the R script.
         remove_variable(): Removes selected variables from the selected list and updates the R script.
         get_selected_columns(): Returns a list of selected columns without their data types.
+        get_selected_methods(): Returns the names of the checked tests.
         generate_r_script(): Generates the R script based on selected variables, methods, and graph options.
         accept(): Runs the normality test using the generated R script and displays the results.
         closeEvent(event): Resets the dialog when it is closed.
@@ -148,6 +151,16 @@ class NormalityTestDialog(QDialog):
         graph_group.setLayout(graph_layout)
         right_layout.addWidget(graph_group)
 
+        # Engine group
+        engine_group = QGroupBox("Engine")
+        engine_layout = QVBoxLayout()
+        self.engine_combo = QComboBox(self)
+        self.engine_combo.addItems(NORMALITY_ENGINES)
+        self.engine_combo.setToolTip("Polars runs all tests in one pass without R; R runs the test script for reproducibility.")
+        engine_layout.addWidget(self.engine_combo)
+        engine_group.setLayout(engine_layout)
+        right_layout.addWidget(engine_group)
+
         content_layout.addLayout(right_layout)
         main_layout.addLayout(content_layout)
 
@@ -250,13 +263,7 @@ class NormalityTestDialog(QDialog):
         return [item.rsplit(" [String]", 1)[0].rsplit(" [Numeric]", 1)[0] for item in self.selected_model.stringList()]
 
 
-    def generate_r_script(self):
-        selected_vars = self.get_selected_columns()
-        
-        if len(selected_vars) == 0:
-            self.script_box.setPlainText("")
-            return
-        
+    def get_selected_methods(self):
         selected_methods = []
         if self.shapiro_checkbox.isChecked():
             selected_methods.append("shapiro")
@@ -264,6 +271,16 @@ class NormalityTestDialog(QDialog):
             selected_methods.append("jarque_bera")
         if self.lilliefors_checkbox.isChecked():
             selected_methods.append("lilliefors")
+        return selected_methods
+
+    def generate_r_script(self):
+        selected_vars = self.get_selected_columns()
+        
+        if len(selected_vars) == 0:
+            self.script_box.setPlainText("")
+            return
+        
+        selected_methods = self.get_selected_methods()
         
         if not selected_methods:
             self.script_box.setPlainText("")
@@ -279,7 +296,12 @@ class NormalityTestDialog(QDialog):
 
             for method in selected_methods:
                 if method == "shapiro":
-                    r_script += f"normality_results_{safe_var}_shapiro <- shapiro.test(data$`{var}`)\n"
+                    # shapiro.test accepts at most 5000 values; larger columns are tested on the same stratified subsample as polars
+                    r_script += (
+                        f"shapiro_{safe_var} <- data$`{var}`\n"
+                        + shapiro_subsample_script(f"shapiro_{safe_var}")
+                        + f"normality_results_{safe_var}_shapiro <- shapiro.test(shapiro_{safe_var})\n"
+                    )
                 elif method == "jarque_bera":
                     r_script += f"normality_results_{safe_var}_jarque <- tseries::jarque.bera.test(data$`{var}`)\n"
                 elif method == "lilliefors":
@@ -316,14 +338,24 @@ class NormalityTestDialog(QDialog):
         self.icon_label.setVisible(True)
         normality_test = NormalityTest(self.model1, self.model2, self.get_selected_columns(), self.parent)
         controller = NormalityTestController(normality_test)
-        controller.run_model(r_script)
+        options = {
+            "columns": self.get_selected_columns(),
+            "tests": self.get_selected_methods(),
+            "histogram": self.histogram_checkbox.isChecked(),
+            "qqplot": self.qqplot_checkbox.isChecked(),
+        }
+        if self.engine_combo.currentText() == NORMALITY_ENGINES[0]:
+            controller.run_native(options)
+            r_script = native_normality_script(r_script)
+        else:
+            controller.run_model(r_script, options)
 
         if not normality_test.error:
             QMessageBox.information(self, "Normality Test", "Exploration has been completed.")
         else:
             QMessageBox.critical(self, "Normality Test", normality_test.result) 
 
-        self.parent.add_output(r_script, normality_test.result, normality_test.plot)
+        self.parent.add_output(r_script, normality_test.result, plot_images=normality_test.plot)
         self.parent.tab_widget.setCurrentWidget(self.parent.output_tab)
         self.icon_label.setVisible(False)
         self.run_button.setText("Run")
@@ -1,11 +1,12 @@
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QTextEdit, QSpacerItem, QSizePolicy, QMessageBox
+    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QTextEdit, QGroupBox, QComboBox, QSpacerItem, QSizePolicy, QMessageBox
 )
 from PyQt6.QtCore import Qt, QStringListModel, QSize
 from PyQt6.QtGui import QIcon
 import polars as pl
 from model.SummaryData import SummaryData
 from controller.Eksploration.EksplorationController import SummaryDataController
+from service.exploration.SummaryStatistics import SUMMARY_ENGINES, native_summary_script
 
 class SummaryDataDialog(QDialog):
     """
@@ -28,6 +29,7 @@ class SummaryDataDialog(QDialog):
         selected_label (QLabel): Label for the selected variables list.
         selected_model (QStringListModel): Model for the selected variables list.
         selected_list (QListView): List view for the selected variables.
+        engine_combo (QComboBox): Combo box to choose between the polars engine and R's summary().
         script_label (QLabel): Label for the R script.
         icon_label (QLabel): Label for the running icon.
         script_box (QTextEdit): Text box to display the generated R script.
@@ -111,6 +113,16 @@ class SummaryDataDialog(QDialog):
         right_layout.addWidget(self.selected_label)
         right_layout.addWidget(self.selected_list)
 
+        # Engine group
+        engine_group = QGroupBox("Engine")
+        engine_layout = QVBoxLayout()
+        self.engine_combo = QComboBox(self)
+        self.engine_combo.addItems(SUMMARY_ENGINES)
+        self.engine_combo.setToolTip("Polars computes the summary table without R; R runs the summary() script for reproducibility.")
+        engine_layout.addWidget(self.engine_combo)
+        engine_group.setLayout(engine_layout)
+        right_layout.addWidget(engine_group)
+
         content_layout.addLayout(right_layout)
         main_layout.addLayout(content_layout)
 
@@ -230,7 +242,12 @@ class SummaryDataDialog(QDialog):
         self.icon_label.setVisible(True)
         summary_data = SummaryData(self.model1, self.model2, self.parent)
         controller = SummaryDataController(summary_data)
-        controller.run_model(r_script)
+        options = {"columns": self.get_selected_columns()}
+        if self.engine_combo.currentText() == SUMMARY_ENGINES[0]:
+            controller.run_native(options)
+            r_script = native_summary_script(r_script)
+        else:
+            controller.run_model(r_script, options)
 
         if not summary_data.error:
             QMessageBox.information(self, "Summary Data", "Exploration has been completed.")
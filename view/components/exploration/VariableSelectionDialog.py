@@ -1,11 +1,14 @@
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QCheckBox, QTextEdit, QGroupBox, QMessageBox, QMessageBox, QSpacerItem, QSizePolicy
+    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QCheckBox, QTextEdit, QGroupBox, QMessageBox, QMessageBox, QSpacerItem, QSizePolicy, QComboBox, QFormLayout, QDoubleSpinBox
 )
 from PyQt6.QtGui import QIcon
 import polars as pl
 from PyQt6.QtCore import Qt, QStringListModel, QSize
 from model.VariableSelection import VariableSelection
 from controller.Eksploration.EksplorationController import VariableSelectionController
+from service.exploration.SelectionStatistics import (
+    SELECTION_ENGINES, SELECTION_CRITERIA, LASSO_RULES, LASSO_FOLDS, LASSO_SEED, native_selection_script,
+)
 
 
 class VariableSelectionDialog(QDialog):
@@ -36,6 +39,11 @@ class VariableSelectionDialog(QDialog):
         forward_checkbox (QCheckBox): Checkbox for forward selection method.
         backward_checkbox (QCheckBox): Checkbox for backward selection method.
         stepwise_checkbox (QCheckBox): Checkbox for stepwise selection method.
+        lasso_checkbox (QCheckBox): Checkbox for LASSO / elastic net selection with a cross-validated penalty.
+        criterion_combo (QComboBox): Combo box to choose AIC or BIC as the selection criterion.
+        alpha_spin (QDoubleSpinBox): Elastic net mixing parameter (1 is the LASSO).
+        rule_combo (QComboBox): Combo box to choose the cross-validated penalty (lambda.1se or lambda.min).
+        engine_combo (QComboBox): Combo box to choose between the polars engine and R's step().
         script_label (QLabel): Label for the R script.
         icon_label (QLabel): Label for the running icon.
         script_box (QTextEdit): Text box to display the generated R script.
@@ -168,19 +176,48 @@ class VariableSelectionDialog(QDialog):
         self.forward_checkbox = QCheckBox("Forward")
         self.backward_checkbox = QCheckBox("Backward")
         self.stepwise_checkbox = QCheckBox("Stepwise")
+        self.lasso_checkbox = QCheckBox("LASSO / Elastic Net")
 
         # Tambahkan event listener untuk setiap checkbox
         self.forward_checkbox.stateChanged.connect(self.generate_r_script)
         self.backward_checkbox.stateChanged.connect(self.generate_r_script)
         self.stepwise_checkbox.stateChanged.connect(self.generate_r_script)
+        self.lasso_checkbox.stateChanged.connect(self.generate_r_script)
 
         # Tambahkan checkbox ke layout
         selection_method_layout.addWidget(self.forward_checkbox)
         selection_method_layout.addWidget(self.backward_checkbox)
         selection_method_layout.addWidget(self.stepwise_checkbox)
+        selection_method_layout.addWidget(self.lasso_checkbox)
         selection_method_group.setLayout(selection_method_layout)
 
         right_layout.addWidget(selection_method_group)
+
+        # Grup Options
+        options_group = QGroupBox("Options")
+        options_layout = QFormLayout()
+        self.criterion_combo = QComboBox(self)
+        self.criterion_combo.addItems(SELECTION_CRITERIA)
+        self.criterion_combo.currentIndexChanged.connect(self.generate_r_script)
+        options_layout.addRow("Criterion:", self.criterion_combo)
+        self.alpha_spin = QDoubleSpinBox(self)
+        self.alpha_spin.setRange(0.01, 1.0)
+        self.alpha_spin.setSingleStep(0.05)
+        self.alpha_spin.setValue(1.0)
+        self.alpha_spin.setToolTip("Elastic net mixing: 1 is the LASSO, smaller values add a ridge penalty.")
+        self.alpha_spin.valueChanged.connect(self.generate_r_script)
+        options_layout.addRow("Alpha:", self.alpha_spin)
+        self.rule_combo = QComboBox(self)
+        self.rule_combo.addItems(LASSO_RULES)
+        self.rule_combo.setToolTip("lambda.1se keeps the fewest variables within one standard error of the best cross-validated error.")
+        self.rule_combo.currentIndexChanged.connect(self.generate_r_script)
+        options_layout.addRow("Lambda:", self.rule_combo)
+        self.engine_combo = QComboBox(self)
+        self.engine_combo.addItems(SELECTION_ENGINES)
+        self.engine_combo.setToolTip("Polars runs all directions in parallel without refitting any model; R runs step() for reproducibility.")
+        options_layout.addRow("Engine:", self.engine_combo)
+        options_group.setLayout(options_layout)
+        right_layout.addWidget(options_group)
         content_layout.addLayout(right_layout)
         main_layout.addLayout(content_layout)
 
@@ -386,10 +423,26 @@ class VariableSelectionDialog(QDialog):
         variable_selection = VariableSelection(self.model1, self.model2, self.parent)
 
         controller =  VariableSelectionController(variable_selection)
-        controller.run_model(r_script)
+        options = {
+            "dependent": self.get_selected_dependent_variable()[0],
+            "independents": self.get_selected_independent_variables(),
+            "methods": selected_methods,
+            "criterion": self.criterion_combo.currentText(),
+            "alpha": self.alpha_spin.value(),
+            "rule": self.rule_combo.currentText(),
+        }
+        if self.engine_combo.currentText() == SELECTION_ENGINES[0]:
+            controller.run_native(options)
+            r_script = native_selection_script(r_script)
+        else:
+            controller.run_model(r_script, options)
 
         if variable_selection.error:
             QMessageBox.critical(self, "Variable Selection", variable_selection.result)
+        elif "lasso" in variable_selection.selected:
+            # Variabel terpilih menjadi variabel auxiliary pada dialog SAE EBLUP atau HB berikutnya, selama data tidak berubah
+            self.parent.selected_auxiliaries = {"columns": variable_selection.selected["lasso"], "data_version": self.model1.data_version()}
+            QMessageBox.information(self, "Variable Selection", "Exploration has been completed. The LASSO selection will be used as the auxiliary variables of the next SAE dialog opened, unless the data changes first.")
         else:
             QMessageBox.information(self, "Variable Selection", "Exploration has been completed.")
             
@@ -415,6 +468,8 @@ class VariableSelectionDialog(QDialog):
             selected_methods.append("backward")
         if self.stepwise_checkbox.isChecked():
             selected_methods.append("both")
+        if self.lasso_checkbox.isChecked():
+            selected_methods.append("lasso")
         return selected_methods
 
     def generate_r_script(self):
@@ -451,15 +506,25 @@ class VariableSelectionDialog(QDialog):
             self.script_box.setPlainText("")
             return
 
+        # BIC penalises every term with log(n) instead of 2
+        penalty = (
+            ", \n                      k = log(nobs(full_model))"
+            if self.criterion_combo.currentText() == "BIC" else ""
+        )
+
         # Add script for each selected method
         for method in selected_methods:
+            if method == "lasso":
+                r_script += self.generate_lasso_script()
+                continue
             model_var = f"{method}_model"  # Variable name for the model
             result_var = f"{method}_result"  # Variable name for the summary result
+            start_model = "full_model" if method == "backward" else "null_model"  # Backward elimination starts from the full model
 
             r_script += (
-            f"{model_var} <- step(null_model, \n"
+            f"{model_var} <- step({start_model}, \n"
             f"                      scope = list(lower = null_model, upper = full_model), \n"
-            f"                      direction = \"{method}\")\n\n"
+            f"                      direction = \"{method}\"{penalty})\n\n"
             )
 
             # Add model summary
@@ -467,3 +532,19 @@ class VariableSelectionDialog(QDialog):
 
         # Display the generated script
         self.script_box.setPlainText(r_script)
+
+    def generate_lasso_script(self):
+        """Function to generate the R script for LASSO / elastic net selection with cv.glmnet"""
+        alpha = self.alpha_spin.value()
+        rule = self.rule_combo.currentText()
+        return (
+            f"# Penalized regression path with {LASSO_FOLDS}-fold cross-validation\n"
+            f"# The folds are drawn by R's own generator, so they differ from the native engine's folds\n"
+            f"# and the cross-validated error (and the chosen lambda) can differ slightly\n"
+            f"suppressMessages(library(glmnet))\n"
+            f"lasso_x <- model.matrix(full_model)[, -1, drop = FALSE]\n"
+            f"lasso_y <- model.response(model.frame(full_model))\n"
+            f"set.seed({LASSO_SEED})\n"
+            f"lasso_model <- cv.glmnet(lasso_x, lasso_y, alpha = {alpha:g}, nfolds = {LASSO_FOLDS})\n"
+            f"lasso_result <- coef(lasso_model, s = \"{rule}\")\n\n"
+        )
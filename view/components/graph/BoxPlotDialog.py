@@ -7,6 +7,10 @@ import polars as pl
 import re
 from model.BoxPlot import BoxPlot
 from controller.Graph.GraphController import BoxPlotController
+from service.graph.NativePlot import RENDERERS, quick_preview_script
+from service.graph.BoxStats import box_stats_r_script
+
+NO_GROUP_LABEL = "(None)"
 
 class BoxPlotDialog(QDialog):
     """
@@ -30,6 +34,8 @@ class BoxPlotDialog(QDialog):
         selected_model (QStringListModel): Model for the selected variables list.
         selected_list (QListView): List view for the selected variables.
         method_combo (QComboBox): Combo box to select the box plot method.
+        group_combo (QComboBox): Combo box to select the column that splits the data into boxes (e.g. domain).
+        renderer_combo (QComboBox): Combo box to choose between the quick preview and the R (publication quality) renderer.
         script_layout (QHBoxLayout): Layout for the R script display.
         script_label (QLabel): Label for the R script.
         icon_label (QLabel): Label to display the running icon.
@@ -41,6 +47,7 @@ class BoxPlotDialog(QDialog):
         add_variable(): Adds selected variables from the data editor and output lists to the selected variables list.
         remove_variable(): Removes selected variables from the selected variables list and adds them back to the data editor or output lists.
         get_selected_columns(): Returns a list of selected columns formatted for R script.
+        get_group_column(): Returns the selected group column, or None.
         generate_r_script(): Generates the R script based on the selected variables and method.
         accept(): Runs the generated R script and displays the result.
         closeEvent(event): Resets the dialog when it is closed.
@@ -123,6 +130,27 @@ class BoxPlotDialog(QDialog):
         method_group.setLayout(method_layout)
         right_layout.addWidget(method_group)
 
+        # Grup pengelompokan
+        group_by_group = QGroupBox("Group by")
+        group_by_layout = QVBoxLayout()
+        self.group_combo = QComboBox(self)
+        self.group_combo.addItem(NO_GROUP_LABEL)
+        self.group_combo.setToolTip("Draws one box per value of this column, e.g. per domain.")
+        self.group_combo.currentIndexChanged.connect(self.generate_r_script)
+        group_by_layout.addWidget(self.group_combo)
+        group_by_group.setLayout(group_by_layout)
+        right_layout.addWidget(group_by_group)
+
+        # Grup renderer
+        renderer_group = QGroupBox("Renderer")
+        renderer_layout = QVBoxLayout()
+        self.renderer_combo = QComboBox(self)
+        self.renderer_combo.addItems(RENDERERS)
+        self.renderer_combo.setToolTip("Quick Preview draws the chart without R; Publication Quality runs the R script with ggplot2.")
+        renderer_layout.addWidget(self.renderer_combo)
+        renderer_group.setLayout(renderer_layout)
+        right_layout.addWidget(renderer_group)
+
         content_layout.addLayout(right_layout)
         main_layout.addLayout(content_layout)
 
@@ -163,6 +191,10 @@ class BoxPlotDialog(QDialog):
         self.data_output_model.setStringList(self.get_column_with_dtype(model2))
         self.all_columns_model1 = self.get_column_with_dtype(model1)
         self.all_columns_model2 = self.get_column_with_dtype(model2)
+        self.group_combo.blockSignals(True)
+        self.group_combo.clear()
+        self.group_combo.addItems([NO_GROUP_LABEL, *model1.get_data().columns, *model2.get_data().columns])
+        self.group_combo.blockSignals(False)
 
     def get_column_with_dtype(self, model):
         self.columns = [
@@ -227,6 +259,10 @@ class BoxPlotDialog(QDialog):
         return [f"`{item.rsplit(' [String]', 1)[0].rsplit(' [Numeric]', 1)[0]}`" 
                 for item in self.selected_model.stringList()]
 
+    def get_group_column(self):
+        group = self.group_combo.currentText()
+        return None if group in ("", NO_GROUP_LABEL) else group
+
     def generate_r_script(self):
         # Get selected columns
         selected_columns = self.get_selected_columns()
@@ -236,33 +272,43 @@ class BoxPlotDialog(QDialog):
 
         # Get selected method
         method = self.method_combo.currentText()
-        formatted_columns = ', '.join(selected_columns)  # Tetap gunakan backticks di sini
         r_script = ""
 
+        group = self.get_group_column()
+        x_label = f"'{group}'" if group else "''"
+        box_aes = "aes(ymin = lower, lower = q1, middle = median, upper = q3, ymax = upper)"
+        r_script += (
+            f"# Box statistics (box_stats) and outliers (box_outliers) are computed in polars\n"
+            f"# per variable{' and ' + group if group else ''}; only these summaries are sent to R.\n\n"
+        )
+
         # Single Box Plot: Jika ada banyak variabel, buat plot terpisah
         if method == "Single Box plot":
             for col in selected_columns:
-                clean_name = re.sub(r"\W+", "_", col.strip("`"))  # Bersihkan nama untuk penamaan objek
+                name = col.strip("`")
+                clean_name = re.sub(r"\W+", "_", name)  # Bersihkan nama untuk penamaan objek
                 r_script += (
                     f"# Box plot for {col}\n"
-                    f"boxplot_{clean_name} <- ggplot(data, aes(y = {col})) +\n"
-                    f"    geom_boxplot(fill = sample(colors(), 1)) +\n"
-                    f"    ggtitle('Box Plot: {col.strip('`')}') +\n"
-                    f"    ylab('{col.strip('`')}') +\n"
+                    f"boxplot_{clean_name} <- ggplot(subset(box_stats, variable == '{name}'), aes(x = group)) +\n"
+                    f"    geom_boxplot({box_aes}, stat = 'identity', fill = sample(colors(), 1)) +\n"
+                    f"    geom_point(data = subset(box_outliers, variable == '{name}'), aes(x = group, y = value), size = 1) +\n"
+                    f"    ggtitle('Box Plot: {name}') +\n"
+                    f"    xlab({x_label}) +\n"
+                    f"    ylab('{name}') +\n"
                     f"    theme_minimal()\n\n"
                 )
 
         # Multiple Box Plot: Gabungkan semua variabel dalam satu plot
         elif method == "Multiple Box Plot":
+            x, x_title = ("group", x_label) if group else ("variable", "'Variable'")
             r_script += (
-                f"# Convert to long format for ggplot compatibility\n"
-                f"data_long <- pivot_longer(data, cols = c({formatted_columns}), \n"
-                f"    names_to = 'variable', values_to = 'value')\n\n"
                 f"# Create multiple box plot\n"
-                f"boxplot_multiple <- ggplot(data_long, aes(x = variable, y = value, fill = variable)) +\n"
-                f"    geom_boxplot() +\n"
+                f"boxplot_multiple <- ggplot(box_stats, aes(x = {x}, fill = variable, group = interaction(group, variable))) +\n"
+                f"    geom_boxplot({box_aes}, stat = 'identity', position = position_dodge(width = 0.9)) +\n"
+                f"    geom_point(data = box_outliers, aes(x = {x}, y = value, group = variable), inherit.aes = FALSE,\n"
+                f"        size = 1, position = position_dodge(width = 0.9)) +\n"
                 f"    ggtitle('Multiple Box Plot') +\n"
-                f"    xlab('Variable') +\n"
+                f"    xlab({x_title}) +\n"
                 f"    ylab('Value') +\n"
                 f"    theme_minimal()\n"
             )
@@ -283,13 +329,25 @@ class BoxPlotDialog(QDialog):
         self.icon_label.setVisible(True)
         box_plot = BoxPlot(self.model1, self.model2, self.parent)
         controller = BoxPlotController(box_plot)
-        controller.run_model(r_script)
+        options = {
+            "columns": [column.strip("`") for column in self.get_selected_columns()],
+            "group": self.get_group_column(),
+            "method": self.method_combo.currentText(),
+        }
+        if self.renderer_combo.currentText() == RENDERERS[0]:
+            controller.run_native(options)
+        else:
+            controller.run_model(r_script, options)
+        # The recorded script rebuilds the summaries that were computed in polars, so it can be replayed in R
+        r_script = box_stats_r_script(options["columns"], options["group"]) + r_script
+        if self.renderer_combo.currentText() == RENDERERS[0]:
+            r_script = quick_preview_script(r_script)
         if box_plot.error:
             QMessageBox.critical(self, "Box Plot", box_plot.result)
         else:
             QMessageBox.information(self, "Box Plot", "Graph has been generated")
 
-        self.parent.add_output(script_text=r_script, result_text=box_plot.result, plot_paths=box_plot.plot)
+        self.parent.add_output(script_text=r_script, result_text=box_plot.result, plot_images=box_plot.plot)
         self.parent.tab_widget.setCurrentWidget(self.parent.output_tab)
 
         self.icon_label.setVisible(False)
@@ -7,6 +7,7 @@ from PyQt6.QtGui import QIcon
 import polars as pl
 from model.Histogram import Histogram
 from controller.Graph.GraphController import HistogramController
+from service.graph.NativePlot import RENDERERS, quick_preview_script
 
 class HistogramDialog(QDialog):
     """
@@ -32,6 +33,7 @@ class HistogramDialog(QDialog):
         method_combo (QComboBox): Combo box to select the histogram method.
         graph_option_combo (QComboBox): Combo box to select between Bins or Binwidth.
         graph_option_spinbox (QSpinBox): Spin box to set the value for Bins or Binwidth.
+        renderer_combo (QComboBox): Combo box to choose between the quick preview and the R (publication quality) renderer.
         script_layout (QHBoxLayout): Layout for the R script section.
         script_label (QLabel): Label for the R script section.
         icon_label (QLabel): Label to display the running icon.
@@ -145,6 +147,16 @@ class HistogramDialog(QDialog):
         graph_option_group.setLayout(graph_option_layout)
         right_layout.addWidget(graph_option_group)
 
+        # Grup renderer
+        renderer_group = QGroupBox("Renderer")
+        renderer_layout = QVBoxLayout()
+        self.renderer_combo = QComboBox(self)
+        self.renderer_combo.addItems(RENDERERS)
+        self.renderer_combo.setToolTip("Quick Preview draws the chart without R; Publication Quality runs the R script with ggplot2.")
+        renderer_layout.addWidget(self.renderer_combo)
+        renderer_group.setLayout(renderer_layout)
+        right_layout.addWidget(renderer_group)
+
         content_layout.addLayout(right_layout)
         main_layout.addLayout(content_layout)
 
@@ -314,13 +326,25 @@ class HistogramDialog(QDialog):
         self.icon_label.setVisible(True)
         histogram = Histogram(self.model1, self.model2, self.parent)
         controller = HistogramController(histogram)
-        controller.run_model(r_script)
+        graph_option = self.graph_option_combo.currentText()
+        bin_value = self.graph_option_spinbox.value()
+        options = {
+            "columns": [column.strip("`") for column in self.get_selected_columns()],
+            "method": self.method_combo.currentText(),
+            "bins": bin_value if graph_option == "Bins" else None,
+            "binwidth": bin_value if graph_option == "Binwidth" else None,
+        }
+        if self.renderer_combo.currentText() == RENDERERS[0]:
+            controller.run_native(options)
+            r_script = quick_preview_script(r_script)
+        else:
+            controller.run_model(r_script, options)
         if histogram.error:
             QMessageBox.critical(self, "Histogram", histogram.result)
         else:
             QMessageBox.information(self, "Histogram", "Graph has been generated.")
 
-        self.parent.add_output(script_text=r_script, result_text=histogram.result, plot_paths=histogram.plot)
+        self.parent.add_output(script_text=r_script, result_text=histogram.result, plot_images=histogram.plot)
         self.parent.tab_widget.setCurrentWidget(self.parent.output_tab)
         self.icon_label.setVisible(False)
         self.run_button.setText("Run")
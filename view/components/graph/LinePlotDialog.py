@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QComboBox,  QTextEdit, QGroupBox, QMessageBox, QMessageBox, QSpacerItem, QSizePolicy
+    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QComboBox,  QTextEdit, QGroupBox, QMessageBox, QMessageBox, QSpacerItem, QSizePolicy, QSpinBox
 )
 from PyQt6.QtCore import Qt, QStringListModel, QSize
 from PyQt6.QtGui import QIcon
@@ -7,6 +7,8 @@ import polars as pl
 import re
 from model.LinePlot import Lineplot
 from controller.Graph.GraphController import LinePlotController
+from service.graph.NativePlot import RENDERERS, quick_preview_script
+from service.graph.Downsample import DOWNSAMPLING_METHODS, DEFAULT_TARGET_POINTS
 
 
 class LinePlotDialog(QDialog):
@@ -35,6 +37,9 @@ class LinePlotDialog(QDialog):
         vertical_model (QStringListModel): Model for the vertical axis list view.
         vertical_list (QListView): List view for the vertical axis.
         method_combo (QComboBox): Combo box to select the plotting method.
+        downsampling_combo (QComboBox): Combo box to select the downsampling method (LTTB, Min-Max or None).
+        target_points_spinbox (QSpinBox): Spin box to set the number of points kept per series.
+        renderer_combo (QComboBox): Combo box to choose between the quick preview and the R (publication quality) renderer.
         script_label (QLabel): Label for the R script section.
         icon_label (QLabel): Label to display the running icon.
         script_box (QTextEdit): Text edit box to display the generated R script.
@@ -168,6 +173,33 @@ class LinePlotDialog(QDialog):
         method_group.setLayout(method_layout)
         right_layout.addWidget(method_group)
 
+        # Grup downsampling
+        downsampling_group = QGroupBox("Downsampling")
+        downsampling_layout = QVBoxLayout()
+        self.downsampling_combo = QComboBox(self)
+        self.downsampling_combo.addItems(DOWNSAMPLING_METHODS)
+        self.downsampling_combo.setToolTip("Reduces long series before they are drawn, keeping their visual shape.")
+        downsampling_layout.addWidget(self.downsampling_combo)
+        self.target_points_spinbox = QSpinBox(self)
+        self.target_points_spinbox.setRange(100, 1000000)
+        self.target_points_spinbox.setSingleStep(500)
+        self.target_points_spinbox.setValue(DEFAULT_TARGET_POINTS)
+        self.target_points_spinbox.setSuffix(" points")
+        self.downsampling_combo.currentTextChanged.connect(lambda method: self.target_points_spinbox.setEnabled(method != "None"))
+        downsampling_layout.addWidget(self.target_points_spinbox)
+        downsampling_group.setLayout(downsampling_layout)
+        right_layout.addWidget(downsampling_group)
+
+        # Grup renderer
+        renderer_group = QGroupBox("Renderer")
+        renderer_layout = QVBoxLayout()
+        self.renderer_combo = QComboBox(self)
+        self.renderer_combo.addItems(RENDERERS)
+        self.renderer_combo.setToolTip("Quick Preview draws the chart without R; Publication Quality runs the R script with ggplot2.")
+        renderer_layout.addWidget(self.renderer_combo)
+        renderer_group.setLayout(renderer_layout)
+        right_layout.addWidget(renderer_group)
+
 
         content_layout.addLayout(right_layout)
 
@@ -363,14 +395,25 @@ class LinePlotDialog(QDialog):
 
         line_plot = Lineplot(self.model1, self.model2, self.parent)
         controller = LinePlotController(line_plot)
-        controller.run_model(r_script)
+        options = {
+            "x": self.get_selected_horizontal()[0],
+            "ys": self.get_selected_vertical(),
+            "method": self.method_combo.currentText(),
+            "downsampling": self.downsampling_combo.currentText(),
+            "target_points": self.target_points_spinbox.value(),
+        }
+        if self.renderer_combo.currentText() == RENDERERS[0]:
+            controller.run_native(options)
+            r_script = quick_preview_script(r_script)
+        else:
+            controller.run_model(r_script, options)
 
         if line_plot.error:
             QMessageBox.critical(self, "Line Plot", line_plot.result)
         else:
             QMessageBox.information(self, "Line Plot", "Graph has been generated.")
 
-        self.parent.add_output(script_text = r_script, result_text = line_plot.result, plot_paths = line_plot.plot)
+        self.parent.add_output(script_text = r_script, result_text = line_plot.result, plot_images=line_plot.plot)
         self.parent.tab_widget.setCurrentWidget(self.parent.output_tab)
 
         self.icon_label.setVisible(False)
@@ -3,9 +3,10 @@ from PyQt6.QtCore import Qt, QStringListModel, QSize
 import polars as pl
 from model.Scatterplot import Scatterplot
 from controller.Graph.GraphController import ScatterPlotController
+from service.graph.NativePlot import RENDERERS, quick_preview_script
 
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QSpacerItem,  QCheckBox, QTextEdit, QGroupBox,QSizePolicy, QMessageBox
+    QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton, QLabel, QSpacerItem,  QCheckBox, QComboBox, QTextEdit, QGroupBox,QSizePolicy, QMessageBox
 )
 
 class ScatterPlotDialog(QDialog):
@@ -32,6 +33,7 @@ class ScatterPlotDialog(QDialog):
         regression_line_checkbox (QCheckBox): Checkbox to show regression line.
         correlation_checkbox (QCheckBox): Checkbox to show correlation.
         density_plot_checkbox (QCheckBox): Checkbox to show density plot.
+        renderer_combo (QComboBox): Combo box to choose between the quick preview and the R (publication quality) renderer.
         script_label (QLabel): Label for the R script.
         icon_label (QLabel): Label for the running icon.
         script_box (QTextEdit): Text box to display the generated R script.
@@ -139,6 +141,16 @@ class ScatterPlotDialog(QDialog):
         graph_group.setLayout(graph_layout)
         right_layout.addWidget(graph_group)
 
+        # Grup renderer
+        renderer_group = QGroupBox("Renderer")
+        renderer_layout = QVBoxLayout()
+        self.renderer_combo = QComboBox(self)
+        self.renderer_combo.addItems(RENDERERS)
+        self.renderer_combo.setToolTip("Quick Preview draws the chart without R; Publication Quality runs the R script with ggplot2.")
+        renderer_layout.addWidget(self.renderer_combo)
+        renderer_group.setLayout(renderer_layout)
+        right_layout.addWidget(renderer_group)
+
         content_layout.addLayout(right_layout)
 
         main_layout.addLayout(content_layout)
@@ -264,14 +276,24 @@ class ScatterPlotDialog(QDialog):
         
         scatter_plot = Scatterplot(self.model1, self.model2, self.parent)
         controller = ScatterPlotController(scatter_plot)
-        controller.run_model(r_script)
+        options = {
+            "columns": selected_columns,
+            "regression": self.regression_line_checkbox.isChecked(),
+            "correlation": self.correlation_checkbox.isChecked(),
+            "density": self.density_plot_checkbox.isChecked(),
+        }
+        if self.renderer_combo.currentText() == RENDERERS[0]:
+            controller.run_native(options)
+            r_script = quick_preview_script(r_script)
+        else:
+            controller.run_model(r_script, options)
 
         if scatter_plot.error:
             QMessageBox.critical(self, "Scatter Plot", scatter_plot.result)
         else:
             QMessageBox.information(self, "Scatter Plot", "Graph has been generated")
 
-        self.parent.add_output(script_text=r_script, result_text=scatter_plot.result, plot_paths=scatter_plot.plot)
+        self.parent.add_output(script_text=r_script, result_text=scatter_plot.result, plot_images=scatter_plot.plot)
         self.parent.tab_widget.setCurrentWidget(self.parent.output_tab)
 
         self.icon_label.setVisible(False)